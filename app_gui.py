@@ -9,65 +9,104 @@ from PyQt5.QtWidgets import (
     QHeaderView, QAbstractItemView, QDateTimeEdit, QComboBox, QCheckBox, QTextEdit,
     QWidget, QHBoxLayout, QPushButton
 )
-from PyQt5 import uic
-from PyQt5.QtCore import QDateTime, Qt # Importar Qt para flags de QMessageBox
+from PyQt5.QtCore import QDateTime, QTimer, Qt # Importar Qt para flags de QMessageBox
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, scoped_session
-
-# Importar modelos y servicios de tu proyecto
-from src.models import Base, User, Task, Category, Notification, TaskState, TaskPriority, TaskFrequency
-from src.services import UserService, TaskService, CategoryService, NotificationService
-
-# --- Configuración de la base de datos ---
-DATA_DIR = 'data'
-if not os.path.exists(DATA_DIR):
-    os.makedirs(DATA_DIR, exist_ok=True) # ensure_directories_exist
-
-DATABASE_URL = f"sqlite:///{DATA_DIR}/database.db"
-engine = create_engine(DATABASE_URL)
-
-# Asegurarse de que las tablas estén creadas
-Base.metadata.create_all(bind=engine)
-
-# Configurar SessionLocal para el manejo de sesiones
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-db_session = scoped_session(SessionLocal)
+# Los modelos, servicios y motores de la base de datos se importan al abrirla (open_database y
+# TaskManagerApp._connect_database): la ventana se muestra antes de cargar SQLAlchemy
+from build_ui import UI_FILE_PATH, load_ui_class
+from refresh_scheduler import RefreshScheduler
+from lookup_models import LabelLookup, LookupListModel, attach_lookup
+from future_watcher import FutureWatcher
 
 class TaskManagerApp(QMainWindow):
     """
     Clase principal de la aplicación GUI para el Gestor de Tareas.
-    Carga la interfaz de usuario desde un archivo .ui y conecta la lógica de negocio.
+    Construye la interfaz de usuario (precompilada o desde el archivo .ui) y conecta la lógica de negocio.
     """
-    def __init__(self):
+    def __init__(self, open_database, ui_class=None):
+        """
+        :param open_database: Función que abre la base de datos y devuelve sus fábricas de sesiones
+                              (ver `open_database`). Se llama en el primer turno del bucle de eventos,
+                              con la ventana ya visible.
+        :param ui_class: Clase de la interfaz precompilada con build_ui.py; None carga el archivo .ui.
+        """
         super().__init__()
-        # Cargar la interfaz de usuario desde el archivo .ui
-        ui_file_path = os.path.join(os.path.dirname(__file__), 'task_manager_ui.ui')
-        if not os.path.exists(ui_file_path):
-            QMessageBox.critical(self, "Error de Carga",
-                                 f"No se encontró el archivo UI: {ui_file_path}\n"
-                                 "Asegúrate de que 'task_manager_ui.ui' esté en el mismo directorio que 'app_gui.py'.")
-            sys.exit(1)
-        uic.loadUi(ui_file_path, self)
+        self.ui_class = ui_class
+        self._setup_ui()
 
-        # Inicializar servicios de la base de datos
-        self.db = db_session()
-        self.user_service = UserService(self.db)
-        self.category_service = CategoryService(self.db)
-        self.task_service = TaskService(self.db)
-        self.notification_service = NotificationService(self.db)
+        # Los servicios se crean al abrir la base de datos; hasta entonces la interfaz no responde
+        self.db = None
+        self.deletion_purger = None
+        self.centralWidget().setEnabled(False)
+        # Los hashes de contraseñas se calculan en un pool de procesos; su resultado vuelve al hilo
+        # de la interfaz a través de este objeto
+        self.future_watcher = FutureWatcher(self)
 
         # Variables para almacenar el ID de la entidad seleccionada (para edición)
         self.current_user_id = None
         self.current_category_id = None
         self.current_task_id = None
         self.current_notification_id = None
+        # Versión de cada entidad al cargarla en su formulario: al guardar, la actualización solo
+        # se aplica si nadie la ha modificado entretanto (ConcurrentUpdateError en otro caso)
+        self.loaded_versions = {}
 
         # Conectar señales y slots
         self._connect_signals_slots()
-        # Configurar tablas y cargar datos iniciales
+        # Configurar tablas; los datos iniciales se cargan al abrir la base de datos
         self._setup_tables()
+        QTimer.singleShot(0, functools.partial(self._connect_database, open_database))
+
+    def _connect_database(self, open_database):
+        """
+        Abre la base de datos, crea los servicios y programa la carga de los datos iniciales.
+        :param open_database: Función que devuelve la fábrica de sesiones de la interfaz y la del
+                              borrado en segundo plano.
+        """
+        from src.models import TaskState, TaskPriority, TaskFrequency
+        from src.services import UserService, TaskService, CategoryService, NotificationService, DeletionPurger
+
+        session_factory, purge_session_factory = open_database()
+        self.db = session_factory()
+        self.user_service = UserService(self.db)
+        self.category_service = CategoryService(self.db)
+        self.task_service = TaskService(self.db)
+        self.notification_service = NotificationService(self.db)
+        # Los usuarios y categorías se marcan como eliminados al instante y sus datos se borran
+        # por lotes en segundo plano, sin bloquear la interfaz ni la base de datos
+        self.deletion_purger = DeletionPurger(purge_session_factory)
+        self.deletion_purger.start()
+
+        # Llenar ComboBoxes de enums
+        self.taskStateInput.addItems([e.value for e in TaskState])
+        self.taskPriorityInput.addItems([p.value for p in TaskPriority])
+        # Asegurarse de que el QComboBox para frecuencia pueda tener una opción vacía
+        self.taskFrequencyInput.addItem("") # Opción vacía al principio
+        self.taskFrequencyInput.addItems([f.value for f in TaskFrequency])
+
+        self._setup_lookups()
+        self._setup_refresh_scheduler()
         self._load_initial_data()
+        self.centralWidget().setEnabled(True)
+
+    def _setup_ui(self):
+        """
+        Construye la interfaz con la clase precompilada o, si no está disponible, cargando el archivo .ui.
+        """
+        if self.ui_class is not None:
+            ui = self.ui_class()
+            ui.setupUi(self)
+            # Los widgets quedan como atributos de la ventana, igual que con uic.loadUi
+            self.__dict__.update(vars(ui))
+            return
+
+        if not os.path.exists(UI_FILE_PATH):
+            QMessageBox.critical(self, "Error de Carga",
+                                 f"No se encontró el archivo UI: {UI_FILE_PATH}\n"
+                                 "Asegúrate de que 'task_manager_ui.ui' esté en el mismo directorio que 'app_gui.py'.")
+            sys.exit(1)
+        from PyQt5 import uic
+        uic.loadUi(UI_FILE_PATH, self)
 
     def _connect_signals_slots(self):
         """
@@ -126,29 +165,58 @@ class TaskManagerApp(QMainWindow):
         self.notificationsTable.setHorizontalHeaderLabels(["ID", "Tarea (ID)", "Fecha de Envío", "Acciones"])
         self.notificationsTable.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch) # PyQt5
         self.notificationsTable.setSelectionBehavior(QAbstractItemView.SelectRows) # PyQt5
-        
-        # Llenar ComboBoxes de enums
-        self.taskStateInput.addItems([e.value for e in TaskState])
-        self.taskPriorityInput.addItems([p.value for p in TaskPriority])
-        # Asegurarse de que el QComboBox para frecuencia pueda tener una opción vacía
-        self.taskFrequencyInput.addItem("") # Opción vacía al principio
-        self.taskFrequencyInput.addItems([f.value for f in TaskFrequency])
 
         # Establecer la fecha/hora actual por defecto para los QDateTimeEdit
         self.taskStartDateInput.setDateTime(QDateTime.currentDateTime())
         self.notificationSendDateInput.setDateTime(QDateTime.currentDateTime())
 
+    def _setup_lookups(self):
+        """
+        Respalda los comboboxes de usuarios, categorías y tareas con modelos paginados que comparten
+        una caché ID → etiqueta, y les añade autocompletado por prefijo contra la base de datos.
+        """
+        def label(entity_id, text):
+            return f"{text} (ID: {entity_id})"
+
+        self.user_lookup_model = LookupListModel(
+            LabelLookup(self.user_service.lookup_users, label), "--- Seleccionar Usuario ---", parent=self)
+        self.category_lookup_model = LookupListModel(
+            LabelLookup(self.category_service.lookup_categories, label), "--- Seleccionar Categoría ---", parent=self)
+        self.task_lookup_model = LookupListModel(
+            LabelLookup(self.task_service.lookup_tasks, label), "--- Seleccionar Tarea ---", parent=self)
+        attach_lookup(self.taskUserInput, self.user_lookup_model)
+        attach_lookup(self.taskCategorySelect, self.category_lookup_model)
+        attach_lookup(self.notificationTaskInput, self.task_lookup_model)
+
+    def _setup_refresh_scheduler(self):
+        """
+        Registra las tablas y comboboxes en el planificador de recargas. Las tablas que se recargan
+        juntas consultan cada fuente una sola vez; los comboboxes solo vacían su modelo, que vuelve
+        a cargar su primera página al abrirse.
+        """
+        from src.repositories.projections import TASK_LIST_COLUMNS
+
+        self.refresh_scheduler = RefreshScheduler(parent=self)
+        self.refresh_scheduler.add_source('users', self.user_service.list_users)
+        self.refresh_scheduler.add_source('categories', self.category_service.get_all_categories)
+        self.refresh_scheduler.add_source('tasks', lambda: self.task_service.list_tasks(TASK_LIST_COLUMNS + ('categorias',)))
+        self.refresh_scheduler.add_source('notifications', self.notification_service.get_all_notifications)
+
+        self.refresh_scheduler.add_region('users', self._render_users, ['users'])
+        self.refresh_scheduler.add_region('categories', self._render_categories, ['categories'])
+        self.refresh_scheduler.add_region('tasks', self._render_tasks, ['tasks'])
+        self.refresh_scheduler.add_region('notifications', self._render_notifications, ['notifications'])
+        self.refresh_scheduler.add_region('user_combo', self.user_lookup_model.reset)
+        self.refresh_scheduler.add_region('category_combo', self.category_lookup_model.reset)
+        self.refresh_scheduler.add_region('task_combo', self.task_lookup_model.reset)
+
     def _load_initial_data(self):
         """
         Carga los datos iniciales en las tablas y comboboxes.
         """
-        self._load_users()
-        self._load_categories()
-        self._load_tasks()
-        self._load_notifications()
-        self._populate_user_combobox()
-        self._populate_category_combobox()
-        self._populate_task_combobox()
+        # Se programa para el primer turno del bucle de eventos: la ventana se muestra antes
+        self.refresh_scheduler.request('users', 'categories', 'tasks', 'notifications',
+                                       'user_combo', 'category_combo', 'task_combo')
         self._toggle_task_frequency() # Ajustar estado inicial de frecuencia
 
     def _on_tab_changed(self, index):
@@ -157,17 +225,14 @@ class TaskManagerApp(QMainWindow):
         """
         tab_name = self.tabWidget.tabText(index)
         if tab_name == "Usuarios":
-            self._load_users()
+            self.refresh_scheduler.request('users')
         elif tab_name == "Categorías":
-            self._load_categories()
+            self.refresh_scheduler.request('categories')
         elif tab_name == "Tareas":
-            self._load_tasks()
-            self._populate_user_combobox() # Recargar usuarios por si hay nuevos
-            self._populate_category_combobox() # Recargar categorías por si hay nuevas
+            self.refresh_scheduler.request('tasks', 'user_combo', 'category_combo') # Recargar usuarios y categorías por si hay nuevos
             self._clear_task_form()
         elif tab_name == "Notificaciones":
-            self._load_notifications()
-            self._populate_task_combobox() # Recargar tareas por si hay nuevas
+            self.refresh_scheduler.request('notifications', 'task_combo') # Recargar tareas por si hay nuevas
             self._clear_notification_form()
 
 
@@ -206,10 +271,9 @@ class TaskManagerApp(QMainWindow):
         return None # O lanzar un error si el valor no es válido
 
     # --- CRUD Usuarios ---
-    def _load_users(self):
-        """Carga los usuarios de la base de datos y los muestra en la tabla."""
+    def _render_users(self, users):
+        """Muestra en la tabla los usuarios cargados de la base de datos."""
         self.usersTable.setRowCount(0) # Limpiar tabla
-        users = self.user_service.get_all_users()
         for row_idx, user in enumerate(users):
             print(f"DEBUG: Processing user from DB: ID={user.id_usuario}, Name={user.nombre}, Type ID={type(user.id_usuario)}") # NEW DEBUG PRINT
             
@@ -236,7 +300,10 @@ class TaskManagerApp(QMainWindow):
             self.usersTable.setCellWidget(row_idx, 3, actions_cell)
 
     def _save_user(self):
-        """Guarda o actualiza un usuario."""
+        """
+        Guarda o actualiza un usuario. El hash de la contraseña se calcula en el pool de procesos
+        y el guardado termina en _finish_save_user, sin bloquear la interfaz mientras tanto.
+        """
         name = self.userNameInput.text().strip()
         email = self.userEmailInput.text().strip()
         password = self.userPasswordInput.text()
@@ -246,25 +313,45 @@ class TaskManagerApp(QMainWindow):
             "correo": email,
             "contrasena": password
         }
+        user_id, version = self.current_user_id, self.loaded_versions.get('user')
+        # Solo incluir la contraseña si ha sido modificada (no vacía)
+        if user_id and not password:
+            user_data.pop("contrasena") # No actualizar contraseña si se deja vacía
+
+        try:
+            future = self.user_service.hash_password_async(user_data, is_new=not user_id)
+        except ValueError as e:
+            self._show_warning_message("Error de Validación", str(e))
+            return
+        except Exception as e:
+            self._show_error_message("Error del Sistema", f"Ocurrió un error inesperado: {e}")
+            return
+        finally:
+            self.db.commit() # No mantener abierta la transacción mientras se calcula el hash
+
+        if future is None:
+            self._finish_save_user(user_id, version, user_data, None)
+            return
+        self.saveUserButton.setEnabled(False) # Evitar un segundo guardado mientras tanto
+        self.future_watcher.watch(future, functools.partial(self._finish_save_user, user_id, version, user_data))
 
+    def _finish_save_user(self, user_id, version, user_data, future):
+        """Guarda el usuario con el hash calculado (future es None si no se cambia la contraseña)."""
+        self.saveUserButton.setEnabled(True)
         try:
-            if self.current_user_id: # Actualizar usuario existente
-                # Solo incluir la contraseña si ha sido modificada (no vacía)
-                if not password:
-                    user_data.pop("contrasena") # No actualizar contraseña si se deja vacía
-                
-                updated_user = self.user_service.update_user(self.current_user_id, user_data)
+            password_hash = future.result() if future is not None else None
+            if user_id: # Actualizar usuario existente
+                updated_user = self.user_service.update_user(user_id, user_data, version, password_hash)
                 if updated_user:
                     self._show_info_message("Éxito", "Usuario actualizado con éxito!")
                 else:
                     self._show_error_message("Error", "Usuario no encontrado para actualizar.")
             else: # Crear nuevo usuario
-                new_user = self.user_service.create_user(user_data)
+                new_user = self.user_service.create_user(user_data, password_hash)
                 self._show_info_message("Éxito", "Usuario creado con éxito!")
 
             self._clear_user_form()
-            self._load_users()
-            self._populate_user_combobox() # Recargar combobox de usuarios
+            self.refresh_scheduler.request('users', 'user_combo')
 
         except ValueError as e:
             self._show_warning_message("Error de Validación", str(e))
@@ -293,6 +380,7 @@ class TaskManagerApp(QMainWindow):
 
         user = self.user_service.get_user_by_id(self.current_user_id)
         if user:
+            self.loaded_versions['user'] = user.version
             self.userNameInput.setText(user.nombre)
             self.userEmailInput.setText(user.correo)
             # No cargar la contraseña por seguridad; el usuario debe reintroducirla para cambiarla.
@@ -302,7 +390,7 @@ class TaskManagerApp(QMainWindow):
             self._show_warning_message("Usuario No Encontrado", f"El usuario con ID {self.current_user_id} no se encontró en la base de datos.")
             self.current_user_id = None # Resetear el ID actual ya que no existe
             self._clear_user_form() # Limpiar formulario si no se encuentra
-            self._load_users() # Recargar la tabla para reflejar el estado actual
+            self.refresh_scheduler.request('users')
 
     def _delete_user(self, user_id):
         """Elimina un usuario previa confirmación."""
@@ -320,15 +408,14 @@ class TaskManagerApp(QMainWindow):
                                      QMessageBox.No) # PyQt5
         if reply == QMessageBox.Yes: # PyQt5
             try:
-                deleted = self.user_service.delete_user(user_id)
+                deleted = self.user_service.delete_user(user_id, deferred=True)
                 if deleted:
+                    self.deletion_purger.wake()
                     self._show_info_message("Éxito", "Usuario eliminado con éxito.")
                 else:
                     self._show_warning_message("Advertencia", "Usuario no encontrado.")
-                self._load_users()
-                self._populate_user_combobox() # Recargar combobox de usuarios
-                self._load_tasks() # Recargar tareas por si se eliminaron cascada
-                self._load_notifications() # Recargar notificaciones por si se eliminaron cascada
+                # Recargar tareas y notificaciones por si se eliminaron en cascada
+                self.refresh_scheduler.request('users', 'user_combo', 'tasks', 'notifications')
                 self._clear_user_form() # Limpiar formulario después de eliminar
             except ValueError as e:
                 self._show_warning_message("Error de Validación", str(e))
@@ -344,19 +431,10 @@ class TaskManagerApp(QMainWindow):
         self.userEmailInput.clear()
         self.userPasswordInput.clear()
 
-    def _populate_user_combobox(self):
-        """Rellena el QComboBox de usuarios en la pestaña de Tareas."""
-        self.taskUserInput.clear()
-        self.taskUserInput.addItem("--- Seleccionar Usuario ---", userData=None)
-        users = self.user_service.get_all_users()
-        for user in users:
-            self.taskUserInput.addItem(f"{user.nombre} (ID: {user.id_usuario})", userData=user.id_usuario)
-
     # --- CRUD Categorías ---
-    def _load_categories(self):
-        """Carga las categorías de la base de datos y las muestra en la tabla."""
+    def _render_categories(self, categories):
+        """Muestra en la tabla las categorías cargadas de la base de datos."""
         self.categoriesTable.setRowCount(0)
-        categories = self.category_service.get_all_categories()
         for row_idx, category in enumerate(categories):
             self.categoriesTable.insertRow(row_idx)
             self.categoriesTable.setItem(row_idx, 0, QTableWidgetItem(str(category.id_categoria)))
@@ -375,7 +453,8 @@ class TaskManagerApp(QMainWindow):
 
         try:
             if self.current_category_id:
-                updated_category = self.category_service.update_category(self.current_category_id, category_data)
+                updated_category = self.category_service.update_category(self.current_category_id, category_data,
+                                                                         self.loaded_versions.get('category'))
                 if updated_category:
                     self._show_info_message("Éxito", "Categoría actualizada con éxito!")
                 else:
@@ -385,8 +464,7 @@ class TaskManagerApp(QMainWindow):
                 self._show_info_message("Éxito", "Categoría creada con éxito!")
             
             self._clear_category_form()
-            self._load_categories()
-            self._populate_category_combobox() # Recargar combobox de categorías
+            self.refresh_scheduler.request('categories', 'category_combo')
         except ValueError as e:
             self._show_warning_message("Error de Validación", str(e))
         except Exception as e:
@@ -414,12 +492,13 @@ class TaskManagerApp(QMainWindow):
 
         category = self.category_service.get_category_by_id(self.current_category_id)
         if category:
+            self.loaded_versions['category'] = category.version
             self.categoryNameInput.setText(category.nombre)
         else:
             self._show_warning_message("Categoría No Encontrada", f"La categoría con ID {self.current_category_id} no se encontró en la base de datos.")
             self.current_category_id = None
             self._clear_category_form()
-            self._load_categories()
+            self.refresh_scheduler.request('categories')
 
     def _delete_category(self, category_id):
         """Elimina una categoría previa confirmación."""
@@ -433,14 +512,14 @@ class TaskManagerApp(QMainWindow):
                                      QMessageBox.No) # PyQt5
         if reply == QMessageBox.Yes: # PyQt5
             try:
-                deleted = self.category_service.delete_category(category_id)
+                deleted = self.category_service.delete_category(category_id, deferred=True)
                 if deleted:
+                    self.deletion_purger.wake()
                     self._show_info_message("Éxito", "Categoría eliminada con éxito.")
                 else:
                     self._show_warning_message("Advertencia", "Categoría no encontrada.")
-                self._load_categories()
-                self._populate_category_combobox() # Recargar combobox de categorías
-                self._load_tasks() # Recargar tareas por si afectó categorías asociadas
+                # Recargar tareas por si afectó categorías asociadas
+                self.refresh_scheduler.request('categories', 'category_combo', 'tasks')
                 self._clear_category_form() # Limpiar formulario después de eliminar
             except ValueError as e:
                 self._show_warning_message("Error de Validación", str(e))
@@ -454,14 +533,6 @@ class TaskManagerApp(QMainWindow):
         self.current_category_id = None
         self.categoryNameInput.clear()
 
-    def _populate_category_combobox(self):
-        """Rellena el QComboBox de categorías en la pestaña de Tareas."""
-        self.taskCategorySelect.clear()
-        self.taskCategorySelect.addItem("--- Seleccionar Categoría ---", userData=None)
-        categories = self.category_service.get_all_categories()
-        for category in categories:
-            self.taskCategorySelect.addItem(f"{category.nombre} (ID: {category.id_categoria})", userData=category.id_categoria)
-
     # --- CRUD Tareas ---
     def _toggle_task_frequency(self):
         """Habilita/deshabilita el QComboBox de frecuencia según si la tarea es recurrente."""
@@ -469,10 +540,9 @@ class TaskManagerApp(QMainWindow):
         if not self.taskRecurringInput.isChecked():
             self.taskFrequencyInput.setCurrentIndex(0) # Seleccionar opción vacía
 
-    def _load_tasks(self):
-        """Carga las tareas de la base de datos y las muestra en la tabla."""
+    def _render_tasks(self, tasks):
+        """Muestra en la tabla las tareas cargadas de la base de datos."""
         self.tasksTable.setRowCount(0)
-        tasks = self.task_service.get_all_tasks()
         for row_idx, task in enumerate(tasks):
             self.tasksTable.insertRow(row_idx)
             self.tasksTable.setItem(row_idx, 0, QTableWidgetItem(str(task.id_tarea)))
@@ -482,8 +552,7 @@ class TaskManagerApp(QMainWindow):
             self.tasksTable.setItem(row_idx, 4, QTableWidgetItem(str(task.id_usuario)))
 
             # Mostrar categorías asociadas
-            categories_str = ", ".join([tc.categoria.nombre for tc in task.categorias if tc.categoria])
-            self.tasksTable.setItem(row_idx, 5, QTableWidgetItem(categories_str if categories_str else "N/A"))
+            self.tasksTable.setItem(row_idx, 5, QTableWidgetItem(task.categorias or "N/A"))
 
             actions_cell = self._create_actions_widget(
                 edit_func=functools.partial(self._load_task_into_form, row_idx, 0),
@@ -493,6 +562,8 @@ class TaskManagerApp(QMainWindow):
 
     def _save_task(self):
         """Guarda o actualiza una tarea."""
+        from src.models import TaskState, TaskPriority, TaskFrequency
+
         title = self.taskTitleInput.text().strip()
         description = self.taskDescriptionInput.toPlainText().strip()
         start_date = self._from_qt_datetime(self.taskStartDateInput.dateTime())
@@ -522,7 +593,8 @@ class TaskManagerApp(QMainWindow):
 
         try:
             if self.current_task_id:
-                updated_task = self.task_service.update_task(self.current_task_id, task_data)
+                updated_task = self.task_service.update_task(self.current_task_id, task_data,
+                                                             self.loaded_versions.get('task'))
                 if updated_task:
                     self._show_info_message("Éxito", "Tarea actualizada con éxito!")
                 else:
@@ -532,8 +604,7 @@ class TaskManagerApp(QMainWindow):
                 self._show_info_message("Éxito", "Tarea creada con éxito!")
             
             self._clear_task_form()
-            self._load_tasks()
-            self._populate_task_combobox() # Recargar combobox de tareas
+            self.refresh_scheduler.request('tasks', 'task_combo')
 
         except ValueError as e:
             self._show_warning_message("Error de Validación", str(e))
@@ -560,8 +631,13 @@ class TaskManagerApp(QMainWindow):
             self._show_error_message("Error de Lectura", f"ID de tarea inválido en la tabla: {e}. Valor: '{item.text()}'")
             return
 
+        # El formulario selecciona usuario y categoría en los comboboxes: deben estar al día
+        if self.refresh_scheduler.is_pending('user_combo') or self.refresh_scheduler.is_pending('category_combo'):
+            self.refresh_scheduler.flush()
+
         task = self.task_service.get_task_by_id(self.current_task_id)
         if task:
+            self.loaded_versions['task'] = task.version
             self.taskTitleInput.setText(task.titulo)
             self.taskDescriptionInput.setText(task.descripcion if task.descripcion else "")
             self.taskStartDateInput.setDateTime(self._to_qt_datetime(task.fecha_inicio))
@@ -572,18 +648,14 @@ class TaskManagerApp(QMainWindow):
             self.taskFrequencyInput.setCurrentText(task.frecuencia.value if task.frecuencia else "")
             self._toggle_task_frequency() # Ajustar enabled/disabled
             
-            # Seleccionar usuario en el combobox
-            user_index = self.taskUserInput.findData(task.id_usuario)
-            if user_index != -1:
-                self.taskUserInput.setCurrentIndex(user_index)
-            else:
-                self.taskUserInput.setCurrentIndex(0) # Seleccionar "Seleccionar Usuario"
+            # Seleccionar usuario en el combobox (0, "Seleccionar Usuario", si no existe)
+            self.taskUserInput.setCurrentIndex(self.user_lookup_model.row_for_id(task.id_usuario))
 
         else:
             self._show_warning_message("Tarea No Encontrada", f"La tarea con ID {self.current_task_id} no se encontró en la base de datos.")
             self.current_task_id = None
             self._clear_task_form()
-            self._load_tasks()
+            self.refresh_scheduler.request('tasks')
 
     def _delete_task(self, task_id):
         """Elimina una tarea previa confirmación."""
@@ -603,9 +675,7 @@ class TaskManagerApp(QMainWindow):
                     self._show_info_message("Éxito", "Tarea eliminada con éxito.")
                 else:
                     self._show_warning_message("Advertencia", "Tarea no encontrada.")
-                self._load_tasks()
-                self._populate_task_combobox() # Recargar combobox de tareas
-                self._load_notifications() # Recargar notificaciones
+                self.refresh_scheduler.request('tasks', 'task_combo', 'notifications')
                 self._clear_task_form() # Limpiar formulario después de eliminar
             except ValueError as e:
                 self._show_warning_message("Error de Validación", str(e))
@@ -643,7 +713,7 @@ class TaskManagerApp(QMainWindow):
             updated_task = self.task_service.add_category_to_task(self.current_task_id, category_id_data)
             if updated_task:
                 self._show_info_message("Éxito", f"Categoría asociada a la tarea ID: {self.current_task_id}.")
-                self._load_tasks() # Recargar tabla de tareas para reflejar la categoría
+                self.refresh_scheduler.request('tasks')
             else:
                 self._show_error_message("Error", "No se pudo asociar la categoría. La tarea o categoría no existe, o ya está asociada.")
         except ValueError as e:
@@ -668,7 +738,7 @@ class TaskManagerApp(QMainWindow):
             updated_task = self.task_service.remove_category_from_task(self.current_task_id, category_id_data)
             if updated_task:
                 self._show_info_message("Éxito", f"Categoría desasociada de la tarea ID: {self.current_task_id}.")
-                self._load_tasks() # Recargar tabla de tareas
+                self.refresh_scheduler.request('tasks')
             else:
                 self._show_error_message("Error", "No se pudo desasociar la categoría. La tarea o asociación no existe.")
         except ValueError as e:
@@ -678,19 +748,10 @@ class TaskManagerApp(QMainWindow):
         finally:
             self.db.commit()
 
-    def _populate_task_combobox(self):
-        """Rellena el QComboBox de tareas en la pestaña de Notificaciones."""
-        self.notificationTaskInput.clear()
-        self.notificationTaskInput.addItem("--- Seleccionar Tarea ---", userData=None)
-        tasks = self.task_service.get_all_tasks()
-        for task in tasks:
-            self.notificationTaskInput.addItem(f"{task.titulo} (ID: {task.id_tarea})", userData=task.id_tarea)
-
     # --- CRUD Notificaciones ---
-    def _load_notifications(self):
-        """Carga las notificaciones de la base de datos y las muestra en la tabla."""
+    def _render_notifications(self, notifications):
+        """Muestra en la tabla las notificaciones cargadas de la base de datos."""
         self.notificationsTable.setRowCount(0)
-        notifications = self.notification_service.get_all_notifications()
         for row_idx, notification in enumerate(notifications):
             self.notificationsTable.insertRow(row_idx)
             self.notificationsTable.setItem(row_idx, 0, QTableWidgetItem(str(notification.id_notificacion)))
@@ -719,7 +780,8 @@ class TaskManagerApp(QMainWindow):
 
         try:
             if self.current_notification_id:
-                updated_notification = self.notification_service.update_notification(self.current_notification_id, notification_data)
+                updated_notification = self.notification_service.update_notification(self.current_notification_id, notification_data,
+                                                                                     self.loaded_versions.get('notification'))
                 if updated_notification:
                     self._show_info_message("Éxito", "Notificación actualizada con éxito!")
                 else:
@@ -729,7 +791,7 @@ class TaskManagerApp(QMainWindow):
                 self._show_info_message("Éxito", "Notificación creada con éxito!")
             
             self._clear_notification_form()
-            self._load_notifications()
+            self.refresh_scheduler.request('notifications')
         except ValueError as e:
             self._show_warning_message("Error de Validación", str(e))
         except Exception as e:
@@ -757,19 +819,16 @@ class TaskManagerApp(QMainWindow):
 
         notification = self.notification_service.get_notification_by_id(self.current_notification_id)
         if notification:
-            # Seleccionar tarea en el combobox
-            task_index = self.notificationTaskInput.findData(notification.id_tarea)
-            if task_index != -1:
-                self.notificationTaskInput.setCurrentIndex(task_index)
-            else:
-                self.notificationTaskInput.setCurrentIndex(0) # Seleccionar "Seleccionar Tarea"
+            self.loaded_versions['notification'] = notification.version
+            # Seleccionar tarea en el combobox (0, "Seleccionar Tarea", si no existe)
+            self.notificationTaskInput.setCurrentIndex(self.task_lookup_model.row_for_id(notification.id_tarea))
 
             self.notificationSendDateInput.setDateTime(self._to_qt_datetime(notification.fecha_envio))
         else:
             self._show_warning_message("Notificación No Encontrada", f"La notificación con ID {self.current_notification_id} no se encontró en la base de datos.")
             self.current_notification_id = None
             self._clear_notification_form()
-            self._load_notifications()
+            self.refresh_scheduler.request('notifications')
 
     def _delete_notification(self, notification_id):
         """Elimina una notificación previa confirmación."""
@@ -788,7 +847,7 @@ class TaskManagerApp(QMainWindow):
                     self._show_info_message("Éxito", "Notificación eliminada con éxito.")
                 else:
                     self._show_warning_message("Advertencia", "Notificación no encontrada.")
-                    self._load_notifications()
+                    self.refresh_scheduler.request('notifications')
                     self._clear_notification_form() # Limpiar formulario después de eliminar
             except ValueError as e:
                 self._show_warning_message("Error de Validación", str(e))
@@ -830,12 +889,39 @@ class TaskManagerApp(QMainWindow):
         """
         Se ejecuta cuando la ventana se cierra, asegurando que la sesión de la base de datos se cierre.
         """
+        if self.deletion_purger:
+            self.deletion_purger.stop(timeout=5.0)
         if self.db:
             self.db.close()
         super().closeEvent(event)
 
-if __name__ == '__main__':
+def open_database():
+    """
+    Abre la base de datos y crea las tablas si el esquema de los modelos ha cambiado.
+    :return: La fábrica de sesiones de la interfaz y la del borrado en segundo plano.
+    """
+    from src.models import Base
+    from src.database.session import create_engines, create_session_factory, init_schema
+
+    # Escritor único y pool de lectura: los listados no compiten con las escrituras
+    engine, read_engine = create_engines()
+    # El escritor tiene una sola conexión: el hilo de DeletionPurger usa otro motor
+    purge_engine, _ = create_engines(readers=0)
+    # Crear las tablas solo si el esquema de los modelos ha cambiado desde el último arranque
+    init_schema(engine, Base.metadata)
+    return create_session_factory(engine, read_engine), create_session_factory(purge_engine)
+
+def main():
+    """
+    Muestra la ventana principal y abre la base de datos en cuanto arranca el bucle de eventos.
+    Nada de esto ocurre al importar el módulo: los procesos del pool de hashes (spawn) vuelven a
+    importar el módulo principal.
+    """
     app = QApplication(sys.argv)
-    window = TaskManagerApp()
+    # Clase de la interfaz precompilada con build_ui.py; None si no existe o el .ui es más reciente
+    window = TaskManagerApp(open_database, load_ui_class())
     window.show()
     sys.exit(app.exec_()) # En PyQt5, es app.exec_()
+
+if __name__ == '__main__':
+    main()
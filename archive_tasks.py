@@ -0,0 +1,39 @@
+import sys
+import argparse
+
+def parse_args(argv=None):
+    """
+    Interpreta los argumentos de la línea de comandos.
+    """
+    parser = argparse.ArgumentParser(description="Archiva las tareas completadas antiguas con sus categorías y notificaciones.")
+    parser.add_argument("--dias", type=int, default=90, help="Antigüedad mínima en días de las tareas a archivar.")
+    parser.add_argument("--lote", type=int, default=1000, help="Tareas por lote y transacción.")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """
+    Ejecuta el archivado informando el progreso.
+    """
+    args = parse_args(argv)
+    # Importaciones diferidas: --help y los errores de argumentos no cargan SQLAlchemy
+    from src.database.session import create_engines, create_session_factory, init_schema
+    from src.models import Base
+    from src.services import TaskService
+
+    engine, read_engine = create_engines()
+    init_schema(engine, Base.metadata)
+    db = create_session_factory(engine, read_engine)()
+    try:
+        total = TaskService(db).archive_completed_tasks(
+            args.dias, batch_size=args.lote, progress=lambda total: print(f"  {total} tareas archivadas...")
+        )
+        print(f"Archivado completado: {total} tareas.")
+    except ValueError as e:
+        print(f"Error en el archivado: {e}", file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+import os
+import sys
+import time
+import argparse
+from src.database import DATA_DIR, DATABASE_PATH, create_backup, list_backups, restore_database
+
+BACKUP_DIR = os.path.join(DATA_DIR, 'backups')
+
+def parse_args(argv=None):
+    """
+    Interpreta los argumentos de la línea de comandos.
+    """
+    parser = argparse.ArgumentParser(description="Copias de seguridad en línea de la base de datos SQLite.")
+    parser.add_argument("--bd", default=DATABASE_PATH, help="Ruta de la base de datos.")
+    parser.add_argument("--directorio", default=BACKUP_DIR, help="Directorio de las copias.")
+    commands = parser.add_subparsers(dest="comando", required=True)
+
+    create = commands.add_parser("crear", help="Crea una copia fechada sin detener la aplicación.")
+    create.add_argument("--compactar", action="store_true", help="Crea una instantánea compactada con VACUUM INTO.")
+    create.add_argument("--conservar", type=int, help="Número de copias a conservar (elimina las más antiguas).")
+    create.add_argument("--paginas", type=int, default=1024, help="Páginas copiadas por paso.")
+    create.add_argument("--pausa", type=float, default=0.005, help="Segundos de pausa entre pasos.")
+    create.add_argument("--cada", type=float, help="Repite la copia cada N minutos hasta interrumpirla (Ctrl+C).")
+
+    commands.add_parser("listar", help="Lista las copias existentes.")
+
+    restore = commands.add_parser("restaurar", help="Restaura una copia sobre la base de datos.")
+    restore.add_argument("copia", help="Ruta de la copia a restaurar.")
+    return parser.parse_args(argv)
+
+def report(result, action):
+    """
+    Muestra el tamaño y la duración de una copia o restauración.
+    """
+    print(f"{action}: {result.path} ({result.size / 2**20:.1f} MiB en {result.seconds:.2f} s, "
+          f"{result.throughput:.1f} MiB/s)")
+
+def progress(copied, total):
+    """
+    Muestra el avance de la copia por la salida de errores.
+    """
+    print(f"\r  {copied}/{total} páginas", end="" if copied < total else "\n", file=sys.stderr)
+
+def main(argv=None):
+    """
+    Ejecuta el comando indicado.
+    """
+    args = parse_args(argv)
+    try:
+        if args.comando == "listar":
+            for path in list_backups(args.bd, args.directorio):
+                print(f"{path} ({os.path.getsize(path) / 2**20:.1f} MiB)")
+        elif args.comando == "restaurar":
+            report(restore_database(args.copia, args.bd, progress=progress), "Restaurada")
+        else:
+            while True:
+                result = create_backup(args.bd, args.directorio, keep=args.conservar, compact=args.compactar,
+                                       pages=args.paginas, sleep=args.pausa, progress=progress)
+                report(result, "Copia creada")
+                if not args.cada:
+                    break
+                time.sleep(args.cada * 60)
+    except ValueError as e:
+        print(f"Error en la copia de seguridad: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        print("Copias programadas detenidas.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""
+Benchmark de las copias de seguridad en línea.
+
+Genera una base de datos del tamaño indicado, en modo rollback journal y en modo WAL, y mide
+la copia por pasos (API de copia en línea) y la instantánea con VACUUM INTO, junto con la
+espera máxima de un escritor concurrente que inserta una fila cada 10 ms durante la copia.
+
+Uso:
+    python -m benchmarks.bench_backup [MiB] [páginas por paso]
+"""
+import os
+import sys
+import time
+import sqlite3
+import tempfile
+import threading
+from src.database import backup_database, snapshot_database
+
+def populate(path, mib, journal_mode):
+    """Crea una tabla con filas de 1 KiB hasta alcanzar `mib` MiB."""
+    conn = sqlite3.connect(path)
+    conn.execute(f"PRAGMA journal_mode={journal_mode}")
+    conn.execute("CREATE TABLE datos (id INTEGER PRIMARY KEY, carga BLOB)")
+    payload = os.urandom(1024)
+    rows = mib * 1024
+    for start in range(0, rows, 10_000):
+        conn.executemany("INSERT INTO datos (carga) VALUES (?)", ((payload,) for _ in range(min(10_000, rows - start))))
+        conn.commit()
+    conn.close()
+
+def with_writer(path, action):
+    """Ejecuta `action` mientras otro hilo escribe; devuelve (resultado, espera máxima en s)."""
+    stop = threading.Event()
+    waits = []
+
+    def write():
+        conn = sqlite3.connect(path, timeout=60)
+        while not stop.is_set():
+            began = time.perf_counter()
+            conn.execute("INSERT INTO datos (carga) VALUES (x'00')")
+            conn.commit()
+            waits.append(time.perf_counter() - began)
+            time.sleep(0.01)
+        conn.close()
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    try:
+        result = action()
+    finally:
+        stop.set()
+        writer.join()
+    return result, max(waits, default=0.0)
+
+def run(mib, pages):
+    for journal_mode in ("delete", "wal"):
+        with tempfile.TemporaryDirectory() as tmp:
+            run_mode(tmp, mib, pages, journal_mode)
+
+def run_mode(tmp, mib, pages, journal_mode):
+    path = os.path.join(tmp, "database.db")
+    populate(path, mib, journal_mode)
+    print(f"Base de datos ({journal_mode}): {os.path.getsize(path) / 2**20:.0f} MiB")
+
+    result, wait = with_writer(path, lambda: backup_database(path, os.path.join(tmp, "copia.db"), pages=pages))
+    print(f"  Copia en línea ({pages} págs/paso): {result.seconds:6.2f} s  {result.throughput:7.1f} MiB/s  "
+          f"espera máx. escritor {wait * 1000:.0f} ms")
+
+    result, wait = with_writer(path, lambda: snapshot_database(path, os.path.join(tmp, "instantanea.db")))
+    print(f"  VACUUM INTO                  : {result.seconds:6.2f} s  {result.throughput:7.1f} MiB/s  "
+          f"espera máx. escritor {wait * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2048,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 1024)
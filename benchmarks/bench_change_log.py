@@ -0,0 +1,68 @@
+"""
+Benchmark del registro de cambios.
+
+Mide el coste de los triggers de change_log en inserciones y actualizaciones masivas (comparando
+con la misma base de datos sin triggers) y la velocidad de lectura de los cambios por páginas con
+changes_since, frente a volver a leer la tabla completa.
+
+Uso:
+    python -m benchmarks.bench_change_log [tareas]
+"""
+import os
+import sys
+import time
+import tempfile
+from sqlalchemy import insert, select, text, update
+from src.models import Base, Task, User
+from src.services import ChangeLogService
+from src.database import TRACKED_TABLES, create_engines, create_session_factory
+
+def write_workload(engine, tasks):
+    began = time.perf_counter()
+    with engine.begin() as conn:
+        conn.execute(insert(Task), [{"titulo": f"Tarea {i}", "id_usuario": 1} for i in range(tasks)])
+    inserted = time.perf_counter() - began
+    began = time.perf_counter()
+    with engine.begin() as conn:
+        conn.execute(update(Task).where(Task.id_tarea % 10 == 0).values(descripcion="Revisada"))
+    return inserted, time.perf_counter() - began
+
+def run(tasks):
+    print(f"{tasks} tareas (actualización del 10%)")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, triggers in (("Sin registro", False), ("Con registro", True)):
+            writer, reader = create_engines(os.path.join(tmp, f"{label}.db"))
+            Base.metadata.create_all(writer)
+            with writer.begin() as conn:
+                conn.execute(insert(User), [{"nombre": "User", "correo": "user@example.com", "contrasena": "password"}])
+                if not triggers:
+                    for table in TRACKED_TABLES:
+                        for action in ("ins", "upd", "del"):
+                            conn.execute(text(f"DROP TRIGGER _cdc_{table}_{action}"))
+            inserted, updated = write_workload(writer, tasks)
+            print(f"  {label}: INSERT {inserted * 1000:8.1f} ms, UPDATE {updated * 1000:8.1f} ms")
+            if triggers:
+                session = create_session_factory(writer, reader)()
+                service = ChangeLogService(session)
+                began = time.perf_counter()
+                seq, pages, read = 0, 0, 0
+                while True:
+                    changes = service.changes_since(seq, 1000)
+                    if not changes:
+                        break
+                    seq, pages, read = changes[-1].seq, pages + 1, read + len(changes)
+                elapsed = time.perf_counter() - began
+                print(f"  changes_since: {read} cambios en {pages} páginas, {elapsed * 1000:8.1f} ms")
+
+                began = time.perf_counter()
+                service.changes_since(seq - 10, 1000)
+                print(f"  Consulta de los últimos 10 cambios: {(time.perf_counter() - began) * 1000:8.2f} ms")
+                began = time.perf_counter()
+                session.execute(select(Task)).all()
+                print(f"  Releer la tabla tasks completa:     {(time.perf_counter() - began) * 1000:8.2f} ms")
+                session.close()
+            writer.dispose()
+            reader.dispose()
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
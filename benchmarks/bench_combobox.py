@@ -0,0 +1,76 @@
+"""
+Benchmark de los comboboxes de la GUI con muchas tareas.
+
+Compara, con QT_QPA_PLATFORM=offscreen, el combobox de tareas rellenado con todas las filas
+(addItem por tarea, como antes) con el respaldado por LookupListModel (primera página al abrir)
+y mide la búsqueda por prefijo del autocompletado.
+
+Uso:
+    python -m benchmarks.bench_combobox [tareas]
+"""
+import os
+import sys
+import time
+import tempfile
+from sqlalchemy import insert
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PyQt5.QtWidgets import QApplication, QComboBox
+from src.models import Base, Task, User
+from src.services import TaskService
+from src.database import create_engines, create_session_factory
+from lookup_models import LabelLookup, LookupListModel, attach_lookup
+
+def populate(engine, tasks):
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"nombre": "User", "correo": "user@example.com", "contrasena": "password"}])
+        conn.execute(insert(Task), [{"titulo": f"Tarea {i}", "id_usuario": 1} for i in range(tasks)])
+
+def timed(action):
+    began = time.perf_counter()
+    action()
+    return (time.perf_counter() - began) * 1000
+
+def run(tasks):
+    app = QApplication.instance() or QApplication([])
+    with tempfile.TemporaryDirectory() as tmp:
+        writer, reader = create_engines(os.path.join(tmp, "database.db"))
+        populate(writer, tasks)
+        service = TaskService(create_session_factory(writer, reader)())
+        print(f"{tasks} tareas")
+
+        combo = QComboBox()
+
+        def fill_all():
+            combo.clear()
+            combo.addItem("--- Seleccionar Tarea ---", userData=None)
+            for task in service.list_tasks(('id_tarea', 'titulo')):
+                combo.addItem(f"{task.titulo} (ID: {task.id_tarea})", userData=task.id_tarea)
+            combo.showPopup()
+            app.processEvents()
+            combo.hidePopup()
+
+        print(f"  Todas las filas (addItem): {timed(fill_all):8.1f} ms")
+
+        model = LookupListModel(LabelLookup(service.lookup_tasks, lambda i, t: f"{t} (ID: {i})"),
+                                "--- Seleccionar Tarea ---")
+        lookup_combo = QComboBox()
+        completer = attach_lookup(lookup_combo, model)
+
+        def reset_and_open():
+            model.reset()
+            lookup_combo.showPopup()
+            app.processEvents()
+            lookup_combo.hidePopup()
+
+        print(f"  Modelo paginado (abrir):   {timed(reset_and_open):8.1f} ms ({model.rowCount() - 1} filas cargadas)")
+        print(f"  Seleccionar la última:     {timed(lambda: model.row_for_id(tasks)):8.1f} ms")
+        for prefix in ("Tarea 9999", "Tarea 1", "Inexistente"):
+            ms = timed(lambda: completer.model().search(prefix))
+            print(f"  Sugerencias '{prefix}':{' ' * (12 - len(prefix))}{ms:8.1f} ms ({completer.model().rowCount()} filas)")
+        writer.dispose()
+        reader.dispose()
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,92 @@
+"""
+Benchmark del almacenamiento compacto de enums y fechas.
+
+Crea N tareas con su historial de estados (los mismos datos que bench_task_analytics) en el
+almacenamiento de texto, copia la base de datos y convierte la copia al almacenamiento compacto.
+Compara el tamaño de las tablas e índices afectados (dbstat) y la latencia, a través del ORM, de
+consultas por rango de fechas sobre índices, por estado y de las series diarias.
+
+Uso:
+    python -m benchmarks.bench_compact_storage [tareas]
+"""
+import os
+import sys
+import time
+import shutil
+import sqlite3
+import tempfile
+from datetime import datetime
+from sqlalchemy import func, select
+from src.models import Task, TaskState, TaskStateChange
+from src.services import TaskAnalyticsService
+from src.database import Migrator, create_engines, create_session_factory
+from benchmarks.bench_task_analytics import populate
+
+OBJECTS = ('tasks', 'ix_tasks_estado', 'task_state_history', 'ix_task_state_history_fecha',
+           'ix_task_state_history_usuario_fecha')
+
+def sizes(path):
+    with sqlite3.connect(path) as conn:
+        conn.execute("VACUUM")
+        pages = dict(conn.execute("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name").fetchall())
+    return {name: pages.get(name, 0) for name in OBJECTS}, os.path.getsize(path)
+
+def timed(action, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        began = time.perf_counter()
+        action()
+        best = min(best, time.perf_counter() - began)
+    return best * 1000
+
+def queries(session):
+    history = TaskStateChange
+    month = (datetime(2023, 6, 1), datetime(2023, 7, 1))
+    return {
+        "Historial de un mes (índice fecha)": lambda: session.scalar(
+            select(func.count()).where(history.fecha >= month[0], history.fecha < month[1])),
+        "Historial de un usuario en un año": lambda: session.scalar(
+            select(func.count()).where(history.id_usuario == 7, history.fecha >= datetime(2023, 1, 1),
+                                       history.fecha < datetime(2024, 1, 1))),
+        "Tareas pendientes (índice estado)": lambda: session.scalar(
+            select(func.count()).where(Task.estado == TaskState.PENDIENTE)),
+        "Tareas iniciadas en un mes": lambda: session.scalar(
+            select(func.count()).where(Task.fecha_inicio >= month[0], Task.fecha_inicio < month[1])),
+        "Series diarias de un usuario": lambda: TaskAnalyticsService(session).daily_series(user_id=7),
+    }
+
+def run(tasks):
+    with tempfile.TemporaryDirectory() as tmp:
+        text_path, compact_path = os.path.join(tmp, "texto.db"), os.path.join(tmp, "compacto.db")
+        writer, reader = create_engines(text_path)
+        populate(writer, tasks)
+        writer.dispose()
+        reader.dispose()
+        shutil.copy(text_path, compact_path)
+        with Migrator(compact_path) as migrator:
+            migrator.migrate()
+            began = time.perf_counter()
+            migrator.convert_storage(True)
+        print(f"{tasks} tareas, conversión en {time.perf_counter() - began:.1f} s")
+
+        results = {}
+        for label, path in (("Texto", text_path), ("Compacto", compact_path)):
+            objects, size = sizes(path)
+            writer, reader = create_engines(path)
+            session = create_session_factory(writer, reader)()
+            times = {name: timed(query) for name, query in queries(session).items()}
+            results[label] = (objects, size, times)
+            session.close()
+            writer.dispose()
+            reader.dispose()
+
+        (text_objects, text_size, text_times), (compact_objects, compact_size, compact_times) = results.values()
+        print(f"  {'':<38} {'Texto':>10} {'Compacto':>10}")
+        for name in OBJECTS:
+            print(f"  {name:<38} {text_objects[name] / 2 ** 20:8.1f} MiB {compact_objects[name] / 2 ** 20:6.1f} MiB")
+        print(f"  {'Archivo completo':<38} {text_size / 2 ** 20:8.1f} MiB {compact_size / 2 ** 20:6.1f} MiB")
+        for name in text_times:
+            print(f"  {name:<38} {text_times[name]:8.1f} ms {compact_times[name]:7.1f} ms")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
@@ -0,0 +1,79 @@
+"""
+Benchmark de varios procesos escribiendo la misma tarea a la vez.
+
+Cada proceso lee un contador (el título de la tarea), le suma uno y lo escribe, N veces, de dos
+formas, cada una sobre una base de datos nueva: con actualizaciones sin condición (la escritura
+de un proceso pisa la de otro que leyó el mismo valor: incrementos perdidos) y con
+actualizaciones condicionadas a la versión leída (compare-and-swap: ante un conflicto se vuelve
+a leer y se repite). Mide las escrituras por segundo, los conflictos, los reintentos por
+SQLITE_BUSY y los incrementos perdidos.
+
+Uso:
+    python -m benchmarks.bench_contention [procesos] [incrementos por proceso]
+"""
+import os
+import sys
+import time
+import tempfile
+import multiprocessing
+from src.database import RetryPolicy, create_engines, create_session_factory
+from src.models import Base
+from src.repositories import ConcurrentUpdateError
+from src.services import TaskService, UserService
+from src.utils import PasswordHasher
+
+def populate(path):
+    writer, _ = create_engines(path, readers=0)
+    Base.metadata.create_all(writer)
+    session = create_session_factory(writer)()
+    user = UserService(session, PasswordHasher(n=2 ** 4, workers=0)).create_user(
+        {"nombre": "Ana", "correo": "ana@example.com", "contrasena": "password"})
+    task_id = TaskService(session).create_task({"titulo": "0", "id_usuario": user.id_usuario}).id_tarea
+    session.close()
+    writer.dispose()
+    return task_id
+
+def worker(path, task_id, increments, versioned):
+    retries = []
+    writer, reader = create_engines(path, readers=1)
+    session = create_session_factory(writer, reader,
+                                     RetryPolicy(attempts=20, on_retry=lambda *args: retries.append(1)))()
+    service = TaskService(session)
+    done = conflicts = 0
+    while done < increments:
+        session.expire_all()
+        task = service.get_task_by_id(task_id)
+        try:
+            service.update_task(task_id, {"titulo": str(int(task.titulo) + 1)},
+                                task.version if versioned else None)
+            done += 1
+        except ConcurrentUpdateError:
+            conflicts += 1
+    session.close()
+    writer.dispose()
+    reader.dispose()
+    return done, conflicts, len(retries)
+
+def run(processes, increments):
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{processes} procesos, {increments} incrementos cada uno sobre la misma tarea")
+        print(f"  {'':<24} {'Escrituras/s':>13} {'Conflictos':>11} {'Reintentos':>11} {'Perdidos':>9}")
+        for label, versioned in (("Sin condición", False), ("Con versión (CAS)", True)):
+            path = os.path.join(tmp, f"{versioned}.db")
+            task_id = populate(path)
+            began = time.perf_counter()
+            with multiprocessing.Pool(processes) as pool:
+                results = pool.starmap(worker, [(path, task_id, increments, versioned)] * processes)
+            elapsed = time.perf_counter() - began
+            writer, _ = create_engines(path, readers=0)
+            with writer.connect() as conn:
+                counter = int(conn.exec_driver_sql("SELECT titulo FROM tasks").scalar())
+            writer.dispose()
+            done = sum(result[0] for result in results)
+            conflicts = sum(result[1] for result in results)
+            retries = sum(result[2] for result in results)
+            print(f"  {label:<24} {done / elapsed:13.0f} {conflicts / (done + conflicts):11.1%} "
+                  f"{retries:11} {done - counter:9}")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 4, int(sys.argv[2]) if len(sys.argv) > 2 else 500)
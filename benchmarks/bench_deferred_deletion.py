@@ -0,0 +1,90 @@
+"""
+Benchmark del borrado de un usuario con muchas tareas.
+
+Crea un usuario con N tareas, cada una con una notificación y una categoría, y lo borra de dos
+formas sobre copias de la misma base de datos: con el borrado en cascada del ORM (carga todos
+los objetos y los borra uno a uno en una sola transacción) y con el borrado diferido (marca
+inmediata y borrado por lotes con DeletionPurger). Mide el tiempo hasta que el usuario deja de
+verse, el tiempo total y la transacción de escritura más larga, que es lo que espera cualquier
+otro proceso que quiera escribir.
+
+Uso:
+    python -m benchmarks.bench_deferred_deletion [tareas]
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+from datetime import datetime
+from sqlalchemy import insert
+from src.models import Base, Category, Notification, Task, TaskCategory, User
+from src.services import DeletionPurger, UserService
+from src.database import create_engines, create_session_factory
+
+def populate(engine, tasks):
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"nombre": f"User {i}", "correo": f"user{i}@example.com", "contrasena": "x"}
+                                    for i in (1, 2)])
+        conn.execute(insert(Category), [{"nombre": "Casa"}])
+        for start in range(1, tasks + 1, 10_000):
+            ids = range(start, min(start + 10_000, tasks + 1))
+            conn.execute(insert(Task), [{"id_tarea": i, "titulo": f"Tarea {i}", "id_usuario": 1} for i in ids])
+            conn.execute(insert(Notification), [{"id_tarea": i, "fecha_envio": datetime(2024, 1, 1)} for i in ids])
+            conn.execute(insert(TaskCategory), [{"id_tarea": i, "id_categoria": 1} for i in ids])
+
+def open_service(path):
+    writer, reader = create_engines(path)
+    factory = create_session_factory(writer, reader)
+    return (writer, reader), factory, UserService(factory())
+
+def cascade(path):
+    engines, _, users = open_service(path)
+    began = time.perf_counter()
+    users.delete_user(1)
+    elapsed = time.perf_counter() - began
+    users.repository.session.close()
+    for engine in engines:
+        engine.dispose()
+    # Todo el borrado es una transacción: el usuario desaparece y el bloqueo se libera al final
+    return elapsed, elapsed, elapsed, 1
+
+def deferred(path, batch_size):
+    engines, factory, users = open_service(path)
+    began = time.perf_counter()
+    users.delete_user(1, deferred=True)
+    hidden = time.perf_counter() - began
+    users.repository.session.close()
+
+    batches, longest, last = [], 0.0, time.perf_counter()
+    def progress(totals):
+        nonlocal longest, last
+        now = time.perf_counter()
+        longest = max(longest, now - last)
+        batches.append(totals)
+        last = now
+    DeletionPurger(factory, batch_size=batch_size, pause=0).purge(progress=progress)
+    total = time.perf_counter() - began
+    for engine in engines:
+        engine.dispose()
+    return hidden, total, max(longest, hidden), len(batches)
+
+def run(tasks, batch_size=1000):
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "origen.db")
+        writer, reader = create_engines(source)
+        populate(writer, tasks)
+        writer.dispose()
+        reader.dispose()
+        print(f"Usuario con {tasks} tareas (una notificación y una categoría por tarea), lotes de {batch_size}")
+        print(f"  {'':<20} {'Oculto en':>10} {'Total':>10} {'Bloqueo máx.':>13} {'Transacciones':>14}")
+        for label, action in (("Cascada del ORM", cascade),
+                              ("Diferido por lotes", lambda path: deferred(path, batch_size))):
+            path = os.path.join(tmp, f"{label}.db")
+            shutil.copy(source, path)
+            hidden, total, longest, transactions = action(path)
+            print(f"  {label:<20} {hidden * 1000:8.1f} ms {total:8.2f} s {longest * 1000:10.1f} ms {transactions:14}")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
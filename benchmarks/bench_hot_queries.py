@@ -0,0 +1,80 @@
+"""
+Benchmark del coste por llamada de las consultas frecuentes de los repositorios.
+
+Compara cada consulta construida como un objeto Query nuevo en cada llamada (como se hacía antes)
+con la sentencia construida una sola vez en el repositorio, que reutiliza su clave de caché y su
+SQL compilado: búsqueda por ID (sin la entidad en el mapa de identidad), tareas de un usuario,
+existencia de una asociación tarea-categoría y unicidad de correos y nombres.
+
+Uso:
+    python -m benchmarks.bench_hot_queries [llamadas]
+"""
+import os
+import sys
+import time
+import tempfile
+import warnings
+from sqlalchemy import insert
+from src.models import Base, Category, Task, TaskCategory, User
+from src.repositories import CategoryRepository, TaskRepository, UserRepository
+from src.database import create_engines, create_session_factory
+
+def populate(engine):
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"nombre": f"User {i}", "correo": f"user{i}@example.com", "contrasena": "x"}
+                                    for i in range(1, 101)])
+        conn.execute(insert(Category), [{"nombre": f"Categoría {i}"} for i in range(1, 11)])
+        conn.execute(insert(Task), [{"titulo": f"Tarea {i}", "id_usuario": i % 100 + 1} for i in range(1, 1001)])
+        conn.execute(insert(TaskCategory), [{"id_tarea": i, "id_categoria": i % 10 + 1} for i in range(1, 1001)])
+
+def timed(calls, action):
+    began = time.perf_counter()
+    for i in range(calls):
+        action(i)
+    return (time.perf_counter() - began) / calls * 1e6
+
+def run(calls):
+    with tempfile.TemporaryDirectory() as tmp:
+        writer, reader = create_engines(os.path.join(tmp, "database.db"))
+        populate(writer)
+        session = create_session_factory(writer, reader)()
+        users, categories, tasks = UserRepository(session), CategoryRepository(session), TaskRepository(session)
+
+        def by_id_query(i):
+            session.query(User).get(i % 100 + 1)
+            session.expunge_all()
+
+        def by_id_get(i):
+            users.get_by_id(i % 100 + 1)
+            session.expunge_all()
+
+        cases = (
+            ("Usuario por ID", by_id_query, by_id_get),
+            ("Tareas de un usuario",
+             lambda i: session.query(Task).filter_by(id_usuario=i % 100 + 1).all(),
+             lambda i: tasks.get_tasks_by_user(i % 100 + 1)),
+            ("Asociación tarea-categoría",
+             lambda i: session.query(TaskCategory).filter_by(id_tarea=i % 1000 + 1, id_categoria=i % 10 + 1).first(),
+             lambda i: tasks._association(i % 1000 + 1, i % 10 + 1)),
+            ("Correo registrado",
+             lambda i: session.query(User.id_usuario).filter_by(correo=f"user{i % 200}@example.com").first() is not None,
+             lambda i: users.email_exists(f"user{i % 200}@example.com")),
+            ("Nombre de categoría registrado",
+             lambda i: session.query(Category.id_categoria).filter_by(nombre=f"Categoría {i % 20}").first() is not None,
+             lambda i: categories.name_exists(f"Categoría {i % 20}")),
+        )
+        print(f"{calls} llamadas por consulta (µs por llamada)")
+        print(f"  {'':<32} {'Query':>8} {'Precompilada':>13}")
+        with warnings.catch_warnings():
+            # Query.get es la API antigua con la que se compara
+            warnings.simplefilter("ignore")
+            for label, before, after in cases:
+                old, new = timed(calls, before), timed(calls, after)
+                print(f"  {label:<32} {old:8.1f} {new:13.1f}   ({1 - new / old:5.1%} menos)")
+        session.close()
+        writer.dispose()
+        reader.dispose()
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,56 @@
+"""
+Benchmark del cálculo de hashes de contraseñas.
+
+Mide hashes por segundo (y por núcleo) calculando en el propio proceso y con PasswordHasher.hash_many
+en pools de 1 a N procesos, y cuántas vueltas da un bucle en otro hilo mientras tanto (lo que podría
+hacer la interfaz durante el cálculo).
+
+Uso:
+    python -m benchmarks.bench_password_hashing [contraseñas] [log2_n]
+"""
+import os
+import sys
+import threading
+import time
+from src.utils.passwords import PasswordHasher, hash_password
+
+def measure(action):
+    ticks = 0
+    done = threading.Event()
+
+    def ticker():
+        nonlocal ticks
+        while not done.is_set():
+            ticks += 1
+            time.sleep(0)
+
+    thread = threading.Thread(target=ticker)
+    thread.start()
+    began = time.perf_counter()
+    action()
+    elapsed = time.perf_counter() - began
+    done.set()
+    thread.join()
+    return elapsed, ticks / elapsed
+
+def run(count, log_n):
+    n = 2 ** log_n
+    passwords = [f"clave-{i}" for i in range(count)]
+    cores = os.cpu_count() or 1
+    print(f"{count} contraseñas, scrypt n=2**{log_n} r=8 p=1, {cores} núcleo(s)")
+
+    elapsed, ticks = measure(lambda: [hash_password(password, n) for password in passwords])
+    print(f"  En el proceso:  {count / elapsed:8.1f} hashes/s, {ticks:10.0f} vueltas/s del otro hilo")
+
+    for workers in sorted({1, cores, cores * 2}):
+        hasher = PasswordHasher(n=n, workers=workers)
+        hasher.hash("calentamiento")
+        elapsed, ticks = measure(lambda: hasher.hash_many(passwords))
+        rate = count / elapsed
+        print(f"  Pool de {workers:2d}:     {rate:8.1f} hashes/s ({rate / min(workers, cores):.1f} por núcleo), "
+              f"{ticks:10.0f} vueltas/s del otro hilo")
+        hasher.shutdown()
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    run(*(args + [200, 14][len(args):]))
@@ -0,0 +1,61 @@
+"""
+Benchmark de memoria y tiempo de las proyecciones para vistas de listado.
+
+Carga todas las tareas como objetos ORM completos (get_all_tasks) y como filas ligeras
+con __slots__ (list_tasks), midiendo el tiempo y el pico de memoria con tracemalloc.
+
+Uso:
+    python -m benchmarks.bench_projections [número de tareas]
+"""
+import sys
+import time
+import gc
+import tracemalloc
+from datetime import datetime
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from src.models import Base, User, Task, TaskState, TaskPriority
+from src.services import TaskService
+
+def populate(session, count, batch=50_000):
+    """Inserta un usuario y `count` tareas con inserciones masivas."""
+    session.execute(insert(User), [{'nombre': "Bench", 'correo': "bench@example.com", 'contrasena': "password"}])
+    states, priorities = list(TaskState), list(TaskPriority)
+    now = datetime(2024, 1, 1)
+    for start in range(0, count, batch):
+        session.execute(insert(Task), [{
+            'titulo': f"Tarea {i}", 'descripcion': "Descripción de la tarea " * 4, 'fecha_inicio': now,
+            'estado': states[i % 3], 'prioridad': priorities[i % 3], 'id_usuario': 1,
+        } for i in range(start, min(start + batch, count))])
+    session.commit()
+
+def measure(label, load, count):
+    """Ejecuta `load` midiendo tiempo y pico de memoria; devuelve el resultado."""
+    gc.collect()
+    tracemalloc.start()
+    began = time.perf_counter()
+    result = load()
+    seconds = time.perf_counter() - began
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<22}: {seconds:6.2f} s  retenido {current / 2**20:8.1f} MiB "
+          f"({current / count:6.0f} B/fila)  pico {peak / 2**20:8.1f} MiB")
+    return result
+
+def run(count):
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as session:
+        populate(session, count)
+
+    print(f"Tareas: {count}")
+    with Session() as session:
+        tasks = measure("ORM (get_all_tasks)", TaskService(session).get_all_tasks, count)
+        del tasks
+    with Session() as session:
+        rows = measure("Filas (list_tasks)", TaskService(session).list_tasks, count)
+        del rows
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,58 @@
+"""
+Benchmark de la caché de consultas de los servicios.
+
+Simula el uso de la GUI: muchas lecturas repetidas de los listados (tareas de un usuario, tareas y
+categorías) con una escritura cada N lecturas, con y sin caché, y muestra las métricas de la caché.
+
+Uso:
+    python -m benchmarks.bench_query_cache [tareas] [lecturas] [lecturas_por_escritura]
+"""
+import os
+import sys
+import time
+import tempfile
+from sqlalchemy import insert
+from src.models import Base, Category, Task, User
+from src.services import TaskService, CategoryService
+from src.database import create_engines, create_session_factory
+
+def populate(engine, tasks, users=50):
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"nombre": f"User {i}", "correo": f"user{i}@example.com", "contrasena": "password"}
+                                    for i in range(users)])
+        conn.execute(insert(Category), [{"nombre": f"Categoría {i}"} for i in range(20)])
+        conn.execute(insert(Task), [{"titulo": f"Tarea {i}", "id_usuario": i % users + 1} for i in range(tasks)])
+
+def workload(session, task_service, category_service, reads, write_every):
+    began = time.perf_counter()
+    for i in range(reads):
+        task_service.get_tasks_by_user(i % 5 + 1)
+        task_service.list_tasks(user_id=i % 5 + 1)
+        category_service.get_all_categories()
+        if write_every and i % write_every == write_every - 1:
+            task_service.update_task(1, {"titulo": f"Tarea 0 ({i})"})
+    return (time.perf_counter() - began) * 1000
+
+def run(tasks, reads, write_every):
+    with tempfile.TemporaryDirectory() as tmp:
+        writer, reader = create_engines(os.path.join(tmp, "database.db"))
+        populate(writer, tasks)
+        print(f"{tasks} tareas, {reads} rondas de lecturas, una escritura cada {write_every}")
+        for label, cached in (("Sin caché", False), ("Con caché", True)):
+            session = create_session_factory(writer, reader)()
+            task_service, category_service = TaskService(session), CategoryService(session)
+            if not cached:
+                task_service.cache = category_service.cache = None
+            ms = workload(session, task_service, category_service, reads, write_every)
+            print(f"  {label}: {ms:8.1f} ms")
+            if cached:
+                print(f"    TaskService:     {task_service.cache.stats}")
+                print(f"    CategoryService: {category_service.cache.stats}")
+            session.close()
+        writer.dispose()
+        reader.dispose()
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:4]]
+    run(*(args + [20_000, 2_000, 50][len(args):]))
@@ -0,0 +1,78 @@
+"""
+Benchmark de lecturas concurrentes con una sola conexión frente al pool de solo lectura.
+
+Varios hilos listan las tareas de un usuario con TaskService.list_tasks mientras otro hilo
+crea tareas sin parar. Primero todas las sesiones comparten la conexión del escritor
+(readers=0) y después las lecturas van al pool de conexiones de solo lectura.
+
+Uso:
+    python -m benchmarks.bench_read_scaling [hilos] [segundos] [tareas]
+"""
+import os
+import sys
+import time
+import tempfile
+import threading
+from sqlalchemy import insert
+from src.models import Base, Task, User
+from src.services import TaskService
+from src.database import create_engines, create_session_factory
+
+def populate(engine, tasks):
+    """Crea 10 usuarios y `tasks` tareas repartidas entre ellos."""
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"nombre": f"User {i}", "correo": f"user{i}@example.com",
+                                     "contrasena": "password"} for i in range(10)])
+        conn.execute(insert(Task), [{"titulo": f"Tarea {i}", "id_usuario": i % 10 + 1} for i in range(tasks)])
+
+def run_mode(tmp, threads, seconds, tasks, readers):
+    writer, reader = create_engines(os.path.join(tmp, "database.db"), readers=readers)
+    populate(writer, tasks)
+    factory = create_session_factory(writer, reader)
+    stop = threading.Event()
+    reads = []
+    writes = [0]
+
+    def read(user_id):
+        count = 0
+        with factory() as session:
+            service = TaskService(session)
+            while not stop.is_set():
+                service.list_tasks(user_id=user_id)
+                session.rollback()
+                count += 1
+        reads.append(count)
+
+    def write():
+        with factory() as session:
+            service = TaskService(session)
+            while not stop.is_set():
+                service.create_task({"titulo": "Nueva", "id_usuario": 1})
+                writes[0] += 1
+
+    workers = [threading.Thread(target=read, args=(i % 10 + 1,)) for i in range(threads)]
+    workers.append(threading.Thread(target=write))
+    for worker in workers:
+        worker.start()
+    time.sleep(seconds)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    writer.dispose()
+    reader.dispose()
+
+    label = "Una conexión" if not readers else f"Pool de {readers}"
+    print(f"  {label:<13}: {sum(reads) / seconds:,.1f} listados/s, {writes[0] / seconds:,.1f} escrituras/s")
+
+def run(threads, seconds, tasks):
+    print(f"{threads} hilos lectores y 1 escritor durante {seconds} s, {tasks} tareas "
+          f"({os.cpu_count()} CPU)")
+    for readers in (0, threads):
+        with tempfile.TemporaryDirectory() as tmp:
+            run_mode(tmp, threads, seconds, tasks, readers)
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 4,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 10,
+        int(sys.argv[3]) if len(sys.argv) > 3 else 50_000)
@@ -0,0 +1,61 @@
+"""
+Benchmark de escritura concurrente con un solo archivo frente a varios shards.
+
+Varios procesos crean tareas para usuarios distintos con TaskService, cada tarea en su
+propia transacción, primero sobre una sola base de datos y después sobre N shards.
+
+Uso:
+    python -m benchmarks.bench_sharding [procesos] [tareas por proceso] [shards]
+"""
+import os
+import sys
+import time
+import tempfile
+from multiprocessing import Pool
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.models import Base
+from src.services import UserService, TaskService
+from src.database.sharding import create_sharded_sessionmaker, shard_paths
+
+def make_factory(tmp, shards):
+    """Fábrica de sesiones: un solo archivo si shards es 0, repartida en otro caso."""
+    if not shards:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'database.db')}", connect_args={'timeout': 60})
+        return sessionmaker(bind=engine)
+    return create_sharded_sessionmaker(os.path.join(tmp, "shards.db"), shard_paths(tmp, shards), create_schema=False)
+
+def prepare(tmp, shards, workers):
+    """Crea el esquema y un usuario por proceso; devuelve los IDs de usuario."""
+    if shards:
+        create_sharded_sessionmaker(os.path.join(tmp, "shards.db"), shard_paths(tmp, shards))
+    else:
+        Base.metadata.create_all(create_engine(f"sqlite:///{os.path.join(tmp, 'database.db')}"))
+    with make_factory(tmp, shards)() as session:
+        service = UserService(session)
+        return [service.create_user({"nombre": f"User {i}", "correo": f"user{i}@example.com",
+                                     "contrasena": "password"}).id_usuario for i in range(workers)]
+
+def work(args):
+    tmp, shards, user_id, count = args
+    with make_factory(tmp, shards)() as session:
+        service = TaskService(session)
+        for i in range(count):
+            service.create_task({"titulo": f"Tarea {i}", "id_usuario": user_id})
+    return count
+
+def run(workers, count, shards):
+    for shard_count in (0, shards):
+        with tempfile.TemporaryDirectory() as tmp:
+            user_ids = prepare(tmp, shard_count, workers)
+            began = time.perf_counter()
+            with Pool(workers) as pool:
+                total = sum(pool.map(work, [(tmp, shard_count, user_id, count) for user_id in user_ids]))
+            seconds = time.perf_counter() - began
+        label = "Un archivo" if not shard_count else f"{shard_count} shards"
+        print(f"  {label:<11}: {total} tareas en {seconds:.2f} s ({total / seconds:,.0f} tareas/s)")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 8,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 500,
+        int(sys.argv[3]) if len(sys.argv) > 3 else 4)
@@ -0,0 +1,105 @@
+"""
+Benchmark del arranque en frío de los puntos de entrada.
+
+Cada medida se toma en un proceso de Python nuevo (sin módulos ya cargados) y se repite
+varias veces, mostrando la mediana en milisegundos:
+  - importar cada script (lo que se paga antes de que empiece a hacer algo);
+  - `--help` de las herramientas de línea de comandos;
+  - preparar el esquema de una base de datos existente con create_all o con init_schema;
+  - crear y mostrar la ventana de la GUI (con QT_QPA_PLATFORM=offscreen), si PyQt5 está instalado,
+    cargando el archivo .ui con uic.loadUi y con la clase precompilada por build_ui.py.
+
+Uso:
+    python -m benchmarks.bench_startup [repeticiones]
+"""
+import os
+import sys
+import time
+import statistics
+import subprocess
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPTS = ["main", "populate_data", "export_data", "import_data", "archive_tasks",
+           "backup_db", "maintain_db", "migrate", "shard_admin"]
+CLIS = ["export_data", "import_data", "archive_tasks", "backup_db", "maintain_db", "migrate"]
+
+SCHEMA = """
+import sys, time
+from src.models import Base
+from src.database import create_engines, init_schema
+engine, _ = create_engines(sys.argv[1], readers=0)
+began = time.perf_counter()
+if sys.argv[2] == "create_all":
+    Base.metadata.create_all(bind=engine)
+else:
+    init_schema(engine, Base.metadata)
+print((time.perf_counter() - began) * 1000)
+"""
+
+GUI = """
+import sys, time
+began = time.perf_counter()
+from PyQt5.QtWidgets import QApplication
+import app_gui
+app = QApplication([])
+ui_class = None if sys.argv[1] == "loadUi" else app_gui.load_ui_class()
+window = app_gui.TaskManagerApp(app_gui.open_database, ui_class)
+window.show()
+app.processEvents()
+print((time.perf_counter() - began) * 1000)
+"""
+
+def timed(args, cwd, env=None):
+    """Ejecuta un proceso y devuelve su duración total en ms."""
+    began = time.perf_counter()
+    subprocess.run(args, cwd=cwd, env=env, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return (time.perf_counter() - began) * 1000
+
+def reported(args, cwd, env=None):
+    """Ejecuta un proceso que imprime su propia medida en ms y la devuelve."""
+    result = subprocess.run(args, cwd=cwd, env=env, check=True, capture_output=True, text=True)
+    return float(result.stdout.strip().splitlines()[-1])
+
+def median(measure, repeat):
+    return statistics.median(measure() for _ in range(repeat))
+
+def run(repeat):
+    with tempfile.TemporaryDirectory() as tmp:
+        # Los scripts crean data/ en el directorio de trabajo: se ejecutan en uno temporal
+        env = dict(os.environ, PYTHONPATH=ROOT, QT_QPA_PLATFORM="offscreen")
+        baseline = median(lambda: timed([sys.executable, "-c", "pass"], tmp, env), repeat)
+        print(f"Intérprete vacío: {baseline:.0f} ms ({repeat} repeticiones, mediana)")
+
+        print("\nImportar el script:")
+        for script in SCRIPTS:
+            ms = median(lambda: timed([sys.executable, "-c", f"import {script}"], tmp, env), repeat)
+            print(f"  {script:<14}: {ms:6.0f} ms")
+
+        print("\nMostrar la ayuda (--help):")
+        for script in CLIS:
+            path = os.path.join(ROOT, f"{script}.py")
+            ms = median(lambda: timed([sys.executable, path, "--help"], tmp, env), repeat)
+            print(f"  {script:<14}: {ms:6.0f} ms")
+
+        print("\nPreparar el esquema de una base de datos existente:")
+        db_path = os.path.join(tmp, "schema.db")
+        reported([sys.executable, "-c", SCHEMA, db_path, "init_schema"], tmp, env)
+        for mode in ("create_all", "init_schema"):
+            ms = median(lambda: reported([sys.executable, "-c", SCHEMA, db_path, mode], tmp, env), repeat)
+            print(f"  {mode:<14}: {ms:6.1f} ms")
+
+        try:
+            import PyQt5  # noqa: F401
+        except ImportError:
+            return
+        from build_ui import build_ui
+        build_ui()
+        print("\nVentana de la GUI mostrada:")
+        for mode in ("loadUi", "precompilada"):
+            ms = median(lambda: reported([sys.executable, "-c", GUI, mode], tmp, env), repeat)
+            print(f"  {mode:<14}: {ms:6.0f} ms")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
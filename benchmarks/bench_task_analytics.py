@@ -0,0 +1,73 @@
+"""
+Benchmark de las series diarias de TaskAnalyticsService.
+
+Crea N tareas repartidas en tres años entre 500 usuarios y 20 categorías, con el 60 % completadas
+entre 0 y 30 días después de su creación y el 75 % con fecha de vencimiento, y mide daily_series global, por usuario y por categoría.
+
+Uso:
+    python -m benchmarks.bench_task_analytics [tareas]
+"""
+import os
+import sys
+import time
+import tempfile
+from sqlalchemy import text
+from src.models import Base
+from src.services import TaskAnalyticsService
+from src.database import create_engines, create_session_factory
+
+def populate(engine, tasks, users=500, categories=20):
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < :users) "
+            "INSERT INTO users (nombre, correo, contrasena) SELECT 'User ' || i, 'user' || i || '@example.com', 'x' FROM n"),
+            {"users": users})
+        conn.execute(text(
+            "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < :categories) "
+            "INSERT INTO categories (nombre) SELECT 'Categoría ' || i FROM n"), {"categories": categories})
+        # El trigger de inserción registra la creación de cada tarea en su fecha de inicio
+        conn.execute(text(
+            "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < :tasks) "
+            "INSERT INTO tasks (titulo, estado, prioridad, recurrente, id_usuario, fecha_inicio, fecha_vencimiento) "
+            "SELECT 'Tarea ' || i, 'PENDIENTE', CASE i % 3 WHEN 0 THEN 'ALTA' WHEN 1 THEN 'MEDIA' ELSE 'BAJA' END, 0, "
+            "i % :users + 1, datetime('2022-01-01', '+' || (i * 1095 / :tasks) || ' days'), "
+            "CASE WHEN i % 4 THEN datetime('2022-01-01', '+' || (i * 1095 / :tasks + i % 45) || ' days') END FROM n"),
+            {"tasks": tasks, "users": users})
+        conn.execute(text("INSERT INTO task_categories (id_tarea, id_categoria) "
+                          "SELECT id_tarea, id_tarea % :categories + 1 FROM tasks"), {"categories": categories})
+        # Se completan las tareas y se fechan los cambios registrados por el trigger en el pasado
+        conn.execute(text("UPDATE tasks SET estado = 'COMPLETADA' WHERE id_tarea % 10 < 6"))
+        conn.execute(text("DELETE FROM task_state_history WHERE estado_anterior IS NOT NULL"))
+        conn.execute(text(
+            "INSERT INTO task_state_history (id_tarea, id_usuario, estado_anterior, estado_nuevo, fecha) "
+            "SELECT id_tarea, id_usuario, 'PENDIENTE', 'COMPLETADA', datetime(fecha_inicio, '+' || (id_tarea % 31) || ' days') "
+            "FROM tasks WHERE id_tarea % 10 < 6"))
+
+def timed(label, action, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        began = time.perf_counter()
+        result = action()
+        best = min(best, time.perf_counter() - began)
+    print(f"  {label:<28} {best * 1000:8.1f} ms ({len(result['fecha'])} días, {result['abiertas'][-1]} abiertas)")
+
+def run(tasks):
+    with tempfile.TemporaryDirectory() as tmp:
+        writer, reader = create_engines(os.path.join(tmp, "database.db"))
+        began = time.perf_counter()
+        populate(writer, tasks)
+        with writer.connect() as conn:
+            history = conn.execute(text("SELECT COUNT(*) FROM task_state_history")).scalar()
+        print(f"{tasks} tareas, {history} cambios de estado (creación en {time.perf_counter() - began:.1f} s)")
+        session = create_session_factory(writer, reader)()
+        analytics = TaskAnalyticsService(session)
+        timed("Todas las tareas", lambda: analytics.daily_series())
+        timed("Un usuario", lambda: analytics.daily_series(user_id=7))
+        timed("Una categoría", lambda: analytics.daily_series(category_id=8))
+        session.close()
+        writer.dispose()
+        reader.dispose()
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,89 @@
+"""
+Benchmark de la analítica por columnas (TaskColumns) frente a recorrer objetos Task del ORM.
+
+Con las tareas de bench_task_analytics, calcula los percentiles de edad y retraso de las tareas
+abiertas, el histograma de retraso por prioridad y las tareas abiertas, vencidas y la edad media
+por usuario, primero recorriendo los objetos Task en Python y después con NumPy.
+
+Uso:
+    python -m benchmarks.bench_task_columns [tareas]
+"""
+import os
+import sys
+import time
+import tempfile
+from collections import defaultdict
+from datetime import datetime
+from sqlalchemy import select
+from src.models import Task, TaskState
+from src.services import TaskAnalyticsService
+from src.database import create_engines, create_session_factory
+from benchmarks.bench_task_analytics import populate
+
+NOW = datetime(2025, 1, 1)
+BINS = (0, 1, 7, 30, 90, 365, 10000)
+
+def percentile(ordered, q):
+    # Interpolación lineal, como np.percentile
+    position = (len(ordered) - 1) * q / 100
+    low = int(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+def orm_loop(session):
+    ages, overdue = [], []
+    histogram = defaultdict(lambda: [0] * (len(BINS) - 1))
+    users = defaultdict(lambda: [0, 0, 0.0])
+    for task in session.scalars(select(Task)):
+        if task.estado == TaskState.COMPLETADA:
+            continue
+        user = users[task.id_usuario]
+        user[0] += 1
+        age = (NOW - task.fecha_inicio).total_seconds() / 86400
+        ages.append(age)
+        user[2] += age
+        if task.fecha_vencimiento is not None and task.fecha_vencimiento < NOW:
+            days = (NOW - task.fecha_vencimiento).total_seconds() / 86400
+            overdue.append(days)
+            user[1] += 1
+            for index in range(len(BINS) - 1):
+                if BINS[index] <= days < BINS[index + 1]:
+                    histogram[task.prioridad][index] += 1
+                    break
+    ages.sort()
+    overdue.sort()
+    return ([percentile(ages, q) for q in (50, 90, 99)], [percentile(overdue, q) for q in (50, 90, 99)],
+            dict(histogram), {user: (n, late, total / n) for user, (n, late, total) in users.items()})
+
+def vectorized(analytics):
+    columns = analytics.task_columns()
+    summary = columns.summary(NOW)
+    return (list(summary['edad']['percentiles'].values()), list(summary['retraso']['percentiles'].values()),
+            columns.histogram_by_priority('retraso', BINS, NOW), columns.per_user(NOW))
+
+def run(tasks):
+    with tempfile.TemporaryDirectory() as tmp:
+        writer, reader = create_engines(os.path.join(tmp, "database.db"))
+        populate(writer, tasks)
+        print(f"{tasks} tareas")
+        for label, action in (("Bucle sobre objetos Task", orm_loop), ("TaskColumns (NumPy)", None)):
+            session = create_session_factory(writer, reader)()
+            began = time.perf_counter()
+            if action:
+                ages, overdue, _, _ = action(session)
+            else:
+                ages, overdue, _, _ = vectorized(TaskAnalyticsService(session))
+            elapsed = time.perf_counter() - began
+            print(f"  {label:<26} {elapsed * 1000:9.1f} ms  edad p50/p90/p99 = "
+                  f"{', '.join(f'{v:.1f}' for v in ages)}; retraso = {', '.join(f'{v:.1f}' for v in overdue)}")
+            session.close()
+        began = time.perf_counter()
+        session = create_session_factory(writer, reader)()
+        columns = TaskAnalyticsService(session).task_columns()
+        print(f"  Consulta de columnas        {(time.perf_counter() - began) * 1000:9.1f} ms ({columns!r})")
+        session.close()
+        writer.dispose()
+        reader.dispose()
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,85 @@
+"""
+Benchmark de la descripción diferida y comprimida de las tareas.
+
+Crea dos bases de datos con las mismas N tareas con descripciones largas: una con las descripciones
+en texto plano, como se guardaban antes, y otra escrita con CompressedText. Compara el tamaño de
+las descripciones, las páginas de la base de datos y la latencia de listar las tareas cargando la
+descripción (comportamiento anterior) y sin cargarla (diferida).
+
+Uso:
+    python -m benchmarks.bench_task_description [tareas] [palabras_por_descripcion]
+"""
+import os
+import sys
+import time
+import random
+import sqlite3
+import tempfile
+from sqlalchemy import insert, select
+from sqlalchemy.orm import undefer
+from src.models import Base, Task, User
+from src.database import create_engines, create_session_factory
+
+WORDS = ("revisar", "informe", "cliente", "entrega", "pendiente", "reunión", "presupuesto", "equipo",
+         "documento", "validar", "servidor", "incidencia", "plazo", "proveedor", "factura", "análisis")
+
+def descriptions(tasks, words):
+    rng = random.Random(42)
+    return [" ".join(rng.choice(WORDS) for _ in range(words)) + "." for _ in range(tasks)]
+
+def populate(path, texts, compressed):
+    writer, reader = create_engines(path)
+    Base.metadata.create_all(writer)
+    with writer.begin() as conn:
+        conn.execute(insert(User), [{"nombre": "User", "correo": "user@example.com", "contrasena": "x"}])
+        rows = [{"titulo": f"Tarea {i}", "descripcion": text, "id_usuario": 1} for i, text in enumerate(texts)]
+        if compressed:
+            conn.execute(insert(Task), rows)
+        else:
+            # Texto plano, sin pasar por CompressedText
+            conn.exec_driver_sql("INSERT INTO tasks (titulo, descripcion, estado, prioridad, recurrente, id_usuario) "
+                                 "VALUES (?, ?, 'PENDIENTE', 'MEDIA', 0, 1)",
+                                 [(row["titulo"], row["descripcion"]) for row in rows])
+    return writer, reader
+
+def storage(path):
+    with sqlite3.connect(path) as conn:
+        payload, = conn.execute("SELECT avg(length(descripcion)) FROM tasks").fetchone()
+        pages, = conn.execute("PRAGMA page_count").fetchone()
+    return payload, pages, os.path.getsize(path)
+
+def timed(action, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        began = time.perf_counter()
+        action()
+        best = min(best, time.perf_counter() - began)
+    return best * 1000
+
+def run(tasks, words):
+    texts = descriptions(tasks, words)
+    print(f"{tasks} tareas, descripciones de {sum(map(len, texts)) // tasks} caracteres de media")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, compressed in (("Texto plano", False), ("CompressedText", True)):
+            path = os.path.join(tmp, f"{label}.db")
+            writer, reader = populate(path, texts, compressed)
+            payload, pages, size = storage(path)
+            print(f"  {label}: {payload:8.0f} bytes por descripción, {pages} páginas, {size / 2 ** 20:6.1f} MiB")
+            session = create_session_factory(writer, reader)()
+
+            def listing(options):
+                session.scalars(select(Task).options(*options)).all()
+                session.expunge_all()
+            loaded = timed(lambda: listing([undefer(Task.descripcion)]))
+            deferred = timed(lambda: listing([]))
+            columns = (Task.id_tarea, Task.titulo, Task.estado, Task.prioridad, Task.id_usuario)
+            projection = timed(lambda: session.execute(select(*columns)).all())
+            print(f"    Listado con descripción {loaded:8.1f} ms, diferida {deferred:8.1f} ms, "
+                  f"proyección {projection:8.1f} ms")
+            session.close()
+            writer.dispose()
+            reader.dispose()
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 500)
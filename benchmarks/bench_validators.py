@@ -0,0 +1,97 @@
+"""
+Benchmark de rendimiento de los validadores precompilados.
+
+Compara la validación registro a registro con la cadena de comprobaciones original
+(excepto la consulta de existencia del usuario) frente a TASK_VALIDATOR.validate_batch.
+
+Uso:
+    python -m benchmarks.bench_validators [número de registros]
+"""
+import sys
+import time
+import random
+from datetime import datetime, timedelta
+from src.models.task import TaskState, TaskPriority, TaskFrequency
+from src.services.validators import TASK_VALIDATOR
+
+def legacy_validate(data):
+    """Cadena de comprobaciones previa a los validadores precompilados (sin consulta a la BD)."""
+    if 'titulo' not in data or not isinstance(data['titulo'], str) or not data['titulo'].strip():
+        raise ValueError("El título de la tarea es obligatorio y debe ser una cadena no vacía.")
+    if 'id_usuario' not in data:
+        raise ValueError("El ID de usuario es obligatorio para crear una tarea.")
+    if not isinstance(data['id_usuario'], int) or data['id_usuario'] <= 0:
+        raise ValueError("El ID de usuario debe ser un entero positivo.")
+    if 'descripcion' in data and not isinstance(data['descripcion'], str):
+        raise ValueError("La descripción debe ser una cadena de texto.")
+    if 'fecha_inicio' in data and not isinstance(data['fecha_inicio'], datetime):
+        raise ValueError("La fecha de inicio debe ser un objeto datetime.")
+    if 'fecha_vencimiento' in data:
+        if not isinstance(data['fecha_vencimiento'], datetime):
+            raise ValueError("La fecha de vencimiento debe ser un objeto datetime.")
+        if 'fecha_inicio' in data and data['fecha_vencimiento'] < data['fecha_inicio']:
+            raise ValueError("La fecha de vencimiento no puede ser anterior a la fecha de inicio.")
+    for key, enum_class in (('estado', TaskState), ('prioridad', TaskPriority)):
+        if key in data and not isinstance(data[key], enum_class):
+            try:
+                data[key] = enum_class[data[key].upper()]
+            except KeyError:
+                raise ValueError(f"Valor inválido. Valores permitidos: {[e.value for e in enum_class]}")
+    if 'recurrente' in data and not isinstance(data['recurrente'], bool):
+        raise ValueError("El campo 'recurrente' debe ser un booleano.")
+    if 'frecuencia' in data and data['frecuencia'] is not None:
+        if not data.get('recurrente', False):
+            raise ValueError("La frecuencia solo puede especificarse si la tarea es recurrente.")
+        if not isinstance(data['frecuencia'], TaskFrequency):
+            try:
+                data['frecuencia'] = TaskFrequency[data['frecuencia'].upper()]
+            except KeyError:
+                raise ValueError(f"Frecuencia inválida. Valores permitidos: {[f.value for f in TaskFrequency]}")
+
+def make_rows(count, seed=42):
+    """Genera registros de tarea como los leería una importación (enums en texto, 10% inválidos)."""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    states = [s.name for s in TaskState] + ['INVALIDO']
+    priorities = [p.name for p in TaskPriority]
+    rows = []
+    for i in range(count):
+        recurring = rng.random() < 0.3
+        begin = start + timedelta(minutes=i)
+        rows.append({
+            'titulo': f"Tarea {i}" if rng.random() < 0.97 else "",
+            'descripcion': "Descripción",
+            'fecha_inicio': begin,
+            'fecha_vencimiento': begin + timedelta(days=rng.randint(1, 30)),
+            'estado': states[rng.randrange(len(states)) if rng.random() < 0.1 else rng.randrange(3)],
+            'prioridad': priorities[rng.randrange(3)],
+            'recurrente': recurring,
+            'frecuencia': 'SEMANAL' if recurring else None,
+            'id_usuario': rng.randint(1, 1000),
+        })
+    return rows
+
+def run(count):
+    rows = make_rows(count)
+    copies = [dict(row) for row in rows]
+
+    began = time.perf_counter()
+    legacy_invalid = 0
+    for data in rows:
+        try:
+            legacy_validate(data)
+        except ValueError:
+            legacy_invalid += 1
+    legacy_seconds = time.perf_counter() - began
+
+    began = time.perf_counter()
+    results = TASK_VALIDATOR.validate_batch(copies)
+    batch_seconds = time.perf_counter() - began
+    batch_invalid = sum(1 for errors in results if errors)
+
+    print(f"Registros: {count}")
+    print(f"  Cadena original : {legacy_seconds:.2f} s  ({count / legacy_seconds:,.0f} registros/s, {legacy_invalid} inválidos)")
+    print(f"  validate_batch  : {batch_seconds:.2f} s  ({count / batch_seconds:,.0f} registros/s, {batch_invalid} inválidos)")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,82 @@
+import os
+import sys
+import argparse
+from importlib import util
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+UI_FILE_PATH = os.path.join(ROOT, 'task_manager_ui.ui')
+COMPILED_UI_PATH = os.path.join(ROOT, 'ui_task_manager.py')
+
+def is_stale(ui_path: str = UI_FILE_PATH, py_path: str = COMPILED_UI_PATH) -> bool:
+    """
+    Indica si el módulo compilado falta o es más antiguo que el archivo .ui.
+    :param ui_path: Ruta del archivo .ui de Qt Designer.
+    :param py_path: Ruta del módulo Python generado.
+    :return: True si hay que volver a generarlo.
+    """
+    if not os.path.exists(py_path):
+        return True
+    return os.path.getmtime(py_path) < os.path.getmtime(ui_path)
+
+def build_ui(ui_path: str = UI_FILE_PATH, py_path: str = COMPILED_UI_PATH, force: bool = False) -> bool:
+    """
+    Genera con uic.compileUi un módulo Python con la clase de la interfaz definida en el .ui,
+    para no interpretar el XML en cada arranque de la aplicación.
+    :param ui_path: Ruta del archivo .ui de Qt Designer.
+    :param py_path: Ruta del módulo Python a generar.
+    :param force: Si es True, lo genera aunque esté al día.
+    :return: True si se ha generado, False si ya estaba al día.
+    """
+    if not os.path.exists(ui_path):
+        raise ValueError(f"No se encontró el archivo UI: {ui_path}")
+    if not force and not is_stale(ui_path, py_path):
+        return False
+    from PyQt5 import uic
+
+    # Se escribe en un temporal y se renombra: la aplicación nunca ve un módulo a medias
+    tmp_path = f"{py_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        uic.compileUi(ui_path, f)
+    os.replace(tmp_path, py_path)
+    return True
+
+def load_ui_class(ui_path: str = UI_FILE_PATH, py_path: str = COMPILED_UI_PATH):
+    """
+    Carga la clase de la interfaz precompilada si existe y está al día con el .ui.
+    :param ui_path: Ruta del archivo .ui de Qt Designer.
+    :param py_path: Ruta del módulo Python generado.
+    :return: La clase Ui_* generada, o None si hay que cargar el .ui con uic.loadUi.
+    """
+    if not os.path.exists(ui_path) or is_stale(ui_path, py_path):
+        return None
+    spec = util.spec_from_file_location(os.path.splitext(os.path.basename(py_path))[0], py_path)
+    module = util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    classes = [value for name, value in vars(module).items() if name.startswith('Ui_') and isinstance(value, type)]
+    return classes[0] if classes else None
+
+def parse_args(argv=None):
+    """
+    Interpreta los argumentos de la línea de comandos.
+    """
+    parser = argparse.ArgumentParser(description="Precompila la interfaz de Qt Designer a un módulo Python.")
+    parser.add_argument("--ui", default=UI_FILE_PATH, help="Archivo .ui de origen.")
+    parser.add_argument("--salida", default=COMPILED_UI_PATH, help="Módulo Python a generar.")
+    parser.add_argument("--forzar", action="store_true", help="Genera el módulo aunque esté al día.")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """
+    Genera el módulo de la interfaz si falta o está desactualizado.
+    """
+    args = parse_args(argv)
+    try:
+        built = build_ui(args.ui, args.salida, force=args.forzar)
+    except ValueError as e:
+        print(f"Error al compilar la interfaz: {e}", file=sys.stderr)
+        return 1
+    print(f"Interfaz generada en {args.salida}." if built else f"{args.salida} ya está al día.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+import sys
+import json
+import time
+import argparse
+
+def parse_args(argv=None):
+    """
+    Interpreta los argumentos de la línea de comandos.
+    """
+    parser = argparse.ArgumentParser(description="Lee o compacta el registro de cambios de la base de datos.")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    read = subparsers.add_parser("leer", help="Escribe en JSONL los cambios posteriores a una secuencia.")
+    read.add_argument("--desde", type=int, default=0, help="Última secuencia ya procesada.")
+    read.add_argument("--limite", type=int, default=1000, help="Cambios por consulta.")
+    read.add_argument("--tablas", nargs="+", help="Tablas de las que leer cambios (por defecto, todas).")
+    read.add_argument("--seguir", action="store_true", help="Sigue esperando cambios nuevos.")
+    read.add_argument("--intervalo", type=float, default=1.0, help="Segundos entre consultas con --seguir.")
+
+    compact = subparsers.add_parser("compactar", help="Elimina las entradas antiguas del registro.")
+    compact.add_argument("--hasta", type=int, help="Última secuencia a eliminar.")
+    compact.add_argument("--dias", type=int, help="Antigüedad mínima en días de las entradas a eliminar.")
+    compact.add_argument("--lote", type=int, default=5000, help="Entradas por lote y transacción.")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """
+    Ejecuta el comando indicado.
+    """
+    args = parse_args(argv)
+    # Importaciones diferidas: --help y los errores de argumentos no cargan SQLAlchemy
+    from src.database.session import create_engines, create_session_factory, init_schema
+    from src.models import Base
+    from src.services import ChangeLogService
+
+    engine, read_engine = create_engines()
+    init_schema(engine, Base.metadata)
+    db = create_session_factory(engine, read_engine)()
+    service = ChangeLogService(db)
+    try:
+        if args.comando == "compactar":
+            total = service.compact_changes(args.hasta, args.dias, batch_size=args.lote)
+            print(f"Compactación completada: {total} entradas eliminadas.")
+            return 0
+
+        seq = args.desde
+        while True:
+            changes = service.changes_since(seq, args.limite, args.tablas)
+            for change in changes:
+                entry = {**change._asdict(), 'columnas': list(change.columnas)}
+                print(json.dumps(entry, ensure_ascii=False, default=str), flush=True)
+            if changes:
+                seq = changes[-1].seq
+            # Cada consulta abre una transacción de lectura nueva para ver los cambios confirmados
+            db.rollback()
+            if len(changes) < args.limite:
+                if not args.seguir:
+                    break
+                time.sleep(args.intervalo)
+    except ValueError as e:
+        print(f"Error en el registro de cambios: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    finally:
+        db.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+import sys
+import argparse
+
+def parse_args(argv=None):
+    """
+    Interpreta los argumentos de la línea de comandos.
+    """
+    parser = argparse.ArgumentParser(description="Exporta las tareas con su usuario y categorías a CSV o JSONL.")
+    parser.add_argument("--formato", choices=["csv", "jsonl"], default="csv", help="Formato de salida.")
+    parser.add_argument("--salida", default="-", help="Archivo de salida ('-' para la salida estándar).")
+    parser.add_argument("--gzip", action="store_true", help="Comprime la salida con gzip.")
+    parser.add_argument("--usuario", type=int, help="Exporta solo las tareas de este ID de usuario.")
+    parser.add_argument("--estado", help="Exporta solo las tareas con este estado (ej. PENDIENTE).")
+    parser.add_argument("--prioridad", help="Exporta solo las tareas con esta prioridad (ej. ALTA).")
+    parser.add_argument("--categoria", type=int, help="Exporta solo las tareas de este ID de categoría.")
+    parser.add_argument("--lote", type=int, default=1000, help="Filas leídas y escritas por bloque.")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """
+    Ejecuta la exportación informando el progreso por la salida de errores.
+    """
+    args = parse_args(argv)
+    filters = {
+        "id_usuario": args.usuario,
+        "estado": args.estado,
+        "prioridad": args.prioridad,
+        "id_categoria": args.categoria,
+    }
+    out = sys.stdout.buffer if args.salida == "-" else args.salida
+
+    def report(total):
+        print(f"  {total} tareas exportadas...", file=sys.stderr)
+
+    # Importaciones diferidas: --help y los errores de argumentos no cargan SQLAlchemy
+    from src.database.session import create_engines, create_session_factory
+    from src.services import TaskService
+
+    engine, read_engine = create_engines()
+    db = create_session_factory(engine, read_engine)()
+    try:
+        total = TaskService(db).export(args.formato, filters, out, compress=args.gzip,
+                                       chunk_size=args.lote, progress=report)
+        print(f"Exportación completada: {total} tareas.", file=sys.stderr)
+    except ValueError as e:
+        print(f"Error en la exportación: {e}", file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
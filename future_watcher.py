@@ -0,0 +1,30 @@
+from concurrent.futures import Future
+from typing import Any, Callable
+from PyQt5.QtCore import QObject, pyqtSignal
+
+class FutureWatcher(QObject):
+    """
+    Lleva a la interfaz el resultado de un Future de otro hilo o proceso (el pool de hashes de
+    contraseñas): la función indicada se ejecuta en el hilo de Qt cuando el Future termina, de
+    modo que el bucle de eventos no se bloquea esperándolo.
+    """
+    # Señal emitida desde el hilo que completa el Future; Qt la entrega en el hilo de este objeto
+    _done = pyqtSignal(object, object)
+
+    def __init__(self, parent: QObject | None = None):
+        super().__init__(parent)
+        self._done.connect(self._deliver)
+        self.pending = 0
+
+    def watch(self, future: Future, callback: Callable[[Future], Any]):
+        """
+        Llama a `callback(future)` en el hilo de Qt cuando el Future termine.
+        :param future: El Future a esperar.
+        :param callback: Función que recibe el Future terminado.
+        """
+        self.pending += 1
+        future.add_done_callback(lambda done: self._done.emit(done, callback))
+
+    def _deliver(self, future: Future, callback: Callable[[Future], Any]):
+        self.pending -= 1
+        callback(future)
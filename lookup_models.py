@@ -0,0 +1,200 @@
+from typing import Callable, Dict, List, Tuple
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, Qt
+from PyQt5.QtWidgets import QComboBox, QCompleter
+
+class LabelLookup:
+    """
+    Caché compartida ID → etiqueta de una entidad, alimentada por consultas paginadas. La usan
+    el modelo del combobox y su autocompletado, de modo que cada etiqueta se consulta una vez.
+    """
+    def __init__(self, fetch: Callable[..., List[Tuple[int, str]]], label: Callable[[int, str], str]):
+        """
+        :param fetch: Función de consulta con la firma de TaskService.lookup_tasks
+                      (prefix, after_id, ids, limit) que devuelve pares (ID, texto).
+        :param label: Función que construye la etiqueta visible a partir de (ID, texto).
+        """
+        self._fetch = fetch
+        self._label = label
+        self._labels: Dict[int, str] = {}
+
+    def _store(self, pairs: List[Tuple[int, str]]) -> List[Tuple[int, str]]:
+        result = []
+        for entity_id, text in pairs:
+            self._labels[entity_id] = self._label(entity_id, text)
+            result.append((entity_id, self._labels[entity_id]))
+        return result
+
+    def page(self, after_id: int | None, limit: int) -> List[Tuple[int, str]]:
+        """
+        Obtiene la siguiente página de pares (ID, etiqueta) en orden de ID.
+        """
+        return self._store(self._fetch(after_id=after_id, limit=limit))
+
+    def search(self, prefix: str, limit: int) -> List[Tuple[int, str]]:
+        """
+        Obtiene hasta `limit` pares (ID, etiqueta) cuyo texto empieza por `prefix`.
+        """
+        return self._store(self._fetch(prefix=prefix, limit=limit))
+
+    def label(self, entity_id: int) -> str | None:
+        """
+        Devuelve la etiqueta de un ID, consultándola solo si no está en la caché.
+        :return: La etiqueta, o None si la entidad no existe.
+        """
+        if entity_id not in self._labels:
+            self._store(self._fetch(ids=[entity_id], limit=None))
+        return self._labels.get(entity_id)
+
+    def clear(self):
+        """
+        Vacía la caché (tras crear, modificar o eliminar entidades).
+        """
+        self._labels.clear()
+
+class LookupListModel(QAbstractListModel):
+    """
+    Modelo de lista para comboboxes: una fila inicial sin selección y las entidades en orden de ID,
+    cargadas por páginas a medida que la lista se desplaza (canFetchMore/fetchMore). El ID de cada
+    fila se expone en Qt.UserRole, por lo que QComboBox.currentData() lo devuelve.
+    """
+    def __init__(self, lookup: LabelLookup, placeholder: str, page_size: int = 200, parent=None):
+        super().__init__(parent)
+        self.lookup = lookup
+        self.placeholder = placeholder
+        self.page_size = page_size
+        self._rows: List[Tuple[int | None, str]] = [(None, placeholder)]
+        self._index: Dict[int, int] = {}
+        self._last_id: int | None = None
+        self._exhausted = False
+        self._fetching = False
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._rows):
+            return None
+        entity_id, label = self._rows[index.row()]
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return label
+        if role == Qt.UserRole:
+            return entity_id
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted and not self._fetching
+
+    def fetchMore(self, parent=QModelIndex()):
+        # La vista puede volver a pedir filas mientras se insertan las de esta página
+        if parent.isValid() or self._exhausted or self._fetching:
+            return
+        self._fetching = True
+        try:
+            page = self.lookup.page(self._last_id, self.page_size)
+            if len(page) < self.page_size:
+                self._exhausted = True
+            if page:
+                self._last_id = page[-1][0]
+            self._append([pair for pair in page if pair[0] not in self._index])
+        finally:
+            self._fetching = False
+
+    def _append(self, pairs: List[Tuple[int, str]]):
+        if not pairs:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(pairs) - 1)
+        for offset, (entity_id, label) in enumerate(pairs):
+            self._index[entity_id] = first + offset
+            self._rows.append((entity_id, label))
+        self.endInsertRows()
+
+    def row_for_id(self, entity_id: int | None) -> int:
+        """
+        Devuelve la fila de un ID, añadiéndolo si aún no se había cargado su página.
+        :return: La fila, o 0 (sin selección) si el ID es None o la entidad no existe.
+        """
+        if entity_id is None:
+            return 0
+        if entity_id not in self._index:
+            label = self.lookup.label(entity_id)
+            if label is None:
+                return 0
+            self._append([(entity_id, label)])
+        return self._index[entity_id]
+
+    def reset(self):
+        """
+        Descarta las filas y la caché; la primera página se vuelve a cargar cuando se necesite.
+        """
+        self.beginResetModel()
+        self.lookup.clear()
+        self._rows = [(None, self.placeholder)]
+        self._index = {}
+        self._last_id = None
+        self._exhausted = False
+        self.endResetModel()
+
+class PrefixSearchModel(QAbstractListModel):
+    """
+    Modelo de las sugerencias del autocompletado: los resultados de buscar por prefijo en la base
+    de datos, limitados a `limit` filas.
+    """
+    def __init__(self, lookup: LabelLookup, limit: int = 20, parent=None):
+        super().__init__(parent)
+        self.lookup = lookup
+        self.limit = limit
+        self._rows: List[Tuple[int, str]] = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._rows):
+            return None
+        entity_id, label = self._rows[index.row()]
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return label
+        if role == Qt.UserRole:
+            return entity_id
+        return None
+
+    def search(self, prefix: str):
+        """
+        Sustituye las sugerencias por las entidades cuyo texto empieza por `prefix`.
+        """
+        self.beginResetModel()
+        self._rows = self.lookup.search(prefix, self.limit) if prefix.strip() else []
+        self.endResetModel()
+
+def attach_lookup(combo: QComboBox, model: LookupListModel, limit: int = 20) -> QCompleter:
+    """
+    Conecta un combobox a un modelo de búsqueda: lo hace editable y añade un autocompletado que
+    consulta la base de datos por prefijo al escribir; al elegir una sugerencia se selecciona su ID.
+    :param combo: El combobox.
+    :param model: Modelo (compartible entre comboboxes) con las entidades.
+    :param limit: Número máximo de sugerencias.
+    :return: El QCompleter creado.
+    """
+    combo.setModel(model)
+    combo.setEditable(True)
+    combo.setInsertPolicy(QComboBox.NoInsert)
+
+    suggestions = PrefixSearchModel(model.lookup, limit, combo)
+    completer = QCompleter(suggestions, combo)
+    # Las sugerencias ya vienen filtradas por la base de datos: el completer no debe filtrarlas
+    completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+    completer.setCaseSensitivity(Qt.CaseInsensitive)
+    combo.setCompleter(completer)
+
+    def on_edited(text):
+        suggestions.search(text)
+        if suggestions.rowCount():
+            completer.complete()
+
+    def on_activated(index):
+        combo.setCurrentIndex(model.row_for_id(index.data(Qt.UserRole)))
+
+    combo.lineEdit().textEdited.connect(on_edited)
+    completer.activated[QModelIndex].connect(on_activated)
+    return completer
@@ -1,33 +1,30 @@
-import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from src.models import Base, User, TaskState, TaskPriority, TaskFrequency
-from src.services import UserService, TaskService, CategoryService, NotificationService
 from datetime import datetime, timedelta
 
-# Asegura que el directorio 'data' exista
-DATA_DIR = 'data'
-if not os.path.exists(DATA_DIR):
-    os.makedirs(DATA_DIR)
-
-DATABASE_URL = f"sqlite:///{DATA_DIR}/database.db"
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
 def init_db():
     """
-    Inicializa la base de datos, creando todas las tablas si no existen.
+    Inicializa la base de datos, creando las tablas que falten si el esquema de los modelos ha cambiado.
+    :return: La fábrica de sesiones de la base de datos.
     """
-    print("Creando tablas de la base de datos...")
-    Base.metadata.create_all(bind=engine)
-    print("Tablas creadas exitosamente.")
+    # Importaciones diferidas: importar el script no carga SQLAlchemy ni abre la base de datos
+    from src.database.session import create_engines, create_session_factory, init_schema
+    from src.models import Base
+
+    # Escritor único y pool de lectura sobre data/database.db
+    engine, read_engine = create_engines()
+    if init_schema(engine, Base.metadata):
+        print("Tablas creadas exitosamente.")
+    else:
+        print("El esquema de la base de datos está al día.")
+    return create_session_factory(engine, read_engine)
 
 def main():
     """
     Función principal para demostrar las operaciones CRUD.
     """
-    init_db()
-    db = SessionLocal()
+    from src.models import TaskState, TaskPriority
+    from src.services import UserService, TaskService, CategoryService, NotificationService
+
+    db = init_db()()
 
     try:
         user_service = UserService(db)
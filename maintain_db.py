@@ -0,0 +1,65 @@
+import os
+import sys
+import argparse
+from src.database import DATABASE_PATH, run_maintenance
+
+def parse_args(argv=None):
+    """
+    Interpreta los argumentos de la línea de comandos.
+    """
+    parser = argparse.ArgumentParser(description="Mantenimiento de la base de datos SQLite en uso.")
+    parser.add_argument("--bd", default=DATABASE_PATH, help="Ruta de la base de datos.")
+    parser.add_argument("--tiempo", type=float, default=5.0, help="Segundos máximos de vacuum incremental.")
+    parser.add_argument("--paginas", type=int, default=1000, help="Páginas liberadas por paso.")
+    parser.add_argument("--activar-incremental", action="store_true",
+                        help="Activa auto_vacuum=INCREMENTAL (VACUUM completo, una sola vez).")
+    parser.add_argument("--rapido", action="store_true", help="Usa quick_check en lugar de integrity_check.")
+    parser.add_argument("--sin-analyze", action="store_true", help="No actualiza las estadísticas.")
+    parser.add_argument("--sin-vacuum", action="store_true", help="No libera páginas.")
+    parser.add_argument("--sin-checkpoint", action="store_true", help="No ejecuta el checkpoint del WAL.")
+    parser.add_argument("--sin-verificar", action="store_true", help="No verifica la integridad.")
+    return parser.parse_args(argv)
+
+def describe(stats):
+    """
+    Resume las estadísticas de la base de datos en una línea.
+    """
+    return (f"{stats['size'] / 2**20:.1f} MiB, {stats['page_count']} páginas, {stats['freelist_count']} libres "
+            f"({stats['fragmentation']:.1%}), auto_vacuum={stats['auto_vacuum']}, journal={stats['journal_mode']}")
+
+def main(argv=None):
+    """
+    Ejecuta el mantenimiento e informa del resultado.
+    """
+    args = parse_args(argv)
+    try:
+        report = run_maintenance(
+            args.bd, analyze=not args.sin_analyze, vacuum=not args.sin_vacuum,
+            wal_checkpoint=not args.sin_checkpoint, check=not args.sin_verificar, quick=args.rapido,
+            time_budget=args.tiempo, pages_per_step=args.paginas, enable_incremental=args.activar_incremental,
+            progress=lambda name: print(f"  {name}...")
+        )
+    except ValueError as e:
+        print(f"Error en el mantenimiento: {e}", file=sys.stderr)
+        return 1
+
+    print(f"Antes:   {describe(report.before)}")
+    print(f"Después: {describe(report.after)}")
+    for name, seconds in report.steps.items():
+        print(f"  {name}: {seconds:.2f} s")
+    if report.after['auto_vacuum'] != 'INCREMENTAL' and not args.sin_vacuum:
+        print("El vacuum incremental requiere auto_vacuum=INCREMENTAL; usa --activar-incremental una vez.")
+    if report.after['freelist_count']:
+        print(f"Quedan {report.after['freelist_count']} páginas libres; vuelve a ejecutar para continuar.")
+    if report.checkpoint:
+        print(f"Checkpoint WAL: {report.checkpoint[2]}/{report.checkpoint[1]} páginas copiadas.")
+    if report.problems:
+        print("Problemas de integridad:", file=sys.stderr)
+        for problem in report.problems:
+            print(f"  {problem}", file=sys.stderr)
+        return 2
+    print("Integridad: correcta." if not args.sin_verificar else "Integridad: no verificada.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+import os
+import sys
+import argparse
+from src.database import DATABASE_PATH, ConvertStorage, Migrator
+
+def parse_args(argv=None):
+    """
+    Interpreta los argumentos de la línea de comandos.
+    """
+    parser = argparse.ArgumentParser(description="Aplica las migraciones pendientes del esquema de la base de datos.")
+    parser.add_argument("--bd", default=DATABASE_PATH, help="Ruta de la base de datos.")
+    parser.add_argument("--hasta", type=int, help="Versión hasta la que migrar (por defecto, la última).")
+    parser.add_argument("--lote", type=int, default=5000, help="Filas por lote en las reescrituras de tablas.")
+    parser.add_argument("--simular", action="store_true", help="Muestra las migraciones pendientes y su duración estimada.")
+    parser.add_argument("--almacenamiento", choices=("compacto", "texto"),
+                        help="Convierte los enums y fechas a enteros (compacto) o de vuelta a texto tras migrar.")
+    return parser.parse_args(argv)
+
+def progress(description, done, total):
+    """
+    Muestra el avance de cada operación.
+    """
+    if done == 0:
+        print(f"  {description}...")
+    else:
+        print(f"\r    {done}/{total} filas", end="" if done < total else "\n")
+
+def table_progress(description, done, total):
+    """
+    Muestra el avance de la conversión del almacenamiento, tabla a tabla.
+    """
+    if done == 0:
+        print(f"  {description}...")
+    else:
+        print(f"    {done}/{total} tablas")
+
+def main(argv=None):
+    """
+    Ejecuta o simula las migraciones.
+    """
+    args = parse_args(argv)
+    try:
+        with Migrator(args.bd) as migrator:
+            if args.simular:
+                total = 0.0
+                for migration, estimates in migrator.estimate(args.hasta):
+                    print(f"Versión {migration.version}: {migration.name}")
+                    for description, seconds in estimates:
+                        print(f"  {description}: ~{seconds:.1f} s")
+                        total += seconds
+                if args.almacenamiento:
+                    operation = ConvertStorage(args.almacenamiento == "compacto")
+                    seconds = operation.estimate(migrator.conn)
+                    print(f"{operation.describe()}: ~{seconds:.1f} s")
+                    total += seconds
+                print(f"Duración estimada: ~{total:.1f} s")
+                return 0
+            applied = migrator.migrate(args.hasta, batch_size=args.lote, progress=progress)
+            for migration in applied:
+                print(f"Aplicada la versión {migration.version}: {migration.name}")
+            print(f"Esquema en la versión {max(migrator.applied_versions(), default=0)}.")
+            if args.almacenamiento:
+                converted = migrator.convert_storage(args.almacenamiento == "compacto", progress=table_progress)
+                state = "convertido al" if converted else "ya estaba en el"
+                print(f"Almacenamiento {state} formato {args.almacenamiento}.")
+    except ValueError as e:
+        print(f"Error en la migración: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,37 +1,37 @@
-import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from src.models import Base, User, TaskState, TaskPriority, TaskFrequency, Category, Task, Notification
-from src.services import UserService, TaskService, CategoryService, NotificationService
 from datetime import datetime, timedelta
 import random
 
-# Asegura que el directorio 'data' exista
-DATA_DIR = 'data'
-if not os.path.exists(DATA_DIR):
-    os.makedirs(DATA_DIR)
-
-DATABASE_URL = f"sqlite:///{DATA_DIR}/database.db"
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
 def init_db():
     """
-    Inicializa la base de datos, creando todas las tablas si no existen.
+    Inicializa la base de datos, creando las tablas que falten si el esquema de los modelos ha cambiado.
+    :return: La fábrica de sesiones de la base de datos.
     """
-    print("Creando tablas de la base de datos si no existen...")
-    Base.metadata.create_all(bind=engine)
-    print("Tablas creadas/verificadas exitosamente.")
+    # Importaciones diferidas: importar el script no carga SQLAlchemy ni abre la base de datos
+    from src.database.session import create_engines, create_session_factory, init_schema
+    from src.models import Base
 
-def generate_simulated_data(num_users=5, num_categories=5, tasks_per_user=5, notifications_per_task=1):
+    # Escritor único y pool de lectura sobre data/database.db
+    engine, read_engine = create_engines()
+    if init_schema(engine, Base.metadata):
+        print("Tablas creadas/verificadas exitosamente.")
+    else:
+        print("El esquema de la base de datos está al día.")
+    return create_session_factory(engine, read_engine)
+
+def generate_simulated_data(session_factory, num_users=5, num_categories=5, tasks_per_user=5,
+                            notifications_per_task=1):
     """
     Genera datos simulados y los inserta en la base de datos.
+    :param session_factory: Fábrica de sesiones (la que devuelve init_db).
     :param num_users: Número de usuarios a crear.
     :param num_categories: Número de categorías a crear.
     :param tasks_per_user: Número promedio de tareas por usuario.
     :param notifications_per_task: Número de notificaciones por tarea.
     """
-    db = SessionLocal()
+    from src.models import TaskState, TaskPriority, TaskFrequency
+    from src.services import UserService, TaskService, CategoryService, NotificationService
+
+    db = session_factory()
     try:
         user_service = UserService(db)
         task_service = TaskService(db)
@@ -143,8 +143,9 @@ def generate_simulated_data(num_users=5, num_categories=5, tasks_per_user=5, not
         db.close()
 
 if __name__ == "__main__":
-    init_db()
+    SessionLocal = init_db()
     generate_simulated_data(
+        SessionLocal,
         num_users=10,        # Crea 10 usuarios
         num_categories=8,    # Crea 8 categorías
         tasks_per_user=7,    # Cada usuario tendrá alrededor de 7 tareas
@@ -0,0 +1,36 @@
+import sys
+import argparse
+
+def parse_args(argv=None):
+    """
+    Interpreta los argumentos de la línea de comandos.
+    """
+    parser = argparse.ArgumentParser(description="Borra por lotes los usuarios y categorías marcados como eliminados con sus datos.")
+    parser.add_argument("--lote", type=int, default=1000, help="Tareas (o asociaciones) por lote y transacción.")
+    parser.add_argument("--pausa", type=float, default=0.05, help="Segundos de espera entre lotes.")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """
+    Ejecuta el borrado informando el progreso.
+    """
+    args = parse_args(argv)
+    # Importaciones diferidas: --help y los errores de argumentos no cargan SQLAlchemy
+    from src.database.session import create_engines, create_session_factory, init_schema
+    from src.models import Base
+    from src.services import DeletionPurger
+
+    engine, read_engine = create_engines()
+    init_schema(engine, Base.metadata)
+    try:
+        purger = DeletionPurger(create_session_factory(engine, read_engine), batch_size=args.lote, pause=args.pausa)
+        totals = purger.purge(progress=lambda totals: print(
+            f"  {totals['tareas']} tareas y {totals['asociaciones']} asociaciones borradas..."))
+        print(f"Borrado completado: {totals['tareas']} tareas y {totals['asociaciones']} asociaciones de categorías.")
+    except ValueError as e:
+        print(f"Error en el borrado: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
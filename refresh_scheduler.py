@@ -0,0 +1,80 @@
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+from PyQt5.QtCore import QObject, QTimer
+
+class RefreshScheduler(QObject):
+    """
+    Agrupa las recargas de la interfaz. Las vistas (tablas, desplegables) se registran como
+    regiones que dependen de fuentes de datos; pedir una recarga solo marca la región como sucia
+    y, al vencer un temporizador corto, se ejecuta una única recarga por turno del bucle de
+    eventos: cada fuente se consulta una sola vez aunque la usen varias regiones.
+    """
+    def __init__(self, interval_ms: int = 30, parent: QObject | None = None):
+        super().__init__(parent)
+        self._sources: Dict[str, Callable[[], Any]] = {}
+        self._regions: Dict[str, Tuple[Callable[..., None], Tuple[str, ...]]] = {}
+        self._dirty: set = set()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.flush)
+
+    def add_source(self, name: str, fetch: Callable[[], Any]):
+        """
+        Registra una fuente de datos compartida.
+        :param name: Nombre de la fuente.
+        :param fetch: Función sin argumentos que consulta los datos.
+        """
+        self._sources[name] = fetch
+
+    def add_region(self, name: str, render: Callable[..., None], sources: Sequence[str] = ()):
+        """
+        Registra una región de la interfaz. Las regiones se recargan en el orden en que se registran.
+        :param name: Nombre de la región.
+        :param render: Función que redibuja la región; recibe los datos de sus fuentes en orden.
+        :param sources: Nombres de las fuentes de las que depende.
+        """
+        unknown = [source for source in sources if source not in self._sources]
+        if unknown:
+            raise ValueError(f"Fuentes de datos desconocidas: {', '.join(unknown)}")
+        self._regions[name] = (render, tuple(sources))
+
+    def request(self, *regions: str):
+        """
+        Marca regiones como sucias y programa la recarga si no estaba ya programada.
+        :param regions: Nombres de las regiones a recargar.
+        """
+        unknown = [region for region in regions if region not in self._regions]
+        if unknown:
+            raise ValueError(f"Regiones desconocidas: {', '.join(unknown)}")
+        self._dirty.update(regions)
+        if self._dirty and not self._timer.isActive():
+            self._timer.start()
+
+    def is_pending(self, region: str | None = None) -> bool:
+        """
+        Indica si hay una recarga pendiente (de una región concreta o de cualquiera).
+        """
+        return region in self._dirty if region is not None else bool(self._dirty)
+
+    def flush(self) -> List[str]:
+        """
+        Ejecuta ahora las recargas pendientes, consultando cada fuente necesaria una sola vez.
+        :return: Los nombres de las regiones recargadas.
+        """
+        self._timer.stop()
+        dirty, self._dirty = self._dirty, set()
+        regions = [name for name in self._regions if name in dirty]
+        needed = self._needed_sources(regions)
+        data = {source: self._sources[source]() for source in needed}
+        for name in regions:
+            render, sources = self._regions[name]
+            render(*(data[source] for source in sources))
+        return regions
+
+    def _needed_sources(self, regions: Iterable[str]) -> List[str]:
+        needed = []
+        for name in regions:
+            for source in self._regions[name][1]:
+                if source not in needed:
+                    needed.append(source)
+        return needed
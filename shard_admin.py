@@ -0,0 +1,68 @@
+import os
+import re
+import sys
+import argparse
+from src.database.sharding import ShardDirectory, ShardRebalancer, create_sharded_sessionmaker, shard_paths
+
+DATA_DIR = 'data'
+SHARDS_DIR = os.path.join(DATA_DIR, 'shards')
+
+def parse_args(argv=None):
+    """
+    Interpreta los argumentos de la línea de comandos.
+    """
+    parser = argparse.ArgumentParser(description="Administra el almacenamiento repartido en varios archivos SQLite.")
+    parser.add_argument("--directorio", default=SHARDS_DIR, help="Directorio de los shards.")
+    parser.add_argument("--shards", type=int, help="Número de shards (por defecto, los existentes).")
+    parser.add_argument("--estrategia", choices=["hash", "range"], default="hash", help="Reparto de usuarios.")
+    parser.add_argument("--rango", type=int, default=100_000, help="Usuarios por shard con la estrategia 'range'.")
+    commands = parser.add_subparsers(dest="comando", required=True)
+    commands.add_parser("iniciar", help="Crea los shards y el directorio (o añade shards nuevos).")
+    commands.add_parser("estadisticas", help="Muestra usuarios y tareas por shard.")
+    commands.add_parser("reequilibrar", help="Mueve cada usuario a su shard según la estrategia y el número de shards.")
+    move = commands.add_parser("mover", help="Mueve un usuario a otro shard.")
+    move.add_argument("usuario", type=int, help="ID del usuario.")
+    move.add_argument("shard", help="Shard de destino (ej. shard2).")
+    return parser.parse_args(argv)
+
+def existing_shards(directory):
+    """
+    Número de archivos de shard en el directorio.
+    """
+    if not os.path.isdir(directory):
+        return 0
+    return sum(1 for name in os.listdir(directory) if re.match(r'^shard\d+\.db$', name))
+
+def main(argv=None):
+    """
+    Ejecuta el comando indicado.
+    """
+    args = parse_args(argv)
+    count = args.shards or existing_shards(args.directorio)
+    if count <= 0:
+        print("No hay shards; usa 'iniciar' con --shards N.", file=sys.stderr)
+        return 1
+    os.makedirs(args.directorio, exist_ok=True)
+    shards = shard_paths(args.directorio, count)
+    directory_path = os.path.join(args.directorio, "shards.db")
+    try:
+        if args.comando == "iniciar":
+            create_sharded_sessionmaker(directory_path, shards, args.estrategia, args.rango)
+            print(f"{count} shards listos en {args.directorio}.")
+            return 0
+        rebalancer = ShardRebalancer(ShardDirectory(directory_path, list(shards), args.estrategia, args.rango), shards)
+        if args.comando == "mover":
+            moved = rebalancer.move_user(args.usuario, args.shard)
+            print(f"Usuario {args.usuario} movido a {args.shard}." if moved else "El usuario ya estaba en ese shard.")
+        elif args.comando == "reequilibrar":
+            total = rebalancer.rebalance(lambda user_id, source, target: print(f"  usuario {user_id}: {source} -> {target}"))
+            print(f"Reequilibrado completado: {total} usuarios movidos.")
+        for shard_id, stats in rebalancer.stats().items():
+            print(f"{shard_id}: {stats['usuarios']} usuarios, {stats['tareas']} tareas")
+    except ValueError as e:
+        print(f"Error en los shards: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+import os
+from importlib import import_module
+
+DATA_DIR = 'data'
+DATABASE_PATH = os.path.join(DATA_DIR, 'database.db')
+
+# Los submódulos se importan al usar sus nombres: las herramientas de copia, mantenimiento y
+# migración solo necesitan sqlite3 y no deben cargar SQLAlchemy al arrancar.
+_EXPORTS = {
+    'backup': ('BackupResult', 'backup_database', 'snapshot_database', 'create_backup', 'list_backups',
+               'rotate_backups', 'restore_database'),
+    'maintenance': ('MaintenanceReport', 'database_stats', 'run_maintenance'),
+    'changes': ('TRACKED_TABLES', 'create_change_triggers'),
+    'storage': ('COMPACT_COLUMNS', 'is_compact_storage'),
+    'migrations': ('Migration', 'Migrator', 'AddColumn', 'CreateIndex', 'RebuildTable',
+                   'EnableAutoincrement', 'CreateChangeLog', 'CreateStateHistory', 'ConvertStorage', 'MIGRATIONS'),
+    'retry': ('RetryPolicy', 'DEFAULT_RETRY_POLICY', 'is_busy_error'),
+    'session': ('RoutingSession', 'create_engines', 'create_session_factory', 'init_schema', 'schema_stamp'),
+}
+_LOCATIONS = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = ['DATA_DIR', 'DATABASE_PATH', *_LOCATIONS]
+
+def __getattr__(name):
+    module = _LOCATIONS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(__all__)
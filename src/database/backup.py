@@ -0,0 +1,210 @@
+import os
+import re
+import sqlite3
+import time
+from datetime import datetime
+from typing import Callable, List
+
+# Nombre de las copias: <base>-AAAAMMDD-HHMMSS.db, para que el orden alfabético sea el cronológico
+_BACKUP_NAME_RE = r'^{stem}-\d{{8}}-\d{{6}}\.db$'
+
+class BackupResult:
+    """
+    Resumen de una copia de seguridad o restauración.
+    """
+    def __init__(self, path: str, size: int, seconds: float, pages: int = 0):
+        self.path = path
+        self.size = size
+        self.seconds = seconds
+        self.pages = pages
+
+    @property
+    def throughput(self) -> float:
+        """Velocidad de la copia en MiB/s."""
+        return self.size / 2**20 / self.seconds if self.seconds else 0.0
+
+    def __repr__(self):
+        return (f"<BackupResult(path='{self.path}', size={self.size}, "
+                f"seconds={self.seconds:.2f}, pages={self.pages})>")
+
+class _BackupRestarted(Exception):
+    """
+    La copia se ha reiniciado demasiadas veces porque otras conexiones modifican el origen.
+    """
+
+def _copy_pages(source: sqlite3.Connection, target: sqlite3.Connection, pages: int, sleep: float,
+                progress: Callable[[int, int], None] | None, max_restarts: int = 2) -> int:
+    """
+    Copia `source` en `target` con la API de copia en línea de SQLite, de `pages` en `pages` páginas.
+
+    En modo WAL el origen se fija con una transacción de lectura: la copia ve una instantánea
+    y los escritores no se bloquean. En modo rollback journal el bloqueo de lectura se libera
+    al terminar cada paso y la pausa de `sleep` segundos deja escribir a las demás conexiones;
+    pero si otra conexión modifica el origen, SQLite reinicia la copia. Tras `max_restarts`
+    reinicios se repite manteniendo el bloqueo de lectura, de modo que la copia termina
+    (los escritores esperan a que acabe).
+    :return: El número total de páginas copiadas.
+    """
+    pinned = source.execute("PRAGMA journal_mode").fetchone()[0].lower() == 'wal'
+    while True:
+        state = {'total': 0, 'remaining': None, 'restarts': 0}
+
+        def report(status, remaining, total):
+            if state['remaining'] is not None and remaining > state['remaining']:
+                state['restarts'] += 1
+                if not pinned and state['restarts'] > max_restarts:
+                    raise _BackupRestarted()
+            state['total'], state['remaining'] = total, remaining
+            if progress:
+                progress(total - remaining, total)
+            if remaining and sleep and not pinned:
+                time.sleep(sleep)
+
+        if pinned:
+            source.execute("BEGIN")
+            source.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        try:
+            source.backup(target, pages=pages, progress=report, sleep=sleep)
+            return state['total']
+        except _BackupRestarted:
+            pinned = True
+        finally:
+            if source.in_transaction:
+                source.rollback()
+
+def backup_database(db_path: str, dest_path: str, pages: int = 1024, sleep: float = 0.005,
+                    progress: Callable[[int, int], None] | None = None) -> BackupResult:
+    """
+    Hace una copia consistente de una base de datos en uso con la API de copia en línea.
+    La copia se escribe en un archivo temporal que se renombra al terminar, de modo que
+    `dest_path` nunca queda a medio escribir.
+    :param db_path: Ruta de la base de datos de origen.
+    :param dest_path: Ruta del archivo de copia.
+    :param pages: Páginas copiadas por paso (-1 copia todo en un solo paso).
+    :param sleep: Pausa en segundos entre pasos.
+    :param progress: Función opcional que recibe (páginas copiadas, páginas totales).
+    :return: El resumen de la copia.
+    :raises ValueError: Si la base de datos de origen no existe.
+    """
+    if not os.path.exists(db_path):
+        raise ValueError(f"La base de datos {db_path} no existe.")
+    if not isinstance(pages, int) or pages == 0 or pages < -1:
+        raise ValueError("El número de páginas por paso debe ser un entero positivo o -1.")
+    tmp_path = f"{dest_path}.tmp"
+    began = time.perf_counter()
+    source = sqlite3.connect(db_path)
+    target = sqlite3.connect(tmp_path)
+    try:
+        copied = _copy_pages(source, target, pages, sleep, progress)
+    except BaseException:
+        target.close()
+        os.remove(tmp_path)
+        raise
+    finally:
+        source.close()
+    target.close()
+    os.replace(tmp_path, dest_path)
+    return BackupResult(dest_path, os.path.getsize(dest_path), time.perf_counter() - began, copied)
+
+def snapshot_database(db_path: str, dest_path: str) -> BackupResult:
+    """
+    Crea una instantánea compactada (sin páginas libres) con VACUUM INTO. Es una sola
+    transacción de lectura: no bloquea a los escritores en modo WAL, pero sí en modo
+    rollback journal mientras dura.
+    :param db_path: Ruta de la base de datos de origen.
+    :param dest_path: Ruta de la instantánea; no debe existir.
+    :return: El resumen de la instantánea.
+    :raises ValueError: Si el origen no existe o el destino ya existe.
+    """
+    if not os.path.exists(db_path):
+        raise ValueError(f"La base de datos {db_path} no existe.")
+    if os.path.exists(dest_path):
+        raise ValueError(f"El archivo {dest_path} ya existe.")
+    began = time.perf_counter()
+    source = sqlite3.connect(db_path)
+    try:
+        source.execute("VACUUM INTO ?", (dest_path,))
+    finally:
+        source.close()
+    return BackupResult(dest_path, os.path.getsize(dest_path), time.perf_counter() - began)
+
+def backup_name(db_path: str, now: datetime | None = None) -> str:
+    """
+    Nombre de archivo de una copia de `db_path` con la fecha y hora indicadas.
+    """
+    stem = os.path.splitext(os.path.basename(db_path))[0]
+    return f"{stem}-{(now or datetime.now()):%Y%m%d-%H%M%S}.db"
+
+def list_backups(db_path: str, directory: str) -> List[str]:
+    """
+    Lista las copias de `db_path` en `directory`, de la más antigua a la más reciente.
+    """
+    if not os.path.isdir(directory):
+        return []
+    stem = os.path.splitext(os.path.basename(db_path))[0]
+    pattern = re.compile(_BACKUP_NAME_RE.format(stem=re.escape(stem)))
+    return [os.path.join(directory, name) for name in sorted(os.listdir(directory)) if pattern.match(name)]
+
+def rotate_backups(db_path: str, directory: str, keep: int) -> List[str]:
+    """
+    Elimina las copias más antiguas de `db_path` conservando las `keep` más recientes.
+    :return: Las rutas eliminadas.
+    """
+    if not isinstance(keep, int) or keep <= 0:
+        raise ValueError("El número de copias a conservar debe ser un entero positivo.")
+    removed = list_backups(db_path, directory)[:-keep]
+    for path in removed:
+        os.remove(path)
+    return removed
+
+def create_backup(db_path: str, directory: str, keep: int | None = None, compact: bool = False,
+                  pages: int = 1024, sleep: float = 0.005,
+                  progress: Callable[[int, int], None] | None = None) -> BackupResult:
+    """
+    Crea una copia con nombre fechado en `directory` y aplica la rotación.
+    :param db_path: Ruta de la base de datos.
+    :param directory: Directorio de las copias (se crea si no existe).
+    :param keep: Número de copias a conservar; None no elimina ninguna.
+    :param compact: True para crear una instantánea compactada con VACUUM INTO.
+    :return: El resumen de la copia.
+    """
+    os.makedirs(directory, exist_ok=True)
+    dest_path = os.path.join(directory, backup_name(db_path))
+    if compact:
+        result = snapshot_database(db_path, dest_path)
+    else:
+        result = backup_database(db_path, dest_path, pages=pages, sleep=sleep, progress=progress)
+    if keep is not None:
+        rotate_backups(db_path, directory, keep)
+    return result
+
+def restore_database(backup_path: str, db_path: str, pages: int = 1024, sleep: float = 0.005,
+                     progress: Callable[[int, int], None] | None = None) -> BackupResult:
+    """
+    Restaura una copia sobre la base de datos con la API de copia en línea, que reemplaza
+    el contenido de forma atómica aunque haya otras conexiones abiertas (que verán los
+    datos restaurados en su siguiente transacción). Antes se verifica la integridad de la copia.
+    :param backup_path: Ruta de la copia.
+    :param db_path: Ruta de la base de datos a restaurar.
+    :return: El resumen de la restauración.
+    :raises ValueError: Si la copia no existe o está dañada.
+    """
+    if not os.path.exists(backup_path):
+        raise ValueError(f"La copia {backup_path} no existe.")
+    began = time.perf_counter()
+    source = sqlite3.connect(f"file:{backup_path}?mode=ro", uri=True)
+    try:
+        try:
+            check = source.execute("PRAGMA quick_check").fetchone()[0]
+        except sqlite3.DatabaseError as e:
+            raise ValueError(f"La copia {backup_path} no es una base de datos válida: {e}")
+        if check != 'ok':
+            raise ValueError(f"La copia {backup_path} está dañada: {check}")
+        target = sqlite3.connect(db_path)
+        try:
+            copied = _copy_pages(source, target, pages, sleep, progress)
+        finally:
+            target.close()
+    finally:
+        source.close()
+    return BackupResult(db_path, os.path.getsize(db_path), time.perf_counter() - began, copied)
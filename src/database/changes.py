@@ -0,0 +1,152 @@
+from typing import Iterable, List, Sequence
+from .storage import STATES, Execute, enum_literal, is_compact_storage, now_sql
+
+# Tablas cuyos cambios se registran en change_log
+TRACKED_TABLES = ('users', 'tasks', 'categories', 'notifications')
+CHANGE_LOG_TABLE = 'change_log'
+# Columnas que no son datos: la versión de la fila cambia con cada UPDATE (concurrencia optimista)
+UNTRACKED_COLUMNS = ('version',)
+STATE_HISTORY_TABLE = 'task_state_history'
+
+# Misma definición que genera create_all para ChangeLogEntry (src/models/change_log.py).
+# AUTOINCREMENT impide reutilizar números de secuencia tras compactar el registro.
+CHANGE_LOG_DDL = f"""
+    CREATE TABLE IF NOT EXISTS {CHANGE_LOG_TABLE} (
+        seq INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+        tabla VARCHAR NOT NULL,
+        clave INTEGER NOT NULL,
+        operacion VARCHAR NOT NULL,
+        columnas VARCHAR,
+        fecha DATETIME NOT NULL
+    )"""
+
+# Misma definición que genera create_all para TaskStateChange (src/models/task_state_history.py)
+STATE_HISTORY_DDL = [
+    f"""
+    CREATE TABLE IF NOT EXISTS {STATE_HISTORY_TABLE} (
+        id INTEGER NOT NULL PRIMARY KEY,
+        id_tarea INTEGER NOT NULL,
+        id_usuario INTEGER NOT NULL,
+        estado_anterior VARCHAR(11),
+        estado_nuevo VARCHAR(11),
+        fecha DATETIME NOT NULL
+    )""",
+    f"CREATE INDEX IF NOT EXISTS ix_task_state_history_fecha ON {STATE_HISTORY_TABLE} (fecha)",
+    f"CREATE INDEX IF NOT EXISTS ix_task_state_history_usuario_fecha ON {STATE_HISTORY_TABLE} (id_usuario, fecha)",
+    f"CREATE INDEX IF NOT EXISTS ix_task_state_history_id_tarea ON {STATE_HISTORY_TABLE} (id_tarea)",
+]
+
+_HISTORY_INSERT = (f"INSERT INTO {STATE_HISTORY_TABLE} "
+                   f"(id_tarea, id_usuario, estado_anterior, estado_nuevo, fecha)")
+
+def state_history_trigger_statements(compact: bool = False) -> List[str]:
+    """
+    Genera los triggers del historial de estados: creación (estado anterior NULL), cada cambio de
+    estado y borrado (estado nuevo NULL). La creación toma la fecha de inicio de la tarea para que
+    las importaciones con fechas antiguas cuenten el día correcto. Los estados se copian tal cual
+    de la tarea; la fecha actual depende del almacenamiento (ver src/database/storage.py).
+    """
+    now = now_sql(compact)
+    return [
+        f"CREATE TRIGGER _hist_tasks_ins AFTER INSERT ON tasks BEGIN {_HISTORY_INSERT} "
+        f"VALUES (NEW.id_tarea, NEW.id_usuario, NULL, NEW.estado, coalesce(NEW.fecha_inicio, {now})); END",
+        f"CREATE TRIGGER _hist_tasks_upd AFTER UPDATE OF estado ON tasks WHEN OLD.estado IS NOT NEW.estado BEGIN "
+        f"{_HISTORY_INSERT} VALUES (NEW.id_tarea, NEW.id_usuario, OLD.estado, NEW.estado, {now}); END",
+        f"CREATE TRIGGER _hist_tasks_del AFTER DELETE ON tasks BEGIN {_HISTORY_INSERT} "
+        f"VALUES (OLD.id_tarea, OLD.id_usuario, OLD.estado, NULL, {now}); END",
+    ]
+
+def state_history_backfill_statements(compact: bool = False,
+                                      sources: Sequence[str] = ('tasks', 'archived_tasks')) -> List[str]:
+    """
+    Genera el historial aproximado de las tareas anteriores al historial: la creación en su fecha
+    de inicio y, si están completadas, la finalización en su fecha de vencimiento (o de inicio).
+    :param sources: Tablas de tareas de las que se genera (las activas y las archivadas).
+    """
+    now = now_sql(compact)
+    pending, completed = (enum_literal(STATES, name, compact) for name in ('PENDIENTE', 'COMPLETADA'))
+    return [
+        f"{_HISTORY_INSERT} SELECT id_tarea, id_usuario, NULL, "
+        f"CASE WHEN estado = {completed} THEN {pending} ELSE estado END, coalesce(fecha_inicio, {now}) FROM {source}"
+        for source in sources
+    ] + [
+        f"{_HISTORY_INSERT} SELECT id_tarea, id_usuario, {pending}, {completed}, "
+        f"coalesce(fecha_vencimiento, fecha_inicio, {now}) FROM {source} WHERE estado = {completed}"
+        for source in sources
+    ]
+
+def _log_insert(table: str, key: str, operation: str, columns: str) -> str:
+    return (f"INSERT INTO {CHANGE_LOG_TABLE} (tabla, clave, operacion, columnas, fecha) "
+            f"VALUES ('{table}', {key}, '{operation}', {columns}, datetime('now', 'localtime'));")
+
+def change_trigger_statements(table: str, key: str, columns: Sequence[str]) -> List[str]:
+    """
+    Genera los triggers que registran en change_log las inserciones, cambios y borrados de una
+    tabla, en la misma transacción que la escritura. Los cambios solo se registran si alguna
+    columna cambia de valor, con la lista de columnas cambiadas separadas por comas.
+    :param table: Nombre de la tabla.
+    :param key: Columna de clave primaria (entera).
+    :param columns: Todas las columnas de la tabla.
+    :return: Las sentencias CREATE TRIGGER.
+    """
+    changed = " OR ".join(f"OLD.{column} IS NOT NEW.{column}" for column in columns)
+    names = " || ".join(f"CASE WHEN OLD.{column} IS NOT NEW.{column} THEN '{column},' ELSE '' END"
+                        for column in columns)
+    names = f"rtrim({names}, ',')"
+    return [
+        f"CREATE TRIGGER _cdc_{table}_ins AFTER INSERT ON {table} BEGIN "
+        f"{_log_insert(table, f'NEW.{key}', 'INSERT', 'NULL')} END",
+        f"CREATE TRIGGER _cdc_{table}_upd AFTER UPDATE ON {table} WHEN {changed} BEGIN "
+        f"{_log_insert(table, f'NEW.{key}', 'UPDATE', names)} END",
+        f"CREATE TRIGGER _cdc_{table}_del AFTER DELETE ON {table} BEGIN "
+        f"{_log_insert(table, f'OLD.{key}', 'DELETE', 'NULL')} END",
+    ]
+
+def _table_exists(execute: Execute, table: str) -> bool:
+    return any(execute(f"SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = '{table}'"))
+
+def has_change_log(execute: Execute) -> bool:
+    return _table_exists(execute, CHANGE_LOG_TABLE)
+
+def create_state_history_triggers(execute: Execute):
+    """
+    (Re)crea los triggers que registran el historial de estados de las tareas, si existen la tabla
+    de tareas y la del historial.
+    """
+    if not (_table_exists(execute, 'tasks') and _table_exists(execute, STATE_HISTORY_TABLE)):
+        return
+    for action in ('ins', 'upd', 'del'):
+        execute(f"DROP TRIGGER IF EXISTS _hist_tasks_{action}")
+    for statement in state_history_trigger_statements(is_compact_storage(execute)):
+        execute(statement)
+
+def backfill_state_history(execute: Execute):
+    """
+    Rellena el historial de estados de las tareas existentes si todavía está vacío. Las bases de
+    datos migradas desde el esquema inicial pueden no tener todavía las tablas de archivo (las crea
+    create_all al abrirlas con init_schema): solo se leen las tablas que existen.
+    """
+    if not any(execute(f"SELECT 1 FROM {STATE_HISTORY_TABLE} LIMIT 1")):
+        sources = [table for table in ('tasks', 'archived_tasks') if _table_exists(execute, table)]
+        for statement in state_history_backfill_statements(is_compact_storage(execute), sources):
+            execute(statement)
+
+def create_change_triggers(execute: Execute, tables: Iterable[str] = TRACKED_TABLES):
+    """
+    (Re)crea los triggers del registro de cambios de las tablas indicadas que existan, a partir
+    de sus columnas actuales. Se debe volver a ejecutar tras añadir columnas o reescribir una tabla.
+    :param execute: Función que ejecuta SQL sobre la conexión.
+    :param tables: Tablas a vigilar.
+    """
+    for table in tables:
+        info = list(execute(f"PRAGMA table_info({table})"))
+        if not info:
+            continue
+        columns = [row[1] for row in info if row[1] not in UNTRACKED_COLUMNS]
+        keys = [row[1] for row in info if row[5]]
+        if len(keys) != 1:
+            raise ValueError(f"La tabla {table} necesita una clave primaria de una sola columna para registrar sus cambios.")
+        for action in ('ins', 'upd', 'del'):
+            execute(f"DROP TRIGGER IF EXISTS _cdc_{table}_{action}")
+        for statement in change_trigger_statements(table, keys[0], columns):
+            execute(statement)
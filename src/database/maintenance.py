@@ -0,0 +1,171 @@
+import os
+import sqlite3
+import time
+from typing import Callable, Dict, List
+
+# Valores de PRAGMA auto_vacuum
+_AUTO_VACUUM_MODES = {0: 'NONE', 1: 'FULL', 2: 'INCREMENTAL'}
+
+class MaintenanceReport:
+    """
+    Resumen de una ejecución de mantenimiento: estadísticas antes y después y resultado de cada paso.
+    """
+    def __init__(self):
+        self.before: Dict[str, object] = {}
+        self.after: Dict[str, object] = {}
+        self.steps: Dict[str, float] = {}
+        self.freed_pages = 0
+        self.checkpoint: tuple | None = None
+        self.problems: List[str] = []
+
+    def __repr__(self):
+        return (f"<MaintenanceReport(freed_pages={self.freed_pages}, problems={len(self.problems)}, "
+                f"steps={list(self.steps)})>")
+
+def connect(db_path: str, busy_timeout: float = 5.0) -> sqlite3.Connection:
+    """
+    Abre una conexión en modo autocommit para ejecutar PRAGMAs de mantenimiento.
+    :raises ValueError: Si la base de datos no existe.
+    """
+    if not os.path.exists(db_path):
+        raise ValueError(f"La base de datos {db_path} no existe.")
+    return sqlite3.connect(db_path, timeout=busy_timeout, isolation_level=None)
+
+def _pragma(conn: sqlite3.Connection, name: str):
+    return conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+def database_stats(conn: sqlite3.Connection) -> Dict[str, object]:
+    """
+    Obtiene el tamaño y la fragmentación de la base de datos.
+    :return: Diccionario con page_size, page_count, freelist_count, size (bytes),
+             fragmentation (fracción de páginas libres), auto_vacuum y journal_mode.
+    """
+    page_size = _pragma(conn, "page_size")
+    page_count = _pragma(conn, "page_count")
+    freelist = _pragma(conn, "freelist_count")
+    return {
+        'page_size': page_size,
+        'page_count': page_count,
+        'freelist_count': freelist,
+        'size': page_size * page_count,
+        'fragmentation': freelist / page_count if page_count else 0.0,
+        'auto_vacuum': _AUTO_VACUUM_MODES[_pragma(conn, "auto_vacuum")],
+        'journal_mode': _pragma(conn, "journal_mode").upper(),
+    }
+
+def optimize(conn: sqlite3.Connection, analysis_limit: int = 1000, full: bool = False):
+    """
+    Actualiza las estadísticas del planificador de consultas, con analysis_limit para acotar
+    las filas leídas por índice. Si todavía no hay estadísticas (o con `full`) ejecuta ANALYZE;
+    si las hay, PRAGMA optimize, que solo vuelve a analizar las tablas que lo necesitan.
+    """
+    conn.execute(f"PRAGMA analysis_limit={int(analysis_limit)}")
+    has_stats = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone() is not None
+    conn.execute("ANALYZE" if full or not has_stats else "PRAGMA optimize")
+
+def enable_incremental_vacuum(conn: sqlite3.Connection) -> bool:
+    """
+    Activa auto_vacuum=INCREMENTAL. En una base de datos existente el cambio exige un VACUUM
+    completo, que reescribe el archivo y bloquea la escritura mientras dura: debe hacerse una
+    sola vez, en una ventana de mantenimiento.
+    :return: True si se ha cambiado el modo, False si ya estaba activo.
+    """
+    if _pragma(conn, "auto_vacuum") == 2:
+        return False
+    conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    conn.execute("VACUUM")
+    return True
+
+def incremental_vacuum(conn: sqlite3.Connection, pages_per_step: int = 1000, time_budget: float = 5.0,
+                       pause: float = 0.05, progress: Callable[[int, int], None] | None = None) -> int:
+    """
+    Devuelve páginas libres al sistema de archivos por pasos, cada uno en su propia
+    transacción corta, con una pausa entre pasos para dejar escribir a las demás conexiones.
+    Se detiene al no quedar páginas libres o al agotar `time_budget` segundos.
+    :return: El número de páginas liberadas (0 si auto_vacuum no es INCREMENTAL).
+    """
+    if _pragma(conn, "auto_vacuum") != 2:
+        return 0
+    deadline = time.monotonic() + time_budget
+    freed = 0
+    remaining = _pragma(conn, "freelist_count")
+    while remaining and time.monotonic() < deadline:
+        conn.execute(f"PRAGMA incremental_vacuum({int(pages_per_step)})").fetchall()
+        left = _pragma(conn, "freelist_count")
+        freed += remaining - left
+        remaining = left
+        if progress:
+            progress(freed, remaining)
+        if remaining and pause:
+            time.sleep(pause)
+    return freed
+
+def checkpoint(conn: sqlite3.Connection, mode: str = 'PASSIVE') -> tuple | None:
+    """
+    Ejecuta un checkpoint del WAL. PASSIVE no espera a lectores ni escritores; TRUNCATE
+    además vacía el archivo -wal si puede.
+    :return: (ocupado, páginas en el WAL, páginas copiadas) o None si no está en modo WAL.
+    """
+    if mode.upper() not in ('PASSIVE', 'FULL', 'RESTART', 'TRUNCATE'):
+        raise ValueError("Modo de checkpoint inválido. Valores permitidos: PASSIVE, FULL, RESTART, TRUNCATE")
+    if _pragma(conn, "journal_mode").lower() != 'wal':
+        return None
+    return tuple(conn.execute(f"PRAGMA wal_checkpoint({mode.upper()})").fetchone())
+
+def integrity_check(conn: sqlite3.Connection, max_errors: int = 100, quick: bool = False) -> List[str]:
+    """
+    Verifica la integridad de la base de datos. quick_check omite la comprobación del
+    contenido de los índices y es mucho más rápido en bases de datos grandes.
+    :return: La lista de problemas encontrados (vacía si está íntegra).
+    """
+    pragma = "quick_check" if quick else "integrity_check"
+    rows = [row[0] for row in conn.execute(f"PRAGMA {pragma}({int(max_errors)})")]
+    problems = [] if rows == ['ok'] else rows
+    problems += [f"Clave foránea rota en {table} (rowid {rowid}) hacia {parent}"
+                 for table, rowid, parent, _ in conn.execute("PRAGMA foreign_key_check")]
+    return problems
+
+def run_maintenance(db_path: str, analyze: bool = True, vacuum: bool = True, wal_checkpoint: bool = True,
+                    check: bool = True, quick: bool = False, time_budget: float = 5.0,
+                    pages_per_step: int = 1000, enable_incremental: bool = False,
+                    progress: Callable[[str], None] | None = None) -> MaintenanceReport:
+    """
+    Ejecuta los pasos de mantenimiento sobre una base de datos en uso y registra las
+    estadísticas antes y después.
+    :param db_path: Ruta de la base de datos.
+    :param analyze: Actualiza las estadísticas del planificador (PRAGMA optimize).
+    :param vacuum: Libera páginas con incremental_vacuum, como máximo durante `time_budget` segundos.
+    :param wal_checkpoint: Ejecuta un checkpoint PASSIVE si la base de datos está en modo WAL.
+    :param check: Verifica la integridad (integrity_check, o quick_check si `quick`).
+    :param enable_incremental: Activa antes auto_vacuum=INCREMENTAL (VACUUM completo, una sola vez).
+    :param progress: Función opcional que recibe el nombre de cada paso al empezar.
+    :return: El informe de mantenimiento.
+    """
+    report = MaintenanceReport()
+    conn = connect(db_path)
+    try:
+        report.before = database_stats(conn)
+
+        def step(name, action):
+            if progress:
+                progress(name)
+            began = time.perf_counter()
+            result = action()
+            report.steps[name] = time.perf_counter() - began
+            return result
+
+        if enable_incremental:
+            step('auto_vacuum', lambda: enable_incremental_vacuum(conn))
+        if analyze:
+            step('optimize', lambda: optimize(conn))
+        if vacuum:
+            report.freed_pages = step('incremental_vacuum', lambda: incremental_vacuum(
+                conn, pages_per_step=pages_per_step, time_budget=time_budget))
+        if wal_checkpoint:
+            report.checkpoint = step('checkpoint', lambda: checkpoint(conn))
+        if check:
+            report.problems = step('integrity_check', lambda: integrity_check(conn, quick=quick))
+        report.after = database_stats(conn)
+    finally:
+        conn.close()
+    return report
@@ -0,0 +1,591 @@
+import os
+import re
+import sqlite3
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Sequence
+from .changes import (
+    TRACKED_TABLES, CHANGE_LOG_DDL, STATE_HISTORY_DDL, has_change_log, create_change_triggers,
+    create_state_history_triggers, backfill_state_history
+)
+from .storage import COMPACT_COLUMNS, convert_sql, declared_type
+
+# Filas copiadas para medir la velocidad en las estimaciones de --simular
+_SAMPLE_ROWS = 20_000
+
+_IDENTIFIER_RE = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+Progress = Callable[[str, int, int], None]
+
+def _identifier(name: str) -> str:
+    """Valida un nombre de tabla, columna o índice para interpolarlo en SQL."""
+    if not _IDENTIFIER_RE.match(name):
+        raise ValueError(f"Nombre inválido en la migración: {name!r}")
+    return name
+
+def _table_rows(conn: sqlite3.Connection, table: str) -> int:
+    return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+def _table_exists(conn: sqlite3.Connection, table: str) -> bool:
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone() is not None
+
+def _refresh_change_triggers(conn: sqlite3.Connection, table: str):
+    """Vuelve a crear los triggers de registro de una tabla tras cambiar sus columnas o reescribirla."""
+    if table in TRACKED_TABLES and has_change_log(conn.execute):
+        create_change_triggers(conn.execute, [table])
+    if table == 'tasks':
+        create_state_history_triggers(conn.execute)
+
+def _timed(conn: sqlite3.Connection, sql: str) -> float:
+    began = time.perf_counter()
+    conn.execute(sql)
+    return time.perf_counter() - began
+
+class Operation:
+    """
+    Operación de una migración. Las operaciones deben ser idempotentes: se pueden volver
+    a ejecutar sobre una base de datos creada ya con el esquema nuevo (create_all) o tras
+    una interrupción.
+    """
+    def describe(self) -> str:
+        raise NotImplementedError
+
+    def prepare(self, conn: sqlite3.Connection, batch_size: int, progress: Progress | None):
+        """
+        Trabajo previo que no debe bloquear la escritura, como las copias por lotes: se ejecuta
+        antes que apply, fuera de la transacción de la migración, con sus propias transacciones.
+        """
+
+    def apply(self, conn: sqlite3.Connection, batch_size: int, progress: Progress | None):
+        """
+        Aplica la operación dentro de la transacción de la migración (Migrator.migrate), que
+        también registra la versión: o se aplica la migración entera o no se aplica nada.
+        """
+        raise NotImplementedError
+
+    def estimate(self, conn: sqlite3.Connection) -> float:
+        """Estimación en segundos de la duración de la operación sobre esta base de datos."""
+        return 0.0
+
+class AddColumn(Operation):
+    """
+    Añade una columna con ALTER TABLE ADD COLUMN. En SQLite solo modifica el esquema (no
+    reescribe la tabla), siempre que el valor por defecto sea constante. Con `optional`, no hace
+    nada si la tabla no existe: es para tablas que no crea ninguna migración (las crea create_all
+    al abrir la base de datos con init_schema, ya con la columna).
+    """
+    def __init__(self, table: str, column: str, definition: str, optional: bool = False):
+        self.table = _identifier(table)
+        self.column = _identifier(column)
+        self.definition = definition
+        self.optional = optional
+
+    def describe(self) -> str:
+        return f"Añadir columna {self.table}.{self.column} {self.definition}"
+
+    def apply(self, conn, batch_size, progress):
+        if self.optional and not _table_exists(conn, self.table):
+            return
+        columns = {row[1] for row in conn.execute(f"PRAGMA table_info({self.table})")}
+        if self.column not in columns:
+            conn.execute(f"ALTER TABLE {self.table} ADD COLUMN {self.column} {self.definition}")
+            _refresh_change_triggers(conn, self.table)
+
+class CreateIndex(Operation):
+    """
+    Crea un índice si no existe. SQLite construye el índice con una sola ordenación, pero
+    bloquea la escritura en la tabla mientras dura; usa --simular para estimar su duración.
+    """
+    def __init__(self, name: str, table: str, columns: Sequence[str], unique: bool = False, where: str | None = None):
+        self.name = _identifier(name)
+        self.table = _identifier(table)
+        self.columns = [_identifier(column) for column in columns]
+        self.unique = unique
+        self.where = where
+
+    def _sql(self, name: str, table: str) -> str:
+        sql = (f"CREATE {'UNIQUE ' if self.unique else ''}INDEX IF NOT EXISTS {name} "
+               f"ON {table} ({', '.join(self.columns)})")
+        return f"{sql} WHERE {self.where}" if self.where else sql
+
+    def describe(self) -> str:
+        return f"Crear índice {self.name} en {self.table} ({', '.join(self.columns)})"
+
+    def apply(self, conn, batch_size, progress):
+        conn.execute(self._sql(self.name, self.table))
+
+    def estimate(self, conn):
+        rows = _table_rows(conn, self.table)
+        if not rows:
+            return 0.0
+        conn.execute(f"CREATE TEMP TABLE _mig_sample AS SELECT * FROM {self.table} LIMIT {_SAMPLE_ROWS}")
+        try:
+            sample = _table_rows(conn, "temp._mig_sample")
+            seconds = _timed(conn, self._sql("temp._mig_sample_ix", "_mig_sample"))
+        finally:
+            conn.execute("DROP TABLE temp._mig_sample")
+        return seconds * rows / sample
+
+class RebuildTable(Operation):
+    """
+    Reescribe una tabla con un esquema nuevo sin bloquear la escritura durante la copia:
+    1. Crea la tabla sombra con el esquema y los índices nuevos.
+    2. Crea triggers que replican en la sombra las inserciones, cambios y borrados.
+    3. Copia las filas por lotes de rowid, cada lote en su propia transacción corta.
+    4. En la transacción de la migración, elimina la tabla original y renombra la sombra.
+    Los pasos 1 a 3 son la fase prepare; el 4, la fase apply.
+
+    `create_sql` define la tabla con el marcador {name} en lugar del nombre. `columns` asocia
+    cada columna nueva a una expresión SQL sobre la fila original, con el marcador {row}
+    delante de cada columna (por defecto, la columna del mismo nombre). Los índices de la
+    tabla original desaparecen con ella, así que `indexes` debe incluir todos los que deba
+    tener la tabla nueva, con nombres que no existan todavía.
+    """
+    def __init__(self, table: str, create_sql: str, columns: Sequence[str] | Dict[str, str],
+                 indexes: Sequence[CreateIndex] = ()):
+        self.table = _identifier(table)
+        self.shadow = f"_mig_new_{self.table}"
+        self.create_sql = create_sql
+        if isinstance(columns, dict):
+            self.columns = {_identifier(name): expr for name, expr in columns.items()}
+        else:
+            self.columns = {_identifier(name): f"{{row}}{name}" for name in columns}
+        self.indexes = list(indexes)
+
+    def describe(self) -> str:
+        return f"Reescribir la tabla {self.table} por lotes"
+
+    def _select(self, row: str) -> str:
+        return ", ".join(expr.format(row=row) for expr in self.columns.values())
+
+    def _drop_triggers(self, conn):
+        for action in ('ins', 'upd', 'del'):
+            conn.execute(f"DROP TRIGGER IF EXISTS _mig_{self.table}_{action}")
+
+    def _create_shadow(self, conn):
+        # Restos de una ejecución interrumpida
+        self._drop_triggers(conn)
+        conn.execute(f"DROP TABLE IF EXISTS {self.shadow}")
+        for index in self.indexes:
+            if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (index.name,)).fetchone():
+                raise ValueError(f"El índice {index.name} ya existe; la tabla reescrita necesita nombres nuevos.")
+
+        conn.execute(self.create_sql.format(name=self.shadow))
+        for index in self.indexes:
+            conn.execute(index._sql(index.name, self.shadow))
+        target = ", ".join(self.columns)
+        conn.execute(f"""
+            CREATE TRIGGER _mig_{self.table}_ins AFTER INSERT ON {self.table} BEGIN
+                INSERT OR REPLACE INTO {self.shadow} (rowid, {target}) VALUES (NEW.rowid, {self._select('NEW.')});
+            END""")
+        conn.execute(f"""
+            CREATE TRIGGER _mig_{self.table}_upd AFTER UPDATE ON {self.table} BEGIN
+                DELETE FROM {self.shadow} WHERE rowid = OLD.rowid;
+                INSERT OR REPLACE INTO {self.shadow} (rowid, {target}) VALUES (NEW.rowid, {self._select('NEW.')});
+            END""")
+        conn.execute(f"""
+            CREATE TRIGGER _mig_{self.table}_del AFTER DELETE ON {self.table} BEGIN
+                DELETE FROM {self.shadow} WHERE rowid = OLD.rowid;
+            END""")
+
+    def prepare(self, conn, batch_size, progress):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._create_shadow(conn)
+            total = _table_rows(conn, self.table)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        target = ", ".join(self.columns)
+        last_rowid, copied = None, 0
+        while True:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                bound = "" if last_rowid is None else f"WHERE rowid > {last_rowid}"
+                rowids = conn.execute(
+                    f"SELECT MIN(rowid), MAX(rowid), COUNT(*) FROM "
+                    f"(SELECT rowid FROM {self.table} {bound} ORDER BY rowid LIMIT {int(batch_size)})"
+                ).fetchone()
+                if not rowids[2]:
+                    conn.execute("COMMIT")
+                    break
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {self.shadow} (rowid, {target}) "
+                    f"SELECT rowid, {self._select('')} FROM {self.table} WHERE rowid BETWEEN ? AND ?",
+                    rowids[:2]
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            last_rowid, copied = rowids[1], copied + rowids[2]
+            if progress:
+                progress(self.describe(), copied, max(total, copied))
+
+    def apply(self, conn, batch_size, progress):
+        self._drop_triggers(conn)
+        conn.execute(f"DROP TABLE {self.table}")
+        conn.execute(f"ALTER TABLE {self.shadow} RENAME TO {self.table}")
+        _refresh_change_triggers(conn, self.table)
+
+    def estimate(self, conn):
+        rows = _table_rows(conn, self.table)
+        if not rows:
+            return 0.0
+        conn.execute(self.create_sql.format(name="temp._mig_sample"))
+        try:
+            for index in self.indexes:
+                conn.execute(index._sql(f"temp._mig_sample_{index.name}", "_mig_sample"))
+            seconds = _timed(conn, f"INSERT INTO temp._mig_sample ({', '.join(self.columns)}) "
+                                   f"SELECT {self._select('')} FROM {self.table} LIMIT {_SAMPLE_ROWS}")
+            sample = _table_rows(conn, "temp._mig_sample")
+        finally:
+            conn.execute("DROP TABLE temp._mig_sample")
+        return seconds * rows / sample
+
+class EnableAutoincrement(RebuildTable):
+    """
+    Declara AUTOINCREMENT la clave entera de una tabla creada sin él, para que SQLite no vuelva a
+    dar los IDs de las filas borradas o archivadas (sin AUTOINCREMENT reutiliza el mayor). La
+    tabla se reescribe con RebuildTable a partir de su definición actual (columnas añadidas,
+    tipos del almacenamiento compacto), sus índices se recrean con el mismo nombre tras el cambio
+    final y la secuencia empieza en el mayor ID de la tabla y de `sequence_sources` (tablas que
+    conservan IDs de la tabla, como las de archivo), si existen. Las tablas que ya son
+    AUTOINCREMENT no se reescriben.
+    """
+    def __init__(self, table: str, key: str, sequence_sources: Sequence[str] = ()):
+        super().__init__(table, "", [])
+        self.key = _identifier(key)
+        self.sequence_sources = [_identifier(source) for source in sequence_sources]
+
+    def describe(self) -> str:
+        return f"Declarar AUTOINCREMENT la clave {self.table}.{self.key}"
+
+    def _table_sql(self, conn) -> str:
+        return conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (self.table,)).fetchone()[0]
+
+    def _is_autoincrement(self, conn) -> bool:
+        return re.search(r'\bAUTOINCREMENT\b', self._table_sql(conn), re.IGNORECASE) is not None
+
+    def _load(self, conn):
+        """Prepara la definición y las columnas de la tabla nueva a partir de la actual."""
+        sql = self._table_sql(conn).replace('{', '{{').replace('}', '}}')
+        sql = re.sub(r'^CREATE TABLE\s+"?\w+"?', 'CREATE TABLE {name}', sql)
+        key = rf'"?{self.key}"?'
+        sql, constraints = re.subn(rf',\s*PRIMARY KEY\s*\(\s*{key}\s*\)', '', sql, flags=re.IGNORECASE)
+        if constraints:
+            sql, found = re.subn(rf'([(,]\s*{key}\s+INTEGER)(\s+NOT NULL)?', r'\1 NOT NULL PRIMARY KEY AUTOINCREMENT',
+                                 sql, count=1, flags=re.IGNORECASE)
+        else:
+            sql, found = re.subn(rf'([(,]\s*{key}\s+INTEGER[^,]*?PRIMARY KEY)', r'\1 AUTOINCREMENT',
+                                 sql, count=1, flags=re.IGNORECASE)
+        if not found:
+            raise ValueError(f"{self.table}.{self.key} no es una clave primaria INTEGER.")
+        self.create_sql = sql
+        self.columns = {_identifier(row[1]): f"{{row}}{row[1]}" for row in conn.execute(f"PRAGMA table_info({self.table})")}
+
+    def prepare(self, conn, batch_size, progress):
+        if not self._is_autoincrement(conn):
+            self._load(conn)
+            super().prepare(conn, batch_size, progress)
+
+    def apply(self, conn, batch_size, progress):
+        if not self._is_autoincrement(conn):
+            if not _table_exists(conn, self.shadow):
+                raise ValueError(f"Falta la copia de {self.table}: la fase prepare no se ha ejecutado.")
+            indexes = [row[0] for row in conn.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL", (self.table,))]
+            super().apply(conn, batch_size, progress)
+            for sql in indexes:
+                conn.execute(sql)
+        top = max(conn.execute(f"SELECT coalesce(MAX({self.key}), 0) FROM {table}").fetchone()[0]
+                  for table in (self.table, *self.sequence_sources) if _table_exists(conn, table))
+        current = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (self.table,)).fetchone()
+        if current is None:
+            conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (self.table, top))
+        elif current[0] < top:
+            conn.execute("UPDATE sqlite_sequence SET seq = ? WHERE name = ?", (top, self.table))
+
+    def estimate(self, conn):
+        if self._is_autoincrement(conn):
+            return 0.0
+        self._load(conn)
+        return super().estimate(conn)
+
+class CreateChangeLog(Operation):
+    """
+    Crea la tabla change_log y los triggers que registran en ella los cambios de las tablas
+    vigiladas (ver src/database/changes.py).
+    """
+    def describe(self) -> str:
+        return f"Crear el registro de cambios de {', '.join(TRACKED_TABLES)}"
+
+    def apply(self, conn, batch_size, progress):
+        conn.execute(CHANGE_LOG_DDL)
+        create_change_triggers(conn.execute)
+
+class CreateStateHistory(Operation):
+    """
+    Crea el historial de estados de las tareas (task_state_history) con sus triggers y lo rellena
+    con la creación y, si están completadas, la finalización de las tareas existentes (activas y,
+    si ya existe la tabla, archivadas).
+    """
+    def describe(self) -> str:
+        return "Crear el historial de estados de las tareas"
+
+    def apply(self, conn, batch_size, progress):
+        for statement in STATE_HISTORY_DDL:
+            conn.execute(statement)
+        create_state_history_triggers(conn.execute)
+        backfill_state_history(conn.execute)
+
+    def estimate(self, conn):
+        rows = sum(_table_rows(conn, table) for table in ('tasks', 'archived_tasks') if _table_exists(conn, table))
+        if not rows:
+            return 0.0
+        conn.execute(f"CREATE TEMP TABLE _mig_sample AS SELECT id_tarea, id_usuario, estado, fecha_inicio "
+                     f"FROM tasks WHERE 0")
+        try:
+            seconds = _timed(conn, f"INSERT INTO temp._mig_sample SELECT id_tarea, id_usuario, estado, fecha_inicio "
+                                   f"FROM tasks LIMIT {_SAMPLE_ROWS}")
+            sample = _table_rows(conn, "temp._mig_sample")
+        finally:
+            conn.execute("DROP TABLE temp._mig_sample")
+        return seconds * rows / sample if sample else 0.0
+
+class ConvertStorage(Operation):
+    """
+    Convierte las columnas de enums y fechas de COMPACT_COLUMNS (src/database/storage.py) al
+    almacenamiento compacto (enteros) o de vuelta al de texto. Cambiar el tipo declarado obliga a
+    reescribir las tablas: cada una se copia convertida a una tabla nueva que sustituye a la
+    original, con sus mismos índices y triggers, en una sola transacción que bloquea la escritura
+    mientras dura (usa --simular para estimarla). No forma parte de MIGRATIONS: es opcional y se
+    aplica con Migrator.convert_storage, que abre esa transacción. Las tablas ya convertidas no se
+    tocan.
+    """
+    def __init__(self, compact: bool = True):
+        self.compact = compact
+
+    def describe(self) -> str:
+        return f"Convertir al almacenamiento {'compacto' if self.compact else 'de texto'}"
+
+    def _pending(self, conn) -> List[str]:
+        pending = []
+        for table, columns in COMPACT_COLUMNS.items():
+            declared = {row[1]: row[2] for row in conn.execute(f"PRAGMA table_info({table})")}
+            if any(column in declared and declared[column].upper() != declared_type(kind, self.compact)
+                   for column, kind in columns.items()):
+                pending.append(table)
+        return pending
+
+    def _create_sql(self, conn, table: str, name: str) -> str:
+        sql = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone()[0]
+        sql = re.sub(r'^CREATE TABLE\s+"?\w+"?', f"CREATE TABLE {name}", sql)
+        for column, kind in COMPACT_COLUMNS[table].items():
+            sql = re.sub(rf'([(,]\s*"?{column}"?\s+)\w+(\(\d+\))?', rf'\g<1>{declared_type(kind, self.compact)}', sql)
+        return sql
+
+    def _select(self, conn, table: str) -> tuple:
+        names = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+        columns = COMPACT_COLUMNS[table]
+        return names, [convert_sql(name, columns[name], self.compact) if name in columns else name for name in names]
+
+    def apply(self, conn, batch_size, progress):
+        # Los triggers del historial se recrean al final: al renombrar una tabla SQLite
+        # comprueba los triggers, y estos no deben apuntar a una tabla ya eliminada
+        for action in ('ins', 'upd', 'del'):
+            conn.execute(f"DROP TRIGGER IF EXISTS _hist_tasks_{action}")
+        pending = self._pending(conn)
+        for done, table in enumerate(pending, start=1):
+            shadow = f"_mig_new_{table}"
+            indexes = [row[0] for row in conn.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL", (table,))]
+            names, expressions = self._select(conn, table)
+            conn.execute(f"DROP TABLE IF EXISTS {shadow}")
+            conn.execute(self._create_sql(conn, table, shadow))
+            conn.execute(f"INSERT INTO {shadow} ({', '.join(names)}) SELECT {', '.join(expressions)} FROM {table}")
+            # AUTOINCREMENT: se conserva la secuencia para no reutilizar IDs de filas ya borradas
+            sequence = (conn.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,)).fetchone()
+                        if _table_exists(conn, 'sqlite_sequence') else None)
+            conn.execute(f"DROP TABLE {table}")
+            conn.execute(f"ALTER TABLE {shadow} RENAME TO {table}")
+            if sequence:
+                conn.execute("UPDATE sqlite_sequence SET seq = max(seq, ?) WHERE name = ?", (sequence[0], table))
+            for sql in indexes:
+                conn.execute(sql)
+            if table in TRACKED_TABLES and has_change_log(conn.execute):
+                create_change_triggers(conn.execute, [table])
+            if progress:
+                progress(self.describe(), done, len(pending))
+        create_state_history_triggers(conn.execute)
+
+    def estimate(self, conn):
+        seconds = 0.0
+        for table in self._pending(conn):
+            rows = _table_rows(conn, table)
+            if not rows:
+                continue
+            names, expressions = self._select(conn, table)
+            conn.execute(self._create_sql(conn, table, "temp._mig_sample"))
+            try:
+                elapsed = _timed(conn, f"INSERT INTO temp._mig_sample ({', '.join(names)}) "
+                                       f"SELECT {', '.join(expressions)} FROM {table} LIMIT {_SAMPLE_ROWS}")
+                seconds += elapsed * rows / _table_rows(conn, "temp._mig_sample")
+            finally:
+                conn.execute("DROP TABLE temp._mig_sample")
+        return seconds
+
+class Migration:
+    """
+    Migración versionada: una lista de operaciones que se aplican en orden.
+    """
+    def __init__(self, version: int, name: str, operations: Sequence[Operation]):
+        self.version = version
+        self.name = name
+        self.operations = list(operations)
+
+    def __repr__(self):
+        return f"<Migration(version={self.version}, name='{self.name}')>"
+
+# Migraciones del esquema de src/models, en orden de versión. Las bases de datos nuevas se
+# crean con create_all y las operaciones no hacen nada, pero la versión queda registrada.
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Esquema inicial", []),
+    Migration(2, "Índices de tareas por usuario y estado y de notificaciones por tarea", [
+        CreateIndex('ix_tasks_id_usuario', 'tasks', ['id_usuario']),
+        CreateIndex('ix_tasks_estado', 'tasks', ['estado']),
+        CreateIndex('ix_notifications_id_tarea', 'notifications', ['id_tarea']),
+    ]),
+    Migration(3, "Registro de cambios (change_log)", [CreateChangeLog()]),
+    Migration(4, "Historial de estados de las tareas", [CreateStateHistory()]),
+    Migration(5, "Borrado diferido de usuarios y categorías", [
+        AddColumn('users', 'eliminado', 'BOOLEAN NOT NULL DEFAULT 0'),
+        AddColumn('categories', 'eliminada', 'BOOLEAN NOT NULL DEFAULT 0'),
+        CreateIndex('ix_users_eliminado', 'users', ['id_usuario'], where='eliminado'),
+        CreateIndex('ix_categories_eliminada', 'categories', ['id_categoria'], where='eliminada'),
+        CreateIndex('ix_task_categories_id_categoria', 'task_categories', ['id_categoria']),
+    ]),
+    Migration(6, "Versión de las filas para la concurrencia optimista", [
+        *(AddColumn(table, 'version', 'INTEGER NOT NULL DEFAULT 1')
+          for table in ('users', 'tasks', 'categories', 'notifications')),
+        # Las tablas de archivo no existen en las bases de datos migradas desde el esquema inicial
+        # hasta que init_schema las crea
+        AddColumn('archived_tasks', 'version', 'INTEGER NOT NULL DEFAULT 1', optional=True),
+    ]),
+    # Sin AUTOINCREMENT, archivar la tarea (o notificación) de mayor ID permite que una nueva
+    # reciba ese ID, y el siguiente archivado falla por la clave repetida en la tabla de archivo
+    Migration(7, "Claves AUTOINCREMENT de tareas y notificaciones", [
+        EnableAutoincrement('tasks', 'id_tarea', ('archived_tasks', 'task_state_history')),
+        EnableAutoincrement('notifications', 'id_notificacion', ('archived_notifications',)),
+    ]),
+]
+
+class Migrator:
+    """
+    Aplica las migraciones pendientes sobre una base de datos SQLite y registra cada versión
+    aplicada en la tabla schema_migrations.
+    """
+    def __init__(self, db_path: str, migrations: Sequence[Migration] | None = None, busy_timeout: float = 30.0):
+        if not os.path.exists(db_path):
+            raise ValueError(f"La base de datos {db_path} no existe.")
+        self.migrations = sorted(MIGRATIONS if migrations is None else migrations, key=lambda m: m.version)
+        versions = [migration.version for migration in self.migrations]
+        if len(set(versions)) != len(versions):
+            raise ValueError("Hay versiones de migración repetidas.")
+        self.conn = sqlite3.connect(db_path, timeout=busy_timeout, isolation_level=None)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INTEGER PRIMARY KEY,
+                nombre TEXT NOT NULL,
+                aplicada DATETIME NOT NULL
+            )""")
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def applied_versions(self) -> List[int]:
+        return [row[0] for row in self.conn.execute("SELECT version FROM schema_migrations ORDER BY version")]
+
+    def pending(self, target: int | None = None) -> List[Migration]:
+        """
+        Migraciones no aplicadas, hasta la versión `target` incluida si se indica.
+        """
+        applied = set(self.applied_versions())
+        return [m for m in self.migrations
+                if m.version not in applied and (target is None or m.version <= target)]
+
+    def estimate(self, target: int | None = None) -> List[tuple]:
+        """
+        Estima la duración de las migraciones pendientes midiendo cada operación sobre una
+        muestra de filas en tablas temporales y extrapolando al tamaño de la tabla.
+        No modifica la base de datos.
+        :return: Lista de (migración, [(descripción, segundos estimados), ...]).
+        """
+        return [(migration, [(op.describe(), op.estimate(self.conn)) for op in migration.operations])
+                for migration in self.pending(target)]
+
+    def convert_storage(self, compact: bool = True, progress: Progress | None = None) -> bool:
+        """
+        Convierte la base de datos al almacenamiento compacto (enums como enteros y fechas como
+        microsegundos desde la época Unix) o de vuelta al de texto. Las aplicaciones que tengan
+        abierta la base de datos deben reiniciarse para detectar el cambio.
+        :param compact: True para el almacenamiento compacto, False para el de texto.
+        :param progress: Función opcional que recibe (descripción, tablas hechas, total).
+        :return: True si se ha convertido alguna tabla.
+        """
+        if self.pending():
+            raise ValueError("Aplica las migraciones pendientes antes de cambiar el almacenamiento.")
+        operation = ConvertStorage(compact)
+        if not operation._pending(self.conn):
+            return False
+        if progress:
+            progress(operation.describe(), 0, 1)
+        self._transaction(lambda: operation.apply(self.conn, 0, progress))
+        return True
+
+    def _transaction(self, action: Callable[[], None]):
+        """Ejecuta `action` en una transacción de escritura y la deshace si falla."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            action()
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def migrate(self, target: int | None = None, batch_size: int = 5000,
+                progress: Progress | None = None) -> List[Migration]:
+        """
+        Aplica las migraciones pendientes en orden. Cada migración se aplica en una transacción
+        junto con su registro en schema_migrations (salvo las copias por lotes de la fase prepare,
+        que se confirman por separado y se repiten si la migración se interrumpe).
+        :param target: Versión hasta la que migrar (por defecto, la última).
+        :param batch_size: Filas por lote en las reescrituras de tablas.
+        :param progress: Función opcional que recibe (descripción, hechas, total).
+        :return: Las migraciones aplicadas.
+        """
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError("El tamaño de lote debe ser un entero positivo.")
+        applied = []
+        for migration in self.pending(target):
+            for operation in migration.operations:
+                if progress:
+                    progress(operation.describe(), 0, 1)
+                operation.prepare(self.conn, batch_size, progress)
+
+            def apply():
+                for operation in migration.operations:
+                    operation.apply(self.conn, batch_size, progress)
+                self.conn.execute("INSERT INTO schema_migrations (version, nombre, aplicada) VALUES (?, ?, ?)",
+                                  (migration.version, migration.name, datetime.now().isoformat(sep=' ')))
+            self._transaction(apply)
+            applied.append(migration)
+        return applied
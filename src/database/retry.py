@@ -0,0 +1,90 @@
+import random
+import sqlite3
+import time
+from typing import Callable, TypeVar
+
+T = TypeVar('T')
+
+# Códigos primarios de SQLite de base de datos ocupada o tabla bloqueada (incluyen los extendidos,
+# como SQLITE_BUSY_SNAPSHOT)
+_BUSY_CODES = (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+
+def is_busy_error(error: BaseException) -> bool:
+    """
+    Indica si un error es un SQLITE_BUSY o SQLITE_LOCKED ("database is locked"), directamente de
+    sqlite3 o envuelto por SQLAlchemy (OperationalError.orig).
+    """
+    error = getattr(error, 'orig', None) or error
+    if not isinstance(error, sqlite3.OperationalError):
+        return False
+    code = getattr(error, 'sqlite_errorcode', None)
+    if code is not None:
+        return code & 0xFF in _BUSY_CODES
+    return 'locked' in str(error) or 'busy' in str(error)
+
+class RetryPolicy:
+    """
+    Reintentos con espera exponencial y aleatoria de las escrituras que fallan porque otra
+    conexión tiene la base de datos bloqueada. El busy_timeout de la conexión ya espera al
+    bloqueo, pero SQLite devuelve SQLITE_BUSY sin esperar cuando una transacción que ha leído
+    intenta escribir después de que otra conexión haya confirmado cambios (su instantánea ya
+    no es la última), y también cuando se agota el tiempo de espera: en esos casos hay que
+    deshacer la transacción y repetirla entera.
+    """
+    def __init__(self, attempts: int = 5, base_delay: float = 0.02, max_delay: float = 1.0,
+                 jitter: float = 0.5, on_retry: Callable[[int, BaseException], None] | None = None):
+        """
+        :param attempts: Número máximo de intentos (1 desactiva los reintentos).
+        :param base_delay: Segundos de espera tras el primer fallo; se duplica en cada reintento.
+        :param max_delay: Espera máxima en segundos.
+        :param jitter: Fracción de la espera que se resta al azar, para que los procesos que han
+                       chocado no vuelvan a intentarlo a la vez.
+        :param on_retry: Función opcional que recibe el número de intento fallido y el error.
+        """
+        if not isinstance(attempts, int) or attempts <= 0:
+            raise ValueError("El número de intentos debe ser un entero positivo.")
+        if base_delay < 0 or max_delay < base_delay:
+            raise ValueError("Las esperas no pueden ser negativas y la máxima no puede ser menor que la inicial.")
+        if not 0 <= jitter <= 1:
+            raise ValueError("El jitter debe estar entre 0 y 1.")
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.on_retry = on_retry
+
+    def __repr__(self):
+        return (f"<RetryPolicy(attempts={self.attempts}, base_delay={self.base_delay}, "
+                f"max_delay={self.max_delay}, jitter={self.jitter})>")
+
+    def delay(self, attempt: int) -> float:
+        """
+        Espera en segundos tras el intento fallido número `attempt` (desde 1).
+        """
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return delay * (1 - self.jitter * random.random())
+
+    def run(self, action: Callable[[], T], rollback: Callable[[], None] | None = None) -> T:
+        """
+        Ejecuta una escritura completa (sus sentencias y el commit) y la repite si falla por
+        SQLITE_BUSY. Los demás errores, y el último SQLITE_BUSY, se propagan.
+        :param action: Función sin argumentos que hace la escritura y la confirma.
+        :param rollback: Función que deshace la transacción fallida antes de repetirla.
+        :return: El resultado de `action`.
+        """
+        attempt = 1
+        while True:
+            try:
+                return action()
+            except Exception as e:
+                if attempt >= self.attempts or not is_busy_error(e):
+                    raise
+                if rollback:
+                    rollback()
+                if self.on_retry:
+                    self.on_retry(attempt, e)
+                time.sleep(self.delay(attempt))
+                attempt += 1
+
+# Política por defecto de los repositorios cuando la sesión no indica otra
+DEFAULT_RETRY_POLICY = RetryPolicy()
@@ -0,0 +1,136 @@
+import os
+import zlib
+from sqlalchemy import MetaData, create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+from . import DATABASE_PATH
+from .retry import RetryPolicy
+from .storage import is_compact_storage
+
+class RoutingSession(Session):
+    """
+    Sesión que envía las lecturas al pool de conexiones de solo lectura y las escrituras a la
+    conexión del escritor. En cuanto una transacción escribe (flush, INSERT/UPDATE/DELETE o
+    cualquier sentencia que no sea un SELECT), el resto de la transacción usa el escritor, para
+    que las lecturas vean sus propios cambios aún sin confirmar.
+    """
+    def __init__(self, writer: Engine, reader: Engine | None = None, **kwargs):
+        super().__init__(**kwargs)
+        self.writer = writer
+        self.reader = reader or writer
+        self._writing = False
+
+    def get_bind(self, mapper=None, *, clause=None, **kw):
+        if (not self._writing and not self._flushing and clause is not None
+                and getattr(clause, 'is_select', False)):
+            return self.reader
+        self._writing = True
+        return self.writer
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _reset_routing(session, transaction):
+    if transaction.parent is None:
+        session._writing = False
+
+def _configure_writer(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+def _configure_reader(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA query_only=ON")
+    cursor.close()
+
+def _storage_detector(engine: Engine):
+    """
+    Listener de conexión que guarda en el dialecto del motor si la base de datos usa el
+    almacenamiento compacto, que consultan los tipos CodedEnum y EpochDateTime al escribir.
+    """
+    def detect(dbapi_connection, connection_record):
+        engine.dialect.compact_storage = is_compact_storage(dbapi_connection.execute)
+    return detect
+
+def create_engines(db_path: str = DATABASE_PATH, readers: int = 4, busy_timeout: float = 30.0,
+                   writers: int = 1) -> tuple:
+    """
+    Crea los motores de la base de datos: un escritor con una sola conexión (SQLite solo
+    admite un escritor a la vez) y un pool de `readers` conexiones de solo lectura (mode=ro).
+    El escritor activa el modo WAL, con el que las lecturas no bloquean ni esperan a la escritura.
+    Cada conexión detecta si la base de datos usa el almacenamiento compacto.
+    El escritor es de un solo usuario a la vez: una sesión lo ocupa desde que escribe hasta que
+    confirma o deshace, y otra sesión u otro hilo del mismo proceso que quiera escribir espera
+    mientras tanto a que el pool se lo devuelva (hasta 30 s; después, TimeoutError, que RetryPolicy
+    no reintenta). Los trabajos largos en segundo plano, como DeletionPurger, deben usar sus propios
+    motores: entre motores distintos la espera es la del bloqueo de SQLite (busy_timeout), cuyos
+    SQLITE_BUSY sí se reintentan.
+    :param db_path: Ruta de la base de datos (se crea su directorio si no existe).
+    :param readers: Número de conexiones de lectura; 0 hace que las lecturas usen el escritor.
+    :param busy_timeout: Segundos de espera si la base de datos está bloqueada.
+    :param writers: Conexiones del escritor; más de una solo tiene sentido con readers=0, cuando
+                    también sirven las lecturas (las escrituras siguen esperando al bloqueo de SQLite).
+    :return: Una tupla (escritor, lector).
+    """
+    directory = os.path.dirname(db_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    writer = create_engine(f"sqlite:///{db_path}", pool_size=writers, max_overflow=0,
+                           connect_args={'timeout': busy_timeout, 'check_same_thread': False})
+    event.listen(writer, "connect", _configure_writer)
+    event.listen(writer, "connect", _storage_detector(writer))
+    if readers <= 0:
+        return writer, writer
+    # El archivo debe existir (y estar en modo WAL) antes de abrirlo en solo lectura
+    with writer.connect():
+        pass
+    reader = create_engine(f"sqlite:///file:{os.path.abspath(db_path)}?mode=ro&uri=true",
+                           pool_size=readers, max_overflow=0,
+                           connect_args={'timeout': busy_timeout, 'check_same_thread': False})
+    event.listen(reader, "connect", _configure_reader)
+    event.listen(reader, "connect", _storage_detector(reader))
+    return writer, reader
+
+def create_session_factory(writer: Engine, reader: Engine | None = None,
+                           retry_policy: RetryPolicy | None = None) -> sessionmaker:
+    """
+    Crea la fábrica de sesiones de la aplicación, que reparte lecturas y escrituras.
+    :param writer: Motor del escritor.
+    :param reader: Motor de solo lectura (por defecto, el del escritor).
+    :param retry_policy: Política de reintentos de las escrituras de los repositorios ante
+                         SQLITE_BUSY (por defecto, DEFAULT_RETRY_POLICY).
+    :return: Un sessionmaker de RoutingSession.
+    """
+    info = {'retry_policy': retry_policy} if retry_policy is not None else None
+    return sessionmaker(class_=RoutingSession, writer=writer, reader=reader,
+                        autocommit=False, autoflush=False, info=info)
+
+def schema_stamp(metadata: MetaData) -> int:
+    """
+    Calcula una huella del esquema definido por los modelos (tablas, columnas, tipos e índices).
+    :param metadata: Metadatos de los modelos.
+    :return: Un entero positivo de 31 bits, apto para PRAGMA user_version.
+    """
+    parts = []
+    for table in metadata.sorted_tables:
+        parts.append(table.name)
+        parts.extend(f"{column.name}:{column.type!r}:{column.nullable}" for column in table.columns)
+        parts.extend(sorted(index.name or '' for index in table.indexes))
+    return zlib.crc32("\n".join(parts).encode()) & 0x7FFFFFFF or 1
+
+def init_schema(engine: Engine, metadata: MetaData) -> bool:
+    """
+    Crea las tablas que falten solo si la huella guardada en PRAGMA user_version no coincide
+    con la de los modelos, evitando al arrancar la inspección de cada tabla que hace create_all.
+    :param engine: Motor del escritor.
+    :param metadata: Metadatos de los modelos.
+    :return: True si se ha ejecutado create_all, False si el esquema ya estaba al día.
+    """
+    stamp = schema_stamp(metadata)
+    with engine.connect() as conn:
+        if conn.exec_driver_sql("PRAGMA user_version").scalar() == stamp:
+            return False
+    metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql(f"PRAGMA user_version = {stamp}")
+    return True
@@ -0,0 +1,409 @@
+import heapq
+import os
+import sqlite3
+import threading
+import zlib
+from typing import Callable, Dict, List, Sequence
+from sqlalchemy import event, insert, delete, select
+from sqlalchemy.ext.horizontal_shard import ShardedSession
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.sql import operators, visitors
+from sqlalchemy.sql.elements import BinaryExpression, BindParameter
+from src.models import Base, User, Task, TaskCategory, Category, Notification
+from .changes import CHANGE_LOG_TABLE, STATE_HISTORY_TABLE
+from .session import create_engines
+
+# Entidades con ID global, asignado por IdAllocator antes de insertar
+_GLOBAL_ID_ENTITIES = {User: 'id_usuario', Task: 'id_tarea', Notification: 'id_notificacion', Category: 'id_categoria'}
+
+STRATEGIES = ('hash', 'range')
+
+class ShardDirectory:
+    """
+    Directorio de shards: una base de datos SQLite aparte con la asignación de cada usuario a
+    su shard (user_shards) y los contadores de IDs globales (id_sequences).
+
+    Los usuarios nuevos se asignan por hash del ID (crc32 % N) o por rangos de IDs de
+    `range_size` usuarios; la asignación se guarda para que el reequilibrado pueda cambiarla.
+    """
+    def __init__(self, path: str, shard_ids: Sequence[str], strategy: str = 'hash', range_size: int = 100_000):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Estrategia de reparto inválida. Valores permitidos: {list(STRATEGIES)}")
+        if not shard_ids:
+            raise ValueError("Se necesita al menos un shard.")
+        self.path = path
+        self.shard_ids = list(shard_ids)
+        self.strategy = strategy
+        self.range_size = range_size
+        self._cache: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS user_shards (id_usuario INTEGER PRIMARY KEY, shard TEXT NOT NULL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS id_sequences (entidad TEXT PRIMARY KEY, siguiente INTEGER NOT NULL)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def preferred_shard(self, user_id: int) -> str:
+        """
+        Shard que corresponde a un usuario según la estrategia y el número de shards actuales.
+        """
+        if self.strategy == 'range':
+            return self.shard_ids[min((user_id - 1) // self.range_size, len(self.shard_ids) - 1)]
+        return self.shard_ids[zlib.crc32(str(user_id).encode()) % len(self.shard_ids)]
+
+    def shard_for_user(self, user_id: int, register: bool = False) -> str:
+        """
+        Shard en el que está un usuario. Los usuarios sin asignación van a su shard preferido,
+        que se guarda en el directorio si `register` es True (al insertar el usuario).
+        """
+        shard = self._cache.get(user_id)
+        if shard is not None:
+            return shard
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT shard FROM user_shards WHERE id_usuario = ?", (user_id,)).fetchone()
+            if row is not None:
+                shard = row[0]
+            elif register:
+                shard = self.preferred_shard(user_id)
+                conn.execute("INSERT INTO user_shards (id_usuario, shard) VALUES (?, ?)", (user_id, shard))
+            else:
+                return self.preferred_shard(user_id)
+        self._cache[user_id] = shard
+        return shard
+
+    def assignments(self) -> Dict[int, str]:
+        with self._connect() as conn:
+            return dict(conn.execute("SELECT id_usuario, shard FROM user_shards ORDER BY id_usuario"))
+
+    def forget(self, user_id: int):
+        """Descarta la asignación en caché de un usuario (tras moverlo de shard)."""
+        self._cache.pop(user_id, None)
+
+class IdAllocator:
+    """
+    Asigna IDs globales únicos entre todos los shards. Reserva bloques de `block_size` IDs
+    por entidad en el directorio con una sola sentencia, para no consultar el directorio
+    en cada inserción.
+    """
+    def __init__(self, directory: ShardDirectory, block_size: int = 100):
+        self.directory = directory
+        self.block_size = block_size
+        self._blocks: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+
+    def next_id(self, entity: str) -> int:
+        with self._lock:
+            block = self._blocks.get(entity)
+            if not block or block[0] >= block[1]:
+                block = self._blocks[entity] = self._reserve(entity)
+            value = block[0]
+            block[0] += 1
+            return value
+
+    def _reserve(self, entity: str) -> List[int]:
+        with self.directory._connect() as conn:
+            conn.execute("INSERT OR IGNORE INTO id_sequences (entidad, siguiente) VALUES (?, 1)", (entity,))
+            end = conn.execute("UPDATE id_sequences SET siguiente = siguiente + ? WHERE entidad = ? RETURNING siguiente",
+                               (self.block_size, entity)).fetchone()[0]
+        return [end - self.block_size, end]
+
+def _user_criterion(statement, parameters=None) -> int | None:
+    """
+    Busca en el WHERE de una consulta una comparación de igualdad id_usuario = valor,
+    para dirigirla solo al shard de ese usuario. El valor puede estar en la propia
+    sentencia o en los parámetros de la ejecución (como en Session.get).
+    """
+    whereclause = getattr(statement, 'whereclause', None)
+    if whereclause is None:
+        return None
+    for element in visitors.iterate(whereclause):
+        if (isinstance(element, BinaryExpression) and element.operator is operators.eq
+                and getattr(element.left, 'key', None) == 'id_usuario' and isinstance(element.right, BindParameter)):
+            value = element.right.effective_value
+            if value is None and isinstance(parameters, dict):
+                value = parameters.get(element.right.key)
+            if isinstance(value, int):
+                return value
+    return None
+
+class TaskShardedSession(ShardedSession):
+    """
+    Sesión que reparte usuarios, tareas, notificaciones y asociaciones Tarea-Categoría entre
+    los shards por usuario. Las categorías son datos de referencia: se escriben en el primer
+    shard y se replican al resto al hacer flush, para que las asociaciones se puedan resolver
+    en el shard de cada tarea.
+    """
+    def __init__(self, directory: ShardDirectory, allocator: IdAllocator, **kwargs):
+        self.directory = directory
+        self.allocator = allocator
+        self.primary_shard = directory.shard_ids[0]
+        self.engines = kwargs['shards']
+        super().__init__(shard_chooser=self._choose_shard, identity_chooser=self._choose_identity,
+                         execute_chooser=self._choose_execution, **kwargs)
+
+    def _choose_shard(self, mapper, instance, clause=None):
+        if isinstance(instance, User):
+            return self.directory.shard_for_user(instance.id_usuario, register=True)
+        if isinstance(instance, Task):
+            return self.directory.shard_for_user(instance.id_usuario or instance.usuario.id_usuario)
+        if isinstance(instance, (Notification, TaskCategory)):
+            task = instance.tarea or self.get(Task, instance.id_tarea)
+            if task is None:
+                raise ValueError(f"La tarea con ID {instance.id_tarea} no existe.")
+            return self._choose_shard(mapper, task)
+        return self.primary_shard
+
+    def _choose_identity(self, mapper, primary_key, *, lazy_loaded_from, **kw):
+        if lazy_loaded_from is not None:
+            return [lazy_loaded_from.identity_token]
+        if mapper.class_ is User:
+            return [self.directory.shard_for_user(primary_key[0])]
+        if mapper.class_ is Category:
+            return [self.primary_shard]
+        return self.directory.shard_ids
+
+    def _choose_execution(self, orm_context):
+        mapper = orm_context.bind_mapper
+        if mapper is not None and mapper.class_ is Category:
+            return [self.primary_shard]
+        user_id = _user_criterion(orm_context.statement, orm_context.parameters)
+        if user_id is not None and mapper is not None and mapper.class_ in (User, Task):
+            return [self.directory.shard_for_user(user_id)]
+        return self.directory.shard_ids
+
+@event.listens_for(TaskShardedSession, "before_flush")
+def _assign_global_ids(session, flush_context, instances):
+    for instance in session.new:
+        column = _GLOBAL_ID_ENTITIES.get(type(instance))
+        if column and getattr(instance, column) is None:
+            setattr(instance, column, session.allocator.next_id(column))
+
+@event.listens_for(TaskShardedSession, "after_flush")
+def _replicate_categories(session, flush_context):
+    upserts = [c for c in list(session.new) + list(session.dirty) if isinstance(c, Category)]
+    deletes = [c.id_categoria for c in session.deleted if isinstance(c, Category)]
+    if not upserts and not deletes:
+        return
+    rows = [{column.key: getattr(c, column.key) for column in Category.__table__.columns} for c in upserts]
+    for shard_id in session.directory.shard_ids[1:]:
+        conn = session.connection(bind_arguments={'shard_id': shard_id})
+        if rows:
+            conn.execute(insert(Category.__table__).prefix_with('OR REPLACE'), rows)
+        if deletes:
+            conn.execute(delete(Category.__table__).where(Category.id_categoria.in_(deletes)))
+
+@event.listens_for(TaskShardedSession, "do_orm_execute")
+def _replicate_category_updates(orm_context):
+    """
+    Los UPDATE de categorías hechos sin flush (como el UPDATE ... RETURNING de los repositorios)
+    se ejecutan en el primer shard; después se copian al resto las categorías que cumplen su
+    condición (la clave primaria, en los repositorios).
+    """
+    mapper = orm_context.bind_mapper
+    if not orm_context.is_update or mapper is None or mapper.class_ is not Category:
+        return None
+    session = orm_context.session
+    result = orm_context.invoke_statement().freeze()
+    table = Category.__table__
+    changed = select(table)
+    if orm_context.statement.whereclause is not None:
+        changed = changed.where(orm_context.statement.whereclause)
+    primary = session.connection(bind_arguments={'shard_id': session.primary_shard})
+    rows = [dict(row) for row in primary.execute(changed).mappings()]
+    if rows:
+        for shard_id in session.directory.shard_ids[1:]:
+            conn = session.connection(bind_arguments={'shard_id': shard_id})
+            conn.execute(insert(table).prefix_with('OR REPLACE'), rows)
+    return result()
+
+def _order_key(statement):
+    """
+    Función que obtiene de una fila los valores del ORDER BY de una consulta ORM, para mezclar
+    en orden los resultados de varios shards. Devuelve None si el orden no es por columnas.
+    """
+    columns = list(statement._order_by_clauses)
+    if not columns or not all(getattr(c, 'key', None) and hasattr(c, 'table') for c in columns):
+        return None
+
+    def key(row):
+        # Las filas de una sola entidad ORM se guardan como el propio objeto
+        mapping = getattr(row, '_mapping', None)
+        if mapping is None:
+            return tuple(getattr(row, column.key) for column in columns)
+        return tuple(mapping[column] if column in mapping else getattr(row[0], column.key) for column in columns)
+    return key
+
+@event.listens_for(TaskShardedSession, "do_orm_execute", insert=True)
+def _merge_ordered_fan_out(orm_context):
+    """
+    Las consultas ordenadas que van a varios shards se ejecutan en cada shard y se mezclan
+    respetando el ORDER BY (y el LIMIT), en lugar de concatenarse.
+    """
+    if not orm_context.is_select or "shard_id" in orm_context.bind_arguments:
+        return None
+    if orm_context.load_options._identity_token is not None or "_sa_shard_id" in orm_context.execution_options:
+        return None
+    statement = orm_context.statement
+    key = _order_key(statement)
+    shard_ids = list(orm_context.session.execute_chooser(orm_context))
+    if key is None or len(shard_ids) < 2:
+        return None
+    frozen = [orm_context.invoke_statement(bind_arguments={**orm_context.bind_arguments, "shard_id": shard_id}).freeze()
+              for shard_id in shard_ids]
+    rows = list(heapq.merge(*(f.data for f in frozen), key=key))
+    limit = getattr(statement, '_limit', None)
+    if isinstance(limit, int):
+        rows = rows[:limit]
+    if frozen[0]._source_supports_scalars:
+        rows = [[row] for row in rows]
+    return frozen[0].with_new_rows(rows)()
+
+def shard_paths(directory: str, count: int) -> Dict[str, str]:
+    """Rutas de los archivos de `count` shards en `directory`: shard0.db, shard1.db..."""
+    return {f"shard{i}": os.path.join(directory, f"shard{i}.db") for i in range(count)}
+
+def create_sharded_sessionmaker(directory_path: str, shards: Dict[str, str], strategy: str = 'hash',
+                                range_size: int = 100_000, create_schema: bool = True) -> sessionmaker:
+    """
+    Crea una fábrica de sesiones repartidas entre varios archivos SQLite.
+    :param directory_path: Ruta de la base de datos del directorio de shards.
+    :param shards: Diccionario {id del shard: ruta del archivo}, en orden; el primero guarda las categorías.
+    :param strategy: 'hash' o 'range'.
+    :param create_schema: Crea las tablas en los shards que no las tengan.
+    :return: Un sessionmaker de TaskShardedSession; los servicios la usan como cualquier sesión.
+    """
+    directory = ShardDirectory(directory_path, list(shards), strategy, range_size)
+    # Mismos motores que la base de datos única (WAL, busy_timeout, detección del almacenamiento
+    # compacto); sin lectores aparte, el escritor de cada shard también sirve las lecturas y necesita
+    # varias conexiones para que una sesión abierta no bloquee a las demás
+    engines = {shard_id: create_engines(path, readers=0, writers=5)[0] for shard_id, path in shards.items()}
+    if create_schema:
+        for engine in engines.values():
+            Base.metadata.create_all(engine)
+    return sessionmaker(class_=TaskShardedSession, directory=directory, allocator=IdAllocator(directory),
+                        shards=engines, autocommit=False, autoflush=False)
+
+class ShardRebalancer:
+    """
+    Mueve usuarios entre shards con todos sus datos. Cada usuario se mueve en una sola
+    transacción sobre los dos shards y el directorio (con ATTACH), de modo que una
+    interrupción del proceso no deja al usuario repartido entre dos shards (en modo WAL, SQLite
+    no garantiza esa atomicidad entre archivos si se cae el sistema operativo durante el COMMIT).
+    Mover filas no es crearlas ni borrarlas: las entradas que los triggers añaden al historial de
+    estados y al registro de cambios durante el movimiento se descartan, y el historial del
+    usuario se copia tal cual.
+    """
+    # Tablas de un usuario, en orden de inserción, con la condición que selecciona sus filas
+    _USER_TABLES = (
+        ('users', "id_usuario = :id"),
+        ('tasks', "id_usuario = :id"),
+        ('task_categories', "id_tarea IN (SELECT id_tarea FROM {db}.tasks WHERE id_usuario = :id)"),
+        ('notifications', "id_tarea IN (SELECT id_tarea FROM {db}.tasks WHERE id_usuario = :id)"),
+        ('archived_tasks', "id_usuario = :id"),
+        ('archived_task_categories', "id_tarea IN (SELECT id_tarea FROM {db}.archived_tasks WHERE id_usuario = :id)"),
+        ('archived_notifications', "id_tarea IN (SELECT id_tarea FROM {db}.archived_tasks WHERE id_usuario = :id)"),
+    )
+    # Columnas del historial sin su clave, que es local de cada shard
+    _HISTORY_COLUMNS = "id_tarea, id_usuario, estado_anterior, estado_nuevo, fecha"
+
+    @staticmethod
+    def _columns(table: str) -> str:
+        """
+        Columnas de una tabla según los modelos. Se nombran en las copias entre shards porque su
+        orden físico depende de cómo se creó cada archivo: las migraciones añaden las columnas
+        nuevas al final y create_all las deja en la posición del modelo.
+        """
+        return ", ".join(column.name for column in Base.metadata.tables[table].columns)
+
+    def __init__(self, directory: ShardDirectory, shards: Dict[str, str]):
+        self.directory = directory
+        self.shards = shards
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Usuarios y tareas por shard."""
+        result = {}
+        for shard_id, path in self.shards.items():
+            with sqlite3.connect(path) as conn:
+                result[shard_id] = {
+                    'usuarios': conn.execute("SELECT COUNT(*) FROM users").fetchone()[0],
+                    'tareas': conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0],
+                }
+        return result
+
+    def move_user(self, user_id: int, target: str) -> bool:
+        """
+        Mueve un usuario, sus tareas, asociaciones y notificaciones, sus tareas archivadas y su
+        historial de estados al shard `target`.
+        :return: True si se ha movido, False si ya estaba en ese shard.
+        """
+        if target not in self.shards:
+            raise ValueError(f"Shard desconocido: {target}")
+        source = self.directory.shard_for_user(user_id)
+        if source == target:
+            return False
+        conn = sqlite3.connect(self.shards[target], timeout=30, isolation_level=None)
+        try:
+            conn.execute("ATTACH DATABASE ? AS origen", (self.shards[source],))
+            conn.execute("ATTACH DATABASE ? AS directorio", (self.directory.path,))
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                log_end = {db: conn.execute(f"SELECT coalesce(MAX(seq), 0) FROM {db}.{CHANGE_LOG_TABLE}").fetchone()[0]
+                           for db in ('main', 'origen')}
+                for table, condition in self._USER_TABLES:
+                    columns = self._columns(table)
+                    conn.execute(f"INSERT OR REPLACE INTO main.{table} ({columns}) SELECT {columns} FROM origen.{table} "
+                                 f"WHERE {condition.format(db='origen')}", {'id': user_id})
+                # Los triggers han anotado en el destino la creación de sus tareas: se descarta y el
+                # historial real pasa al destino antes de que el borrado anote también su final
+                conn.execute(f"DELETE FROM main.{STATE_HISTORY_TABLE} WHERE id_usuario = :id", {'id': user_id})
+                conn.execute(f"INSERT INTO main.{STATE_HISTORY_TABLE} ({self._HISTORY_COLUMNS}) "
+                             f"SELECT {self._HISTORY_COLUMNS} FROM origen.{STATE_HISTORY_TABLE} "
+                             f"WHERE id_usuario = :id ORDER BY id", {'id': user_id})
+                for table, condition in reversed(self._USER_TABLES):
+                    conn.execute(f"DELETE FROM origen.{table} WHERE {condition.format(db='origen')}", {'id': user_id})
+                conn.execute(f"DELETE FROM origen.{STATE_HISTORY_TABLE} WHERE id_usuario = :id", {'id': user_id})
+                for db, end in log_end.items():
+                    conn.execute(f"DELETE FROM {db}.{CHANGE_LOG_TABLE} WHERE seq > ?", (end,))
+                conn.execute("UPDATE directorio.user_shards SET shard = ? WHERE id_usuario = ?", (target, user_id))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+        self.directory.forget(user_id)
+        return True
+
+    def rebalance(self, progress: Callable[[int, int, str], None] | None = None) -> int:
+        """
+        Mueve a su shard preferido a cada usuario que no esté en él; se usa tras añadir shards
+        o cambiar la estrategia de reparto. Antes se copian las categorías a los shards nuevos.
+        :param progress: Función opcional que recibe (ID de usuario, shard origen, shard destino).
+        :return: El número de usuarios movidos.
+        """
+        self._replicate_categories()
+        moved = 0
+        for user_id, current in self.directory.assignments().items():
+            target = self.directory.preferred_shard(user_id)
+            if target != current and self.move_user(user_id, target):
+                moved += 1
+                if progress:
+                    progress(user_id, current, target)
+        return moved
+
+    def _replicate_categories(self):
+        primary = self.directory.shard_ids[0]
+        for shard_id in self.directory.shard_ids[1:]:
+            conn = sqlite3.connect(self.shards[shard_id], timeout=30)
+            try:
+                conn.execute("ATTACH DATABASE ? AS principal", (self.shards[primary],))
+                with conn:
+                    # Es una copia: no se anota en el registro de cambios del shard
+                    log_end = conn.execute(f"SELECT coalesce(MAX(seq), 0) FROM {CHANGE_LOG_TABLE}").fetchone()[0]
+                    columns = self._columns('categories')
+                    conn.execute(f"INSERT OR REPLACE INTO main.categories ({columns}) "
+                                 f"SELECT {columns} FROM principal.categories")
+                    conn.execute(f"DELETE FROM {CHANGE_LOG_TABLE} WHERE seq > ?", (log_end,))
+            finally:
+                conn.close()
@@ -0,0 +1,74 @@
+from typing import Callable, Dict, Iterable, Sequence, Tuple
+
+# Nombres de los miembros de TaskState, TaskPriority y TaskFrequency (src/models/task.py), en orden:
+# en el almacenamiento compacto cada enum se guarda como la posición de su miembro
+STATES = ('PENDIENTE', 'EN_PROGRESO', 'COMPLETADA')
+PRIORITIES = ('ALTA', 'MEDIA', 'BAJA')
+FREQUENCIES = ('DIARIA', 'SEMANAL', 'MENSUAL')
+# Marca de las columnas de fecha y hora, que se guardan como microsegundos desde la época Unix
+DATETIME = None
+
+# Columnas con codificación compacta opcional: tabla -> columna -> nombres del enum o DATETIME
+COMPACT_COLUMNS: Dict[str, Dict[str, Tuple[str, ...] | None]] = {
+    'tasks': {'fecha_inicio': DATETIME, 'fecha_vencimiento': DATETIME, 'estado': STATES,
+              'prioridad': PRIORITIES, 'frecuencia': FREQUENCIES},
+    'archived_tasks': {'fecha_inicio': DATETIME, 'fecha_vencimiento': DATETIME, 'estado': STATES,
+                       'prioridad': PRIORITIES, 'frecuencia': FREQUENCIES, 'fecha_archivado': DATETIME},
+    'task_state_history': {'estado_anterior': STATES, 'estado_nuevo': STATES, 'fecha': DATETIME},
+    'notifications': {'fecha_envio': DATETIME},
+    'archived_notifications': {'fecha_envio': DATETIME},
+}
+
+# Función de ejecución de SQL: sqlite3.Connection.execute o Connection.exec_driver_sql de SQLAlchemy
+Execute = Callable[[str], Iterable[tuple]]
+
+def is_compact_storage(execute: Execute) -> bool:
+    """
+    Indica si la base de datos usa el almacenamiento compacto: la columna tasks.estado se declara
+    INTEGER tras convertirla (ver ConvertStorage en src/database/migrations.py).
+    """
+    for row in execute("PRAGMA table_info(tasks)"):
+        if row[1] == 'estado':
+            return row[2].upper() == 'INTEGER'
+    return False
+
+def declared_type(kind: Sequence[str] | None, compact: bool) -> str:
+    """
+    Tipo declarado de una columna: INTEGER en el almacenamiento compacto y, en el de texto, el
+    mismo que genera create_all (DATETIME o VARCHAR con la longitud del nombre más largo).
+    """
+    if compact:
+        return 'INTEGER'
+    return 'DATETIME' if kind is DATETIME else f"VARCHAR({max(map(len, kind))})"
+
+def enum_literal(names: Sequence[str], name: str, compact: bool) -> str:
+    """Literal SQL de un miembro de un enum en el almacenamiento indicado."""
+    return str(names.index(name)) if compact else f"'{name}'"
+
+def now_sql(compact: bool) -> str:
+    """Fecha y hora local actual en SQL, con el formato del almacenamiento indicado."""
+    if compact:
+        return ("(CAST(strftime('%s', 'now', 'localtime') AS INTEGER) * 1000000 "
+                "+ CAST(substr(strftime('%f', 'now', 'localtime'), 4) AS INTEGER) * 1000)")
+    return "datetime('now', 'localtime')"
+
+def convert_sql(column: str, kind: Sequence[str] | None, compact: bool) -> str:
+    """
+    Expresión SQL que convierte una columna al almacenamiento indicado. Las fechas en texto
+    ('AAAA-MM-DD HH:MM:SS.ffffff', como las guarda SQLAlchemy) pasan a microsegundos desde la época
+    Unix, sin zona horaria, y viceversa; los enums pasan de nombre a posición y viceversa.
+    """
+    if kind is DATETIME:
+        if compact:
+            return (f"CASE WHEN typeof({column}) = 'text' THEN "
+                    f"CAST(strftime('%s', {column}) AS INTEGER) * 1000000 "
+                    f"+ CAST(substr(substr({column}, 21) || '000000', 1, 6) AS INTEGER) ELSE {column} END")
+        return (f"CASE WHEN typeof({column}) = 'integer' THEN "
+                f"strftime('%Y-%m-%d %H:%M:%S', {column} / 1000000, 'unixepoch') "
+                f"|| printf('.%06d', {column} % 1000000) ELSE {column} END")
+    pairs = enumerate(kind)
+    if compact:
+        cases = " ".join(f"WHEN '{name}' THEN {code}" for code, name in pairs)
+    else:
+        cases = " ".join(f"WHEN {code} THEN '{name}'" for code, name in pairs)
+    return f"CASE {column} {cases} ELSE {column} END"
@@ -1,5 +1,9 @@
 from .base import Base
+from .types import CompressedText, CodedEnum, EpochDateTime
 from .user import User
 from .task import Task, TaskCategory, TaskState, TaskPriority, TaskFrequency
 from .category import Category
 from .notification import Notification
+from .archive import ArchivedTask, ArchivedTaskCategory, ArchivedNotification
+from .change_log import ChangeLogEntry
+from .task_state_history import TaskStateChange
@@ -0,0 +1,75 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Boolean, Index, text
+from sqlalchemy.orm import relationship, deferred
+from src.models.base import Base
+from src.models.types import CodedEnum, CompressedText, EpochDateTime
+from src.models.task import TaskState, TaskPriority, TaskFrequency
+
+class ArchivedTaskCategory(Base):
+    """
+    Asociación Tarea-Categoría de una tarea archivada.
+    """
+    __tablename__ = 'archived_task_categories'
+    id_tarea = Column(Integer, primary_key=True)
+    id_categoria = Column(Integer, primary_key=True)
+
+    tarea = relationship("ArchivedTask", back_populates="categorias",
+                         primaryjoin="foreign(ArchivedTaskCategory.id_tarea) == ArchivedTask.id_tarea")
+    categoria = relationship("Category", viewonly=True,
+                             primaryjoin="foreign(ArchivedTaskCategory.id_categoria) == Category.id_categoria")
+
+    def __repr__(self):
+        return f"<ArchivedTaskCategory(id_tarea={self.id_tarea}, id_categoria={self.id_categoria})>"
+
+class ArchivedNotification(Base):
+    """
+    Notificación de una tarea archivada.
+    """
+    __tablename__ = 'archived_notifications'
+
+    id_notificacion = Column(Integer, primary_key=True)
+    id_tarea = Column(Integer, nullable=False, index=True)
+    fecha_envio = Column(EpochDateTime, nullable=False)
+
+    tarea = relationship("ArchivedTask", back_populates="notificaciones",
+                         primaryjoin="foreign(ArchivedNotification.id_tarea) == ArchivedTask.id_tarea")
+
+    def __repr__(self):
+        return (f"<ArchivedNotification(id_notificacion={self.id_notificacion}, "
+                f"id_tarea={self.id_tarea}, fecha_envio='{self.fecha_envio}')>")
+
+class ArchivedTask(Base):
+    """
+    Modelo de Tarea archivada.
+    Tabla fría con las tareas completadas que se han sacado de 'tasks'. Conserva el ID
+    original y las mismas columnas (y nombres de relación) que Task, para que se pueda
+    leer igual que una tarea activa. Las referencias no son claves foráneas, para que
+    el archivo no bloquee ni se vea afectado por los cambios en las tablas activas.
+    """
+    __tablename__ = 'archived_tasks'
+
+    id_tarea = Column(Integer, primary_key=True, autoincrement=False)
+    titulo = Column(String, nullable=False)
+    descripcion = deferred(Column(CompressedText(), nullable=True))
+    fecha_inicio = Column(EpochDateTime)
+    fecha_vencimiento = Column(EpochDateTime, nullable=True)
+    estado = Column(CodedEnum(TaskState), nullable=False)
+    prioridad = Column(CodedEnum(TaskPriority), nullable=False)
+    recurrente = Column(Boolean, default=False)
+    frecuencia = Column(CodedEnum(TaskFrequency), nullable=True)
+    id_usuario = Column(Integer, nullable=False)
+    version = Column(Integer, nullable=False, server_default=text('1'))
+    fecha_archivado = Column(EpochDateTime, default=datetime.now, nullable=False)
+
+    usuario = relationship("User", viewonly=True,
+                           primaryjoin="foreign(ArchivedTask.id_usuario) == User.id_usuario")
+    notificaciones = relationship("ArchivedNotification", back_populates="tarea", cascade="all, delete-orphan",
+                                  primaryjoin="foreign(ArchivedNotification.id_tarea) == ArchivedTask.id_tarea")
+    categorias = relationship("ArchivedTaskCategory", back_populates="tarea", cascade="all, delete-orphan",
+                              primaryjoin="foreign(ArchivedTaskCategory.id_tarea) == ArchivedTask.id_tarea")
+
+    __table_args__ = (Index('ix_archived_tasks_id_usuario', 'id_usuario'),)
+
+    def __repr__(self):
+        return (f"<ArchivedTask(id_tarea={self.id_tarea}, titulo='{self.titulo}', "
+                f"estado='{self.estado.value}', id_usuario={self.id_usuario})>")
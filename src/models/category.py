@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, Boolean, Index, false, text
 from sqlalchemy.orm import relationship
 from src.models.base import Base
 from src.models.task import TaskCategory  # Importar la tabla de asociación
@@ -12,9 +12,16 @@ class Category(Base):
 
     id_categoria = Column(Integer, primary_key=True, index=True)
     nombre = Column(String, unique=True, nullable=False)
+    # Borrado diferido: la categoría queda oculta al marcarla y sus asociaciones se borran después por lotes
+    eliminada = Column(Boolean, default=False, server_default=false(), nullable=False)
+    # Versión de la fila para la concurrencia optimista (ver Task.version)
+    version = Column(Integer, nullable=False, server_default=text('1'))
+    __mapper_args__ = {'version_id_col': version}
 
     # Relación muchos-a-muchos con Tarea a través de TaskCategory
     tareas = relationship("TaskCategory", back_populates="categoria", cascade="all, delete-orphan")
 
+    __table_args__ = (Index('ix_categories_eliminada', 'id_categoria', sqlite_where=text('eliminada')),)
+
     def __repr__(self):
         return f"<Category(id_categoria={self.id_categoria}, nombre='{self.nombre}')>"
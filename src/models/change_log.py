@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, String, DateTime, event
+from src.models.base import Base
+from src.database.changes import CHANGE_LOG_TABLE, create_change_triggers
+
+class ChangeLogEntry(Base):
+    """
+    Modelo de entrada del registro de cambios.
+    Cada inserción, cambio o borrado en las tablas vigiladas añade una entrada (mediante
+    triggers, en la misma transacción) con un número de secuencia creciente.
+    """
+    __tablename__ = CHANGE_LOG_TABLE
+    # AUTOINCREMENT: los números de secuencia no se reutilizan tras compactar el registro
+    __table_args__ = {'sqlite_autoincrement': True}
+
+    seq = Column(Integer, primary_key=True)
+    tabla = Column(String, nullable=False)
+    clave = Column(Integer, nullable=False)
+    operacion = Column(String, nullable=False)
+    columnas = Column(String, nullable=True)
+    fecha = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return (f"<ChangeLogEntry(seq={self.seq}, tabla='{self.tabla}', clave={self.clave}, "
+                f"operacion='{self.operacion}', columnas='{self.columnas}')>")
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_change_triggers(metadata, connection, **kw):
+    # create_all no crea triggers: se (re)crean cada vez sobre las columnas actuales
+    if connection.dialect.name == 'sqlite':
+        create_change_triggers(connection.exec_driver_sql)
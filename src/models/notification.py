@@ -1,7 +1,8 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, ForeignKey, text
 from sqlalchemy.orm import relationship
 from src.models.base import Base
+from src.models.types import EpochDateTime
 
 class Notification(Base):
     """
@@ -9,10 +10,15 @@ class Notification(Base):
     Representa una notificación asociada a una tarea.
     """
     __tablename__ = 'notifications'
+    # AUTOINCREMENT evita reutilizar IDs de notificaciones archivadas
+    __table_args__ = {'sqlite_autoincrement': True}
 
     id_notificacion = Column(Integer, primary_key=True, index=True)
-    id_tarea = Column(Integer, ForeignKey('tasks.id_tarea'), nullable=False)
-    fecha_envio = Column(DateTime, default=datetime.now, nullable=False)
+    id_tarea = Column(Integer, ForeignKey('tasks.id_tarea'), nullable=False, index=True)
+    fecha_envio = Column(EpochDateTime, default=datetime.now, nullable=False)
+    # Versión de la fila para la concurrencia optimista (ver Task.version)
+    version = Column(Integer, nullable=False, server_default=text('1'))
+    __mapper_args__ = {'version_id_col': version}
 
     # Relación muchos-a-uno con Tarea
     tarea = relationship("Task", back_populates="notificaciones")
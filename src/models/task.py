@@ -1,8 +1,9 @@
 import enum
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, text
+from sqlalchemy.orm import relationship, deferred
 from src.models.base import Base
+from src.models.types import CodedEnum, CompressedText, EpochDateTime
 
 class TaskState(enum.Enum):
     """
@@ -34,7 +35,7 @@ class TaskCategory(Base):
     """
     __tablename__ = 'task_categories'
     id_tarea = Column(Integer, ForeignKey('tasks.id_tarea'), primary_key=True)
-    id_categoria = Column(Integer, ForeignKey('categories.id_categoria'), primary_key=True)
+    id_categoria = Column(Integer, ForeignKey('categories.id_categoria'), primary_key=True, index=True)
 
     tarea = relationship("Task", back_populates="categorias")
     categoria = relationship("Category", back_populates="tareas")
@@ -48,17 +49,25 @@ class Task(Base):
     Representa una tarea en el sistema.
     """
     __tablename__ = 'tasks'
+    # AUTOINCREMENT evita reutilizar IDs de tareas archivadas (archived_tasks conserva el ID)
+    __table_args__ = {'sqlite_autoincrement': True}
 
     id_tarea = Column(Integer, primary_key=True, index=True)
     titulo = Column(String, nullable=False)
-    descripcion = Column(String, nullable=True)
-    fecha_inicio = Column(DateTime, default=datetime.now)
-    fecha_vencimiento = Column(DateTime, nullable=True)
-    estado = Column(Enum(TaskState), default=TaskState.PENDIENTE, nullable=False)
-    prioridad = Column(Enum(TaskPriority), default=TaskPriority.MEDIA, nullable=False)
+    # Diferida: los listados no la cargan; se lee al acceder al atributo o con undefer
+    descripcion = deferred(Column(CompressedText(), nullable=True))
+    fecha_inicio = Column(EpochDateTime, default=datetime.now)
+    fecha_vencimiento = Column(EpochDateTime, nullable=True)
+    estado = Column(CodedEnum(TaskState), default=TaskState.PENDIENTE, nullable=False, index=True)
+    prioridad = Column(CodedEnum(TaskPriority), default=TaskPriority.MEDIA, nullable=False)
     recurrente = Column(Boolean, default=False)
-    frecuencia = Column(Enum(TaskFrequency), nullable=True)
-    id_usuario = Column(Integer, ForeignKey('users.id_usuario'), nullable=False)
+    frecuencia = Column(CodedEnum(TaskFrequency), nullable=True)
+    id_usuario = Column(Integer, ForeignKey('users.id_usuario'), nullable=False, index=True)
+    # Versión de la fila para la concurrencia optimista: cada UPDATE la incrementa y, con
+    # version_id_col, los flush del ORM solo actualizan o borran la fila si no ha cambiado desde
+    # que se leyó (StaleDataError si no); BaseRepository.update admite la versión esperada
+    version = Column(Integer, nullable=False, server_default=text('1'))
+    __mapper_args__ = {'version_id_col': version}
 
     # Relación muchos-a-uno con Usuario
     usuario = relationship("User", back_populates="tareas")
@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Integer, Index, event
+from src.models.base import Base
+from src.models.types import CodedEnum, EpochDateTime
+from src.models.task import TaskState
+from src.database.changes import STATE_HISTORY_TABLE, create_state_history_triggers, backfill_state_history
+
+class TaskStateChange(Base):
+    """
+    Modelo de cambio de estado de una tarea.
+    Historial de solo inserción escrito por triggers sobre la tabla de tareas: la creación
+    (estado anterior None), cada cambio de estado y el borrado (estado nuevo None).
+    """
+    __tablename__ = STATE_HISTORY_TABLE
+    __table_args__ = (
+        Index('ix_task_state_history_fecha', 'fecha'),
+        Index('ix_task_state_history_usuario_fecha', 'id_usuario', 'fecha'),
+        Index('ix_task_state_history_id_tarea', 'id_tarea'),
+    )
+
+    id = Column(Integer, primary_key=True)
+    # Sin clave foránea: el historial se conserva al archivar o eliminar la tarea
+    id_tarea = Column(Integer, nullable=False)
+    id_usuario = Column(Integer, nullable=False)
+    estado_anterior = Column(CodedEnum(TaskState), nullable=True)
+    estado_nuevo = Column(CodedEnum(TaskState), nullable=True)
+    fecha = Column(EpochDateTime, nullable=False)
+
+    def __repr__(self):
+        previous = self.estado_anterior.name if self.estado_anterior else None
+        new = self.estado_nuevo.name if self.estado_nuevo else None
+        return (f"<TaskStateChange(id_tarea={self.id_tarea}, estado_anterior={previous}, "
+                f"estado_nuevo={new}, fecha='{self.fecha}')>")
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_state_history_triggers(metadata, connection, tables=(), **kw):
+    if connection.dialect.name == 'sqlite':
+        create_state_history_triggers(connection.exec_driver_sql)
+        if TaskStateChange.__table__ in tables:
+            backfill_state_history(connection.exec_driver_sql)
@@ -0,0 +1,141 @@
+import zlib
+from datetime import date, datetime, timedelta
+from sqlalchemy import DateTime, Integer, String, case, cast, func, type_coerce
+from sqlalchemy.types import TypeDecorator
+
+# Tamaño en bytes (UTF-8) a partir del cual se comprime un texto
+COMPRESSION_THRESHOLD = 1024
+
+class CompressedText(TypeDecorator):
+    """
+    Texto que se guarda comprimido con zlib a partir de un tamaño. SQLite admite valores de
+    distinto tipo en una misma columna: los textos cortos (o que no se reducen al comprimirlos)
+    se guardan como TEXT y los comprimidos como BLOB, de modo que al leer basta con mirar el
+    tipo del valor y las filas escritas antes de activar la compresión se leen igual. La columna
+    sigue declarándose como VARCHAR, por lo que no requiere migración. Los textos comprimidos no
+    son legibles desde SQL (LIKE, length, instr).
+    """
+    impl = String
+    cache_ok = True
+
+    def __init__(self, threshold: int | None = COMPRESSION_THRESHOLD, level: int = 6, *args, **kwargs):
+        """
+        :param threshold: Tamaño mínimo en bytes para comprimir; None desactiva la compresión.
+        :param level: Nivel de compresión de zlib (1-9).
+        """
+        super().__init__(*args, **kwargs)
+        self.threshold = threshold
+        self.level = level
+
+    def process_bind_param(self, value, dialect):
+        if value is None or self.threshold is None or not isinstance(value, str):
+            return value
+        data = value.encode('utf-8')
+        if len(data) < self.threshold:
+            return value
+        compressed = zlib.compress(data, self.level)
+        return compressed if len(compressed) < len(data) else value
+
+    def process_result_value(self, value, dialect):
+        if isinstance(value, bytes):
+            return zlib.decompress(value).decode('utf-8')
+        return value
+
+EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+# julianday del 1970-01-01
+_UNIX_EPOCH_JULIANDAY = 2440587.5
+
+def compact_storage(dialect) -> bool:
+    """
+    Indica si el motor del dialecto usa el almacenamiento compacto. create_engines lo detecta al
+    abrir cada conexión (src/database/storage.py) y lo guarda en el dialecto de su motor.
+    """
+    return getattr(dialect, 'compact_storage', False)
+
+def to_epoch_microseconds(value: datetime) -> int:
+    """Microsegundos desde la época Unix de una fecha sin zona horaria (la hora local tal cual)."""
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, datetime.min.time())
+    return (value.replace(tzinfo=None) - EPOCH) // _MICROSECOND
+
+def from_epoch_microseconds(value: int) -> datetime:
+    """Fecha sin zona horaria a partir de los microsegundos desde la época Unix."""
+    return EPOCH + timedelta(microseconds=value)
+
+def epoch_seconds(column):
+    """
+    Expresión SQL con los segundos desde la época Unix de una columna de fecha, en cualquiera de
+    los dos almacenamientos (entero en microsegundos o texto), redondeados igual en ambos.
+    """
+    seconds = cast(func.round((func.julianday(column) - _UNIX_EPOCH_JULIANDAY) * 86400), Integer)
+    compact = cast(func.round(type_coerce(column, Integer) / 1000000.0), Integer)
+    return case((func.typeof(column) == 'integer', compact), else_=seconds)
+
+class CodedEnum(TypeDecorator):
+    """
+    Enum que se guarda por su nombre, como Enum de SQLAlchemy (VARCHAR con la longitud del nombre
+    más largo), o, en el almacenamiento compacto, como la posición del miembro en la enumeración.
+    Se leen los dos formatos y se aceptan miembros o sus nombres.
+    """
+    impl = String
+    cache_ok = True
+
+    def __init__(self, enum_class, *args, **kwargs):
+        super().__init__(max(len(member.name) for member in enum_class), *args, **kwargs)
+        self.enum_class = enum_class
+        self._members = tuple(enum_class)
+
+    def _member(self, value):
+        if isinstance(value, self.enum_class):
+            return value
+        try:
+            return self.enum_class[value]
+        except KeyError:
+            raise LookupError(f"{value!r} no es un valor de {self.enum_class.__name__}.") from None
+
+    def bind_processor(self, dialect):
+        members = {member: code for code, member in enumerate(self._members)}
+
+        def process(value):
+            if value is None:
+                return None
+            member = self._member(value)
+            return members[member] if compact_storage(dialect) else member.name
+        return process
+
+    def result_processor(self, dialect, coltype):
+        def process(value):
+            if value is None:
+                return None
+            return self._members[value] if isinstance(value, int) else self._member(value)
+        return process
+
+class EpochDateTime(TypeDecorator):
+    """
+    Fecha y hora que se guarda como DateTime de SQLAlchemy (texto ISO) o, en el almacenamiento
+    compacto, como entero de microsegundos desde la época Unix, que ocupa menos en filas e índices
+    y se compara como número. Se leen los dos formatos.
+    """
+    impl = DateTime
+    cache_ok = True
+
+    def bind_processor(self, dialect):
+        as_text = self.impl_instance.bind_processor(dialect)
+
+        def process(value):
+            if value is None:
+                return None
+            if compact_storage(dialect) and isinstance(value, date):
+                return to_epoch_microseconds(value)
+            return as_text(value) if as_text else value
+        return process
+
+    def result_processor(self, dialect, coltype):
+        from_text = self.impl_instance.result_processor(dialect, coltype)
+
+        def process(value):
+            if isinstance(value, int):
+                return from_epoch_microseconds(value)
+            return from_text(value) if from_text else value
+        return process
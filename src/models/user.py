@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, Boolean, Index, false, text
 from sqlalchemy.orm import relationship
 from src.models.base import Base
 
@@ -13,9 +13,16 @@ class User(Base):
     nombre = Column(String, nullable=False)
     correo = Column(String, unique=True, nullable=False)
     contrasena = Column(String, nullable=False)
+    # Borrado diferido: el usuario queda oculto al marcarlo y sus tareas se borran después por lotes
+    eliminado = Column(Boolean, default=False, server_default=false(), nullable=False)
+    # Versión de la fila para la concurrencia optimista (ver Task.version)
+    version = Column(Integer, nullable=False, server_default=text('1'))
+    __mapper_args__ = {'version_id_col': version}
 
     # Relación uno-a-muchos con Tarea
     tareas = relationship("Task", back_populates="usuario", cascade="all, delete-orphan")
 
+    __table_args__ = (Index('ix_users_eliminado', 'id_usuario', sqlite_where=text('eliminado')),)
+
     def __repr__(self):
         return f"<User(id_usuario={self.id_usuario}, nombre='{self.nombre}', correo='{self.correo}')>"
@@ -1,5 +1,8 @@
-from .base_repository import BaseRepository
+from .base_repository import BaseRepository, ConcurrentUpdateError
 from .user_repository import UserRepository
 from .task_repository import TaskRepository
 from .category_repository import CategoryRepository
 from .notification_repository import NotificationRepository
+from .versions import TableVersions
+from . import deletion  # Registra los criterios que ocultan los usuarios y categorías eliminados
+from .change_log_repository import ChangeLogRepository
@@ -1,7 +1,19 @@
+from sqlalchemy import inspect, select, update
 from sqlalchemy.orm import Session
-from typing import TypeVar, Generic, List, Dict, Any
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.exc import StaleDataError
+from src.database.retry import DEFAULT_RETRY_POLICY, RetryPolicy
+from src.repositories.projections import make_rows
+from typing import TypeVar, Generic, List, Dict, Any, Callable, Iterable, Sequence, Tuple
 
 T = TypeVar('T')
+R = TypeVar('R')
+
+class ConcurrentUpdateError(ValueError):
+    """
+    La entidad ha cambiado (otra sesión o proceso la ha actualizado) desde que se leyó la versión
+    con la que se quería escribir: hay que volver a leerla y repetir el cambio.
+    """
 
 class BaseRepository(Generic[T]):
     """
@@ -11,57 +23,200 @@ class BaseRepository(Generic[T]):
         self.session = session
         self.model = model
 
+    @property
+    def retry_policy(self) -> RetryPolicy:
+        """
+        Política de reintentos de las escrituras: la de la sesión (session.info['retry_policy'],
+        ver create_session_factory) o, si no indica ninguna, DEFAULT_RETRY_POLICY.
+        """
+        return self.session.info.get('retry_policy') or DEFAULT_RETRY_POLICY
+
+    def _write(self, action: Callable[[], R]) -> R:
+        """
+        Ejecuta una escritura completa (sentencias y commit) con la política de reintentos: si la
+        base de datos está ocupada, deshace la transacción y la repite entera.
+        :param action: Función sin argumentos que escribe y confirma.
+        :return: El resultado de `action`.
+        """
+        return self.retry_policy.run(action, rollback=self.session.rollback)
+
+    def _commit(self, entity: T) -> T:
+        """
+        Confirma la transacción conservando cargadas las columnas que la entidad ya tiene (las
+        escritas, los valores por defecto y la clave generada, o las devueltas por RETURNING), que
+        el commit expiraría, de modo que leerla después no necesita otro SELECT.
+        :param entity: Entidad recién escrita.
+        :return: La misma entidad.
+        """
+        state = inspect(entity)
+        loaded = {attr.key: state.dict[attr.key] for attr in state.mapper.column_attrs if attr.key in state.dict}
+        self.session.commit()
+        for key, value in loaded.items():
+            set_committed_value(entity, key, value)
+        return entity
+
     def add(self, entity_data: Dict[str, Any]) -> T:
         """
-        Agrega una nueva entidad a la base de datos.
+        Agrega una nueva entidad a la base de datos con un único INSERT, que devuelve la clave
+        generada, sin volver a leerla después.
         :param entity_data: Diccionario con los datos de la entidad.
         :return: La entidad creada.
         """
-        entity = self.model(**entity_data)
-        self.session.add(entity)
-        self.session.commit()
-        self.session.refresh(entity)
-        return entity
+        def write():
+            entity = self.model(**entity_data)
+            self.session.add(entity)
+            self.session.flush()
+            # Las columnas sin valor ni valor por defecto del servidor se han insertado como NULL
+            state = inspect(entity)
+            for attr in state.mapper.column_attrs:
+                if attr.key not in state.dict and all(column.server_default is None for column in attr.columns):
+                    set_committed_value(entity, attr.key, None)
+            return self._commit(entity)
+        return self._write(write)
 
     def get_by_id(self, entity_id: int) -> T | None:
         """
-        Obtiene una entidad por su ID.
+        Obtiene una entidad por su ID, sin consultar la base de datos si ya está en la sesión.
         :param entity_id: ID de la entidad.
         :return: La entidad o None si no se encuentra.
         """
-        return self.session.query(self.model).get(entity_id)
+        return self.session.get(self.model, entity_id)
 
     def get_all(self) -> List[T]:
         """
         Obtiene todas las entidades de un tipo específico.
         :return: Una lista de entidades.
         """
-        return self.session.query(self.model).all()
+        return self.session.query(self.model).order_by(*self.model.__table__.primary_key).all()
+
+    def _projection_columns(self, columns: Sequence[str]) -> list:
+        """
+        Resuelve los nombres de columna de una proyección.
+        :param columns: Nombres de las columnas del modelo.
+        :return: Las columnas del modelo.
+        :raises ValueError: Si alguna columna no existe.
+        """
+        table_columns = self.model.__table__.columns
+        unknown = [name for name in columns if name not in table_columns]
+        if unknown or not columns:
+            raise ValueError(f"Columnas inválidas para {self.model.__tablename__}: {unknown}. "
+                             f"Valores permitidos: {list(table_columns.keys())}")
+        return [getattr(self.model, name) for name in columns]
 
-    def update(self, entity_id: int, update_data: Dict[str, Any]) -> T | None:
+    def get_rows(self, columns: Sequence[str]) -> list:
+        """
+        Obtiene todas las entidades como filas ligeras de solo lectura (con __slots__) que
+        contienen únicamente las columnas pedidas, sin pasar por el mapa de identidad del ORM.
+        :param columns: Nombres de las columnas a obtener.
+        :return: Una lista de filas, ordenadas por clave primaria.
+        """
+        stmt = select(*self._projection_columns(columns)).order_by(*self.model.__table__.primary_key)
+        return make_rows(f"{self.model.__name__}Row", columns, self.session.execute(stmt))
+
+    def lookup(self, label_column: str, prefix: str | None = None, after_id: int | None = None,
+               ids: Iterable[int] | None = None, limit: int | None = None) -> List[Tuple[int, Any]]:
+        """
+        Obtiene pares (ID, etiqueta) para listas de selección, por páginas y sin cargar objetos ORM.
+        :param label_column: Columna que se usa como etiqueta.
+        :param prefix: Si se indica, solo las entidades cuya etiqueta empieza por este texto.
+        :param after_id: Si se indica, solo las entidades con un ID mayor (paginación por clave).
+        :param ids: Si se indica, solo las entidades con estos IDs.
+        :param limit: Número máximo de pares.
+        :return: Una lista de tuplas (ID, etiqueta), ordenadas por ID.
         """
-        Actualiza una entidad existente por su ID.
+        pk, label = self._projection_columns([self.model.__table__.primary_key.columns[0].name, label_column])
+        stmt = select(pk, label).order_by(pk)
+        if prefix:
+            stmt = stmt.where(label.startswith(prefix, autoescape=True))
+        if after_id is not None:
+            stmt = stmt.where(pk > after_id)
+        if ids is not None:
+            stmt = stmt.where(pk.in_(list(ids)))
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return [tuple(row) for row in self.session.execute(stmt)]
+
+    def update(self, entity_id: int, update_data: Dict[str, Any], expected_version: int | None = None) -> T | None:
+        """
+        Actualiza una entidad existente por su ID con un único UPDATE ... RETURNING, que la trae
+        actualizada (o actualiza la que ya estaba en la sesión) sin leerla antes ni después, e
+        incrementa su versión. Con `expected_version` el UPDATE es un compare-and-swap: solo se
+        aplica si la fila conserva esa versión, de modo que no se pisan los cambios de otro proceso.
         :param entity_id: ID de la entidad a actualizar.
         :param update_data: Diccionario con los datos a actualizar.
+        Como al actualizar, también se confirma la transacción de la sesión cuando la entidad no se
+        encuentra (para liberar el bloqueo de escritura del UPDATE), con lo que tuviera pendiente.
+        :param expected_version: Versión leída de la entidad (opcional).
         :return: La entidad actualizada o None si no se encuentra.
+        :raises ConcurrentUpdateError: Si la entidad existe pero su versión ya no es la esperada.
+        :raises ValueError: Si algún campo no es una columna de la entidad.
         """
-        entity = self.get_by_id(entity_id)
-        if entity:
-            for key, value in update_data.items():
-                setattr(entity, key, value)
-            self.session.commit()
-            self.session.refresh(entity)
+        if expected_version is not None and (not isinstance(expected_version, int) or expected_version <= 0):
+            raise ValueError("La versión esperada debe ser un entero positivo.")
+        table_columns = self.model.__table__.columns
+        unknown = [name for name in update_data if name not in table_columns]
+        if unknown:
+            raise ValueError(f"Campos inválidos para {self.model.__tablename__}: {unknown}. "
+                             f"Valores permitidos: {list(table_columns.keys())}")
+        pk = self.model.__table__.primary_key.columns[0]
+        version = self.model.__mapper__.version_id_col
+        if not update_data:
+            entity = self.get_by_id(entity_id)
+            if entity is not None and expected_version is not None and getattr(entity, version.key) != expected_version:
+                self._conflict(entity_id, expected_version, getattr(entity, version.key))
+            return entity
+        criteria, values = [pk == entity_id], dict(update_data)
+        if version is not None:
+            values[version.key] = version + 1
+            if expected_version is not None:
+                criteria.append(version == expected_version)
+        stmt = update(self.model).where(*criteria).values(**values).returning(self.model)
+
+        def write():
+            entity = self.session.scalars(stmt, execution_options={'synchronize_session': 'fetch'}).one_or_none()
+            if entity is None:
+                # Sin filas afectadas la transacción de escritura sigue abierta: se confirma (no hay
+                # nada que deshacer del UPDATE) para liberar el bloqueo sin descartar el resto de la sesión
+                self.session.commit()
+                return None
+            return self._commit(entity)
+        entity = self._write(write)
+        if entity is None and expected_version is not None:
+            # Con el atributo del ORM (no la columna) para que tampoco vea las entidades ocultas
+            current = self.session.scalar(select(getattr(self.model, version.key)).where(pk == entity_id))
+            if current is not None:
+                self._conflict(entity_id, expected_version, current)
         return entity
 
+    def _conflict(self, entity_id: int, expected_version: int, current_version: int):
+        raise ConcurrentUpdateError(
+            f"{self.model.__name__} con ID {entity_id} ha sido modificado por otra sesión "
+            f"(versión {current_version}, se esperaba la {expected_version}); vuelve a cargarlo.")
+
+    def _delete_dependents(self, entity_id: int):
+        """
+        Borra, en la transacción de delete, las filas que dependen de la entidad sin una relación
+        del ORM que las borre en cascada (como las del archivo). Por defecto no hay ninguna.
+        """
+
     def delete(self, entity_id: int) -> bool:
         """
         Elimina una entidad por su ID.
         :param entity_id: ID de la entidad a eliminar.
         :return: True si se eliminó con éxito, False en caso contrario.
         """
-        entity = self.get_by_id(entity_id)
-        if entity:
+        def write():
+            entity = self.get_by_id(entity_id)
+            if not entity:
+                return False
             self.session.delete(entity)
-            self.session.commit()
+            self._delete_dependents(entity_id)
+            try:
+                self.session.commit()
+            except StaleDataError:
+                # La entidad (o alguna de las que se borran en cascada) cambió tras leerla
+                self.session.rollback()
+                raise ConcurrentUpdateError(f"{self.model.__name__} con ID {entity_id} ha sido modificado "
+                                            f"por otra sesión mientras se eliminaba; vuelve a intentarlo.")
             return True
-        return False
+        return self._write(write)
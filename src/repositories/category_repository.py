@@ -1,6 +1,17 @@
+from sqlalchemy import bindparam, delete, false, func, select, update
 from sqlalchemy.orm import Session
 from src.models.category import Category
+from src.models.task import TaskCategory
+from src.models.archive import ArchivedTaskCategory
 from src.repositories.base_repository import BaseRepository
+from typing import Iterator
+
+# Consultas frecuentes construidas una sola vez (ver user_repository.py)
+_ID_BY_NAME = select(Category.id_categoria).where(Category.nombre == bindparam('nombre')).limit(1)
+_MARK_DELETED = (update(Category).where(Category.id_categoria == bindparam('categoria'), Category.eliminada == false())
+                 .values(eliminada=True, version=Category.version + 1))
+_NEXT_DELETED = select(Category.id_categoria).where(Category.eliminada).order_by(Category.id_categoria).limit(1)
+_INCLUDE_DELETED = {'include_deleted': True}
 
 class CategoryRepository(BaseRepository[Category]):
     """
@@ -9,3 +20,69 @@ class CategoryRepository(BaseRepository[Category]):
     """
     def __init__(self, session: Session):
         super().__init__(session, Category)
+
+    def name_exists(self, nombre: str) -> bool:
+        """
+        Indica si ya hay una categoría con un nombre.
+        :param nombre: Nombre a comprobar.
+        :return: True si el nombre está registrado.
+        """
+        return self.session.scalars(_ID_BY_NAME, {'nombre': nombre},
+                                    execution_options=_INCLUDE_DELETED).first() is not None
+
+    def _delete_dependents(self, category_id: int):
+        # Las asociaciones archivadas no tienen claves foráneas ni relación con la categoría
+        links = ArchivedTaskCategory.__table__
+        self.session.execute(delete(links).where(links.c.id_categoria == category_id))
+
+    def mark_deleted(self, category_id: int) -> bool:
+        """
+        Marca una categoría como eliminada con un único UPDATE: deja de aparecer en las consultas
+        junto con sus asociaciones, que se borran después por lotes con purge_deleted.
+        :param category_id: ID de la categoría.
+        :return: True si se ha marcado, False si no existe o ya estaba marcada.
+        """
+        def write():
+            marked = self.session.execute(_MARK_DELETED, {'categoria': category_id},
+                                          execution_options={'synchronize_session': False}).rowcount
+            self.session.commit()
+            return marked > 0
+        return self._write(write)
+
+    def purge_deleted(self, batch_size: int = 1000) -> Iterator[int]:
+        """
+        Borra las categorías marcadas como eliminadas con sus asociaciones Tarea-Categoría, activas y
+        archivadas, en lotes con su propia transacción (ver UserRepository.purge_deleted); la
+        categoría se borra tras su último lote.
+        :param batch_size: Número máximo de asociaciones por lote.
+        :return: Un iterador con el número de asociaciones borradas en cada lote.
+        """
+        while True:
+            category_id = self.session.scalar(_NEXT_DELETED, execution_options=_INCLUDE_DELETED)
+            if category_id is None:
+                return
+
+            def write_batch():
+                for links in (TaskCategory.__table__, ArchivedTaskCategory.__table__):
+                    candidates = (select(links.c.id_tarea).where(links.c.id_categoria == category_id)
+                                  .order_by(links.c.id_tarea).limit(batch_size).subquery())
+                    bound = self.session.scalar(select(func.max(candidates.c.id_tarea)))
+                    if bound is None:
+                        continue
+                    removed = self.session.execute(delete(links).where(links.c.id_categoria == category_id,
+                                                                       links.c.id_tarea <= bound)).rowcount
+                    self.session.commit()
+                    return removed
+                self.session.execute(delete(Category.__table__)
+                                     .where(Category.__table__.c.id_categoria == category_id))
+                self.session.commit()
+                return None
+            while True:
+                try:
+                    removed = self._write(write_batch)
+                except Exception:
+                    self.session.rollback()
+                    raise
+                if removed is None:
+                    break
+                yield removed
@@ -0,0 +1,68 @@
+from datetime import datetime
+from typing import Iterable, Iterator
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+from src.models.change_log import ChangeLogEntry
+from src.repositories.base_repository import BaseRepository
+from src.repositories.projections import make_rows
+
+# Columnas de las filas que devuelve since()
+CHANGE_COLUMNS = ('seq', 'tabla', 'clave', 'operacion', 'columnas', 'fecha')
+
+class ChangeLogRepository(BaseRepository[ChangeLogEntry]):
+    """
+    Repositorio para el modelo ChangeLogEntry.
+    Las entradas las escriben los triggers de las tablas vigiladas; el repositorio solo las lee
+    por número de secuencia y compacta las antiguas.
+    """
+    def __init__(self, session: Session):
+        super().__init__(session, ChangeLogEntry)
+
+    def since(self, seq: int, limit: int, tables: Iterable[str] | None = None) -> list:
+        """
+        Obtiene las entradas posteriores a `seq`, recorriendo la clave primaria desde ese punto.
+        :param seq: Último número de secuencia ya procesado.
+        :param limit: Número máximo de entradas.
+        :param tables: Si se indica, solo las entradas de estas tablas.
+        :return: Una lista de filas ligeras con CHANGE_COLUMNS, en orden de secuencia; 'columnas'
+                 es la tupla de columnas cambiadas (vacía en inserciones y borrados).
+        """
+        stmt = select(*self._projection_columns(CHANGE_COLUMNS)).where(ChangeLogEntry.seq > seq)
+        if tables is not None:
+            stmt = stmt.where(ChangeLogEntry.tabla.in_(list(tables)))
+        stmt = stmt.order_by(ChangeLogEntry.seq).limit(limit)
+        return make_rows('ChangeRow', CHANGE_COLUMNS, (
+            (seq, tabla, clave, operacion, tuple(columnas.split(',')) if columnas else (), fecha)
+            for seq, tabla, clave, operacion, columnas, fecha in self.session.execute(stmt)
+        ))
+
+    def last_seq(self) -> int:
+        """
+        Devuelve el último número de secuencia registrado (0 si el registro está vacío).
+        """
+        return self.session.scalar(select(func.max(ChangeLogEntry.seq))) or 0
+
+    def compact(self, up_to_seq: int, older_than: datetime | None = None, batch_size: int = 5000) -> Iterator[int]:
+        """
+        Elimina las entradas con secuencia hasta `up_to_seq` (y, si se indica, anteriores a
+        `older_than`), por lotes de la clave primaria, cada uno en su propia transacción.
+        :return: Un iterador con el número de entradas eliminadas en cada lote.
+        """
+        if older_than is not None:
+            oldest_kept = self.session.scalar(select(func.min(ChangeLogEntry.seq))
+                                              .where(ChangeLogEntry.fecha >= older_than))
+            if oldest_kept is not None:
+                up_to_seq = min(up_to_seq, oldest_kept - 1)
+        while True:
+            batch = (select(ChangeLogEntry.seq).where(ChangeLogEntry.seq <= up_to_seq)
+                     .order_by(ChangeLogEntry.seq).limit(batch_size).scalar_subquery())
+            try:
+                removed = self.session.execute(delete(ChangeLogEntry.__table__)
+                                               .where(ChangeLogEntry.seq.in_(batch))).rowcount
+                self.session.commit()
+            except Exception:
+                self.session.rollback()
+                raise
+            if not removed:
+                return
+            yield removed
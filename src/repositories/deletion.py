@@ -0,0 +1,73 @@
+import weakref
+from sqlalchemy import and_, event, false, select
+from sqlalchemy.orm import Session, with_loader_criteria
+from src.models import (ArchivedNotification, ArchivedTask, ArchivedTaskCategory, Category, Notification, Task,
+                        TaskCategory, User)
+
+# Las subconsultas usan las tablas y no las entidades, para que no se les apliquen a su vez los criterios
+_users, _categories, _tasks, _archived = User.__table__, Category.__table__, Task.__table__, ArchivedTask.__table__
+
+def _deleted_user_ids():
+    return select(_users.c.id_usuario).where(_users.c.eliminado)
+
+def _deleted_task_ids():
+    return select(_tasks.c.id_tarea).where(_tasks.c.id_usuario.in_(_deleted_user_ids()))
+
+def _deleted_archived_task_ids():
+    return select(_archived.c.id_tarea).where(_archived.c.id_usuario.in_(_deleted_user_ids()))
+
+def _deleted_category_ids():
+    return select(_categories.c.id_categoria).where(_categories.c.eliminada)
+
+# Criterios que ocultan los usuarios y categorías marcados como eliminados y lo que depende de ellos
+# hasta que el borrado por lotes los elimina. Las subconsultas usan los índices parciales de las
+# marcas, así que su coste es mínimo mientras no hay borrados pendientes.
+_CRITERIA = {
+    User: lambda cls: cls.eliminado == false(),
+    Category: lambda cls: cls.eliminada == false(),
+    Task: lambda cls: cls.id_usuario.not_in(_deleted_user_ids()),
+    TaskCategory: lambda cls: and_(cls.id_categoria.not_in(_deleted_category_ids()),
+                                   cls.id_tarea.not_in(_deleted_task_ids())),
+    Notification: lambda cls: cls.id_tarea.not_in(_deleted_task_ids()),
+    ArchivedTask: lambda cls: cls.id_usuario.not_in(_deleted_user_ids()),
+    ArchivedTaskCategory: lambda cls: and_(cls.id_categoria.not_in(_deleted_category_ids()),
+                                           cls.id_tarea.not_in(_deleted_archived_task_ids())),
+    ArchivedNotification: lambda cls: cls.id_tarea.not_in(_deleted_archived_task_ids()),
+}
+_HIDE_DELETED = tuple(with_loader_criteria(entity, criterion, include_aliases=True)
+                      for entity, criterion in _CRITERIA.items())
+
+# Sentencia con los criterios ya añadidos de cada sentencia reutilizada (como las consultas
+# frecuentes de los repositorios), para no repetir options() ni el análisis de los lambdas
+_WITH_CRITERIA = weakref.WeakKeyDictionary()
+
+@event.listens_for(Session, "do_orm_execute")
+def _hide_deleted(orm_execute_state):
+    """
+    Añade los criterios a las consultas del ORM y a sus UPDATE y DELETE (una actualización de un
+    usuario oculto no lo encuentra, igual que get_by_id), salvo a las que piden incluir los
+    eliminados con la opción de ejecución `include_deleted` (comprobaciones de unicidad y el
+    borrado por lotes).
+    with_loader_criteria no se aplica al recargar objetos caducados, así que en esas cargas el
+    criterio se añade al WHERE: tras marcar un usuario, session.get sobre un objeto suyo que
+    seguía en la sesión lo descarta y devuelve None.
+    """
+    if orm_execute_state.execution_options.get('include_deleted', False):
+        return
+    if orm_execute_state.is_update or orm_execute_state.is_delete:
+        if orm_execute_state.is_orm_statement:
+            orm_execute_state.statement = orm_execute_state.statement.options(*_HIDE_DELETED)
+        return
+    if not orm_execute_state.is_select:
+        return
+    if orm_execute_state.is_column_load:
+        mapper = orm_execute_state.bind_mapper
+        criterion = _CRITERIA.get(mapper.class_) if mapper is not None else None
+        if criterion is not None:
+            orm_execute_state.statement = orm_execute_state.statement.where(criterion(mapper.class_))
+    else:
+        statement = orm_execute_state.statement
+        hidden = _WITH_CRITERIA.get(statement)
+        if hidden is None:
+            hidden = _WITH_CRITERIA[statement] = statement.options(*_HIDE_DELETED)
+        orm_execute_state.statement = hidden
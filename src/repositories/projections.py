@@ -0,0 +1,69 @@
+from functools import lru_cache
+from typing import Any, Dict, Sequence, Tuple
+
+# Columnas que muestran las vistas de listado de la GUI
+TASK_LIST_COLUMNS = ('id_tarea', 'titulo', 'estado', 'prioridad', 'id_usuario')
+USER_LIST_COLUMNS = ('id_usuario', 'nombre', 'correo')
+
+def _readonly_setattr(self, name, value):
+    raise AttributeError(f"{type(self).__name__} es de solo lectura.")
+
+def _repr(self):
+    values = ", ".join(f"{field}={getattr(self, field)!r}" for field in self._fields)
+    return f"<{type(self).__name__}({values})>"
+
+def _values(self) -> Tuple[Any, ...]:
+    return tuple(getattr(self, field) for field in self._fields)
+
+def _eq(self, other):
+    if type(other) is not type(self):
+        return NotImplemented
+    return _values(self) == _values(other)
+
+def _hash(self):
+    return hash(_values(self))
+
+def _asdict(self) -> Dict[str, Any]:
+    return {field: getattr(self, field) for field in self._fields}
+
+def _init(self, *values):
+    if len(values) != len(self._fields):
+        raise TypeError(f"{type(self).__name__} espera {len(self._fields)} valores y ha recibido {len(values)}.")
+    # __setattr__ es de solo lectura: se asigna cada slot con el de object
+    for field, value in zip(self._fields, values):
+        object.__setattr__(self, field, value)
+
+@lru_cache(maxsize=None)
+def row_class(name: str, fields: Tuple[str, ...]) -> type:
+    """
+    Crea (una sola vez por combinación de columnas) una clase de fila de solo lectura con
+    __slots__: sin diccionario por instancia ni estado del ORM, solo los valores pedidos.
+    :param name: Nombre de la clase.
+    :param fields: Nombres de las columnas, en el orden en que se reciben los valores.
+    :return: La clase de fila; se construye con los valores en orden: Clase(*fila).
+    """
+    return type(name, (), {
+        '__slots__': fields,
+        '_fields': fields,
+        '__init__': _init,
+        '__setattr__': _readonly_setattr,
+        '__delattr__': _readonly_setattr,
+        '__repr__': _repr,
+        '__eq__': _eq,
+        '__hash__': _hash,
+        '_asdict': _asdict,
+    })
+
+def make_rows(name: str, fields: Sequence[str], rows) -> list:
+    """
+    Convierte filas de resultado (tuplas) en objetos de fila ligeros.
+    :param name: Nombre de la clase de fila.
+    :param fields: Columnas de las filas.
+    :param rows: Iterable de tuplas de valores.
+    :return: Una lista de objetos de fila.
+    """
+    cls = row_class(name, tuple(fields))
+    return [cls(*row) for row in rows]
+
+TaskListRow = row_class('TaskRow', TASK_LIST_COLUMNS)
+UserListRow = row_class('UserRow', USER_LIST_COLUMNS)
@@ -1,8 +1,43 @@
-from sqlalchemy.orm import Session
-from src.models.task import Task, TaskCategory
+from datetime import datetime
+from sqlalchemy import select, func, exists, insert, delete, literal, bindparam
+from sqlalchemy.orm import Session, undefer
+from src.models.task import Task, TaskCategory, TaskState
 from src.models.category import Category
+from src.models.user import User
+from src.models.notification import Notification
+from src.models.archive import ArchivedTask, ArchivedTaskCategory, ArchivedNotification
+from src.models.task_state_history import TaskStateChange
 from src.repositories.base_repository import BaseRepository
-from typing import List
+from src.repositories.projections import make_rows
+from typing import List, Dict, Any, Iterator, Sequence
+
+# Columnas de la exportación de tareas, en el orden en que se devuelven las filas
+EXPORT_COLUMNS = (
+    'id_tarea', 'titulo', 'descripcion', 'fecha_inicio', 'fecha_vencimiento',
+    'estado', 'prioridad', 'recurrente', 'frecuencia', 'id_usuario', 'usuario', 'categorias'
+)
+
+# Consultas frecuentes construidas una sola vez (ver user_repository.py). Los valores van como
+# parámetros de la ejecución, de donde también los lee el reparto por usuario de los shards
+_WITH_DESCRIPTION = (undefer(Task.descripcion),)
+_ARCHIVED_WITH_DESCRIPTION = (undefer(ArchivedTask.descripcion),)
+_BY_USER = select(Task).where(Task.id_usuario == bindparam('id_usuario'))
+_ASSOCIATION = (select(TaskCategory)
+                .where(TaskCategory.id_tarea == bindparam('id_tarea'), TaskCategory.id_categoria == bindparam('id_categoria'))
+                .limit(1))
+
+def _categories_subquery():
+    """
+    Subconsulta correlacionada con los nombres de las categorías de cada tarea, separados por comas.
+    """
+    return (
+        select(func.group_concat(Category.nombre, ', '))
+        .select_from(TaskCategory)
+        .join(Category, Category.id_categoria == TaskCategory.id_categoria)
+        .where(TaskCategory.id_tarea == Task.id_tarea)
+        .correlate(Task)
+        .scalar_subquery()
+    )
 
 class TaskRepository(BaseRepository[Task]):
     """
@@ -13,6 +48,10 @@ class TaskRepository(BaseRepository[Task]):
     def __init__(self, session: Session):
         super().__init__(session, Task)
 
+    def _association(self, task_id: int, category_id: int) -> TaskCategory | None:
+        """Asociación entre una tarea y una categoría, o None si no existe."""
+        return self.session.scalars(_ASSOCIATION, {'id_tarea': task_id, 'id_categoria': category_id}).first()
+
     def add_category_to_task(self, task_id: int, category_id: int) -> Task | None:
         """
         Asocia una categoría a una tarea existente.
@@ -20,20 +59,19 @@ class TaskRepository(BaseRepository[Task]):
         :param category_id: ID de la categoría.
         :return: La tarea actualizada o None si no se encuentra.
         """
-        task = self.get_by_id(task_id)
-        category = self.session.query(Category).get(category_id)
-        if task and category:
-            # Check if the association already exists
-            existing_association = self.session.query(TaskCategory).filter_by(
-                id_tarea=task_id, id_categoria=category_id
-            ).first()
-            if not existing_association:
-                association = TaskCategory(id_tarea=task_id, id_categoria=category_id)
-                task.categorias.append(association) # Add to the relationship
-                self.session.commit()
-                self.session.refresh(task)
-            return task
-        return None
+        def write():
+            task = self.get_by_id(task_id)
+            category = self.session.get(Category, category_id)
+            if task and category:
+                # Check if the association already exists
+                existing_association = self._association(task_id, category_id)
+                if not existing_association:
+                    association = TaskCategory(id_tarea=task_id, id_categoria=category_id)
+                    task.categorias.append(association) # Add to the relationship
+                    self._commit(task)
+                return task
+            return None
+        return self._write(write)
 
     def remove_category_from_task(self, task_id: int, category_id: int) -> Task | None:
         """
@@ -42,17 +80,24 @@ class TaskRepository(BaseRepository[Task]):
         :param category_id: ID de la categoría.
         :return: La tarea actualizada o None si no se encuentra.
         """
-        task = self.get_by_id(task_id)
-        if task:
-            association_to_delete = self.session.query(TaskCategory).filter_by(
-                id_tarea=task_id, id_categoria=category_id
-            ).first()
-            if association_to_delete:
-                self.session.delete(association_to_delete)
-                self.session.commit()
-                self.session.refresh(task)
-            return task
-        return None
+        def write():
+            task = self.get_by_id(task_id)
+            if task:
+                association_to_delete = self._association(task_id, category_id)
+                if association_to_delete:
+                    self.session.delete(association_to_delete)
+                    self._commit(task)
+                return task
+            return None
+        return self._write(write)
+
+    def get_by_id(self, entity_id: int) -> Task | None:
+        """
+        Obtiene una tarea por su ID, con la descripción (diferida en los listados) ya cargada.
+        :param entity_id: ID de la tarea.
+        :return: La tarea o None si no se encuentra.
+        """
+        return self.session.get(Task, entity_id, options=_WITH_DESCRIPTION)
 
     def get_tasks_by_user(self, user_id: int) -> List[Task]:
         """
@@ -60,4 +105,137 @@ class TaskRepository(BaseRepository[Task]):
         :param user_id: ID del usuario.
         :return: Una lista de tareas.
         """
-        return self.session.query(self.model).filter_by(id_usuario=user_id).all()
+        return list(self.session.scalars(_BY_USER, {'id_usuario': user_id}))
+
+    def get_archived_by_id(self, task_id: int) -> ArchivedTask | None:
+        """
+        Obtiene una tarea archivada por su ID original.
+        :param task_id: ID de la tarea.
+        :return: La tarea archivada o None si no se encuentra.
+        """
+        return self.session.get(ArchivedTask, task_id, options=_ARCHIVED_WITH_DESCRIPTION)
+
+    def get_state_history(self, task_id: int) -> list:
+        """
+        Obtiene los cambios de estado de una tarea (activa, archivada o eliminada) en orden.
+        :param task_id: ID de la tarea.
+        :return: Una lista de filas (estado_anterior, estado_nuevo, fecha).
+        """
+        stmt = (select(TaskStateChange.estado_anterior, TaskStateChange.estado_nuevo, TaskStateChange.fecha)
+                .where(TaskStateChange.id_tarea == task_id).order_by(TaskStateChange.id))
+        return make_rows('TaskStateChangeRow', ('estado_anterior', 'estado_nuevo', 'fecha'), self.session.execute(stmt))
+
+    def get_archived(self, user_id: int | None = None) -> List[ArchivedTask]:
+        """
+        Obtiene las tareas archivadas, opcionalmente de un usuario.
+        :param user_id: ID de usuario opcional.
+        :return: Una lista de tareas archivadas, ordenadas por ID.
+        """
+        stmt = select(ArchivedTask).order_by(ArchivedTask.id_tarea)
+        if user_id is not None:
+            stmt = stmt.where(ArchivedTask.id_usuario == user_id)
+        return list(self.session.scalars(stmt))
+
+    def archive_completed_before(self, cutoff: datetime, batch_size: int = 1000) -> Iterator[int]:
+        """
+        Mueve a las tablas de archivo las tareas completadas cuya fecha de referencia (la de
+        vencimiento o, si no tiene, la de inicio) es anterior a `cutoff`, junto con sus
+        categorías y notificaciones. Cada lote se copia con INSERT ... SELECT y se borra de
+        las tablas activas en una sola transacción, sin cargar objetos en la sesión.
+        :param cutoff: Fecha límite.
+        :param batch_size: Número máximo de tareas por lote.
+        :return: Un iterador con el número de tareas archivadas en cada lote.
+        """
+        archivable = (Task.estado == TaskState.COMPLETADA,
+                      func.coalesce(Task.fecha_vencimiento, Task.fecha_inicio) < cutoff)
+        task_columns = [column.name for column in Task.__table__.columns]
+
+        def write_batch():
+            # Las tareas del lote son las archivables con ID hasta el del último del lote,
+            # así las sentencias siguientes no necesitan una lista de IDs
+            candidates = select(Task.id_tarea).where(*archivable).order_by(Task.id_tarea).limit(batch_size).subquery()
+            bound = self.session.scalar(select(func.max(candidates.c.id_tarea)))
+            if bound is None:
+                return None
+            in_batch = (*archivable, Task.id_tarea <= bound)
+            batch = select(Task.id_tarea).where(*in_batch)
+            moved = self.session.execute(
+                insert(ArchivedTask.__table__).from_select(
+                    task_columns + ['fecha_archivado'],
+                    select(*Task.__table__.columns, literal(datetime.now(), ArchivedTask.fecha_archivado.type)).where(*in_batch)
+                )
+            ).rowcount
+            self.session.execute(insert(ArchivedTaskCategory.__table__).from_select(
+                ['id_tarea', 'id_categoria'],
+                select(TaskCategory.id_tarea, TaskCategory.id_categoria).where(TaskCategory.id_tarea.in_(batch))
+            ))
+            self.session.execute(insert(ArchivedNotification.__table__).from_select(
+                ['id_notificacion', 'id_tarea', 'fecha_envio'],
+                select(Notification.id_notificacion, Notification.id_tarea, Notification.fecha_envio)
+                .where(Notification.id_tarea.in_(batch))
+            ))
+            self.session.execute(delete(Notification.__table__).where(Notification.id_tarea.in_(batch)))
+            self.session.execute(delete(TaskCategory.__table__).where(TaskCategory.id_tarea.in_(batch)))
+            self.session.execute(delete(Task.__table__).where(*in_batch))
+            self.session.commit()
+            return moved
+        while True:
+            try:
+                moved = self._write(write_batch)
+            except Exception:
+                self.session.rollback()
+                raise
+            if moved is None:
+                return
+            yield moved
+
+    def get_rows(self, columns: Sequence[str], user_id: int | None = None) -> list:
+        """
+        Obtiene las tareas como filas ligeras de solo lectura con las columnas pedidas.
+        Además de las columnas de la tabla admite 'categorias' (nombres separados por comas).
+        :param columns: Nombres de las columnas a obtener.
+        :param user_id: ID de usuario opcional para limitar las tareas.
+        :return: Una lista de filas, ordenadas por ID de tarea.
+        """
+        table_columns = [name for name in columns if name != 'categorias']
+        expressions = dict(zip(table_columns, self._projection_columns(table_columns))) if table_columns else {}
+        if 'categorias' in columns:
+            expressions['categorias'] = _categories_subquery()
+        stmt = select(*(expressions[name] for name in columns)).order_by(Task.id_tarea)
+        if user_id is not None:
+            stmt = stmt.where(Task.id_usuario == user_id)
+        return make_rows('TaskRow', columns, self.session.execute(stmt))
+
+    def iter_export_rows(self, filters: Dict[str, Any] | None = None,
+                         chunk_size: int = 1000) -> Iterator[Sequence[Sequence[Any]]]:
+        """
+        Recorre las tareas con el nombre de su usuario y sus categorías en una sola consulta,
+        entregando las filas en bloques para mantener la memoria constante.
+        :param filters: Filtros opcionales ('id_usuario', 'estado', 'prioridad', 'id_categoria').
+        :param chunk_size: Número de filas por bloque.
+        :return: Un iterador de bloques de filas con las columnas de EXPORT_COLUMNS.
+        """
+        filters = filters or {}
+        stmt = (
+            select(
+                Task.id_tarea, Task.titulo, Task.descripcion, Task.fecha_inicio, Task.fecha_vencimiento,
+                Task.estado, Task.prioridad, Task.recurrente, Task.frecuencia, Task.id_usuario,
+                User.nombre, _categories_subquery()
+            )
+            .join(User, User.id_usuario == Task.id_usuario)
+            .order_by(Task.id_tarea)
+        )
+        for column in ('id_usuario', 'estado', 'prioridad'):
+            if filters.get(column) is not None:
+                stmt = stmt.where(getattr(Task, column) == filters[column])
+        if filters.get('id_categoria') is not None:
+            stmt = stmt.where(exists().where(
+                TaskCategory.id_tarea == Task.id_tarea,
+                TaskCategory.id_categoria == filters['id_categoria']
+            ))
+
+        result = self.session.execute(stmt.execution_options(yield_per=chunk_size))
+        try:
+            yield from result.partitions()
+        finally:
+            result.close()
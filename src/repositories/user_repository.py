@@ -1,6 +1,25 @@
+from sqlalchemy import bindparam, delete, false, func, select, update
 from sqlalchemy.orm import Session
 from src.models.user import User
+from src.models.task import Task, TaskCategory
+from src.models.notification import Notification
+from src.models.archive import ArchivedTask, ArchivedTaskCategory, ArchivedNotification
 from src.repositories.base_repository import BaseRepository
+from typing import Iterator
+
+# Consultas frecuentes construidas una sola vez: cada llamada reutiliza la sentencia, su clave de
+# caché y su SQL compilado, y solo cambia el valor del parámetro
+_ID_BY_EMAIL = select(User.id_usuario).where(User.correo == bindparam('correo')).limit(1)
+_BY_EMAIL = select(User).where(User.correo == bindparam('correo')).limit(1)
+_MARK_DELETED = (update(User).where(User.id_usuario == bindparam('usuario'), User.eliminado == false())
+                 .values(eliminado=True, version=User.version + 1))
+_NEXT_DELETED = select(User.id_usuario).where(User.eliminado).order_by(User.id_usuario).limit(1)
+# Las comprobaciones de unicidad y el borrado por lotes también ven los usuarios marcados como
+# eliminados (ver src/repositories/deletion.py)
+_INCLUDE_DELETED = {'include_deleted': True}
+# Tablas (tareas, asociaciones, notificaciones) con los datos de un usuario, activos y archivados
+_USER_DATA = ((Task.__table__, TaskCategory.__table__, Notification.__table__),
+              (ArchivedTask.__table__, ArchivedTaskCategory.__table__, ArchivedNotification.__table__))
 
 class UserRepository(BaseRepository[User]):
     """
@@ -9,3 +28,85 @@ class UserRepository(BaseRepository[User]):
     """
     def __init__(self, session: Session):
         super().__init__(session, User)
+
+    def email_exists(self, correo: str) -> bool:
+        """
+        Indica si ya hay un usuario con un correo.
+        :param correo: Correo a comprobar.
+        :return: True si el correo está registrado.
+        """
+        return self.session.scalars(_ID_BY_EMAIL, {'correo': correo},
+                                    execution_options=_INCLUDE_DELETED).first() is not None
+
+    def get_by_email(self, correo: str) -> User | None:
+        """
+        Obtiene un usuario por su correo (columna única, indexada).
+        :param correo: Correo del usuario.
+        :return: El usuario o None si no se encuentra.
+        """
+        return self.session.scalars(_BY_EMAIL, {'correo': correo}).first()
+
+    def _delete_dependents(self, user_id: int):
+        # Las tareas archivadas no tienen claves foráneas ni relación con el usuario
+        tasks, links, notifications = _USER_DATA[1]
+        archived = select(tasks.c.id_tarea).where(tasks.c.id_usuario == user_id)
+        self.session.execute(delete(notifications).where(notifications.c.id_tarea.in_(archived)))
+        self.session.execute(delete(links).where(links.c.id_tarea.in_(archived)))
+        self.session.execute(delete(tasks).where(tasks.c.id_usuario == user_id))
+
+    def mark_deleted(self, user_id: int) -> bool:
+        """
+        Marca un usuario como eliminado con un único UPDATE: deja de aparecer en las consultas
+        junto con sus tareas, notificaciones y asociaciones, que se borran después por lotes
+        con purge_deleted.
+        :param user_id: ID del usuario.
+        :return: True si se ha marcado, False si no existe o ya estaba marcado.
+        """
+        def write():
+            marked = self.session.execute(_MARK_DELETED, {'usuario': user_id},
+                                          execution_options={'synchronize_session': False}).rowcount
+            self.session.commit()
+            return marked > 0
+        return self._write(write)
+
+    def purge_deleted(self, batch_size: int = 1000) -> Iterator[int]:
+        """
+        Borra los usuarios marcados como eliminados con sus tareas, notificaciones y asociaciones
+        Tarea-Categoría, activas y archivadas. Cada lote de tareas se borra con DELETE sobre conjuntos
+        (sin cargar objetos en la sesión) en su propia transacción, de modo que otros procesos pueden
+        escribir entre lotes; el usuario se borra tras su último lote.
+        :param batch_size: Número máximo de tareas por lote.
+        :return: Un iterador con el número de tareas (activas o archivadas) borradas en cada lote.
+        """
+        while True:
+            user_id = self.session.scalar(_NEXT_DELETED, execution_options=_INCLUDE_DELETED)
+            if user_id is None:
+                return
+
+            def write_batch():
+                for tasks, links, notifications in _USER_DATA:
+                    # Mismo esquema de lotes que TaskRepository.archive_completed_before
+                    candidates = (select(tasks.c.id_tarea).where(tasks.c.id_usuario == user_id)
+                                  .order_by(tasks.c.id_tarea).limit(batch_size).subquery())
+                    bound = self.session.scalar(select(func.max(candidates.c.id_tarea)))
+                    if bound is None:
+                        continue
+                    in_batch = (tasks.c.id_usuario == user_id, tasks.c.id_tarea <= bound)
+                    batch = select(tasks.c.id_tarea).where(*in_batch)
+                    self.session.execute(delete(notifications).where(notifications.c.id_tarea.in_(batch)))
+                    self.session.execute(delete(links).where(links.c.id_tarea.in_(batch)))
+                    removed = self.session.execute(delete(tasks).where(*in_batch)).rowcount
+                    self.session.commit()
+                    return removed
+                self.session.execute(delete(User.__table__).where(User.__table__.c.id_usuario == user_id))
+                self.session.commit()
+                return None
+            while True:
+                try:
+                    removed = self._write(write_batch)
+                except Exception:
+                    self.session.rollback()
+                    raise
+                if removed is None:
+                    break
+                yield removed
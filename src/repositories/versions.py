@@ -0,0 +1,162 @@
+import os
+import sqlite3
+import threading
+import weakref
+from typing import Dict, Iterable, Tuple
+from sqlalchemy import event, inspect as sa_inspect
+from sqlalchemy.orm import Session
+from src.models import Base
+
+# Tablas que dependen de cada tabla por clave foránea, directa o indirectamente: se invalidan con
+# ella (borrados en cascada y filas ocultas al marcar un usuario o una categoría como eliminados)
+_DEPENDENTS: Dict[str, Tuple[str, ...]] = {}
+
+def _dependents(table: str) -> Tuple[str, ...]:
+    if not _DEPENDENTS:
+        direct: Dict[str, set] = {}
+        for candidate in Base.metadata.sorted_tables:
+            for fk in candidate.foreign_keys:
+                direct.setdefault(fk.column.table.name, set()).add(candidate.name)
+        for name in direct:
+            found, pending = [], list(direct[name])
+            while pending:
+                child = pending.pop()
+                if child not in found and child != name:
+                    found.append(child)
+                    pending.extend(direct.get(child, ()))
+            _DEPENDENTS[name] = tuple(found)
+    return _DEPENDENTS.get(table, ())
+
+class TableVersions:
+    """
+    Contadores de versión por tabla de una base de datos, compartidos por todas las sesiones del
+    proceso. Las escrituras hechas con una sesión (flush del ORM o INSERT/UPDATE/DELETE con
+    session.execute) incrementan la versión de sus tablas; las de otros procesos se detectan con
+    PRAGMA data_version sobre una conexión de vigilancia de solo lectura e incrementan la versión
+    global, que invalida todas las tablas.
+    """
+    _registry = weakref.WeakKeyDictionary()
+    _registry_lock = threading.Lock()
+
+    def __init__(self, db_path: str | None = None):
+        self._lock = threading.Lock()
+        self._versions: Dict[str, int] = {}
+        self._epoch = 0
+        self._watcher = None
+        self._data_version = None
+        if db_path:
+            self._watcher = sqlite3.connect(f"file:{os.path.abspath(db_path)}?mode=ro", uri=True,
+                                            check_same_thread=False)
+            self._data_version = self._read_data_version()
+
+    @classmethod
+    def for_session(cls, session: Session, create: bool = True) -> 'TableVersions | None':
+        """
+        Devuelve los contadores de la base de datos de una sesión (los del escritor si la sesión
+        reparte lecturas y escrituras).
+        :param session: La sesión.
+        :param create: Si es False, devuelve None cuando aún no existen.
+        """
+        key = getattr(session, 'writer', None) or session.bind or session
+        versions = cls._registry.get(key)
+        if versions is None and create:
+            with cls._registry_lock:
+                versions = cls._registry.get(key)
+                if versions is None:
+                    db_path = getattr(getattr(key, 'url', None), 'database', None)
+                    versions = cls(db_path if db_path and db_path != ':memory:' else None)
+                    cls._registry[key] = versions
+        return versions
+
+    def _read_data_version(self) -> int | None:
+        try:
+            return self._watcher.execute("PRAGMA data_version").fetchone()[0]
+        except sqlite3.Error:
+            return None
+
+    def poll(self):
+        """
+        Comprueba si otra conexión ha confirmado cambios y, en ese caso, invalida todas las tablas.
+        """
+        if self._watcher is None:
+            return
+        with self._lock:
+            current = self._read_data_version()
+            if current != self._data_version:
+                self._data_version = current
+                self._epoch += 1
+
+    def sync(self):
+        """
+        Toma como referencia el data_version actual tras confirmar escrituras propias, que ya han
+        incrementado sus tablas. Un cambio externo confirmado justo entre ambas cosas no se distingue
+        del propio; se detecta con el siguiente cambio externo.
+        """
+        if self._watcher is None:
+            return
+        with self._lock:
+            self._data_version = self._read_data_version()
+
+    def bump(self, tables: Iterable[str]):
+        """
+        Incrementa la versión de las tablas indicadas y de las que dependen de ellas.
+        """
+        with self._lock:
+            for table in tables:
+                for name in (table, *_dependents(table)):
+                    self._versions[name] = self._versions.get(name, 0) + 1
+
+    def snapshot(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        """
+        Devuelve la versión global seguida de la versión de cada tabla indicada.
+        """
+        with self._lock:
+            return (self._epoch, *(self._versions.get(table, 0) for table in tables))
+
+    def close(self):
+        if self._watcher is not None:
+            self._watcher.close()
+            self._watcher = None
+
+def _record_writes(session: Session, tables: Iterable[str]):
+    tables = set(tables)
+    if not tables:
+        return
+    versions = TableVersions.for_session(session, create=False)
+    if versions is None:
+        return
+    session.info.setdefault('_written_tables', set()).update(tables)
+    # Se incrementa al escribir (lecturas posteriores en la misma transacción) y al terminarla
+    versions.bump(tables)
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session, flush_context):
+    tables = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        tables.update(table.name for table in sa_inspect(obj).mapper.tables)
+    _record_writes(session, tables)
+
+@event.listens_for(Session, "do_orm_execute")
+def _on_execute(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, 'table', None)
+        if table is not None:
+            _record_writes(orm_execute_state.session, [table.name])
+
+def _end_transaction(session, sync: bool):
+    written = session.info.pop('_written_tables', None)
+    if not written:
+        return
+    versions = TableVersions.for_session(session, create=False)
+    if versions is not None:
+        versions.bump(written)
+        if sync:
+            versions.sync()
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session):
+    _end_transaction(session, sync=True)
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session):
+    _end_transaction(session, sync=False)
@@ -2,3 +2,8 @@ from .user_service import UserService
 from .task_service import TaskService
 from .category_service import CategoryService
 from .notification_service import NotificationService
+from .import_service import ImportService, ImportResult
+from .change_log_service import ChangeLogService
+from .analytics_service import TaskAnalyticsService
+from .purge_service import DeletionPurger
+from .cache import QueryCache, CacheStats, cached_query
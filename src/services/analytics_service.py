@@ -0,0 +1,143 @@
+from datetime import date
+from sqlalchemy import and_, case, func, literal, or_, select, union
+from sqlalchemy.orm import Session
+from src.models.task import Task, TaskCategory, TaskPriority, TaskState
+from src.models.user import User
+from src.models.archive import ArchivedTaskCategory
+from src.models.task_state_history import TaskStateChange
+from src.models.types import epoch_seconds
+from typing import Dict
+
+# Marca de fecha ausente en las columnas de task_columns (igual a task_columns.NO_DATE)
+_NO_DATE = -2 ** 63
+
+# Usuarios marcados como eliminados (borrado diferido), cuyas tareas no cuentan en la analítica:
+# task_columns lee el cursor sin pasar por los criterios de src/repositories/deletion.py y el
+# historial no tiene criterio propio. Usa la tabla, no la entidad, como esos criterios.
+_DELETED_USERS = select(User.__table__.c.id_usuario).where(User.__table__.c.eliminado)
+
+def _epoch(column):
+    return func.coalesce(epoch_seconds(column), literal(_NO_DATE))
+
+def _codes(column, enum_class):
+    return case(*((column == member, code) for code, member in enumerate(enum_class)))
+
+def _is_open(state_column):
+    return and_(state_column.is_not(None), state_column != TaskState.COMPLETADA)
+
+class TaskAnalyticsService:
+    """
+    Servicio de analítica de tareas. Para las series diarias, SQLite agrega por día el historial
+    de estados (task_state_history) y NumPy construye las series completas, por lo que el coste no
+    depende del número de días sin cambios; las distribuciones de edad, retraso y tiempo de
+    finalización se calculan con NumPy sobre las columnas de las tareas (TaskColumns).
+    """
+    def __init__(self, session: Session):
+        self.session = session
+
+    def _daily_changes(self, user_id: int | None, category_id: int | None):
+        """
+        Agrega el historial por día: tareas creadas, completadas y variación de tareas abiertas.
+        """
+        history = TaskStateChange
+        # Días desde la época Unix, como datetime64[D] de NumPy
+        day = epoch_seconds(history.fecha) // 86400
+        completed = and_(history.estado_nuevo == TaskState.COMPLETADA,
+                         or_(history.estado_anterior.is_(None), history.estado_anterior != TaskState.COMPLETADA))
+        open_delta = (case((_is_open(history.estado_nuevo), 1), else_=0)
+                      - case((_is_open(history.estado_anterior), 1), else_=0))
+        stmt = select(
+            day.label('dia'),
+            func.sum(case((and_(history.estado_anterior.is_(None), history.estado_nuevo.is_not(None)), 1), else_=0)),
+            func.sum(case((completed, 1), else_=0)),
+            func.sum(open_delta),
+        ).where(history.id_usuario.not_in(_DELETED_USERS)).group_by('dia').order_by('dia')
+        if user_id is not None:
+            stmt = stmt.where(history.id_usuario == user_id)
+        if category_id is not None:
+            in_category = union(
+                select(TaskCategory.id_tarea).where(TaskCategory.id_categoria == category_id),
+                select(ArchivedTaskCategory.id_tarea).where(ArchivedTaskCategory.id_categoria == category_id),
+            )
+            stmt = stmt.where(history.id_tarea.in_(in_category))
+        return self.session.execute(stmt).all()
+
+    def task_columns(self, user_id: int | None = None):
+        """
+        Obtiene en una sola consulta las columnas de las tareas como arrays de NumPy: usuario,
+        estado y prioridad como códigos enteros, y fechas de inicio, vencimiento y finalización
+        (último paso a completada del historial) en segundos desde la época Unix.
+        :param user_id: ID de usuario opcional.
+        :return: TaskColumns con una posición por tarea.
+        """
+        # Importación diferida: NumPy solo se carga al usar la analítica
+        from src.services.task_columns import TaskColumns
+
+        if user_id is not None and (not isinstance(user_id, int) or user_id <= 0):
+            raise ValueError("El ID de usuario debe ser un entero positivo.")
+        history = TaskStateChange
+        # Subconsulta correlacionada por índice (id_tarea) solo para las tareas completadas
+        completed_at = (select(func.max(history.fecha))
+                        .where(history.id_tarea == Task.id_tarea, history.estado_nuevo == TaskState.COMPLETADA)
+                        .scalar_subquery())
+        stmt = select(
+            Task.id_usuario,
+            _codes(Task.estado, TaskState),
+            _codes(Task.prioridad, TaskPriority),
+            _epoch(Task.fecha_inicio),
+            _epoch(Task.fecha_vencimiento),
+            _epoch(case((Task.estado == TaskState.COMPLETADA, completed_at))),
+        ).where(Task.id_usuario.not_in(_DELETED_USERS))
+        if user_id is not None:
+            stmt = stmt.where(Task.id_usuario == user_id)
+        # Las columnas son enteros sin conversión de tipos: se leen las tuplas del cursor DBAPI,
+        # sin construir filas de SQLAlchemy
+        connection = self.session.connection(bind_arguments={'clause': stmt})
+        return TaskColumns.from_rows(connection.execute(stmt).cursor.fetchall())
+
+    def daily_series(self, start: date | None = None, end: date | None = None,
+                     user_id: int | None = None, category_id: int | None = None) -> Dict[str, object]:
+        """
+        Obtiene las series diarias de tareas creadas, completadas y abiertas al final de cada día
+        (burndown), para todas las tareas o las de un usuario o una categoría. Las categorías son
+        las actuales de cada tarea (o las que tenía al archivarse).
+        :param start: Primer día (por defecto, el del primer cambio registrado).
+        :param end: Último día (por defecto, hoy).
+        :param user_id: ID de usuario opcional.
+        :param category_id: ID de categoría opcional.
+        :return: Diccionario con arrays de NumPy de la misma longitud: 'fecha' (datetime64[D]),
+                 'creadas', 'completadas' y 'abiertas'.
+        """
+        # Importación diferida: NumPy solo se carga al usar la analítica
+        import numpy as np
+
+        for name, value in (('usuario', user_id), ('categoría', category_id)):
+            if value is not None and (not isinstance(value, int) or value <= 0):
+                raise ValueError(f"El ID de {name} debe ser un entero positivo.")
+        for name, value in (('inicial', start), ('final', end)):
+            if value is not None and not isinstance(value, date):
+                raise ValueError(f"La fecha {name} debe ser una fecha.")
+        end_day = np.datetime64(end or date.today(), 'D').astype(np.int64)
+        rows = self._daily_changes(user_id, category_id)
+        changes = np.array(rows, dtype=np.int64).reshape(-1, 4)
+        first_day = min(int(changes[0, 0]), int(end_day)) if len(changes) else int(end_day)
+        start_day = np.datetime64(start, 'D').astype(np.int64) if start else first_day
+        if start_day > end_day:
+            raise ValueError("La fecha inicial debe ser anterior o igual a la final.")
+
+        # Series completas desde el primer día con cambios; los abiertos se acumulan desde ahí
+        origin = min(first_day, int(start_day))
+        length = int(end_day) - origin + 1
+        changes = changes[changes[:, 0] <= end_day]
+        offsets = changes[:, 0] - origin
+        series = np.zeros((3, length), dtype=np.int64)
+        series[:, offsets] = changes[:, 1:].T
+        opened = np.cumsum(series[2])
+
+        window = slice(int(start_day) - origin, length)
+        return {
+            'fecha': np.arange(start_day, end_day + 1).astype('datetime64[D]'),
+            'creadas': series[0, window],
+            'completadas': series[1, window],
+            'abiertas': opened[window],
+        }
@@ -0,0 +1,140 @@
+import functools
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Sequence
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from src.repositories.versions import TableVersions
+
+class CacheStats:
+    """
+    Métricas de una caché de consultas.
+    """
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Proporción de llamadas servidas desde la caché."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __repr__(self):
+        return (f"<CacheStats(hits={self.hits}, misses={self.misses}, invalidations={self.invalidations}, "
+                f"evictions={self.evictions}, hit_rate={self.hit_rate:.1%})>")
+
+class QueryCache:
+    """
+    Caché LRU de resultados de consultas de un servicio, con clave (método, argumentos). Cada
+    entrada guarda la versión de las tablas de las que depende y se descarta en cuanto alguna
+    cambia (ver TableVersions), de modo que nunca se devuelve un resultado anterior a una escritura.
+    """
+    def __init__(self, versions: TableVersions, maxsize: int = 256, ttl: float | None = None):
+        """
+        :param versions: Contadores de versión de la base de datos.
+        :param maxsize: Número máximo de entradas; se descartan las menos usadas recientemente.
+        :param ttl: Segundos de validez opcionales de cada entrada, además de la invalidación.
+        """
+        if maxsize <= 0:
+            raise ValueError("El tamaño máximo de la caché debe ser un entero positivo.")
+        self.versions = versions
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    @classmethod
+    def for_session(cls, session: Session, **kwargs) -> 'QueryCache':
+        """
+        Crea una caché sobre los contadores de versión de la base de datos de la sesión. Los
+        resultados con objetos ORM de la sesión dejan de ser válidos al terminar su transacción
+        (commit, rollback o close), porque sus objetos quedan expirados o separados de ella.
+        """
+        cache = cls(TableVersions.for_session(session), **kwargs)
+        ref = weakref.ref(cache)
+
+        def on_transaction_end(session, transaction):
+            target = ref()
+            if target is not None and transaction.parent is None:
+                target._generation += 1
+
+        event.listen(session, "after_transaction_end", on_transaction_end)
+        return cache
+
+    def get_or_load(self, key: Hashable, tables: Sequence[str], loader: Callable[[], Any],
+                    session_bound: bool = False) -> Any:
+        """
+        Devuelve el resultado guardado para `key` si sus tablas no han cambiado; si no, lo calcula.
+        :param key: Clave de la consulta.
+        :param tables: Tablas que lee la consulta.
+        :param loader: Función que ejecuta la consulta.
+        :param session_bound: True si el resultado contiene objetos ORM de la sesión.
+        :return: El resultado de la consulta.
+        """
+        self.versions.poll()
+        snapshot = self.versions.snapshot(tables)
+        if session_bound:
+            snapshot += (self._generation,)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] == snapshot and (entry[1] is None or entry[1] > now):
+                    self._entries.move_to_end(key)
+                    self.stats.hits += 1
+                    return entry[2]
+                del self._entries[key]
+                self.stats.invalidations += 1
+            self.stats.misses += 1
+
+        value = loader()
+        expires = now + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (snapshot, expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+        return value
+
+    def clear(self):
+        """
+        Vacía la caché (las métricas se conservan).
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+def cached_query(*tables: str, orm: bool = False):
+    """
+    Decorador para métodos de listado de un servicio con atributo `cache` (QueryCache): guarda el
+    resultado con clave (método, argumentos) y dependiente de `tables`. Las listas se devuelven
+    como copia para que el llamador pueda modificarlas sin alterar la caché. Si los argumentos no
+    son hashables, la consulta se ejecuta sin caché.
+    :param tables: Tablas que lee el método.
+    :param orm: True si el método devuelve objetos ORM (solo válidos hasta el fin de la transacción).
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache = getattr(self, 'cache', None)
+            key = (method.__name__, args, tuple(sorted(kwargs.items())))
+            try:
+                hash(key)
+            except TypeError:
+                cache = None
+            if cache is None:
+                return method(self, *args, **kwargs)
+            value = cache.get_or_load(key, tables, lambda: method(self, *args, **kwargs), session_bound=orm)
+            return list(value) if isinstance(value, list) else value
+        return wrapper
+    return decorator
@@ -1,7 +1,9 @@
 from sqlalchemy.orm import Session
 from src.repositories.category_repository import CategoryRepository
 from src.models.category import Category
-from typing import List, Dict, Any
+from src.services.validators import CATEGORY_VALIDATOR
+from src.services.cache import QueryCache, cached_query
+from typing import List, Dict, Any, Iterable, Tuple
 
 class CategoryService:
     """
@@ -9,24 +11,27 @@ class CategoryService:
     """
     def __init__(self, session: Session):
         self.repository = CategoryRepository(session)
+        self.cache = QueryCache.for_session(session)
 
-    def _validate_category_data(self, data: Dict[str, Any], is_new: bool = True):
+    def _validate_category_data(self, data: Dict[str, Any], is_new: bool = True, known_names=None):
         """
         Valida los datos de una categoría.
         :param data: Diccionario con los datos de la categoría.
         :param is_new: True si es una creación, False si es una actualización.
+        :param known_names: Conjunto opcional de nombres ya registrados; si se indica,
+                            se usa en lugar de consultar la base de datos.
         :raises ValueError: Si los datos no son válidos.
         """
+        CATEGORY_VALIDATOR.check(data, is_new)
         if is_new:
-            if 'nombre' not in data or not isinstance(data['nombre'], str) or not data['nombre'].strip():
-                raise ValueError("El nombre de la categoría es obligatorio y debe ser una cadena no vacía.")
             # Basic check for existing name, more robust check would be in repository/DB constraint
-            if self.repository.session.query(Category).filter_by(nombre=data['nombre']).first():
+            if known_names is not None:
+                name_taken = data['nombre'] in known_names
+            else:
+                name_taken = self.repository.name_exists(data['nombre'])
+            if name_taken:
                 raise ValueError(f"Ya existe una categoría con el nombre: {data['nombre']}")
 
-        if 'nombre' in data and (not isinstance(data['nombre'], str) or not data['nombre'].strip()):
-            raise ValueError("El nombre de la categoría debe ser una cadena no vacía.")
-
     def create_category(self, category_data: Dict[str, Any]) -> Category:
         """
         Crea una nueva categoría después de validar los datos.
@@ -46,6 +51,7 @@ class CategoryService:
             raise ValueError("El ID de categoría debe ser un entero positivo.")
         return self.repository.get_by_id(category_id)
 
+    @cached_query('categories', orm=True)
     def get_all_categories(self) -> List[Category]:
         """
         Obtiene todas las categorías.
@@ -53,24 +59,44 @@ class CategoryService:
         """
         return self.repository.get_all()
 
-    def update_category(self, category_id: int, update_data: Dict[str, Any]) -> Category | None:
+    def lookup_categories(self, prefix: str | None = None, after_id: int | None = None,
+                          ids: Iterable[int] | None = None, limit: int | None = 50) -> List[Tuple[int, str]]:
+        """
+        Obtiene pares (ID, nombre) de categorías para listas de selección y autocompletado.
+        :param prefix: Texto inicial del nombre, para el autocompletado.
+        :param after_id: ID a partir del cual continuar (paginación).
+        :param ids: IDs concretos a obtener.
+        :param limit: Número máximo de pares.
+        :return: Una lista de tuplas (ID, nombre) ordenadas por ID.
+        """
+        return self.repository.lookup('nombre', prefix, after_id, ids, limit)
+
+    def update_category(self, category_id: int, update_data: Dict[str, Any],
+                        expected_version: int | None = None) -> Category | None:
         """
         Actualiza una categoría existente después de validar los datos.
         :param category_id: ID de la categoría a actualizar.
         :param update_data: Diccionario con los datos a actualizar.
+        :param expected_version: Versión leída (atributo version); si se indica y ha cambiado,
+                                 no se actualiza y se lanza ConcurrentUpdateError.
         :return: La categoría actualizada o None.
         """
         if not isinstance(category_id, int) or category_id <= 0:
             raise ValueError("El ID de categoría debe ser un entero positivo.")
         self._validate_category_data(update_data, is_new=False)
-        return self.repository.update(category_id, update_data)
+        return self.repository.update(category_id, update_data, expected_version)
 
-    def delete_category(self, category_id: int) -> bool:
+    def delete_category(self, category_id: int, deferred: bool = False) -> bool:
         """
         Elimina una categoría por su ID.
+        Con `deferred`, la categoría solo se marca como eliminada (deja de aparecer en las
+        consultas al instante) y DeletionPurger borra después sus asociaciones por lotes.
         :param category_id: ID de la categoría a eliminar.
+        :param deferred: True para marcarla y diferir el borrado de sus asociaciones.
         :return: True si se eliminó con éxito, False en caso contrario.
         """
         if not isinstance(category_id, int) or category_id <= 0:
             raise ValueError("El ID de categoría debe ser un entero positivo.")
+        if deferred:
+            return self.repository.mark_deleted(category_id)
         return self.repository.delete(category_id)
@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from src.database.changes import TRACKED_TABLES
+from src.repositories.change_log_repository import ChangeLogRepository
+from typing import Callable, Iterable
+
+class ChangeLogService:
+    """
+    Servicio para consultar y compactar el registro de cambios (change_log). Los consumidores
+    guardan el último número de secuencia procesado y piden periódicamente los cambios posteriores.
+    """
+    def __init__(self, session: Session):
+        self.repository = ChangeLogRepository(session)
+
+    def changes_since(self, seq: int = 0, limit: int = 1000, tables: Iterable[str] | None = None) -> list:
+        """
+        Obtiene los cambios posteriores a un número de secuencia.
+        :param seq: Último número de secuencia ya procesado (0 para empezar desde el principio).
+        :param limit: Número máximo de cambios.
+        :param tables: Tablas de las que obtener cambios (por defecto, todas las vigiladas).
+        :return: Una lista de filas (seq, tabla, clave, operacion, columnas, fecha) en orden de secuencia.
+        """
+        if not isinstance(seq, int) or seq < 0:
+            raise ValueError("El número de secuencia debe ser un entero no negativo.")
+        if not isinstance(limit, int) or limit <= 0:
+            raise ValueError("El límite debe ser un entero positivo.")
+        if tables is not None:
+            tables = list(tables)
+            unknown = [table for table in tables if table not in TRACKED_TABLES]
+            if unknown:
+                raise ValueError(f"Tablas sin registro de cambios: {unknown}. Valores permitidos: {list(TRACKED_TABLES)}")
+        return self.repository.since(seq, limit, tables)
+
+    def last_seq(self) -> int:
+        """
+        Obtiene el último número de secuencia registrado (0 si no hay cambios).
+        """
+        return self.repository.last_seq()
+
+    def compact_changes(self, up_to_seq: int | None = None, older_than_days: int | None = None,
+                        batch_size: int = 5000, progress: Callable[[int], None] | None = None) -> int:
+        """
+        Elimina las entradas antiguas del registro: las que tienen secuencia hasta `up_to_seq`
+        (normalmente la menor ya procesada por todos los consumidores) y, si se indica, más de
+        `older_than_days` días. Los números de secuencia no se reutilizan.
+        :param up_to_seq: Última secuencia a eliminar (por defecto, todas).
+        :param older_than_days: Antigüedad mínima en días de las entradas a eliminar.
+        :param batch_size: Número de entradas por lote y transacción.
+        :param progress: Función opcional que recibe el total eliminado tras cada lote.
+        :return: El número de entradas eliminadas.
+        """
+        if up_to_seq is None and older_than_days is None:
+            raise ValueError("Indica la secuencia o la antigüedad hasta la que compactar.")
+        if up_to_seq is not None and (not isinstance(up_to_seq, int) or up_to_seq < 0):
+            raise ValueError("El número de secuencia debe ser un entero no negativo.")
+        if older_than_days is not None and (not isinstance(older_than_days, int) or older_than_days < 0):
+            raise ValueError("La antigüedad en días debe ser un entero no negativo.")
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError("El tamaño de lote debe ser un entero positivo.")
+        cutoff = datetime.now() - timedelta(days=older_than_days) if older_than_days is not None else None
+        bound = self.repository.last_seq() if up_to_seq is None else up_to_seq
+        total = 0
+        for removed in self.repository.compact(bound, cutoff, batch_size):
+            total += removed
+            if progress:
+                progress(total)
+        return total
@@ -0,0 +1,247 @@
+import json
+from contextlib import ExitStack
+from datetime import datetime
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from src.models.user import User
+from src.models.category import Category
+from src.models.task import Task, TaskCategory, TaskState, TaskPriority
+from src.services.user_service import UserService
+from src.services.task_service import TaskService
+from src.services.category_service import CategoryService
+from src.utils.streams import open_text_input, open_text_output, iter_records, EXPORT_FORMATS
+from typing import Any, Callable, Dict, List, Tuple
+
+# Valores por defecto de las columnas de Task, para que todas las filas de un lote
+# tengan las mismas claves en el INSERT masivo
+_TASK_DEFAULTS = {
+    'descripcion': None,
+    'fecha_vencimiento': None,
+    'estado': TaskState.PENDIENTE,
+    'prioridad': TaskPriority.MEDIA,
+    'recurrente': False,
+    'frecuencia': None,
+}
+
+_TRUE_STRINGS = {'true', '1', 'si', 'sí', 'yes'}
+_FALSE_STRINGS = {'false', '0', 'no'}
+
+class ImportResult:
+    """
+    Resumen de una importación.
+    """
+    def __init__(self):
+        self.total = 0
+        self.inserted = 0
+        self.rejected = 0
+
+    def __repr__(self):
+        return f"<ImportResult(total={self.total}, inserted={self.inserted}, rejected={self.rejected})>"
+
+class ImportService:
+    """
+    Servicio para importar usuarios, categorías y tareas de forma masiva desde CSV o JSONL.
+    Los registros se leen en flujo, se validan por lotes con las mismas reglas que los
+    servicios de cada entidad (resolviendo las referencias con mapas en memoria) y se
+    insertan con un INSERT masivo por lote, en una transacción por lote.
+    """
+    def __init__(self, session: Session):
+        self.session = session
+        self.user_service = UserService(session)
+        self.task_service = TaskService(session)
+        self.category_service = CategoryService(session)
+
+    # --- Puntos de entrada ---
+    def import_users(self, source, fmt: str, rejects=None, batch_size: int = 1000,
+                     progress: Callable[[int], None] | None = None) -> ImportResult:
+        """
+        Importa usuarios. Los correos ya registrados o repetidos en el archivo se rechazan. Las
+        contraseñas de cada lote se convierten en hashes en paralelo en el pool de procesos.
+        :param source: Ruta o flujo de origen.
+        :param fmt: 'csv' o 'jsonl'.
+        :param rejects: Ruta o flujo opcional donde escribir los registros rechazados (JSONL).
+        :param batch_size: Número de registros por lote y transacción.
+        :param progress: Función opcional que recibe el total de registros procesados tras cada lote.
+        :return: El resumen de la importación.
+        """
+        known_emails = set(self.session.scalars(select(User.correo)))
+
+        def prepare(record):
+            data = _pick(record, ('nombre', 'correo', 'contrasena'))
+            self.user_service._validate_user_data(data, is_new=True, known_emails=known_emails)
+            known_emails.add(data['correo'])
+            return data
+
+        def insert_batch(rows):
+            hashes = self.user_service.hasher.hash_many(row['contrasena'] for row in rows)
+            self.session.execute(insert(User), [{**row, 'contrasena': hashed} for row, hashed in zip(rows, hashes)])
+
+        return self._run(source, fmt, rejects, batch_size, progress, prepare, insert_batch)
+
+    def import_categories(self, source, fmt: str, rejects=None, batch_size: int = 1000,
+                          progress: Callable[[int], None] | None = None) -> ImportResult:
+        """
+        Importa categorías. Los nombres ya registrados o repetidos en el archivo se rechazan.
+        Los parámetros son los mismos que en import_users.
+        :return: El resumen de la importación.
+        """
+        known_names = set(self.session.scalars(select(Category.nombre)))
+
+        def prepare(record):
+            data = _pick(record, ('nombre',))
+            self.category_service._validate_category_data(data, is_new=True, known_names=known_names)
+            known_names.add(data['nombre'])
+            return data
+
+        def insert_batch(rows):
+            self.session.execute(insert(Category), rows)
+
+        return self._run(source, fmt, rejects, batch_size, progress, prepare, insert_batch)
+
+    def import_tasks(self, source, fmt: str, rejects=None, batch_size: int = 1000,
+                     progress: Callable[[int], None] | None = None) -> ImportResult:
+        """
+        Importa tareas. El usuario se indica con 'id_usuario' o con 'correo_usuario', y las
+        categorías con 'categorias' (nombres separados por comas o lista JSON).
+        Los parámetros son los mismos que en import_users.
+        :return: El resumen de la importación.
+        """
+        user_ids_by_email = dict(self.session.execute(select(User.correo, User.id_usuario)).all())
+        known_user_ids = set(user_ids_by_email.values())
+        category_ids_by_name = dict(self.session.execute(select(Category.nombre, Category.id_categoria)).all())
+
+        def prepare(record):
+            data = _coerce_task_record(record)
+            if data.get('id_usuario') is None and record.get('correo_usuario') is not None:
+                if record['correo_usuario'] not in user_ids_by_email:
+                    raise ValueError(f"El usuario con correo {record['correo_usuario']} no existe.")
+                data['id_usuario'] = user_ids_by_email[record['correo_usuario']]
+            elif data.get('id_usuario') is None:
+                data.pop('id_usuario', None)
+            self.task_service._validate_task_data(data, is_new=True, known_user_ids=known_user_ids)
+
+            category_ids = []
+            for name in _split_names(record.get('categorias')):
+                if name not in category_ids_by_name:
+                    raise ValueError(f"La categoría con nombre {name} no existe.")
+                category_ids.append(category_ids_by_name[name])
+            row = {**_TASK_DEFAULTS, 'fecha_inicio': datetime.now(), **data}
+            return row, list(dict.fromkeys(category_ids))
+
+        def insert_batch(prepared):
+            rows = [row for row, _ in prepared]
+            task_ids = self.session.scalars(
+                insert(Task).returning(Task.id_tarea, sort_by_parameter_order=True), rows
+            ).all()
+            links = [
+                {'id_tarea': task_id, 'id_categoria': category_id}
+                for task_id, (_, category_ids) in zip(task_ids, prepared)
+                for category_id in category_ids
+            ]
+            if links:
+                self.session.execute(insert(TaskCategory), links)
+
+        return self._run(source, fmt, rejects, batch_size, progress, prepare, insert_batch)
+
+    # --- Canalización común ---
+    def _run(self, source, fmt, rejects, batch_size, progress, prepare, insert_batch) -> ImportResult:
+        """
+        Lee, valida e inserta los registros por lotes, escribiendo los rechazados.
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Formato de importación inválido. Valores permitidos: {list(EXPORT_FORMATS)}")
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError("El tamaño de lote debe ser un entero positivo.")
+
+        result = ImportResult()
+        with ExitStack() as stack:
+            stream = stack.enter_context(open_text_input(source))
+            reject_stream = stack.enter_context(open_text_output(rejects)) if rejects is not None else None
+
+            def reject(line_no, record, errors):
+                result.rejected += 1
+                if reject_stream is not None:
+                    entry = {'linea': line_no, 'errores': errors, 'registro': record}
+                    reject_stream.write(json.dumps(entry, ensure_ascii=False, default=str) + '\n')
+
+            batch: List[Tuple[int, Dict[str, Any], Any]] = []
+            for line_no, record, error in iter_records(fmt, stream):
+                result.total += 1
+                if error is None:
+                    try:
+                        batch.append((line_no, record, prepare(record)))
+                    except ValueError as e:
+                        error = str(e)
+                if error is not None:
+                    reject(line_no, record, [error])
+                if len(batch) >= batch_size:
+                    self._flush(batch, insert_batch, result, reject)
+                    batch = []
+                    if progress:
+                        progress(result.total)
+            if batch:
+                self._flush(batch, insert_batch, result, reject)
+            if progress:
+                progress(result.total)
+        return result
+
+    def _flush(self, batch, insert_batch, result: ImportResult, reject):
+        """
+        Inserta un lote en una sola transacción. Si el lote viola alguna restricción de la
+        base de datos, se reintenta registro a registro para aislar los rechazados.
+        """
+        try:
+            insert_batch([prepared for _, _, prepared in batch])
+            self.session.commit()
+            result.inserted += len(batch)
+            return
+        except IntegrityError:
+            self.session.rollback()
+
+        for line_no, record, prepared in batch:
+            try:
+                insert_batch([prepared])
+                self.session.commit()
+                result.inserted += 1
+            except IntegrityError as e:
+                self.session.rollback()
+                reject(line_no, record, [f"Error de integridad: {e.orig}"])
+
+def _pick(record: Dict[str, Any], keys) -> Dict[str, Any]:
+    """Copia del registro solo las claves presentes y no vacías."""
+    return {key: record[key] for key in keys if record.get(key) is not None}
+
+def _split_names(value) -> List[str]:
+    """Interpreta una lista de nombres (lista JSON o texto separado por comas)."""
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [str(name).strip() for name in value if str(name).strip()]
+    return [name.strip() for name in str(value).split(',') if name.strip()]
+
+def _coerce_task_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convierte los valores de texto de un registro de tarea a los tipos que espera el validador.
+    Los valores que no se pueden convertir se dejan tal cual para que el validador los rechace.
+    """
+    data = _pick(record, ('titulo', 'descripcion', 'fecha_inicio', 'fecha_vencimiento',
+                          'estado', 'prioridad', 'recurrente', 'frecuencia', 'id_usuario'))
+    if isinstance(data.get('id_usuario'), str):
+        try:
+            data['id_usuario'] = int(data['id_usuario'])
+        except ValueError:
+            pass
+    for key in ('fecha_inicio', 'fecha_vencimiento'):
+        if isinstance(data.get(key), str):
+            try:
+                data[key] = datetime.fromisoformat(data[key])
+            except ValueError:
+                pass
+    if isinstance(data.get('recurrente'), str):
+        flag = data['recurrente'].strip().lower()
+        if flag in _TRUE_STRINGS:
+            data['recurrente'] = True
+        elif flag in _FALSE_STRINGS:
+            data['recurrente'] = False
+    return data
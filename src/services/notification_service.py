@@ -2,8 +2,9 @@ from sqlalchemy.orm import Session
 from src.repositories.notification_repository import NotificationRepository
 from src.models.notification import Notification
 from src.models.task import Task
+from src.services.validators import NOTIFICATION_VALIDATOR
+from src.services.cache import QueryCache, cached_query
 from typing import List, Dict, Any
-from datetime import datetime
 
 class NotificationService:
     """
@@ -12,6 +13,7 @@ class NotificationService:
     def __init__(self, session: Session):
         self.repository = NotificationRepository(session)
         self.session = session
+        self.cache = QueryCache.for_session(session)
 
     def _validate_notification_data(self, data: Dict[str, Any], is_new: bool = True):
         """
@@ -20,18 +22,12 @@ class NotificationService:
         :param is_new: True si es una creación, False si es una actualización.
         :raises ValueError: Si los datos no son válidos.
         """
+        NOTIFICATION_VALIDATOR.check(data, is_new)
         if is_new:
-            if 'id_tarea' not in data:
-                raise ValueError("El ID de tarea es obligatorio para crear una notificación.")
-            if not isinstance(data['id_tarea'], int) or data['id_tarea'] <= 0:
-                raise ValueError("El ID de tarea debe ser un entero positivo.")
             # Check if task exists
-            if not self.session.query(Task).get(data['id_tarea']):
+            if self.session.get(Task, data['id_tarea']) is None:
                 raise ValueError(f"La tarea con ID {data['id_tarea']} no existe.")
 
-        if 'fecha_envio' in data and not isinstance(data['fecha_envio'], datetime):
-            raise ValueError("La fecha de envío debe ser un objeto datetime.")
-
     def create_notification(self, notification_data: Dict[str, Any]) -> Notification:
         """
         Crea una nueva notificación después de validar los datos.
@@ -51,6 +47,7 @@ class NotificationService:
             raise ValueError("El ID de notificación debe ser un entero positivo.")
         return self.repository.get_by_id(notification_id)
 
+    @cached_query('notifications', orm=True)
     def get_all_notifications(self) -> List[Notification]:
         """
         Obtiene todas las notificaciones.
@@ -58,17 +55,20 @@ class NotificationService:
         """
         return self.repository.get_all()
 
-    def update_notification(self, notification_id: int, update_data: Dict[str, Any]) -> Notification | None:
+    def update_notification(self, notification_id: int, update_data: Dict[str, Any],
+                            expected_version: int | None = None) -> Notification | None:
         """
         Actualiza una notificación existente después de validar los datos.
         :param notification_id: ID de la notificación a actualizar.
         :param update_data: Diccionario con los datos a actualizar.
+        :param expected_version: Versión leída (atributo version); si se indica y ha cambiado,
+                                 no se actualiza y se lanza ConcurrentUpdateError.
         :return: La notificación actualizada o None.
         """
         if not isinstance(notification_id, int) or notification_id <= 0:
             raise ValueError("El ID de notificación debe ser un entero positivo.")
         self._validate_notification_data(update_data, is_new=False)
-        return self.repository.update(notification_id, update_data)
+        return self.repository.update(notification_id, update_data, expected_version)
 
     def delete_notification(self, notification_id: int) -> bool:
         """
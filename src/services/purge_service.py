@@ -0,0 +1,94 @@
+import threading
+import time
+from sqlalchemy.orm import Session
+from src.repositories.user_repository import UserRepository
+from src.repositories.category_repository import CategoryRepository
+from typing import Callable, Dict
+
+class DeletionPurger:
+    """
+    Trabajo en segundo plano que borra los usuarios y categorías marcados como eliminados
+    (UserService.delete_user y CategoryService.delete_category con deferred=True) con sus datos.
+    Borra por lotes, cada uno en su propia transacción, y espera `pause` segundos entre lotes para
+    dejar libre el bloqueo de escritura a los demás procesos y sesiones.
+    """
+    def __init__(self, session_factory: Callable[[], Session], batch_size: int = 1000,
+                 pause: float = 0.05, interval: float = 60.0):
+        """
+        :param session_factory: Fábrica de sesiones; el trabajo usa una sesión propia.
+        :param batch_size: Número de tareas (o asociaciones) por lote y transacción.
+        :param pause: Segundos de espera entre lotes.
+        :param interval: Segundos entre comprobaciones del hilo si no se le avisa antes con wake.
+        """
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError("El tamaño de lote debe ser un entero positivo.")
+        if pause < 0 or interval <= 0:
+            raise ValueError("La pausa no puede ser negativa y el intervalo debe ser positivo.")
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.pause = pause
+        self.interval = interval
+        self.last_error: Exception | None = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def purge(self, progress: Callable[[Dict[str, int]], None] | None = None) -> Dict[str, int]:
+        """
+        Borra todos los usuarios y categorías marcados como eliminados.
+        :param progress: Función opcional que recibe los totales tras cada lote.
+        :return: Diccionario con las tareas y asociaciones de categorías borradas.
+        """
+        totals = {'tareas': 0, 'asociaciones': 0}
+        session = self.session_factory()
+        try:
+            for key, batches in (('tareas', UserRepository(session).purge_deleted(self.batch_size)),
+                                 ('asociaciones', CategoryRepository(session).purge_deleted(self.batch_size))):
+                for removed in batches:
+                    totals[key] += removed
+                    if progress:
+                        progress(dict(totals))
+                    if self._stop.is_set():
+                        return totals
+                    if self.pause:
+                        time.sleep(self.pause)
+        finally:
+            session.close()
+        return totals
+
+    def start(self):
+        """
+        Arranca el hilo, que purga al arrancar, cada `interval` segundos y al recibir wake.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="DeletionPurger", daemon=True)
+        self._thread.start()
+
+    def wake(self):
+        """
+        Avisa al hilo de que hay borrados nuevos para que no espere al siguiente intervalo.
+        """
+        self._wake.set()
+
+    def stop(self, timeout: float | None = None):
+        """
+        Detiene el hilo tras el lote en curso; lo que quede se borra en el siguiente arranque.
+        """
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                self.purge()
+                self.last_error = None
+            except Exception as e:
+                # Se reintenta en la siguiente vuelta; los lotes ya confirmados no se repiten
+                self.last_error = e
+            self._wake.wait(self.interval)
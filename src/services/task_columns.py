@@ -0,0 +1,163 @@
+from datetime import datetime
+from itertools import chain
+from typing import Dict, Sequence
+import numpy as np
+from src.models.task import TaskState, TaskPriority
+
+# Códigos enteros de los enums: posición del miembro en la enumeración
+STATES = tuple(TaskState)
+PRIORITIES = tuple(TaskPriority)
+COMPLETED_CODE = STATES.index(TaskState.COMPLETADA)
+# Marca de fecha ausente en las columnas de segundos desde la época Unix
+NO_DATE = np.iinfo(np.int64).min
+SECONDS_PER_DAY = 86400.0
+METRICS = ('edad', 'retraso', 'finalizacion')
+
+def epoch_seconds(moment: datetime) -> int:
+    """
+    Convierte una fecha sin zona horaria en segundos desde la época Unix, como strftime('%s') de SQLite.
+    """
+    return int((moment - datetime(1970, 1, 1)).total_seconds())
+
+class TaskColumns:
+    """
+    Columnas de las tareas como arrays de NumPy alineados (una posición por tarea): usuario, códigos
+    de estado y prioridad (posición en TaskState y TaskPriority) y fechas en segundos desde la
+    época Unix (NO_DATE si no hay fecha). Las métricas, percentiles, histogramas y agregados por
+    usuario se calculan sobre los arrays completos, sin recorrer las tareas en Python.
+    """
+    def __init__(self, id_usuario, estado, prioridad, fecha_inicio, fecha_vencimiento, fecha_completada):
+        self.id_usuario = id_usuario
+        self.estado = estado
+        self.prioridad = prioridad
+        self.fecha_inicio = fecha_inicio
+        self.fecha_vencimiento = fecha_vencimiento
+        self.fecha_completada = fecha_completada
+
+    @classmethod
+    def from_rows(cls, rows) -> 'TaskColumns':
+        """
+        Construye las columnas a partir de filas (usuario, estado, prioridad, inicio, vencimiento, completada).
+        :param rows: Lista de filas de enteros.
+        :return: Columnas de las tareas.
+        """
+        # fromiter sobre los valores aplanados evita que NumPy inspeccione cada fila como secuencia
+        data = np.fromiter(chain.from_iterable(rows), dtype=np.int64, count=6 * len(rows)).reshape(-1, 6)
+        return cls(data[:, 0].copy(), data[:, 1].astype(np.int8), data[:, 2].astype(np.int8),
+                   data[:, 3].copy(), data[:, 4].copy(), data[:, 5].copy())
+
+    def __len__(self):
+        return len(self.estado)
+
+    def __repr__(self):
+        return f"<TaskColumns(tareas={len(self)}, abiertas={int(self.open_mask().sum())})>"
+
+    def open_mask(self):
+        """
+        Obtiene la máscara de las tareas no completadas.
+        """
+        return self.estado != COMPLETED_CODE
+
+    def _now(self, now: datetime | None) -> int:
+        if now is not None and not isinstance(now, datetime):
+            raise ValueError("La fecha de referencia debe ser una fecha y hora.")
+        return epoch_seconds(now or datetime.now())
+
+    def metric(self, name: str, now: datetime | None = None):
+        """
+        Calcula una métrica en días para las tareas en las que está definida:
+        'edad' (días desde el inicio de las tareas abiertas), 'retraso' (días desde el vencimiento
+        de las tareas abiertas ya vencidas) o 'finalizacion' (días entre el inicio y la finalización
+        de las tareas completadas).
+        :param name: Nombre de la métrica.
+        :param now: Fecha de referencia (por defecto, ahora).
+        :return: Tupla (valores en días, máscara de las tareas incluidas).
+        """
+        if name not in METRICS:
+            raise ValueError(f"La métrica debe ser una de: {', '.join(METRICS)}.")
+        if name == 'finalizacion':
+            mask = (~self.open_mask() & (self.fecha_inicio != NO_DATE) & (self.fecha_completada != NO_DATE))
+            values = self.fecha_completada[mask] - self.fecha_inicio[mask]
+            return values / SECONDS_PER_DAY, mask
+        current = self._now(now)
+        column = self.fecha_inicio if name == 'edad' else self.fecha_vencimiento
+        mask = self.open_mask() & (column != NO_DATE)
+        if name == 'retraso':
+            mask &= column < current
+        return (current - column[mask]) / SECONDS_PER_DAY, mask
+
+    @staticmethod
+    def percentiles(values, q: Sequence[float] = (50, 90, 99)) -> Dict[float, float]:
+        """
+        Calcula percentiles de una métrica.
+        :param values: Array de valores.
+        :param q: Percentiles a calcular (0-100).
+        :return: Diccionario percentil -> valor (NaN si no hay valores).
+        """
+        if len(values) == 0:
+            return {p: float('nan') for p in q}
+        return dict(zip(q, np.percentile(values, q).tolist()))
+
+    def summary(self, now: datetime | None = None, q: Sequence[float] = (50, 90, 99)) -> Dict[str, Dict]:
+        """
+        Resume las tres métricas: número de tareas, media y percentiles.
+        :param now: Fecha de referencia (por defecto, ahora).
+        :param q: Percentiles a calcular.
+        :return: Diccionario métrica -> {'tareas', 'media', 'percentiles'}.
+        """
+        result = {}
+        now = now or datetime.now()
+        for name in METRICS:
+            values, _ = self.metric(name, now)
+            result[name] = {
+                'tareas': len(values),
+                'media': float(values.mean()) if len(values) else float('nan'),
+                'percentiles': self.percentiles(values, q),
+            }
+        return result
+
+    def histogram_by_priority(self, name: str, bins: Sequence[float], now: datetime | None = None) -> Dict[TaskPriority, object]:
+        """
+        Calcula el histograma de una métrica para cada prioridad con un único bincount.
+        :param name: Nombre de la métrica ('edad', 'retraso' o 'finalizacion').
+        :param bins: Límites crecientes de los intervalos en días; los valores fuera de ellos se descartan.
+        :param now: Fecha de referencia (por defecto, ahora).
+        :return: Diccionario prioridad -> array con el número de tareas de cada intervalo.
+        """
+        edges = np.asarray(bins, dtype=np.float64)
+        if edges.ndim != 1 or len(edges) < 2 or np.any(np.diff(edges) <= 0):
+            raise ValueError("Los intervalos deben tener al menos dos límites crecientes.")
+        values, mask = self.metric(name, now)
+        # Como np.histogram: intervalos [a, b) salvo el último, que incluye su límite superior
+        index = np.searchsorted(edges, values, side='right') - 1
+        index[values == edges[-1]] = len(edges) - 2
+        inside = (index >= 0) & (index < len(edges) - 1)
+        width = len(edges) - 1
+        counts = np.bincount(self.prioridad[mask][inside].astype(np.int64) * width + index[inside],
+                             minlength=len(PRIORITIES) * width).reshape(len(PRIORITIES), width)
+        return dict(zip(PRIORITIES, counts))
+
+    def per_user(self, now: datetime | None = None) -> Dict[str, object]:
+        """
+        Agrega las tareas por usuario.
+        :param now: Fecha de referencia (por defecto, ahora).
+        :return: Diccionario de arrays alineados: 'id_usuario', 'total', 'abiertas', 'vencidas',
+                 'edad_media' (días de las tareas abiertas) y 'finalizacion_media' (días; NaN si no hay datos).
+        """
+        users, inverse = np.unique(self.id_usuario, return_inverse=True)
+        size = len(users)
+        now = now or datetime.now()
+        age, age_mask = self.metric('edad', now)
+        overdue, overdue_mask = self.metric('retraso', now)
+        completion, completion_mask = self.metric('finalizacion', now)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return {
+                'id_usuario': users,
+                'total': np.bincount(inverse, minlength=size),
+                'abiertas': np.bincount(inverse, weights=self.open_mask(), minlength=size).astype(np.int64),
+                'vencidas': np.bincount(inverse[overdue_mask], minlength=size),
+                'edad_media': (np.bincount(inverse[age_mask], weights=age, minlength=size)
+                               / np.bincount(inverse[age_mask], minlength=size)),
+                'finalizacion_media': (np.bincount(inverse[completion_mask], weights=completion, minlength=size)
+                                       / np.bincount(inverse[completion_mask], minlength=size)),
+            }
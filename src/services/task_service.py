@@ -1,10 +1,16 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from src.repositories.task_repository import TaskRepository
-from src.models.task import Task, TaskState, TaskPriority, TaskFrequency
+from src.repositories.task_repository import TaskRepository, EXPORT_COLUMNS
+from src.repositories.projections import TASK_LIST_COLUMNS
+from src.models.task import Task
 from src.models.user import User
 from src.models.category import Category
-from typing import List, Dict, Any
-from datetime import datetime
+from src.models.archive import ArchivedTask
+from src.services.validators import TASK_VALIDATOR
+from src.services.cache import QueryCache, cached_query
+from src.utils.streams import open_text_output, make_row_writer, EXPORT_FORMATS
+from typing import List, Dict, Any, Callable, Iterable, Sequence, Tuple
+from datetime import datetime, timedelta
 
 class TaskService:
     """
@@ -13,71 +19,43 @@ class TaskService:
     def __init__(self, session: Session):
         self.repository = TaskRepository(session)
         self.session = session
+        self.cache = QueryCache.for_session(session)
 
-    def _validate_task_data(self, data: Dict[str, Any], is_new: bool = True):
+    def _validate_task_data(self, data: Dict[str, Any], is_new: bool = True, known_user_ids=None):
         """
         Valida los datos de una tarea.
         :param data: Diccionario con los datos de la tarea.
         :param is_new: True si es una creación, False si es una actualización.
+        :param known_user_ids: Conjunto opcional de IDs de usuario existentes; si se indica,
+                               se usa en lugar de consultar la base de datos.
         :raises ValueError: Si los datos no son válidos.
         """
+        TASK_VALIDATOR.check(data, is_new)
         if is_new:
-            if 'titulo' not in data or not isinstance(data['titulo'], str) or not data['titulo'].strip():
-                raise ValueError("El título de la tarea es obligatorio y debe ser una cadena no vacía.")
-            if 'id_usuario' not in data:
-                raise ValueError("El ID de usuario es obligatorio para crear una tarea.")
-            if not isinstance(data['id_usuario'], int) or data['id_usuario'] <= 0:
-                raise ValueError("El ID de usuario debe ser un entero positivo.")
             # Check if user exists
-            if not self.session.query(User).get(data['id_usuario']):
+            if known_user_ids is not None:
+                user_exists = data['id_usuario'] in known_user_ids
+            else:
+                user_exists = self.session.get(User, data['id_usuario']) is not None
+            if not user_exists:
                 raise ValueError(f"El usuario con ID {data['id_usuario']} no existe.")
 
-        if 'titulo' in data and (not isinstance(data['titulo'], str) or not data['titulo'].strip()):
-            raise ValueError("El título de la tarea debe ser una cadena no vacía.")
-
-        if 'descripcion' in data and not isinstance(data['descripcion'], str):
-            raise ValueError("La descripción debe ser una cadena de texto.")
-
-        if 'fecha_inicio' in data and not isinstance(data['fecha_inicio'], datetime):
-            raise ValueError("La fecha de inicio debe ser un objeto datetime.")
-
-        if 'fecha_vencimiento' in data:
-            if not isinstance(data['fecha_vencimiento'], datetime):
-                raise ValueError("La fecha de vencimiento debe ser un objeto datetime.")
-            if 'fecha_inicio' in data and data['fecha_vencimiento'] < data['fecha_inicio']:
-                raise ValueError("La fecha de vencimiento no puede ser anterior a la fecha de inicio.")
-
-        if 'estado' in data:
-            if not isinstance(data['estado'], TaskState):
-                try:
-                    data['estado'] = TaskState[data['estado'].upper()]
-                except KeyError:
-                    raise ValueError(f"Estado de tarea inválido. Valores permitidos: {[e.value for e in TaskState]}")
-
-        if 'prioridad' in data:
-            if not isinstance(data['prioridad'], TaskPriority):
-                try:
-                    data['prioridad'] = TaskPriority[data['prioridad'].upper()]
-                except KeyError:
-                    raise ValueError(f"Prioridad de tarea inválida. Valores permitidos: {[p.value for p in TaskPriority]}")
-
-        if 'recurrente' in data and not isinstance(data['recurrente'], bool):
-            raise ValueError("El campo 'recurrente' debe ser un booleano.")
-
-        # Corregir la validación de frecuencia
-        if 'frecuencia' in data and data['frecuencia'] is not None:
-            if not data.get('recurrente', False): # Si hay frecuencia pero no es recurrente
-                raise ValueError("La frecuencia solo puede especificarse si la tarea es recurrente.")
-            if not isinstance(data['frecuencia'], TaskFrequency):
-                try:
-                    data['frecuencia'] = TaskFrequency[data['frecuencia'].upper()]
-                except KeyError:
-                    raise ValueError(f"Frecuencia de tarea inválida. Valores permitidos: {[f.value for f in TaskFrequency]}")
-        
-        # Si la tarea no es recurrente, la frecuencia debe ser None
-        if 'recurrente' in data and not data['recurrente'] and 'frecuencia' in data and data['frecuencia'] is not None:
-            raise ValueError("La frecuencia no debe especificarse si la tarea no es recurrente.")
-
+    def validate_batch(self, rows: List[Dict[str, Any]], is_new: bool = True) -> List[Sequence[str]]:
+        """
+        Valida un lote de tareas de una sola vez, informando todos los errores de cada una.
+        La existencia de los usuarios se comprueba con una única consulta para todo el lote.
+        :param rows: Lista de diccionarios con los datos de las tareas (se normalizan en sitio).
+        :param is_new: True si son creaciones, False si son actualizaciones.
+        :return: Una lista con los errores de cada tarea, en el mismo orden (vacía si es válida).
+        """
+        results = TASK_VALIDATOR.validate_batch(rows, is_new)
+        if is_new:
+            user_ids = {data['id_usuario'] for data, errors in zip(rows, results) if not errors}
+            existing = set(self.session.scalars(select(User.id_usuario).where(User.id_usuario.in_(user_ids)))) if user_ids else set()
+            for i, (data, errors) in enumerate(zip(rows, results)):
+                if not errors and data['id_usuario'] not in existing:
+                    results[i] = [f"El usuario con ID {data['id_usuario']} no existe."]
+        return results
 
     def create_task(self, task_data: Dict[str, Any]) -> Task:
         """
@@ -88,34 +66,81 @@ class TaskService:
         self._validate_task_data(task_data, is_new=True)
         return self.repository.add(task_data)
 
-    def get_task_by_id(self, task_id: int) -> Task | None:
+    def get_task_by_id(self, task_id: int, include_archived: bool = False) -> Task | ArchivedTask | None:
         """
         Obtiene una tarea por su ID.
         :param task_id: ID de la tarea.
-        :return: La tarea o None.
+        :param include_archived: Si es True y la tarea no está activa, se busca en el archivo.
+        :return: La tarea (o la tarea archivada) o None.
         """
         if not isinstance(task_id, int) or task_id <= 0:
             raise ValueError("El ID de tarea debe ser un entero positivo.")
-        return self.repository.get_by_id(task_id)
+        task = self.repository.get_by_id(task_id)
+        if task is None and include_archived:
+            task = self.repository.get_archived_by_id(task_id)
+        return task
 
-    def get_all_tasks(self) -> List[Task]:
+    @cached_query('tasks', 'archived_tasks', orm=True)
+    def get_all_tasks(self, include_archived: bool = False) -> List[Task | ArchivedTask]:
         """
         Obtiene todas las tareas.
+        :param include_archived: Si es True, se añaden al final las tareas archivadas.
         :return: Una lista de tareas.
         """
-        return self.repository.get_all()
+        tasks = self.repository.get_all()
+        if include_archived:
+            tasks += self.repository.get_archived()
+        return tasks
+
+    @cached_query('tasks', 'task_categories', 'categories')
+    def list_tasks(self, columns: Sequence[str] = TASK_LIST_COLUMNS, user_id: int | None = None) -> list:
+        """
+        Obtiene las tareas como filas ligeras de solo lectura, para vistas de listado.
+        :param columns: Columnas a obtener; además de las de la tabla admite 'categorias'.
+        :param user_id: ID de usuario opcional para limitar las tareas.
+        :return: Una lista de filas con los atributos pedidos.
+        """
+        if user_id is not None and (not isinstance(user_id, int) or user_id <= 0):
+            raise ValueError("El ID de usuario debe ser un entero positivo.")
+        return self.repository.get_rows(columns, user_id)
 
-    def update_task(self, task_id: int, update_data: Dict[str, Any]) -> Task | None:
+    def lookup_tasks(self, prefix: str | None = None, after_id: int | None = None,
+                     ids: Iterable[int] | None = None, limit: int | None = 50) -> List[Tuple[int, str]]:
+        """
+        Obtiene pares (ID, título) de tareas para listas de selección y autocompletado.
+        :param prefix: Texto inicial del título, para el autocompletado.
+        :param after_id: ID a partir del cual continuar (paginación).
+        :param ids: IDs concretos a obtener.
+        :param limit: Número máximo de pares.
+        :return: Una lista de tuplas (ID, título) ordenadas por ID.
+        """
+        return self.repository.lookup('titulo', prefix, after_id, ids, limit)
+
+    def update_task(self, task_id: int, update_data: Dict[str, Any],
+                    expected_version: int | None = None) -> Task | None:
         """
         Actualiza una tarea existente después de validar los datos.
         :param task_id: ID de la tarea a actualizar.
         :param update_data: Diccionario con los datos a actualizar.
+        :param expected_version: Versión leída (atributo version); si se indica y ha cambiado,
+                                 no se actualiza y se lanza ConcurrentUpdateError.
         :return: La tarea actualizada o None.
         """
         if not isinstance(task_id, int) or task_id <= 0:
             raise ValueError("El ID de tarea debe ser un entero positivo.")
         self._validate_task_data(update_data, is_new=False)
-        return self.repository.update(task_id, update_data)
+        return self.repository.update(task_id, update_data, expected_version)
+
+    def get_state_history(self, task_id: int) -> list:
+        """
+        Obtiene el historial de estados de una tarea: su creación (estado_anterior None), cada
+        cambio de estado hecho con update_task o por otras vías, y su borrado (estado_nuevo None).
+        :param task_id: ID de la tarea.
+        :return: Una lista de filas (estado_anterior, estado_nuevo, fecha) en orden.
+        """
+        if not isinstance(task_id, int) or task_id <= 0:
+            raise ValueError("El ID de tarea debe ser un entero positivo.")
+        return self.repository.get_state_history(task_id)
 
     def delete_task(self, task_id: int) -> bool:
         """
@@ -134,7 +159,7 @@ class TaskService:
         :param category_id: ID de la categoría.
         :return: La tarea actualizada o None.
         """
-        if not self.session.query(Category).get(category_id):
+        if not self.session.get(Category, category_id):
             raise ValueError(f"La categoría con ID {category_id} no existe.")
         return self.repository.add_category_to_task(task_id, category_id)
 
@@ -147,12 +172,110 @@ class TaskService:
         """
         return self.repository.remove_category_from_task(task_id, category_id)
 
-    def get_tasks_by_user(self, user_id: int) -> List[Task]:
+    @cached_query('tasks', 'archived_tasks', orm=True)
+    def get_tasks_by_user(self, user_id: int, include_archived: bool = False) -> List[Task | ArchivedTask]:
         """
         Obtiene todas las tareas asociadas a un usuario específico.
         :param user_id: ID del usuario.
+        :param include_archived: Si es True, se añaden al final las tareas archivadas del usuario.
         :return: Una lista de tareas.
         """
         if not isinstance(user_id, int) or user_id <= 0:
             raise ValueError("El ID de usuario debe ser un entero positivo.")
-        return self.repository.get_tasks_by_user(user_id)
+        tasks = self.repository.get_tasks_by_user(user_id)
+        if include_archived:
+            tasks += self.repository.get_archived(user_id)
+        return tasks
+
+    def archive_completed_tasks(self, older_than_days: int, batch_size: int = 1000,
+                                progress: Callable[[int], None] | None = None) -> int:
+        """
+        Mueve a las tablas de archivo las tareas completadas con más de `older_than_days` días
+        (según su fecha de vencimiento o, si no tiene, su fecha de inicio), junto con sus
+        categorías y notificaciones, en lotes de `batch_size` tareas.
+        :param older_than_days: Antigüedad mínima en días.
+        :param batch_size: Número de tareas por lote y transacción.
+        :param progress: Función opcional que recibe el total archivado tras cada lote.
+        :return: El número de tareas archivadas.
+        """
+        if not isinstance(older_than_days, int) or older_than_days < 0:
+            raise ValueError("La antigüedad en días debe ser un entero no negativo.")
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError("El tamaño de lote debe ser un entero positivo.")
+        cutoff = datetime.now() - timedelta(days=older_than_days)
+        total = 0
+        for moved in self.repository.archive_completed_before(cutoff, batch_size):
+            total += moved
+            if progress:
+                progress(total)
+        return total
+
+    def _validate_export_filters(self, filters: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Valida y normaliza los filtros de exportación.
+        :param filters: Diccionario de filtros.
+        :return: Una copia de los filtros con los enums resueltos.
+        :raises ValueError: Si algún filtro no es válido.
+        """
+        allowed = ('id_usuario', 'estado', 'prioridad', 'id_categoria')
+        unknown = [key for key in filters if key not in allowed]
+        if unknown:
+            raise ValueError(f"Filtros de exportación desconocidos: {unknown}. Valores permitidos: {list(allowed)}")
+
+        normalized = {key: value for key, value in filters.items() if value is not None}
+        for key in ('id_usuario', 'id_categoria'):
+            if key in normalized and (not isinstance(normalized[key], int) or normalized[key] <= 0):
+                raise ValueError(f"El filtro '{key}' debe ser un entero positivo.")
+        # Reutiliza la validación de enums de las tareas
+        enum_filters = {key: normalized[key] for key in ('estado', 'prioridad') if key in normalized}
+        self._validate_task_data(enum_filters, is_new=False)
+        normalized.update(enum_filters)
+        return normalized
+
+    def export(self, fmt: str, filters: Dict[str, Any] | None = None, out=None,
+               compress: bool = False, chunk_size: int = 1000,
+               progress: Callable[[int], None] | None = None) -> int:
+        """
+        Exporta las tareas con su usuario y categorías en flujo hacia CSV o JSONL.
+        Las filas se leen de una única consulta y se escriben por bloques, por lo que
+        la memoria usada no depende del número de tareas.
+        :param fmt: Formato de salida: 'csv' o 'jsonl'.
+        :param filters: Filtros opcionales ('id_usuario', 'estado', 'prioridad', 'id_categoria').
+        :param out: Ruta del archivo de salida o flujo abierto.
+        :param compress: True para comprimir la salida con gzip.
+        :param chunk_size: Número de filas leídas y escritas por bloque.
+        :param progress: Función opcional que recibe el total de filas escritas tras cada bloque.
+        :return: El número de tareas exportadas.
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Formato de exportación inválido. Valores permitidos: {list(EXPORT_FORMATS)}")
+        if out is None:
+            raise ValueError("Se requiere un destino para la exportación.")
+        if not isinstance(chunk_size, int) or chunk_size <= 0:
+            raise ValueError("El tamaño de bloque debe ser un entero positivo.")
+        filters = self._validate_export_filters(filters or {})
+
+        total = 0
+        with open_text_output(out, compress=compress) as stream:
+            writer = make_row_writer(fmt, stream, EXPORT_COLUMNS)
+            for chunk in self.repository.iter_export_rows(filters, chunk_size=chunk_size):
+                writer.write_rows(_serialize_export_row(row) for row in chunk)
+                total += len(chunk)
+                if progress:
+                    progress(total)
+        return total
+
+def _serialize_export_row(row) -> tuple:
+    """Convierte los enums y fechas de una fila de exportación a texto plano."""
+    (id_tarea, titulo, descripcion, fecha_inicio, fecha_vencimiento,
+     estado, prioridad, recurrente, frecuencia, id_usuario, usuario, categorias) = row
+    return (
+        id_tarea, titulo, descripcion,
+        fecha_inicio.isoformat() if fecha_inicio else None,
+        fecha_vencimiento.isoformat() if fecha_vencimiento else None,
+        estado.value if estado else None,
+        prioridad.value if prioridad else None,
+        bool(recurrente) if recurrente is not None else None,
+        frecuencia.value if frecuencia else None,
+        id_usuario, usuario, categorias
+    )
@@ -1,50 +1,79 @@
+import hmac
+from concurrent.futures import Future
 from sqlalchemy.orm import Session
 from src.repositories.user_repository import UserRepository
 from src.models.user import User
-from typing import List, Dict, Any
-import re
+from src.repositories.projections import USER_LIST_COLUMNS
+from src.services.validators import USER_VALIDATOR
+from src.services.cache import QueryCache, cached_query
+from src.utils.passwords import PasswordHasher, get_default_hasher, is_password_hash
+from typing import List, Dict, Any, Iterable, Sequence, Tuple
 
 class UserService:
     """
     Servicio para gestionar la lógica de negocio relacionada con los usuarios.
     """
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, hasher: PasswordHasher | None = None):
+        """
+        :param session: La sesión de base de datos.
+        :param hasher: Calculador de hashes de contraseñas; por defecto, el compartido del proceso.
+        """
         self.repository = UserRepository(session)
+        self.cache = QueryCache.for_session(session)
+        self.hasher = hasher or get_default_hasher()
 
-    def _validate_user_data(self, data: Dict[str, Any], is_new: bool = True):
+    def _validate_user_data(self, data: Dict[str, Any], is_new: bool = True, known_emails=None):
         """
         Valida los datos de un usuario.
         :param data: Diccionario con los datos del usuario.
         :param is_new: True si es una creación, False si es una actualización.
+        :param known_emails: Conjunto opcional de correos ya registrados; si se indica,
+                             se usa en lugar de consultar la base de datos.
         :raises ValueError: Si los datos no son válidos.
         """
-        if is_new:
-            if not all(k in data for k in ['nombre', 'correo', 'contrasena']):
-                raise ValueError("Nombre, correo y contraseña son campos obligatorios.")
-        
-        if 'nombre' in data and (not isinstance(data['nombre'], str) or not data['nombre'].strip()):
-            raise ValueError("El nombre es obligatorio y debe ser una cadena no vacía.")
-        
-        if 'correo' in data:
-            if not isinstance(data['correo'], str) or not re.match(r"[^@]+@[^@]+\.[^@]+", data['correo']):
-                raise ValueError("El formato del correo electrónico no es válido.")
-            # Basic check for existing email, more robust check would be in repository/DB constraint
-            if is_new and self.repository.session.query(User).filter_by(correo=data['correo']).first():
+        USER_VALIDATOR.check(data, is_new)
+        # Basic check for existing email, more robust check would be in repository/DB constraint
+        if is_new and 'correo' in data:
+            if known_emails is not None:
+                email_taken = data['correo'] in known_emails
+            else:
+                email_taken = self.repository.email_exists(data['correo'])
+            if email_taken:
                 raise ValueError(f"Ya existe un usuario con el correo: {data['correo']}")
-        
-        # Validar la longitud de la contraseña
-        if 'contrasena' in data:
-            if not isinstance(data['contrasena'], str) or len(data['contrasena']) < 6:
-                raise ValueError("La contraseña es obligatoria y debe tener al menos 6 caracteres.")
 
-    def create_user(self, user_data: Dict[str, Any]) -> User:
+    def _password_hash(self, password: str, password_hash: str | None) -> str:
+        if password_hash is None:
+            return self.hasher.hash(password)
+        if not is_password_hash(password_hash):
+            raise ValueError("El hash de la contraseña no es válido.")
+        return password_hash
+
+    def hash_password_async(self, data: Dict[str, Any], is_new: bool = True) -> Future | None:
         """
-        Crea un nuevo usuario después de validar los datos.
+        Valida los datos de un usuario y empieza a calcular en el pool el hash de su contraseña,
+        sin esperarlo. Una interfaz gráfica lo usa para no bloquearse mientras se calcula y pasa
+        después el resultado a create_user o update_user como `password_hash`.
+        :param data: Diccionario con los datos del usuario.
+        :param is_new: True si es una creación, False si es una actualización.
+        :return: Un Future con el hash, o None si los datos no incluyen contraseña.
+        :raises ValueError: Si los datos no son válidos.
+        """
+        self._validate_user_data(data, is_new)
+        if 'contrasena' not in data:
+            return None
+        return self.hasher.hash_async(data['contrasena'])
+
+    def create_user(self, user_data: Dict[str, Any], password_hash: str | None = None) -> User:
+        """
+        Crea un nuevo usuario después de validar los datos. La contraseña se guarda como hash scrypt.
         :param user_data: Diccionario con los datos del usuario.
+        :param password_hash: Hash ya calculado de la contraseña (hash_password_async); si no se
+                              indica, se calcula esperando al pool.
         :return: El usuario creado.
         """
         self._validate_user_data(user_data, is_new=True)
-        return self.repository.add(user_data)
+        return self.repository.add({**user_data,
+                                    'contrasena': self._password_hash(user_data['contrasena'], password_hash)})
 
     def get_user_by_id(self, user_id: int) -> User | None:
         """
@@ -56,6 +85,7 @@ class UserService:
             raise ValueError("El ID de usuario debe ser un entero positivo.")
         return self.repository.get_by_id(user_id)
 
+    @cached_query('users', orm=True)
     def get_all_users(self) -> List[User]:
         """
         Obtiene todos los usuarios.
@@ -63,24 +93,101 @@ class UserService:
         """
         return self.repository.get_all()
 
-    def update_user(self, user_id: int, update_data: Dict[str, Any]) -> User | None:
+    @cached_query('users')
+    def list_users(self, columns: Sequence[str] = USER_LIST_COLUMNS) -> list:
+        """
+        Obtiene los usuarios como filas ligeras de solo lectura, para vistas de listado.
+        :param columns: Columnas a obtener.
+        :return: Una lista de filas con los atributos pedidos.
+        """
+        return self.repository.get_rows(columns)
+
+    def lookup_users(self, prefix: str | None = None, after_id: int | None = None,
+                     ids: Iterable[int] | None = None, limit: int | None = 50) -> List[Tuple[int, str]]:
+        """
+        Obtiene pares (ID, nombre) de usuarios para listas de selección y autocompletado.
+        :param prefix: Texto inicial del nombre, para el autocompletado.
+        :param after_id: ID a partir del cual continuar (paginación).
+        :param ids: IDs concretos a obtener.
+        :param limit: Número máximo de pares.
+        :return: Una lista de tuplas (ID, nombre) ordenadas por ID.
+        """
+        return self.repository.lookup('nombre', prefix, after_id, ids, limit)
+
+    def update_user(self, user_id: int, update_data: Dict[str, Any],
+                    expected_version: int | None = None, password_hash: str | None = None) -> User | None:
         """
         Actualiza un usuario existente después de validar los datos.
         :param user_id: ID del usuario a actualizar.
         :param update_data: Diccionario con los datos a actualizar.
+        :param expected_version: Versión leída (atributo version); si se indica y ha cambiado,
+                                 no se actualiza y se lanza ConcurrentUpdateError.
+        :param password_hash: Hash ya calculado de la nueva contraseña (hash_password_async).
         :return: El usuario actualizado o None.
         """
         if not isinstance(user_id, int) or user_id <= 0:
             raise ValueError("El ID de usuario debe ser un entero positivo.")
         self._validate_user_data(update_data, is_new=False)
-        return self.repository.update(user_id, update_data)
+        if 'contrasena' in update_data:
+            update_data = {**update_data,
+                           'contrasena': self._password_hash(update_data['contrasena'], password_hash)}
+        return self.repository.update(user_id, update_data, expected_version)
+
+    def verify_credentials_async(self, correo: str, password: str) -> Future:
+        """
+        Busca al usuario por correo (columna única, indexada) y empieza a verificar su contraseña
+        en el pool, sin esperar. Si el usuario no existe se verifica igualmente contra un hash de
+        referencia, para que la respuesta no revele qué correos están registrados.
+        :param correo: Correo del usuario.
+        :param password: Contraseña en texto plano.
+        :return: Un Future con True si las credenciales son correctas.
+        """
+        user = self.repository.get_by_email(correo)
+        if user is None:
+            verified = self.hasher.verify_async(password, self.hasher.dummy_hash())
+            result = Future()
+            verified.add_done_callback(lambda _: result.set_result(False))
+            return result
+        stored = user.contrasena
+        if is_password_hash(stored):
+            return self.hasher.verify_async(password, stored)
+        result = Future()
+        result.set_result(hmac.compare_digest(stored.encode('utf-8'), password.encode('utf-8')))
+        return result
+
+    def authenticate(self, correo: str, password: str, verified: Future | None = None) -> User | None:
+        """
+        Comprueba las credenciales de un usuario. Las contraseñas guardadas en texto plano
+        (anteriores al uso de hashes) o con otro coste se vuelven a guardar con el coste actual.
+        :param correo: Correo del usuario.
+        :param password: Contraseña en texto plano.
+        :param verified: Future de verify_credentials_async ya terminado; si no se indica, se
+                         verifica esperando al pool.
+        :return: El usuario si las credenciales son correctas, o None.
+        """
+        if verified is None:
+            verified = self.verify_credentials_async(correo, password)
+        if not verified.result():
+            return None
+        user = self.repository.get_by_email(correo)
+        if user is not None and self.hasher.needs_rehash(user.contrasena):
+            user = self.repository.update(user.id_usuario, {'contrasena': self.hasher.hash(password)})
+        return user
 
-    def delete_user(self, user_id: int) -> bool:
+    def delete_user(self, user_id: int, deferred: bool = False) -> bool:
         """
         Elimina un usuario por su ID.
+        Sin `deferred`, el borrado en cascada del ORM carga y borra una a una sus tareas,
+        notificaciones y asociaciones en una sola transacción, en la que también se borran sus
+        tareas archivadas. Con `deferred`, el usuario solo se
+        marca como eliminado (deja de aparecer en las consultas al instante) y DeletionPurger
+        borra después sus datos por lotes.
         :param user_id: ID del usuario a eliminar.
+        :param deferred: True para marcarlo y diferir el borrado de sus datos.
         :return: True si se eliminó con éxito, False en caso contrario.
         """
         if not isinstance(user_id, int) or user_id <= 0:
             raise ValueError("El ID de usuario debe ser un entero positivo.")
+        if deferred:
+            return self.repository.mark_deleted(user_id)
         return self.repository.delete(user_id)
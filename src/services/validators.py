@@ -0,0 +1,225 @@
+import re
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+from src.models.task import TaskState, TaskPriority, TaskFrequency
+
+# Valor centinela que devuelven las comprobaciones cuando el valor no es válido
+INVALID = object()
+# Valor centinela para los campos ausentes
+_MISSING = object()
+# Resultado compartido de los registros válidos
+NO_ERRORS: Tuple[str, ...] = ()
+
+EMAIL_RE = re.compile(r"[^@]+@[^@]+\.[^@]+")
+
+class EnumLookup:
+    """
+    Resuelve un miembro de un enum a partir del propio miembro, de su nombre o de su valor,
+    sin distinguir mayúsculas, con un único acceso a diccionario.
+    """
+    def __init__(self, enum_class):
+        self.enum_class = enum_class
+        self._members: Dict[Any, Any] = {}
+        for member in enum_class:
+            self._members[member.name.upper()] = member
+            self._members[member.value.upper()] = member
+        # El mensaje de error se construye una sola vez
+        self.allowed_values = [member.value for member in enum_class]
+
+    def __call__(self, value):
+        if value.__class__ is self.enum_class:
+            return value
+        if isinstance(value, str):
+            return self._members.get(value.upper(), INVALID)
+        return INVALID
+
+# Comprobaciones: funciones que devuelven el valor normalizado o INVALID
+
+def non_empty_str():
+    return lambda value: value if isinstance(value, str) and value.strip() else INVALID
+
+def positive_int():
+    return lambda value: value if isinstance(value, int) and value > 0 else INVALID
+
+def instance_of(expected_type):
+    return lambda value: value if isinstance(value, expected_type) else INVALID
+
+def matches(regex):
+    match = regex.match
+    return lambda value: value if isinstance(value, str) and match(value) else INVALID
+
+def min_length(length: int):
+    return lambda value: value if isinstance(value, str) and len(value) >= length else INVALID
+
+def _allow_none(check):
+    return lambda value: value if value is None else check(value)
+
+class FieldRule:
+    """
+    Regla de un campo: se aplica solo si el campo está presente en los datos.
+    La comprobación devuelve el valor normalizado (que se guarda en los datos) o INVALID.
+    """
+    __slots__ = ('name', 'check', 'message', 'create_message', 'allow_none')
+
+    def __init__(self, name: str, check: Callable[[Any], Any], message: str,
+                 create_message: str | None = None, allow_none: bool = False):
+        self.name = name
+        self.check = check
+        self.message = message
+        self.create_message = create_message or message
+        self.allow_none = allow_none
+
+class Rule:
+    """
+    Regla entre varios campos: una función que recibe los datos y devuelve un mensaje de error o None.
+    """
+    __slots__ = ('check',)
+
+    def __init__(self, check: Callable[[Dict[str, Any]], str | None]):
+        self.check = check
+
+class Validator:
+    """
+    Validador precompilado de una entidad. El esquema (una lista ordenada de reglas) se
+    traduce una sola vez, para la creación y para la actualización, a una tupla de pasos
+    (campo, comprobación, mensaje) que validar un registro solo recorre. Se informan todos
+    los errores de cada registro.
+    """
+    def __init__(self, required: Sequence[Tuple[Tuple[str, ...], str]], steps: Sequence[FieldRule | Rule]):
+        """
+        :param required: Pares (campos, mensaje) obligatorios en la creación.
+        :param steps: Reglas aplicadas en orden.
+        """
+        self.required = tuple(required)
+        self.steps = tuple(steps)
+        self._plans = {is_new: self._compile(is_new) for is_new in (True, False)}
+
+    def _compile(self, is_new: bool) -> Tuple[Tuple[str | None, Callable[[Any], Any], str | None], ...]:
+        """
+        Traduce el esquema a los pasos de la validación; las reglas entre campos no tienen campo
+        ni mensaje (la comprobación recibe los datos y devuelve el error).
+        """
+        plan = []
+        for step in self.steps:
+            if isinstance(step, Rule):
+                plan.append((None, step.check, None))
+                continue
+            check = _allow_none(step.check) if step.allow_none else step.check
+            plan.append((step.name, check, step.create_message if is_new else step.message))
+        return tuple(plan)
+
+    def validate(self, data: Dict[str, Any], is_new: bool = True) -> Sequence[str]:
+        """
+        Valida (y normaliza en el propio diccionario) los datos de un registro.
+        :param data: Diccionario con los datos.
+        :param is_new: True si es una creación, False si es una actualización.
+        :return: La lista de mensajes de error; NO_ERRORS (tupla vacía) si los datos son válidos.
+        """
+        errors = []
+        if is_new:
+            for fields, message in self.required:
+                if not all(field in data for field in fields):
+                    errors.append(message)
+        for name, check, message in self._plans[is_new]:
+            if name is None:
+                error = check(data)
+                if error:
+                    errors.append(error)
+                continue
+            value = data.get(name, _MISSING)
+            if value is _MISSING:
+                continue
+            result = check(value)
+            if result is INVALID:
+                errors.append(message)
+            elif result is not value:
+                data[name] = result
+        # Los registros válidos comparten una tupla vacía: no se crea un objeto por registro
+        return errors or NO_ERRORS
+
+    def validate_batch(self, rows: Iterable[Dict[str, Any]], is_new: bool = True) -> List[Sequence[str]]:
+        """
+        Valida un lote de registros.
+        :param rows: Registros a validar.
+        :param is_new: True si son creaciones, False si son actualizaciones.
+        :return: Una lista con los errores de cada registro, en el mismo orden.
+        """
+        validate = self.validate
+        return [validate(data, is_new) for data in rows]
+
+    def check(self, data: Dict[str, Any], is_new: bool = True):
+        """
+        Valida un registro y lanza el primer error encontrado.
+        :raises ValueError: Si los datos no son válidos.
+        """
+        errors = self.validate(data, is_new)
+        if errors:
+            raise ValueError(errors[0])
+
+# --- Esquemas por entidad ---
+
+_STATE = EnumLookup(TaskState)
+_PRIORITY = EnumLookup(TaskPriority)
+_FREQUENCY = EnumLookup(TaskFrequency)
+
+def _due_date_after_start(data):
+    due, start = data.get('fecha_vencimiento'), data.get('fecha_inicio')
+    if isinstance(due, datetime) and isinstance(start, datetime) and due < start:
+        return "La fecha de vencimiento no puede ser anterior a la fecha de inicio."
+    return None
+
+def _frequency_requires_recurrence(data):
+    if data.get('frecuencia') is not None and not data.get('recurrente', False):
+        return "La frecuencia solo puede especificarse si la tarea es recurrente."
+    return None
+
+_TITLE_REQUIRED = "El título de la tarea es obligatorio y debe ser una cadena no vacía."
+
+TASK_VALIDATOR = Validator(
+    required=[
+        (('titulo',), _TITLE_REQUIRED),
+        (('id_usuario',), "El ID de usuario es obligatorio para crear una tarea."),
+    ],
+    steps=[
+        FieldRule('titulo', non_empty_str(), "El título de la tarea debe ser una cadena no vacía.",
+                  create_message=_TITLE_REQUIRED),
+        FieldRule('id_usuario', positive_int(), "El ID de usuario debe ser un entero positivo."),
+        FieldRule('descripcion', instance_of(str), "La descripción debe ser una cadena de texto."),
+        FieldRule('fecha_inicio', instance_of(datetime), "La fecha de inicio debe ser un objeto datetime."),
+        FieldRule('fecha_vencimiento', instance_of(datetime), "La fecha de vencimiento debe ser un objeto datetime."),
+        Rule(_due_date_after_start),
+        FieldRule('estado', _STATE, f"Estado de tarea inválido. Valores permitidos: {_STATE.allowed_values}"),
+        FieldRule('prioridad', _PRIORITY, f"Prioridad de tarea inválida. Valores permitidos: {_PRIORITY.allowed_values}"),
+        FieldRule('recurrente', instance_of(bool), "El campo 'recurrente' debe ser un booleano."),
+        Rule(_frequency_requires_recurrence),
+        FieldRule('frecuencia', _FREQUENCY, f"Frecuencia de tarea inválida. Valores permitidos: {_FREQUENCY.allowed_values}",
+                  allow_none=True),
+    ],
+)
+
+USER_VALIDATOR = Validator(
+    required=[(('nombre', 'correo', 'contrasena'), "Nombre, correo y contraseña son campos obligatorios.")],
+    steps=[
+        FieldRule('nombre', non_empty_str(), "El nombre es obligatorio y debe ser una cadena no vacía."),
+        FieldRule('correo', matches(EMAIL_RE), "El formato del correo electrónico no es válido."),
+        FieldRule('contrasena', min_length(6), "La contraseña es obligatoria y debe tener al menos 6 caracteres."),
+    ],
+)
+
+_CATEGORY_NAME_REQUIRED = "El nombre de la categoría es obligatorio y debe ser una cadena no vacía."
+
+CATEGORY_VALIDATOR = Validator(
+    required=[(('nombre',), _CATEGORY_NAME_REQUIRED)],
+    steps=[
+        FieldRule('nombre', non_empty_str(), "El nombre de la categoría debe ser una cadena no vacía.",
+                  create_message=_CATEGORY_NAME_REQUIRED),
+    ],
+)
+
+NOTIFICATION_VALIDATOR = Validator(
+    required=[(('id_tarea',), "El ID de tarea es obligatorio para crear una notificación.")],
+    steps=[
+        FieldRule('id_tarea', positive_int(), "El ID de tarea debe ser un entero positivo."),
+        FieldRule('fecha_envio', instance_of(datetime), "La fecha de envío debe ser un objeto datetime."),
+    ],
+)
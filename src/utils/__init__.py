@@ -0,0 +1,6 @@
+from .streams import (
+    open_text_output, open_text_input, make_row_writer, iter_records, detect_format, EXPORT_FORMATS
+)
+from .passwords import (
+    PasswordHasher, hash_password, verify_password, is_password_hash, get_default_hasher
+)
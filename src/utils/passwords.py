@@ -0,0 +1,193 @@
+import base64
+import hashlib
+import hmac
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Iterable, List, Tuple
+
+# Coste por defecto de scrypt: n=2**14, r=8, p=1 (16 MiB de memoria, unas decenas de ms por hash)
+DEFAULT_COST = (2 ** 14, 8, 1)
+SALT_BYTES = 16
+HASH_BYTES = 32
+_PREFIX = 'scrypt'
+
+def _b64encode(data: bytes) -> str:
+    return base64.b64encode(data).decode('ascii').rstrip('=')
+
+def _b64decode(text: str) -> bytes:
+    return base64.b64decode(text + '=' * (-len(text) % 4))
+
+def _derive(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(password.encode('utf-8'), salt=salt, n=n, r=r, p=p,
+                          maxmem=128 * n * r * (p + 1) + (1 << 20), dklen=HASH_BYTES)
+
+def hash_password(password: str, n: int = DEFAULT_COST[0], r: int = DEFAULT_COST[1], p: int = DEFAULT_COST[2]) -> str:
+    """
+    Calcula el hash scrypt de una contraseña con una sal aleatoria.
+    :param password: La contraseña en texto plano.
+    :param n: Coste de CPU y memoria (potencia de 2).
+    :param r: Tamaño de bloque.
+    :param p: Paralelismo.
+    :return: El hash codificado como 'scrypt$n$r$p$sal$hash'.
+    """
+    salt = os.urandom(SALT_BYTES)
+    return f"{_PREFIX}${n}${r}${p}${_b64encode(salt)}${_b64encode(_derive(password, salt, n, r, p))}"
+
+def parse_password_hash(encoded: str) -> Tuple[int, int, int, bytes, bytes] | None:
+    """
+    Descompone un hash generado por hash_password.
+    :return: Tupla (n, r, p, sal, hash), o None si el valor no es un hash válido.
+    """
+    parts = encoded.split('$') if isinstance(encoded, str) else ()
+    if len(parts) != 6 or parts[0] != _PREFIX:
+        return None
+    try:
+        return int(parts[1]), int(parts[2]), int(parts[3]), _b64decode(parts[4]), _b64decode(parts[5])
+    except ValueError:
+        return None
+
+def is_password_hash(value: str) -> bool:
+    """
+    Indica si un valor almacenado es un hash de hash_password (y no una contraseña en texto plano).
+    """
+    return parse_password_hash(value) is not None
+
+def verify_password(password: str, encoded: str) -> bool:
+    """
+    Comprueba una contraseña contra su hash en tiempo constante.
+    :return: True si coincide; False si no coincide o el hash no es válido.
+    """
+    parsed = parse_password_hash(encoded)
+    if parsed is None:
+        return False
+    n, r, p, salt, expected = parsed
+    return hmac.compare_digest(_derive(password, salt, n, r, p), expected)
+
+class PasswordHasher:
+    """
+    Calcula y verifica hashes de contraseñas en un pool de procesos, para que su coste de CPU no
+    bloquee la interfaz ni otros hilos por el GIL. El pool se crea al primer uso y reparte los
+    lotes (hash_many) entre todos sus procesos.
+    """
+    def __init__(self, n: int = DEFAULT_COST[0], r: int = DEFAULT_COST[1], p: int = DEFAULT_COST[2],
+                 workers: int | None = None):
+        """
+        :param n: Coste de CPU y memoria de scrypt (potencia de 2 mayor que 1).
+        :param r: Tamaño de bloque.
+        :param p: Paralelismo.
+        :param workers: Número de procesos; None usa uno por núcleo y 0 calcula en el propio proceso.
+        """
+        if not isinstance(n, int) or n < 2 or n & (n - 1):
+            raise ValueError("El coste n de scrypt debe ser una potencia de 2 mayor que 1.")
+        if not isinstance(r, int) or not isinstance(p, int) or r <= 0 or p <= 0:
+            raise ValueError("Los parámetros r y p de scrypt deben ser enteros positivos.")
+        if workers is not None and (not isinstance(workers, int) or workers < 0):
+            raise ValueError("El número de procesos debe ser un entero no negativo.")
+        self.cost = (n, r, p)
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+        self._dummy: str | None = None
+
+    def _pool(self) -> Executor | None:
+        if self.workers == 0:
+            return None
+        with self._lock:
+            if self._executor is None:
+                # spawn: los procesos no heredan conexiones ni hilos (Qt) del proceso principal
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+            return self._executor
+
+    def _submit(self, fn, *args) -> Future:
+        pool = self._pool()
+        if pool is not None:
+            return pool.submit(fn, *args)
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def hash_async(self, password: str) -> Future:
+        """
+        Calcula el hash de una contraseña en el pool.
+        :return: Un Future con el hash codificado.
+        """
+        return self._submit(hash_password, password, *self.cost)
+
+    def verify_async(self, password: str, encoded: str) -> Future:
+        """
+        Verifica una contraseña en el pool.
+        :return: Un Future con True si coincide.
+        """
+        return self._submit(verify_password, password, encoded)
+
+    def hash(self, password: str) -> str:
+        """
+        Calcula el hash de una contraseña y espera el resultado.
+        """
+        return self.hash_async(password).result()
+
+    def verify(self, password: str, encoded: str) -> bool:
+        """
+        Verifica una contraseña y espera el resultado.
+        """
+        return self.verify_async(password, encoded).result()
+
+    def hash_many(self, passwords: Iterable[str]) -> List[str]:
+        """
+        Calcula los hashes de muchas contraseñas en paralelo, repartidas en bloques entre los procesos.
+        :param passwords: Las contraseñas.
+        :return: Los hashes, en el mismo orden.
+        """
+        passwords = list(passwords)
+        pool = self._pool()
+        if pool is None:
+            return [hash_password(password, *self.cost) for password in passwords]
+        n, r, p = self.cost
+        chunksize = max(1, len(passwords) // (self.workers * 4))
+        return list(pool.map(hash_password, passwords, [n] * len(passwords), [r] * len(passwords),
+                             [p] * len(passwords), chunksize=chunksize))
+
+    def needs_rehash(self, encoded: str) -> bool:
+        """
+        Indica si un valor almacenado no es un hash o usa un coste distinto del configurado.
+        """
+        parsed = parse_password_hash(encoded)
+        return parsed is None or parsed[:3] != self.cost
+
+    def dummy_hash(self) -> str:
+        """
+        Hash de referencia con el coste configurado, para verificar contra él cuando el usuario no
+        existe y que la respuesta tarde lo mismo.
+        """
+        if self._dummy is None:
+            self._dummy = hash_password('', *self.cost)
+        return self._dummy
+
+    def shutdown(self):
+        """
+        Detiene el pool de procesos (se vuelve a crear si se usa de nuevo).
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    def __repr__(self):
+        n, r, p = self.cost
+        return f"<PasswordHasher(n={n}, r={r}, p={p}, workers={self.workers})>"
+
+_default_hasher: PasswordHasher | None = None
+
+def get_default_hasher() -> PasswordHasher:
+    """
+    Devuelve el PasswordHasher compartido del proceso, con el coste por defecto.
+    """
+    global _default_hasher
+    if _default_hasher is None:
+        _default_hasher = PasswordHasher()
+    return _default_hasher
@@ -0,0 +1,159 @@
+import csv
+import gzip
+import io
+import json
+import os
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, Sequence, TextIO, Tuple
+
+EXPORT_FORMATS = ('csv', 'jsonl')
+
+@contextmanager
+def open_text_output(out, compress: bool = False):
+    """
+    Abre un destino de texto para escritura en flujo.
+    :param out: Ruta del archivo o flujo ya abierto (texto o binario).
+    :param compress: True para comprimir la salida con gzip. Las rutas terminadas
+                     en '.gz' se comprimen siempre.
+    :return: Un flujo de texto UTF-8 listo para escribir.
+    :raises ValueError: Si se pide compresión sobre un flujo de texto.
+    """
+    if isinstance(out, (str, os.PathLike)):
+        path = os.fspath(out)
+        if compress or path.endswith('.gz'):
+            stream = gzip.open(path, 'wt', encoding='utf-8', newline='')
+        else:
+            stream = open(path, 'w', encoding='utf-8', newline='')
+        try:
+            yield stream
+        finally:
+            stream.close()
+        return
+
+    if isinstance(out, io.TextIOBase):
+        if compress:
+            raise ValueError("La compresión gzip requiere una ruta o un flujo binario.")
+        yield out
+        out.flush()
+        return
+
+    # Flujo binario: se envuelve sin cerrar el flujo del llamador
+    raw = gzip.GzipFile(fileobj=out, mode='wb') if compress else out
+    stream = io.TextIOWrapper(raw, encoding='utf-8', newline='')
+    try:
+        yield stream
+    finally:
+        stream.flush()
+        stream.detach()
+        if compress:
+            raw.close()
+
+@contextmanager
+def open_text_input(source):
+    """
+    Abre un origen de texto para lectura en flujo.
+    :param source: Ruta del archivo (descomprime automáticamente si termina en '.gz')
+                   o flujo ya abierto (texto o binario).
+    :return: Un flujo de texto UTF-8 listo para leer.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+        if path.endswith('.gz'):
+            stream = gzip.open(path, 'rt', encoding='utf-8', newline='')
+        else:
+            stream = open(path, 'r', encoding='utf-8', newline='')
+        try:
+            yield stream
+        finally:
+            stream.close()
+        return
+
+    if isinstance(source, io.TextIOBase):
+        yield source
+        return
+
+    stream = io.TextIOWrapper(source, encoding='utf-8', newline='')
+    try:
+        yield stream
+    finally:
+        stream.detach()
+
+def detect_format(path: str) -> str | None:
+    """
+    Deduce el formato ('csv' o 'jsonl') a partir de la extensión de una ruta.
+    :param path: Ruta del archivo.
+    :return: El formato o None si no se reconoce.
+    """
+    name = path[:-3] if path.endswith('.gz') else path
+    for fmt in EXPORT_FORMATS:
+        if name.endswith('.' + fmt):
+            return fmt
+    return None
+
+def iter_records(fmt: str, stream: TextIO) -> Iterator[Tuple[int, Dict[str, Any] | None, str | None]]:
+    """
+    Lee registros de un flujo CSV (con cabecera) o JSONL sin cargarlo entero en memoria.
+    :param fmt: 'csv' o 'jsonl'.
+    :param stream: Flujo de texto de origen.
+    :return: Un iterador de tuplas (número de línea, registro, error de lectura).
+             Si la línea no se pudo interpretar, el registro es None y se informa el error.
+    :raises ValueError: Si el formato no es soportado.
+    """
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for record in reader:
+            # Las columnas vacías del CSV equivalen a valores ausentes
+            yield reader.line_num, {key: (value if value != '' else None)
+                                    for key, value in record.items() if key is not None}, None
+        return
+    if fmt == 'jsonl':
+        for line_no, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_no, None, f"JSON inválido: {e.msg}"
+                continue
+            if not isinstance(record, dict):
+                yield line_no, None, "Cada línea debe contener un objeto JSON."
+                continue
+            yield line_no, record, None
+        return
+    raise ValueError(f"Formato de importación inválido. Valores permitidos: {list(EXPORT_FORMATS)}")
+
+class _CsvRowWriter:
+    """Escribe filas como CSV con una cabecera inicial."""
+    def __init__(self, stream: TextIO, fieldnames: Sequence[str]):
+        self._writer = csv.writer(stream)
+        self._writer.writerow(fieldnames)
+
+    def write_rows(self, rows: Iterable[Sequence[Any]]):
+        self._writer.writerows(('' if value is None else value for value in row) for row in rows)
+
+class _JsonlRowWriter:
+    """Escribe filas como objetos JSON, uno por línea."""
+    def __init__(self, stream: TextIO, fieldnames: Sequence[str]):
+        self._stream = stream
+        self._fieldnames = tuple(fieldnames)
+        self._encoder = json.JSONEncoder(ensure_ascii=False)
+
+    def write_rows(self, rows: Iterable[Sequence[Any]]):
+        encode = self._encoder.encode
+        fieldnames = self._fieldnames
+        self._stream.write(''.join(encode(dict(zip(fieldnames, row))) + '\n' for row in rows))
+
+def make_row_writer(fmt: str, stream: TextIO, fieldnames: Sequence[str]):
+    """
+    Crea un escritor de filas para el formato indicado.
+    :param fmt: 'csv' o 'jsonl'.
+    :param stream: Flujo de texto de destino.
+    :param fieldnames: Nombres de las columnas, en el orden de las filas.
+    :return: Un objeto con el método write_rows(rows).
+    :raises ValueError: Si el formato no es soportado.
+    """
+    if fmt == 'csv':
+        return _CsvRowWriter(stream, fieldnames)
+    if fmt == 'jsonl':
+        return _JsonlRowWriter(stream, fieldnames)
+    raise ValueError(f"Formato de exportación inválido. Valores permitidos: {list(EXPORT_FORMATS)}")
@@ -0,0 +1,99 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.models import Base
+from src.services import UserService
+from src.database import (backup_database, snapshot_database, create_backup, list_backups,
+                          rotate_backups, restore_database)
+from src.database.backup import backup_name
+
+class TestBackup(unittest.TestCase):
+    """
+    Pruebas unitarias para las copias de seguridad de la base de datos.
+    """
+    def setUp(self):
+        """
+        Crea una base de datos en archivo con algunos usuarios.
+        """
+        self.tmp = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp, "database.db")
+        self.engine = create_engine(f"sqlite:///{self.db_path}")
+        Base.metadata.create_all(self.engine)
+        self.session = sessionmaker(bind=self.engine)()
+        self.user_service = UserService(self.session)
+        for i in range(3):
+            self.user_service.create_user({"nombre": f"User {i}", "correo": f"user{i}@example.com",
+                                           "contrasena": "password"})
+
+    def tearDown(self):
+        """
+        Cierra la sesión y elimina los archivos temporales.
+        """
+        self.session.close()
+        self.engine.dispose()
+        shutil.rmtree(self.tmp)
+
+    def count_users(self, path):
+        with sqlite3.connect(path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def test_backup_in_steps_while_connection_is_open(self):
+        """
+        Verifica la copia por pasos con la sesión abierta y el informe de progreso.
+        """
+        steps = []
+        dest = os.path.join(self.tmp, "copy.db")
+        result = backup_database(self.db_path, dest, pages=1, sleep=0, progress=lambda c, t: steps.append((c, t)))
+        self.assertEqual(self.count_users(dest), 3)
+        self.assertEqual(result.pages, steps[-1][1])
+        self.assertEqual(steps[-1][0], steps[-1][1])
+        self.assertGreater(len(steps), 1)
+        self.assertFalse(os.path.exists(dest + ".tmp"))
+
+    def test_snapshot_and_rotation(self):
+        """
+        Verifica la instantánea con VACUUM INTO y que la rotación conserva las más recientes.
+        """
+        directory = os.path.join(self.tmp, "backups")
+        result = create_backup(self.db_path, directory, compact=True)
+        self.assertEqual(self.count_users(result.path), 3)
+        with self.assertRaises(ValueError):
+            snapshot_database(self.db_path, result.path)
+
+        for day in (1, 2, 3):
+            backup_database(self.db_path, os.path.join(directory, backup_name(self.db_path, datetime(2024, 1, day))))
+        self.assertEqual(len(list_backups(self.db_path, directory)), 4)
+        removed = rotate_backups(self.db_path, directory, keep=2)
+        self.assertEqual([os.path.basename(p) for p in removed],
+                         ["database-20240101-000000.db", "database-20240102-000000.db"])
+        self.assertEqual(list_backups(self.db_path, directory)[-1], result.path)
+
+    def test_restore_replaces_live_database(self):
+        """
+        Verifica que la restauración reemplaza los datos y que la sesión abierta los ve.
+        """
+        dest = os.path.join(self.tmp, "copy.db")
+        backup_database(self.db_path, dest)
+        self.user_service.create_user({"nombre": "Extra", "correo": "extra@example.com", "contrasena": "password"})
+        self.session.commit()
+        self.assertEqual(len(self.user_service.get_all_users()), 4)
+        self.session.close()
+
+        restore_database(dest, self.db_path)
+        self.assertEqual(len(self.user_service.get_all_users()), 3)
+
+    def test_restore_rejects_invalid_backup(self):
+        """
+        Verifica que no se restaura un archivo que no es una base de datos.
+        """
+        bogus = os.path.join(self.tmp, "bogus.db")
+        with open(bogus, "wb") as f:
+            f.write(b"not a database" * 100)
+        with self.assertRaises(ValueError):
+            restore_database(bogus, self.db_path)
+        self.assertEqual(self.count_users(self.db_path), 3)
@@ -3,6 +3,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from src.models import Base
 from src.services import UserService, TaskService, CategoryService, NotificationService
+from src.utils import PasswordHasher
 
 class BaseTest(unittest.TestCase):
     """
@@ -18,8 +19,9 @@ class BaseTest(unittest.TestCase):
         Session = sessionmaker(bind=self.engine)
         self.session = Session()
 
-        # Inicializa los servicios con la sesión de prueba
-        self.user_service = UserService(self.session)
+        # Inicializa los servicios con la sesión de prueba (hashes de contraseña de coste mínimo)
+        self.hasher = PasswordHasher(n=2 ** 4, workers=0)
+        self.user_service = UserService(self.session, self.hasher)
         self.task_service = TaskService(self.session)
         self.category_service = CategoryService(self.session)
         self.notification_service = NotificationService(self.session)
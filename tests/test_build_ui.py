@@ -0,0 +1,63 @@
+import os
+import shutil
+import tempfile
+import unittest
+from importlib import util
+from build_ui import UI_FILE_PATH, build_ui, is_stale, load_ui_class
+
+@unittest.skipUnless(util.find_spec("PyQt5"), "PyQt5 no está instalado")
+class TestBuildUi(unittest.TestCase):
+    """
+    Pruebas unitarias para la precompilación de la interfaz.
+    """
+    def setUp(self):
+        """
+        Copia el archivo .ui a un directorio temporal.
+        """
+        self.tmp = tempfile.mkdtemp()
+        self.ui_path = os.path.join(self.tmp, "task_manager_ui.ui")
+        self.py_path = os.path.join(self.tmp, "ui_task_manager.py")
+        shutil.copy(UI_FILE_PATH, self.ui_path)
+
+    def tearDown(self):
+        """
+        Elimina los archivos temporales.
+        """
+        shutil.rmtree(self.tmp)
+
+    def test_build_only_when_stale(self):
+        """
+        Verifica que el módulo se genera si falta o si el .ui es más reciente, y no en otro caso.
+        """
+        self.assertTrue(is_stale(self.ui_path, self.py_path))
+        self.assertTrue(build_ui(self.ui_path, self.py_path))
+        self.assertFalse(is_stale(self.ui_path, self.py_path))
+        self.assertFalse(build_ui(self.ui_path, self.py_path))
+
+        built = os.path.getmtime(self.py_path)
+        os.utime(self.ui_path, (built + 10, built + 10))
+        self.assertTrue(is_stale(self.ui_path, self.py_path))
+        self.assertTrue(build_ui(self.ui_path, self.py_path))
+        self.assertTrue(build_ui(self.ui_path, self.py_path, force=True))
+
+    def test_load_ui_class_ignores_stale_module(self):
+        """
+        Verifica que solo se usa la clase generada si está al día con el .ui.
+        """
+        self.assertIsNone(load_ui_class(self.ui_path, self.py_path))
+        build_ui(self.ui_path, self.py_path)
+        ui_class = load_ui_class(self.ui_path, self.py_path)
+        self.assertEqual(ui_class.__name__, "Ui_MainWindow")
+        self.assertTrue(hasattr(ui_class, "setupUi"))
+
+        built = os.path.getmtime(self.py_path)
+        os.utime(self.ui_path, (built + 10, built + 10))
+        self.assertIsNone(load_ui_class(self.ui_path, self.py_path))
+
+    def test_missing_ui_file(self):
+        """
+        Verifica que la compilación falla si no existe el archivo .ui.
+        """
+        with self.assertRaises(ValueError) as cm:
+            build_ui(os.path.join(self.tmp, "missing.ui"), self.py_path)
+        self.assertIn("No se encontró el archivo UI", str(cm.exception))
@@ -0,0 +1,145 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, insert, update
+from src.models import Base, Task, ChangeLogEntry
+from src.services import ChangeLogService
+from src.database import Migration, Migrator, AddColumn, RebuildTable
+from tests.test_base import BaseTest
+
+class TestChangeLog(BaseTest):
+    """
+    Pruebas unitarias para el registro de cambios y su consulta por número de secuencia.
+    """
+    def setUp(self):
+        super().setUp()
+        self.change_service = ChangeLogService(self.session)
+        self.user = self.user_service.create_user({"nombre": "Ana", "correo": "ana@example.com", "contrasena": "password"})
+
+    def changes(self, seq=0):
+        return [(c.tabla, c.clave, c.operacion, c.columnas) for c in self.change_service.changes_since(seq)]
+
+    def test_writes_are_logged_in_order(self):
+        """
+        Verifica que las inserciones, cambios y borrados se registran con las columnas cambiadas.
+        """
+        task = self.task_service.create_task({"titulo": "Tarea", "id_usuario": self.user.id_usuario})
+        seq = self.change_service.last_seq()
+        self.task_service.update_task(task.id_tarea, {"titulo": "Otra", "descripcion": "Texto"})
+        self.task_service.update_task(task.id_tarea, {"titulo": "Otra"})
+        self.task_service.delete_task(task.id_tarea)
+
+        self.assertEqual(self.changes(), [
+            ("users", self.user.id_usuario, "INSERT", ()),
+            ("tasks", task.id_tarea, "INSERT", ()),
+            ("tasks", task.id_tarea, "UPDATE", ("titulo", "descripcion")),
+            ("tasks", task.id_tarea, "DELETE", ()),
+        ])
+        self.assertEqual(len(self.changes(seq)), 2)
+
+    def test_bulk_statements_and_rollback(self):
+        """
+        Verifica que las sentencias masivas se registran y que un rollback descarta sus entradas.
+        """
+        self.session.execute(insert(Task), [{"titulo": f"T{i}", "id_usuario": self.user.id_usuario} for i in range(3)])
+        self.session.commit()
+        self.session.execute(update(Task).values(titulo="Masiva"))
+        self.session.rollback()
+        self.assertEqual([c[2] for c in self.changes()], ["INSERT"] * 4)
+
+    def test_paging_and_filters(self):
+        """
+        Verifica la lectura por páginas, el filtro de tablas y la validación de parámetros.
+        """
+        for i in range(5):
+            self.category_service.create_category({"nombre": f"Categoría {i}"})
+        first = self.change_service.changes_since(0, limit=3, tables=["categories"])
+        second = self.change_service.changes_since(first[-1].seq, limit=3, tables=["categories"])
+        self.assertEqual([c.tabla for c in first + second], ["categories"] * 5)
+        self.assertEqual(len({c.seq for c in first + second}), 5)
+
+        for kwargs in ({"seq": -1}, {"limit": 0}, {"tables": ["change_log"]}):
+            with self.assertRaises(ValueError):
+                self.change_service.changes_since(**kwargs)
+
+    def test_compaction_keeps_sequence_growing(self):
+        """
+        Verifica la compactación por secuencia y por antigüedad, y que los números no se reutilizan.
+        """
+        for i in range(4):
+            self.category_service.create_category({"nombre": f"Categoría {i}"})
+        last = self.change_service.last_seq()
+        self.assertEqual(self.change_service.compact_changes(up_to_seq=2, batch_size=1), 2)
+        self.assertEqual(self.change_service.changes_since()[0].seq, 3)
+
+        self.session.execute(update(ChangeLogEntry).where(ChangeLogEntry.seq == 3)
+                             .values(fecha=datetime.now() - timedelta(days=10)))
+        self.session.commit()
+        self.assertEqual(self.change_service.compact_changes(older_than_days=5), 1)
+
+        self.assertEqual(self.change_service.compact_changes(up_to_seq=last), last - 3)
+        self.category_service.create_category({"nombre": "Nueva"})
+        self.assertEqual(self.change_service.last_seq(), last + 1)
+        with self.assertRaises(ValueError):
+            self.change_service.compact_changes()
+
+class TestChangeLogMigrations(unittest.TestCase):
+    """
+    Pruebas unitarias para la creación del registro de cambios en bases de datos existentes.
+    """
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp, "database.db")
+        engine = create_engine(f"sqlite:///{self.db_path}")
+        Base.metadata.create_all(engine)
+        engine.dispose()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def log(self, conn):
+        return conn.execute("SELECT tabla, operacion, columnas FROM change_log ORDER BY seq").fetchall()
+
+    def test_migration_creates_log_and_triggers(self):
+        """
+        Verifica que la migración crea el registro en una base de datos anterior a él.
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("DROP TABLE change_log")
+            for table in ("users", "tasks", "categories", "notifications"):
+                for action in ("ins", "upd", "del"):
+                    conn.execute(f"DROP TRIGGER _cdc_{table}_{action}")
+        with Migrator(self.db_path) as migrator:
+            migrator.migrate()
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("INSERT INTO categories (nombre) VALUES ('Casa')")
+            self.assertEqual(self.log(conn), [("categories", "INSERT", None)])
+
+    def test_schema_changes_refresh_triggers(self):
+        """
+        Verifica que añadir una columna o reescribir la tabla mantiene el registro de sus cambios.
+        """
+        migration = [
+            AddColumn("categories", "color", "VARCHAR"),
+            RebuildTable("categories", "CREATE TABLE {name} (id_categoria INTEGER PRIMARY KEY, "
+                                       "nombre VARCHAR NOT NULL UNIQUE, color VARCHAR)",
+                         ["id_categoria", "nombre", "color"]),
+        ]
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("INSERT INTO categories (nombre) VALUES ('Casa')")
+        for version, operation in enumerate(migration, start=100):
+            with Migrator(self.db_path, [Migration(version, "Prueba", [operation])]) as migrator:
+                migrator.migrate()
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("UPDATE categories SET color = color || 'x' WHERE color IS NOT NULL")
+                conn.execute("UPDATE categories SET color = 'rojo' WHERE color IS NULL")
+        with sqlite3.connect(self.db_path) as conn:
+            self.assertEqual(self.log(conn), [("categories", "INSERT", None),
+                                              ("categories", "UPDATE", "color"),
+                                              ("categories", "UPDATE", "color")])
+
+if __name__ == '__main__':
+    unittest.main()
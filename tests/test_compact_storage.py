@@ -0,0 +1,213 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from sqlalchemy import select
+from src.models import Base, CodedEnum, EpochDateTime, Task, TaskFrequency, TaskPriority, TaskState
+from src.database import Migrator, create_engines, create_session_factory
+from src.database.storage import FREQUENCIES, PRIORITIES, STATES
+from src.services import NotificationService, TaskService, UserService
+from src.services.analytics_service import TaskAnalyticsService
+from src.utils import PasswordHasher
+
+START = datetime(2024, 3, 1, 9, 30, 15, 123456)
+
+class TestCompactStorage(unittest.TestCase):
+    """
+    Pruebas unitarias para el almacenamiento compacto de enums y fechas.
+    """
+    def setUp(self):
+        """
+        Crea una base de datos en archivo en el almacenamiento de texto con tareas, notificaciones,
+        historial y tareas archivadas.
+        """
+        self.tmp = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp, "database.db")
+        writer, reader = self.open()
+        Base.metadata.create_all(writer)
+        with self.services(writer, reader) as (session, users, tasks, notifications):
+            user_id = users.create_user({"nombre": "Ana", "correo": "ana@example.com", "contrasena": "password"}).id_usuario
+            for i, (state, priority) in enumerate(zip(TaskState, TaskPriority)):
+                task = tasks.create_task({"titulo": f"Tarea {i}", "id_usuario": user_id, "prioridad": priority.name,
+                                          "fecha_inicio": START + timedelta(days=i),
+                                          "fecha_vencimiento": START + timedelta(days=i + 10),
+                                          "recurrente": True, "frecuencia": TaskFrequency.SEMANAL.name})
+                notifications.create_notification({"id_tarea": task.id_tarea, "fecha_envio": START + timedelta(hours=i)})
+                tasks.update_task(task.id_tarea, {"estado": state.name})
+            tasks.create_task({"titulo": "Sin fechas", "id_usuario": user_id})
+            old = tasks.create_task({"titulo": "Antigua", "id_usuario": user_id, "estado": "COMPLETADA",
+                                     "fecha_inicio": datetime(2020, 1, 1)})
+            notifications.create_notification({"id_tarea": old.id_tarea, "fecha_envio": datetime(2020, 1, 2)})
+            tasks.archive_completed_tasks(older_than_days=30)
+            self.user_id = user_id
+        self.expected = self.snapshot()
+        self.dispose(writer, reader)
+
+    def tearDown(self):
+        """
+        Elimina los archivos temporales.
+        """
+        shutil.rmtree(self.tmp)
+
+    def open(self):
+        return create_engines(self.db_path, readers=1)
+
+    def dispose(self, *engines):
+        for engine in engines:
+            engine.dispose()
+
+    @contextmanager
+    def services(self, writer, reader):
+        session = create_session_factory(writer, reader)()
+        hasher = PasswordHasher(n=2 ** 4, workers=0)
+        try:
+            yield session, UserService(session, hasher), TaskService(session), NotificationService(session)
+        finally:
+            session.close()
+
+    def snapshot(self):
+        """
+        Valores leídos con el ORM de las tareas (activas y archivadas), notificaciones e historial.
+        """
+        writer, reader = self.open()
+        with self.services(writer, reader) as (session, users, tasks, notifications):
+            rows = [(t.id_tarea, t.titulo, t.fecha_inicio, t.fecha_vencimiento, t.estado, t.prioridad,
+                     t.frecuencia, getattr(t, 'fecha_archivado', None))
+                    for t in tasks.get_all_tasks(include_archived=True)]
+            rows += [(n.id_notificacion, n.id_tarea, n.fecha_envio) for n in notifications.get_all_notifications()]
+            rows += [(change.estado_anterior, change.estado_nuevo, change.fecha)
+                     for task in tasks.get_all_tasks() for change in tasks.get_state_history(task.id_tarea)]
+            columns = TaskAnalyticsService(session).task_columns()
+            series = TaskAnalyticsService(session).daily_series(start=date(2024, 1, 1), end=date(2024, 1, 31))
+            analytics = (columns.estado.tolist(), columns.prioridad.tolist(), columns.fecha_inicio.tolist(),
+                         columns.fecha_vencimiento.tolist(), {k: v.tolist() for k, v in series.items()})
+        self.dispose(writer, reader)
+        return rows, analytics
+
+    def query(self, sql):
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute(sql).fetchall()
+
+    def convert(self, compact):
+        with Migrator(self.db_path) as migrator:
+            migrator.migrate()
+            return migrator.convert_storage(compact)
+
+    def test_enum_names_match_models(self):
+        """
+        Verifica que los nombres de los enums del almacenamiento siguen el orden de los modelos.
+        """
+        self.assertEqual(STATES, tuple(member.name for member in TaskState))
+        self.assertEqual(PRIORITIES, tuple(member.name for member in TaskPriority))
+        self.assertEqual(FREQUENCIES, tuple(member.name for member in TaskFrequency))
+
+    def test_round_trip(self):
+        """
+        Verifica que la conversión al almacenamiento compacto y de vuelta al de texto conserva los
+        valores leídos, los índices y la secuencia de los IDs.
+        """
+        indexes = self.query("SELECT name, tbl_name FROM sqlite_master WHERE type IN ('index', 'trigger') ORDER BY name")
+        sequence = self.query("SELECT name, seq FROM sqlite_sequence ORDER BY name")
+        text_values = self.query("SELECT fecha_inicio, estado FROM tasks ORDER BY id_tarea")
+
+        self.assertTrue(self.convert(True))
+        self.assertFalse(self.convert(True))
+        self.assertEqual(self.query("SELECT DISTINCT typeof(estado), typeof(prioridad), typeof(fecha_vencimiento) "
+                                    "FROM tasks WHERE fecha_vencimiento IS NOT NULL"), [("integer",) * 3])
+        self.assertEqual(self.query("SELECT DISTINCT typeof(fecha) FROM task_state_history"), [("integer",)])
+        self.assertEqual({row[2] for row in self.query("PRAGMA table_info(archived_tasks)") if row[1] == "fecha_archivado"},
+                         {"INTEGER"})
+        self.assertEqual(self.query("SELECT name, tbl_name FROM sqlite_master WHERE type IN ('index', 'trigger') "
+                                    "ORDER BY name"), indexes)
+        self.assertEqual(self.query("SELECT name, seq FROM sqlite_sequence ORDER BY name"), sequence)
+        self.assertEqual(self.snapshot(), self.expected)
+
+        self.assertTrue(self.convert(False))
+        self.assertEqual(self.query("SELECT fecha_inicio, estado FROM tasks ORDER BY id_tarea"), text_values)
+        self.assertEqual(self.snapshot(), self.expected)
+
+    def test_writes_and_queries_in_compact_storage(self):
+        """
+        Verifica las escrituras, el historial de los triggers, el archivo y las consultas por rango
+        con el almacenamiento compacto.
+        """
+        self.convert(True)
+        writer, reader = self.open()
+        with self.services(writer, reader) as (session, users, tasks, notifications):
+            task = tasks.create_task({"titulo": "Nueva", "id_usuario": self.user_id, "fecha_inicio": START,
+                                      "prioridad": "ALTA"})
+            task_id = task.id_tarea
+            tasks.update_task(task_id, {"estado": "EN_PROGRESO"})
+            session.expire_all()
+            task = tasks.get_task_by_id(task_id)
+            self.assertEqual((task.fecha_inicio, task.estado, task.prioridad),
+                             (START, TaskState.EN_PROGRESO, TaskPriority.ALTA))
+            history = tasks.get_state_history(task_id)
+            self.assertEqual([(change.estado_anterior, change.estado_nuevo) for change in history],
+                             [(None, TaskState.PENDIENTE), (TaskState.PENDIENTE, TaskState.EN_PROGRESO)])
+            self.assertLess(abs(history[-1].fecha - datetime.now()), timedelta(minutes=1))
+
+            in_range = session.scalars(select(Task.id_tarea)
+                                       .where(Task.fecha_inicio >= START, Task.fecha_inicio < START + timedelta(days=2))
+                                       .order_by(Task.id_tarea)).all()
+            self.assertEqual(len(in_range), 3)
+            self.assertIn(task_id, in_range)
+            self.assertEqual(session.scalars(select(Task.titulo).where(Task.estado == TaskState.EN_PROGRESO)
+                                             .order_by(Task.id_tarea)).all(), ["Tarea 1", "Nueva"])
+
+            tasks.update_task(task_id, {"estado": "COMPLETADA", "fecha_vencimiento": datetime(2020, 1, 1)})
+            self.assertGreaterEqual(tasks.archive_completed_tasks(older_than_days=30), 1)
+            archived = tasks.get_task_by_id(task_id, include_archived=True)
+            self.assertEqual((archived.estado, archived.fecha_inicio), (TaskState.COMPLETADA, START))
+            self.assertIsInstance(archived.fecha_archivado, datetime)
+        self.dispose(writer, reader)
+        self.assertEqual(self.query(f"SELECT typeof(fecha_archivado), estado FROM archived_tasks "
+                                    f"WHERE id_tarea = {task_id}"), [("integer", 2)])
+
+    def test_requires_applied_migrations(self):
+        """
+        Verifica que no se cambia el almacenamiento con migraciones pendientes.
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("DROP TABLE IF EXISTS schema_migrations")
+        with Migrator(self.db_path) as migrator:
+            with self.assertRaises(ValueError):
+                migrator.convert_storage(True)
+
+class TestCompactTypes(unittest.TestCase):
+    """
+    Pruebas unitarias para los tipos CodedEnum y EpochDateTime.
+    """
+    def test_processors(self):
+        """
+        Verifica la codificación de cada almacenamiento y la lectura de los dos formatos.
+        """
+        from sqlalchemy.dialects import sqlite
+
+        text, compact = sqlite.dialect(), sqlite.dialect()
+        compact.compact_storage = True
+        def processors(column, dialect):
+            column = column.dialect_impl(dialect)
+            return column.bind_processor(dialect), column.result_processor(dialect, None)
+
+        enum = CodedEnum(TaskState)
+        self.assertEqual(processors(enum, text)[0](TaskState.COMPLETADA), "COMPLETADA")
+        write, read = processors(enum, compact)
+        self.assertEqual((write("COMPLETADA"), write(None)), (2, None))
+        with self.assertRaises(LookupError):
+            write("CERRADA")
+        self.assertEqual((read(1), read("EN_PROGRESO"), read(None)), (TaskState.EN_PROGRESO, TaskState.EN_PROGRESO, None))
+
+        self.assertEqual(processors(EpochDateTime(), text)[0](START), "2024-03-01 09:30:15.123456")
+        write, _ = processors(EpochDateTime(), compact)
+        _, read = processors(EpochDateTime(), text)
+        self.assertIsInstance(write(START), int)
+        self.assertEqual(read(write(START)), START)
+        self.assertEqual(read("2024-03-01 09:30:15.123456"), START)
+        self.assertEqual(read(write(datetime(1960, 5, 4))), datetime(1960, 5, 4))
+
+if __name__ == '__main__':
+    unittest.main()
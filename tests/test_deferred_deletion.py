@@ -0,0 +1,233 @@
+import os
+import time
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime
+from sqlalchemy import event, text
+from src.database import create_engines, create_session_factory
+from src.models import Base
+from src.services import (
+    CategoryService, DeletionPurger, NotificationService, TaskAnalyticsService, TaskService, UserService
+)
+from src.utils import PasswordHasher
+from tests.test_base import BaseTest
+
+def populate(users, tasks, categories, notifications, per_user=3):
+    """
+    Crea dos usuarios con tareas, notificaciones y una categoría común.
+    :return: Tupla (ID de Ana, ID de Eva, ID de la categoría).
+    """
+    category_id = categories.create_category({"nombre": "Casa"}).id_categoria
+    user_ids = []
+    for name in ("Ana", "Eva"):
+        user_id = users.create_user({"nombre": name, "correo": f"{name.lower()}@example.com",
+                                     "contrasena": "password"}).id_usuario
+        for i in range(per_user):
+            task_id = tasks.create_task({"titulo": f"{name} {i}", "id_usuario": user_id}).id_tarea
+            tasks.add_category_to_task(task_id, category_id)
+            notifications.create_notification({"id_tarea": task_id, "fecha_envio": datetime(2024, 5, 1, 9, 0)})
+        user_ids.append(user_id)
+    return (*user_ids, category_id)
+
+class TestDeferredDeletion(BaseTest):
+    """
+    Pruebas unitarias para el borrado diferido de usuarios y categorías.
+    """
+    def setUp(self):
+        super().setUp()
+        self.ana, self.eva, self.category_id = populate(self.user_service, self.task_service,
+                                                        self.category_service, self.notification_service)
+
+    def count(self, table):
+        return self.session.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+
+    def test_deferred_delete_hides_user_and_dependents(self):
+        """
+        Verifica que marcar un usuario es un único UPDATE y que desde ese momento no aparecen ni él
+        ni sus tareas, notificaciones y asociaciones, aunque sigan en la base de datos.
+        """
+        task = self.task_service.get_tasks_by_user(self.ana)[0]
+        task_id = task.id_tarea
+        statements = []
+        event.listen(self.engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement.split()[0]))
+        self.assertTrue(self.user_service.delete_user(self.ana, deferred=True))
+        self.assertEqual(statements, ["UPDATE"])
+
+        self.assertIsNone(self.user_service.get_user_by_id(self.ana))
+        self.assertIsNone(self.task_service.get_task_by_id(task_id))
+        self.assertEqual([user.id_usuario for user in self.user_service.get_all_users()], [self.eva])
+        self.assertEqual(self.task_service.get_tasks_by_user(self.ana), [])
+        self.assertEqual({row.id_usuario for row in self.task_service.list_tasks()}, {self.eva})
+        self.assertEqual(len(self.notification_service.get_all_notifications()), 3)
+        self.assertEqual(len(self.category_service.get_category_by_id(self.category_id).tareas), 3)
+        self.assertEqual(self.count("tasks"), 6)
+
+        # El correo sigue reservado hasta el borrado y el usuario no se puede volver a eliminar
+        with self.assertRaises(ValueError):
+            self.user_service.create_user({"nombre": "Ana", "correo": "ana@example.com", "contrasena": "password"})
+        self.assertIsNone(self.user_service.authenticate("ana@example.com", "password"))
+        self.assertFalse(self.user_service.delete_user(self.ana, deferred=True))
+        self.assertFalse(self.user_service.delete_user(self.ana))
+
+    def test_deferred_delete_hides_category_links(self):
+        """
+        Verifica que marcar una categoría la oculta junto con sus asociaciones.
+        """
+        self.assertTrue(self.category_service.delete_category(self.category_id, deferred=True))
+        self.assertIsNone(self.category_service.get_category_by_id(self.category_id))
+        self.assertEqual(self.category_service.get_all_categories(), [])
+        self.assertTrue(all(task.categorias == [] for task in self.task_service.get_all_tasks()))
+        self.assertEqual(self.task_service.list_tasks(('id_tarea', 'categorias'))[0].categorias, None)
+        with self.assertRaises(ValueError):
+            self.category_service.create_category({"nombre": "Casa"})
+        self.assertEqual(self.count("task_categories"), 6)
+
+    def test_hidden_rows_are_not_updated(self):
+        """
+        Verifica que las actualizaciones no encuentran (ni modifican) el usuario, sus tareas ni la
+        categoría marcados como eliminados, igual que las consultas.
+        """
+        task_id = self.task_service.get_tasks_by_user(self.ana)[0].id_tarea
+        self.user_service.delete_user(self.ana, deferred=True)
+        self.category_service.delete_category(self.category_id, deferred=True)
+        self.assertIsNone(self.user_service.update_user(self.ana, {"nombre": "Otra"}))
+        self.assertIsNone(self.user_service.update_user(self.ana, {"nombre": "Otra"}, expected_version=2))
+        self.assertIsNone(self.task_service.update_task(task_id, {"titulo": "Oculta"}))
+        self.assertIsNone(self.category_service.update_category(self.category_id, {"nombre": "Otra"}))
+        self.assertEqual(self.count("users WHERE nombre = 'Otra'"), 0)
+        self.assertEqual(self.count("tasks WHERE titulo = 'Oculta'"), 0)
+        self.assertEqual(self.count("categories WHERE nombre = 'Otra'"), 0)
+        self.assertEqual(self.user_service.update_user(self.eva, {"nombre": "Eva María"}).nombre, "Eva María")
+
+    def test_deferred_delete_hides_user_from_analytics(self):
+        """
+        Verifica que las columnas y las series diarias de la analítica dejan de contar las tareas
+        del usuario marcado como eliminado.
+        """
+        analytics = TaskAnalyticsService(self.session)
+        self.assertEqual(len(analytics.task_columns()), 6)
+        self.user_service.delete_user(self.ana, deferred=True)
+        columns = analytics.task_columns()
+        self.assertEqual(set(columns.id_usuario.tolist()), {self.eva})
+        self.assertEqual(len(analytics.task_columns(user_id=self.ana)), 0)
+        series = analytics.daily_series()
+        self.assertEqual((int(series['creadas'].sum()), int(series['abiertas'][-1])), (3, 3))
+        self.assertEqual(int(analytics.daily_series(user_id=self.ana)['creadas'].sum()), 0)
+
+    def test_purge_deletes_in_batches(self):
+        """
+        Verifica que el borrado elimina los datos marcados por lotes y conserva los demás.
+        """
+        self.user_service.delete_user(self.ana, deferred=True)
+        self.category_service.delete_category(self.category_id, deferred=True)
+        totals = []
+        purger = DeletionPurger(lambda: self.session, batch_size=2, pause=0)
+        self.assertEqual(purger.purge(progress=totals.append), {'tareas': 3, 'asociaciones': 3})
+        self.assertEqual(totals, [{'tareas': 2, 'asociaciones': 0}, {'tareas': 3, 'asociaciones': 0},
+                                  {'tareas': 3, 'asociaciones': 2}, {'tareas': 3, 'asociaciones': 3}])
+        self.assertEqual([self.count(table) for table in ("users", "tasks", "notifications", "task_categories",
+                                                          "categories")], [1, 3, 3, 0, 0])
+        self.assertEqual(self.session.execute(text("SELECT COUNT(*) FROM tasks WHERE id_usuario = :id"),
+                                              {"id": self.eva}).scalar(), 3)
+        self.assertEqual(purger.purge(), {'tareas': 0, 'asociaciones': 0})
+        # Tras el borrado el correo y el nombre quedan libres
+        self.user_service.create_user({"nombre": "Ana", "correo": "ana@example.com", "contrasena": "password"})
+        self.category_service.create_category({"nombre": "Casa"})
+
+    def test_archived_tasks_are_hidden_and_purged(self):
+        """
+        Verifica que las tareas archivadas (con sus asociaciones y notificaciones) del usuario marcado
+        se ocultan y se borran con él, y que las asociaciones archivadas de la categoría marcada
+        también se borran.
+        """
+        for user_id in (self.ana, self.eva):
+            task = self.task_service.get_tasks_by_user(user_id)[0]
+            self.task_service.update_task(task.id_tarea, {"estado": "COMPLETADA"})
+        self.assertEqual(self.task_service.archive_completed_tasks(0), 2)
+        self.user_service.delete_user(self.ana, deferred=True)
+        self.assertEqual({task.id_usuario for task in self.task_service.get_all_tasks(include_archived=True)},
+                         {self.eva})
+        self.assertEqual(self.task_service.get_tasks_by_user(self.ana, include_archived=True), [])
+
+        self.category_service.delete_category(self.category_id, deferred=True)
+        archived = self.task_service.get_tasks_by_user(self.eva, include_archived=True)[-1]
+        self.assertEqual(archived.categorias, [])
+        self.assertEqual(DeletionPurger(lambda: self.session, batch_size=2, pause=0).purge(),
+                         {'tareas': 3, 'asociaciones': 3})
+        self.assertEqual([self.count(table) for table in ("archived_tasks", "archived_notifications",
+                                                          "archived_task_categories")], [1, 1, 0])
+        self.assertEqual(self.count(f"archived_tasks WHERE id_usuario = {self.eva}"), 1)
+
+    def test_purger_arguments(self):
+        """
+        Verifica la validación de los parámetros del borrado.
+        """
+        with self.assertRaises(ValueError):
+            DeletionPurger(lambda: self.session, batch_size=0)
+        with self.assertRaises(ValueError):
+            DeletionPurger(lambda: self.session, pause=-1)
+
+class TestDeletionPurgerThread(unittest.TestCase):
+    """
+    Pruebas unitarias para el borrado en segundo plano sobre una base de datos en archivo.
+    """
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp, "database.db")
+        self.writer, self.reader = create_engines(self.db_path, readers=1)
+        Base.metadata.create_all(self.writer)
+        self.factory = create_session_factory(self.writer, self.reader)
+        self.session = self.factory()
+        self.users = UserService(self.session, PasswordHasher(n=2 ** 4, workers=0))
+        self.ana, self.eva, _ = populate(self.users, TaskService(self.session), CategoryService(self.session),
+                                         NotificationService(self.session), per_user=10)
+
+    def tearDown(self):
+        self.session.close()
+        self.writer.dispose()
+        self.reader.dispose()
+        shutil.rmtree(self.tmp)
+
+    def query(self, sql):
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute(sql).fetchone()[0]
+
+    def test_other_writers_run_between_batches(self):
+        """
+        Verifica que entre lotes no queda ninguna transacción abierta: otra conexión escribe sin esperar.
+        """
+        self.users.delete_user(self.ana, deferred=True)
+        writer = sqlite3.connect(self.db_path, timeout=0, isolation_level=None)
+        written = []
+
+        def write_between_batches(totals):
+            writer.execute("UPDATE users SET nombre = ? WHERE id_usuario = ?", (f"Eva {totals['tareas']}", self.eva))
+            written.append(totals['tareas'])
+        DeletionPurger(self.factory, batch_size=4, pause=0).purge(progress=write_between_batches)
+        writer.close()
+        self.assertEqual(written, [4, 8, 10])
+        self.assertEqual(self.query("SELECT COUNT(*) FROM tasks"), 10)
+
+    def test_background_thread(self):
+        """
+        Verifica que el hilo borra los datos marcados al recibir el aviso y se detiene.
+        """
+        purger = DeletionPurger(self.factory, batch_size=3, pause=0, interval=30)
+        purger.start()
+        try:
+            self.users.delete_user(self.ana, deferred=True)
+            purger.wake()
+            deadline = time.monotonic() + 10
+            while self.query("SELECT COUNT(*) FROM users") > 1 and time.monotonic() < deadline:
+                time.sleep(0.02)
+        finally:
+            purger.stop(timeout=10)
+        self.assertIsNone(purger.last_error)
+        self.assertEqual(self.query("SELECT COUNT(*) FROM users"), 1)
+        self.assertEqual(self.query("SELECT COUNT(*) FROM notifications"), 10)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import threading
+import time
+import unittest
+from concurrent.futures import Future
+from importlib import util
+
+HAS_QT = util.find_spec("PyQt5") is not None
+if HAS_QT:
+    from PyQt5.QtWidgets import QApplication
+    from future_watcher import FutureWatcher
+
+@unittest.skipUnless(HAS_QT, "PyQt5 no está instalado")
+class TestFutureWatcher(unittest.TestCase):
+    """
+    Pruebas unitarias para la entrega de resultados de Futures en el hilo de Qt.
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def process_events(self, watcher, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while watcher.pending and time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.005)
+
+    def test_callback_runs_in_qt_thread(self):
+        """
+        Verifica que el resultado de un Future completado en otro hilo llega en el hilo de Qt,
+        y solo al procesar los eventos.
+        """
+        watcher = FutureWatcher()
+        future = Future()
+        received = []
+        watcher.watch(future, lambda done: received.append((done.result(), threading.current_thread())))
+        worker = threading.Thread(target=future.set_result, args=("hash",))
+        worker.start()
+        worker.join()
+        self.assertEqual(received, [])
+        self.process_events(watcher)
+        self.assertEqual(received, [("hash", threading.main_thread())])
+        self.assertEqual(watcher.pending, 0)
+
+    def test_exceptions_reach_the_callback(self):
+        """
+        Verifica que un Future ya terminado con error también se entrega, con su excepción.
+        """
+        watcher = FutureWatcher()
+        future = Future()
+        future.set_exception(ValueError("fallo"))
+        errors = []
+        watcher.watch(future, lambda done: errors.append(done.exception()))
+        self.process_events(watcher)
+        self.assertEqual([str(error) for error in errors], ["fallo"])
+
+if __name__ == '__main__':
+    unittest.main()
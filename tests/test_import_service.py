@@ -0,0 +1,117 @@
+import io
+import json
+from tests.test_base import BaseTest
+from src.models import User, Task, Category, TaskState, TaskPriority
+from src.services import ImportService
+
+class TestImportService(BaseTest):
+    """
+    Pruebas unitarias para la clase ImportService.
+    """
+    def setUp(self):
+        """
+        Crea el servicio de importación y un usuario y una categoría existentes.
+        """
+        super().setUp()
+        self.import_service = ImportService(self.session)
+        self.user = self.user_service.create_user({
+            "nombre": "Existing User",
+            "correo": "existing@example.com",
+            "contrasena": "password"
+        })
+        self.category = self.category_service.create_category({"nombre": "Trabajo"})
+
+    def test_import_users_csv_with_rejects(self):
+        """
+        Verifica la importación de usuarios y el rechazo de correos inválidos o duplicados.
+        """
+        source = io.StringIO(
+            "nombre,correo,contrasena\n"
+            "Ana,ana@example.com,password1\n"
+            "Bad,bad-email,password1\n"
+            "Dup,existing@example.com,password1\n"
+            "Ana Bis,ana@example.com,password1\n"
+            "Luis,luis@example.com,123\n"
+            "Eva,eva@example.com,password1\n"
+        )
+        rejects = io.StringIO()
+        result = self.import_service.import_users(source, "csv", rejects=rejects, batch_size=2)
+        self.assertEqual((result.total, result.inserted, result.rejected), (6, 2, 4))
+        self.assertEqual(self.session.query(User).count(), 3)
+
+        rejected = [json.loads(line) for line in rejects.getvalue().splitlines()]
+        self.assertEqual([entry["linea"] for entry in rejected], [3, 4, 5, 6])
+        self.assertIn("El formato del correo electrónico no es válido.", rejected[0]["errores"][0])
+        self.assertIn("Ya existe un usuario con el correo: existing@example.com", rejected[1]["errores"][0])
+        self.assertIn("Ya existe un usuario con el correo: ana@example.com", rejected[2]["errores"][0])
+        self.assertEqual(rejected[3]["registro"]["nombre"], "Luis")
+
+    def test_import_categories_jsonl(self):
+        """
+        Verifica la importación de categorías y el rechazo de líneas mal formadas.
+        """
+        source = io.StringIO('{"nombre": "Casa"}\n{"nombre": "Trabajo"}\nno es json\n{"nombre": "Ocio"}\n')
+        result = self.import_service.import_categories(source, "jsonl")
+        self.assertEqual((result.total, result.inserted, result.rejected), (4, 2, 2))
+        names = sorted(c.nombre for c in self.session.query(Category).all())
+        self.assertEqual(names, ["Casa", "Ocio", "Trabajo"])
+
+    def test_import_tasks_resolves_users_and_categories(self):
+        """
+        Verifica que las tareas se asocian a usuarios por ID o correo y a categorías por nombre.
+        """
+        source = io.StringIO(
+            "titulo,estado,prioridad,id_usuario,correo_usuario,categorias,fecha_inicio\n"
+            f"Task A,En progreso,ALTA,{self.user.id_usuario},,Trabajo,2024-01-01T10:00:00\n"
+            "Task B,,,,existing@example.com,,\n"
+            "Task C,,,,missing@example.com,,\n"
+            f"Task D,,,{self.user.id_usuario},,Inexistente,\n"
+            f",,,{self.user.id_usuario},,,\n"
+            f"Task E,INVALID,,{self.user.id_usuario},,,\n"
+            "Task F,,,999,,,\n"
+        )
+        rejects = io.StringIO()
+        result = self.import_service.import_tasks(source, "csv", rejects=rejects)
+        self.assertEqual((result.total, result.inserted, result.rejected), (7, 2, 5))
+
+        task_a = self.session.query(Task).filter_by(titulo="Task A").one()
+        self.assertEqual(task_a.estado, TaskState.EN_PROGRESO)
+        self.assertEqual(task_a.prioridad, TaskPriority.ALTA)
+        self.assertEqual(task_a.fecha_inicio.year, 2024)
+        self.assertEqual([tc.categoria.nombre for tc in task_a.categorias], ["Trabajo"])
+        task_b = self.session.query(Task).filter_by(titulo="Task B").one()
+        self.assertEqual(task_b.id_usuario, self.user.id_usuario)
+        self.assertEqual(task_b.estado, TaskState.PENDIENTE)
+
+        errors = [json.loads(line)["errores"][0] for line in rejects.getvalue().splitlines()]
+        self.assertIn("El usuario con correo missing@example.com no existe.", errors[0])
+        self.assertIn("La categoría con nombre Inexistente no existe.", errors[1])
+        self.assertIn("El título de la tarea es obligatorio", errors[2])
+        self.assertIn("Estado de tarea inválido.", errors[3])
+        self.assertIn("El usuario con ID 999 no existe.", errors[4])
+
+    def test_export_import_round_trip(self):
+        """
+        Verifica que un archivo exportado por TaskService.export se puede volver a importar.
+        """
+        task = self.task_service.create_task({
+            "titulo": "Round Trip", "id_usuario": self.user.id_usuario, "estado": TaskState.EN_PROGRESO
+        })
+        self.task_service.add_category_to_task(task.id_tarea, self.category.id_categoria)
+        exported = io.StringIO()
+        self.task_service.export("jsonl", out=exported)
+
+        result = self.import_service.import_tasks(io.StringIO(exported.getvalue()), "jsonl")
+        self.assertEqual((result.inserted, result.rejected), (1, 0))
+        copies = self.session.query(Task).filter_by(titulo="Round Trip").all()
+        self.assertEqual(len(copies), 2)
+        self.assertEqual(copies[1].estado, TaskState.EN_PROGRESO)
+        self.assertEqual(len(copies[1].categorias), 1)
+
+    def test_import_invalid_format(self):
+        """
+        Verifica que la importación falla con un formato no soportado.
+        """
+        with self.assertRaises(ValueError) as cm:
+            self.import_service.import_users(io.StringIO(""), "xml")
+        self.assertIn("Formato de importación inválido.", str(cm.exception))
@@ -0,0 +1,114 @@
+import os
+import unittest
+from importlib import util
+from tests.test_base import BaseTest
+
+HAS_QT = util.find_spec("PyQt5") is not None
+if HAS_QT:
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtCore import Qt
+    from PyQt5.QtWidgets import QApplication, QComboBox
+    from lookup_models import LabelLookup, LookupListModel, PrefixSearchModel, attach_lookup
+
+@unittest.skipUnless(HAS_QT, "PyQt5 no está instalado")
+class TestLookupModels(BaseTest):
+    """
+    Pruebas unitarias para los modelos de los comboboxes con carga por páginas y autocompletado.
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        """
+        Crea un usuario con 25 tareas y un modelo de tareas con páginas de 10 que cuenta las consultas.
+        """
+        super().setUp()
+        user = self.user_service.create_user({"nombre": "Ana", "correo": "ana@example.com", "contrasena": "password"})
+        self.tasks = [self.task_service.create_task({"titulo": f"Tarea {i:02d}", "id_usuario": user.id_usuario})
+                      for i in range(25)]
+        self.queries = []
+
+        def fetch(**kwargs):
+            self.queries.append(kwargs)
+            return self.task_service.lookup_tasks(**kwargs)
+
+        self.lookup = LabelLookup(fetch, lambda entity_id, text: f"{text} (ID: {entity_id})")
+        self.model = LookupListModel(self.lookup, "--- Seleccionar Tarea ---", page_size=10)
+
+    def tearDown(self):
+        """
+        Atiende los eventos pendientes de los widgets (que pueden pedir filas) antes de borrar las tablas.
+        """
+        self.app.processEvents()
+        super().tearDown()
+
+    def labels(self):
+        return [self.model.index(row).data() for row in range(self.model.rowCount())]
+
+    def test_rows_are_fetched_in_pages(self):
+        """
+        Verifica que el modelo empieza sin consultar y carga las entidades por páginas.
+        """
+        self.assertEqual(self.labels(), ["--- Seleccionar Tarea ---"])
+        self.assertIsNone(self.model.index(0).data(Qt.UserRole))
+        self.assertEqual(self.queries, [])
+
+        while self.model.canFetchMore():
+            self.model.fetchMore()
+        self.assertEqual(self.model.rowCount(), 26)
+        self.assertEqual(len(self.queries), 3)
+        self.assertEqual(self.model.index(1).data(), f"Tarea 00 (ID: {self.tasks[0].id_tarea})")
+        self.assertEqual(self.model.index(25).data(Qt.UserRole), self.tasks[-1].id_tarea)
+
+    def test_row_for_id_outside_loaded_pages(self):
+        """
+        Verifica que seleccionar un ID no cargado lo añade con una sola consulta y sin duplicarlo después.
+        """
+        self.model.fetchMore()
+        last = self.tasks[-1].id_tarea
+        row = self.model.row_for_id(last)
+        self.assertEqual(self.model.index(row).data(Qt.UserRole), last)
+        self.assertEqual(self.queries[-1], {"ids": [last], "limit": None})
+        self.assertEqual(self.model.row_for_id(last), row)
+        self.assertEqual(self.model.row_for_id(None), 0)
+        self.assertEqual(self.model.row_for_id(999), 0)
+
+        while self.model.canFetchMore():
+            self.model.fetchMore()
+        ids = [self.model.index(r).data(Qt.UserRole) for r in range(1, self.model.rowCount())]
+        self.assertEqual(sorted(ids), [task.id_tarea for task in self.tasks])
+
+    def test_label_cache_and_reset(self):
+        """
+        Verifica que las etiquetas se guardan en la caché y que reset la vacía.
+        """
+        self.model.fetchMore()
+        queries = len(self.queries)
+        self.assertEqual(self.lookup.label(self.tasks[0].id_tarea), f"Tarea 00 (ID: {self.tasks[0].id_tarea})")
+        self.assertEqual(len(self.queries), queries)
+
+        self.model.reset()
+        self.assertEqual(self.model.rowCount(), 1)
+        self.assertTrue(self.model.canFetchMore())
+        self.lookup.label(self.tasks[0].id_tarea)
+        self.assertEqual(len(self.queries), queries + 1)
+
+    def test_prefix_search_and_combobox_completion(self):
+        """
+        Verifica las sugerencias por prefijo (limitadas) y que elegir una selecciona su ID en el combobox.
+        """
+        suggestions = PrefixSearchModel(self.lookup, limit=3)
+        suggestions.search("tarea 1")
+        self.assertEqual(suggestions.rowCount(), 3)
+        self.assertEqual(self.queries[-1], {"prefix": "tarea 1", "limit": 3})
+        suggestions.search("  ")
+        self.assertEqual(suggestions.rowCount(), 0)
+
+        combo = QComboBox()
+        completer = attach_lookup(combo, self.model, limit=5)
+        self.assertTrue(combo.isEditable())
+        completer.model().search("Tarea 2")
+        target = completer.completionModel().index(2, 0)
+        completer.activated[type(target)].emit(target)
+        self.assertEqual(combo.currentData(), self.tasks[22].id_tarea)
@@ -0,0 +1,95 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from src.database import database_stats, run_maintenance
+from src.database.maintenance import connect, enable_incremental_vacuum, incremental_vacuum, checkpoint
+
+class TestMaintenance(unittest.TestCase):
+    """
+    Pruebas unitarias para el mantenimiento de la base de datos.
+    """
+    def setUp(self):
+        """
+        Crea una base de datos en archivo con una tabla de la que se borran muchas filas.
+        """
+        self.tmp = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp, "database.db")
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("CREATE TABLE datos (id INTEGER PRIMARY KEY, carga TEXT)")
+            conn.execute("CREATE INDEX ix_datos_carga ON datos (carga)")
+            conn.executemany("INSERT INTO datos (carga) VALUES (?)", ((f"{i:08d}" * 50,) for i in range(5000)))
+        self.conn = connect(self.db_path)
+
+    def tearDown(self):
+        """
+        Cierra la conexión y elimina los archivos temporales.
+        """
+        self.conn.close()
+        shutil.rmtree(self.tmp)
+
+    def delete_most_rows(self):
+        self.conn.execute("DELETE FROM datos WHERE id > 500")
+
+    def test_incremental_vacuum_in_time_slices(self):
+        """
+        Verifica que el vacuum incremental libera páginas por pasos y reduce el archivo.
+        """
+        self.assertTrue(enable_incremental_vacuum(self.conn))
+        self.assertFalse(enable_incremental_vacuum(self.conn))
+        self.delete_most_rows()
+        before = database_stats(self.conn)
+        self.assertGreater(before['fragmentation'], 0.5)
+
+        steps = []
+        freed = incremental_vacuum(self.conn, pages_per_step=50, pause=0, progress=lambda f, r: steps.append(r))
+        after = database_stats(self.conn)
+        self.assertEqual(freed, before['freelist_count'])
+        self.assertEqual(after['freelist_count'], 0)
+        self.assertLess(after['size'], before['size'])
+        self.assertGreater(len(steps), 1)
+
+    def test_incremental_vacuum_respects_time_budget(self):
+        """
+        Verifica que el vacuum se detiene al agotar el tiempo, dejando páginas para la próxima vez.
+        """
+        enable_incremental_vacuum(self.conn)
+        self.delete_most_rows()
+        freed = incremental_vacuum(self.conn, pages_per_step=1, time_budget=0)
+        self.assertEqual(freed, 0)
+        self.assertGreater(database_stats(self.conn)['freelist_count'], 0)
+
+    def test_checkpoint_only_in_wal_mode(self):
+        """
+        Verifica que el checkpoint solo se ejecuta en modo WAL.
+        """
+        self.assertIsNone(checkpoint(self.conn))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("INSERT INTO datos (carga) VALUES ('x')")
+        busy, log, done = checkpoint(self.conn, 'truncate')
+        self.assertEqual(busy, 0)
+        with self.assertRaises(ValueError):
+            checkpoint(self.conn, 'INVALID')
+
+    def test_run_maintenance_report(self):
+        """
+        Verifica el informe completo: estadísticas, pasos ejecutados e integridad.
+        """
+        self.delete_most_rows()
+        report = run_maintenance(self.db_path, enable_incremental=True, time_budget=10)
+        self.assertEqual(report.before['auto_vacuum'], 'NONE')
+        self.assertEqual(report.after['auto_vacuum'], 'INCREMENTAL')
+        self.assertEqual(report.after['freelist_count'], 0)
+        self.assertLess(report.after['size'], report.before['size'])
+        self.assertEqual(list(report.steps), ['auto_vacuum', 'optimize', 'incremental_vacuum', 'checkpoint',
+                                              'integrity_check'])
+        self.assertEqual(report.problems, [])
+        self.assertGreater(self.conn.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0], 0)
+
+    def test_missing_database(self):
+        """
+        Verifica que el mantenimiento falla si la base de datos no existe.
+        """
+        with self.assertRaises(ValueError):
+            run_maintenance(os.path.join(self.tmp, "missing.db"))
@@ -0,0 +1,228 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.models import Base, TaskState
+from src.services import NotificationService, TaskService
+from src.database import Migration, Migrator, AddColumn, CreateIndex, RebuildTable
+
+# Esquema que creaba create_all en la primera versión de la aplicación, antes de las migraciones
+BASELINE_SCHEMA = """
+    CREATE TABLE categories (id_categoria INTEGER NOT NULL, nombre VARCHAR NOT NULL,
+                             PRIMARY KEY (id_categoria), UNIQUE (nombre));
+    CREATE INDEX ix_categories_id_categoria ON categories (id_categoria);
+    CREATE TABLE users (id_usuario INTEGER NOT NULL, nombre VARCHAR NOT NULL, correo VARCHAR NOT NULL,
+                        contrasena VARCHAR NOT NULL, PRIMARY KEY (id_usuario), UNIQUE (correo));
+    CREATE INDEX ix_users_id_usuario ON users (id_usuario);
+    CREATE TABLE tasks (id_tarea INTEGER NOT NULL, titulo VARCHAR NOT NULL, descripcion VARCHAR,
+                        fecha_inicio DATETIME, fecha_vencimiento DATETIME, estado VARCHAR(11) NOT NULL,
+                        prioridad VARCHAR(5) NOT NULL, recurrente BOOLEAN, frecuencia VARCHAR(7),
+                        id_usuario INTEGER NOT NULL, PRIMARY KEY (id_tarea),
+                        FOREIGN KEY(id_usuario) REFERENCES users (id_usuario));
+    CREATE INDEX ix_tasks_id_tarea ON tasks (id_tarea);
+    CREATE TABLE notifications (id_notificacion INTEGER NOT NULL, id_tarea INTEGER NOT NULL,
+                                fecha_envio DATETIME NOT NULL, PRIMARY KEY (id_notificacion),
+                                FOREIGN KEY(id_tarea) REFERENCES tasks (id_tarea));
+    CREATE INDEX ix_notifications_id_notificacion ON notifications (id_notificacion);
+    CREATE TABLE task_categories (id_tarea INTEGER NOT NULL, id_categoria INTEGER NOT NULL,
+                                  PRIMARY KEY (id_tarea, id_categoria),
+                                  FOREIGN KEY(id_tarea) REFERENCES tasks (id_tarea),
+                                  FOREIGN KEY(id_categoria) REFERENCES categories (id_categoria));
+    INSERT INTO users VALUES (1, 'Ana', 'ana@example.com', 'x');
+    INSERT INTO tasks VALUES (1, 'Hecha', NULL, '2024-01-01 09:00:00.000000', NULL, 'COMPLETADA', 'MEDIA', 0, NULL, 1);
+    INSERT INTO tasks VALUES (2, 'Pendiente', NULL, '2024-01-02 09:00:00.000000', NULL, 'PENDIENTE', 'ALTA', 0, NULL, 1);
+    INSERT INTO notifications VALUES (1, 2, '2024-01-03 09:00:00.000000');
+"""
+
+class TestMigrations(unittest.TestCase):
+    """
+    Pruebas unitarias para el sistema de migraciones.
+    """
+    def setUp(self):
+        """
+        Crea una base de datos en archivo con una tabla 'items' con datos.
+        """
+        self.tmp = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp, "database.db")
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, nombre VARCHAR, precio VARCHAR)")
+            conn.executemany("INSERT INTO items (nombre, precio) VALUES (?, ?)",
+                             ((f"item {i}", str(i * 10)) for i in range(1, 101)))
+
+    def tearDown(self):
+        """
+        Elimina los archivos temporales.
+        """
+        shutil.rmtree(self.tmp)
+
+    def query(self, sql):
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute(sql).fetchall()
+
+    def index_names(self, table):
+        return {row[0] for row in self.query(f"SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = '{table}'")}
+
+    def test_project_migrations_on_new_and_old_schema(self):
+        """
+        Verifica que las migraciones del proyecto se registran en una base de datos nueva y
+        crean los índices en una base de datos anterior a ellos.
+        """
+        engine = create_engine(f"sqlite:///{self.db_path}")
+        Base.metadata.create_all(engine)
+        engine.dispose()
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("DROP INDEX ix_tasks_estado")
+        with Migrator(self.db_path) as migrator:
+            self.assertEqual([m.version for m in migrator.pending()], [1, 2, 3, 4, 5, 6, 7])
+            migrator.migrate()
+            self.assertEqual(migrator.applied_versions(), [1, 2, 3, 4, 5, 6, 7])
+            self.assertEqual(migrator.pending(), [])
+            self.assertEqual(migrator.migrate(), [])
+        self.assertIn("ix_tasks_estado", self.index_names("tasks"))
+
+    def test_add_column_and_index_with_target_version(self):
+        """
+        Verifica AddColumn, CreateIndex y la migración hasta una versión concreta.
+        """
+        migrations = [
+            Migration(1, "Columna stock", [AddColumn("items", "stock", "INTEGER NOT NULL DEFAULT 0")]),
+            Migration(2, "Índice por nombre", [CreateIndex("ix_items_nombre", "items", ["nombre"], unique=True)]),
+        ]
+        with Migrator(self.db_path, migrations) as migrator:
+            self.assertEqual(migrator.migrate(target=1), migrations[:1])
+            self.assertEqual(self.query("SELECT SUM(stock) FROM items"), [(0,)])
+            # Reaplicar la operación no falla aunque la columna ya exista
+            migrations[0].operations[0].apply(migrator.conn, 100, None)
+            # Una columna opcional no se añade si la tabla no existe
+            AddColumn("missing", "stock", "INTEGER", optional=True).apply(migrator.conn, 100, None)
+            with self.assertRaises(sqlite3.OperationalError):
+                AddColumn("missing", "stock", "INTEGER").apply(migrator.conn, 100, None)
+            migrator.migrate()
+        self.assertIn("ix_items_nombre", self.index_names("items"))
+
+    def test_rebuild_table_in_batches_with_concurrent_writes(self):
+        """
+        Verifica que la reescritura por lotes conserva los cambios hechos durante la copia.
+        """
+        rebuild = RebuildTable(
+            "items",
+            "CREATE TABLE {name} (id INTEGER PRIMARY KEY, nombre VARCHAR NOT NULL, precio INTEGER NOT NULL)",
+            {"id": "{row}id", "nombre": "{row}nombre", "precio": "CAST({row}precio AS INTEGER)"},
+            indexes=[CreateIndex("ix_items_precio", "items", ["precio"])],
+        )
+        writer = sqlite3.connect(self.db_path, isolation_level=None)
+        batches = []
+
+        def progress(description, done, total):
+            batches.append(done)
+            if len(batches) == 2:
+                # Cambios de otra conexión entre lotes: antes y después del punto copiado
+                writer.execute("UPDATE items SET precio = '5' WHERE id = 1")
+                writer.execute("UPDATE items SET precio = '7' WHERE id = 90")
+                writer.execute("DELETE FROM items WHERE id IN (2, 95)")
+                writer.execute("INSERT INTO items (nombre, precio) VALUES ('nuevo', '3')")
+
+        with Migrator(self.db_path, [Migration(1, "Precio entero", [rebuild])]) as migrator:
+            migrator.migrate(batch_size=30, progress=progress)
+        writer.close()
+
+        self.assertEqual(batches[1:], [30, 60, 90, 100])
+        self.assertEqual(self.query("SELECT COUNT(*), SUM(precio) FROM items"),
+                         [(99, sum(i * 10 for i in range(1, 101)) - 10 + 5 - 900 + 7 - 20 - 950 + 3)])
+        self.assertEqual(self.query("SELECT typeof(precio) FROM items WHERE id = 1"), [("integer",)])
+        self.assertEqual(self.index_names("items"), {"ix_items_precio"})
+        self.assertEqual(self.query("SELECT name FROM sqlite_master WHERE name LIKE '_mig%'"), [])
+
+    def test_estimate_does_not_modify_database(self):
+        """
+        Verifica que la simulación estima la duración sin aplicar cambios.
+        """
+        migrations = [Migration(1, "Índice y reescritura", [
+            CreateIndex("ix_items_nombre", "items", ["nombre"]),
+            RebuildTable("items", "CREATE TABLE {name} (id INTEGER PRIMARY KEY, nombre VARCHAR)", ["id", "nombre"]),
+        ])]
+        with Migrator(self.db_path, migrations) as migrator:
+            (migration, estimates), = migrator.estimate()
+            self.assertEqual(len(estimates), 2)
+            self.assertTrue(all(seconds > 0 for _, seconds in estimates))
+            self.assertEqual(migrator.applied_versions(), [])
+        self.assertEqual(self.index_names("items"), set())
+        self.assertEqual(len(self.query("PRAGMA table_info(items)")), 3)
+
+    def test_invalid_migrations(self):
+        """
+        Verifica que se rechazan versiones repetidas y nombres inválidos.
+        """
+        with self.assertRaises(ValueError):
+            Migrator(self.db_path, [Migration(1, "a", []), Migration(1, "b", [])])
+        with self.assertRaises(ValueError):
+            AddColumn("items; DROP TABLE items", "x", "INTEGER")
+        with self.assertRaises(ValueError):
+            Migrator(os.path.join(self.tmp, "missing.db"))
+
+    def test_project_migrations_on_baseline_schema(self):
+        """
+        Verifica que las migraciones del proyecto llevan de principio a fin una base de datos con
+        el esquema inicial (sin tablas de archivo y sin pasar por init_schema).
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executescript(BASELINE_SCHEMA)
+        with Migrator(self.db_path) as migrator:
+            migrator.migrate()
+            self.assertEqual(migrator.applied_versions(), [m.version for m in migrator.migrations])
+        self.assertEqual(self.query("SELECT id_tarea, estado_anterior, estado_nuevo FROM task_state_history "
+                                    "ORDER BY id_tarea, id"),
+                         [(1, None, "PENDIENTE"), (1, "PENDIENTE", "COMPLETADA"), (2, None, "PENDIENTE")])
+        self.assertEqual(self.query("SELECT eliminado, version FROM users"), [(0, 1)])
+        self.assertIn("ix_tasks_estado", self.index_names("tasks"))
+
+    def test_failed_migration_is_not_recorded(self):
+        """
+        Verifica que una migración que falla no deja cambios a medias ni queda registrada.
+        """
+        migrations = [Migration(1, "Columna y fallo", [
+            AddColumn("items", "stock", "INTEGER NOT NULL DEFAULT 0"),
+            AddColumn("missing", "stock", "INTEGER"),
+        ])]
+        with Migrator(self.db_path, migrations) as migrator:
+            with self.assertRaises(sqlite3.OperationalError):
+                migrator.migrate()
+            self.assertEqual(migrator.applied_versions(), [])
+        self.assertNotIn("stock", {row[1] for row in self.query("PRAGMA table_info(items)")})
+
+    def test_autoincrement_keeps_archived_ids(self):
+        """
+        Verifica que, tras archivar las tareas de mayor ID en una base de datos creada sin
+        AUTOINCREMENT, la migración evita que las tareas y notificaciones nuevas reciban los IDs
+        archivados y el archivado sigue funcionando.
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executescript(BASELINE_SCHEMA)
+            conn.execute("UPDATE tasks SET estado = 'COMPLETADA'")
+        with Migrator(self.db_path) as migrator:
+            migrator.migrate(target=6)
+        engine = create_engine(f"sqlite:///{self.db_path}")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        tasks, notifications = TaskService(session), NotificationService(session)
+        try:
+            self.assertEqual(tasks.archive_completed_tasks(30), 2)
+            session.close()
+            with Migrator(self.db_path) as migrator:
+                migrator.migrate()
+            task = tasks.create_task({"titulo": "Nueva", "id_usuario": 1, "estado": TaskState.COMPLETADA,
+                                      "fecha_inicio": datetime(2024, 2, 1)})
+            notification = notifications.create_notification({"id_tarea": task.id_tarea,
+                                                              "fecha_envio": datetime(2024, 2, 2)})
+            self.assertEqual((task.id_tarea, notification.id_notificacion), (3, 2))
+            self.assertEqual(tasks.archive_completed_tasks(30), 1)
+        finally:
+            session.close()
+            engine.dispose()
+        self.assertIn("AUTOINCREMENT", self.query("SELECT sql FROM sqlite_master WHERE name = 'tasks'")[0][0])
+        self.assertEqual(self.index_names("tasks"), {"ix_tasks_id_tarea", "ix_tasks_id_usuario", "ix_tasks_estado"})
+        self.assertEqual(self.query("SELECT name FROM sqlite_master WHERE name LIKE '_mig%'"), [])
@@ -0,0 +1,211 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+import multiprocessing
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from src.database import RetryPolicy, create_engines, create_session_factory, is_busy_error
+from src.models import Base, Category
+from src.repositories import ConcurrentUpdateError
+from src.services import TaskService, UserService
+from src.utils import PasswordHasher
+from tests.test_base import BaseTest
+
+def increment(db_path, task_id, increments):
+    """
+    Suma `increments` al contador (el título) de una tarea leyendo, sumando y escribiendo con la
+    versión leída; si otro proceso se adelanta, vuelve a leer y lo intenta de nuevo.
+    :return: Tupla (incrementos hechos, conflictos, errores de base de datos ocupada).
+    """
+    writer, reader = create_engines(db_path, readers=1, busy_timeout=5)
+    session = create_session_factory(writer, reader, RetryPolicy(attempts=20, base_delay=0.005))()
+    service = TaskService(session)
+    done = conflicts = busy = 0
+    try:
+        while done < increments:
+            session.expire_all()
+            task = service.get_task_by_id(task_id)
+            try:
+                service.update_task(task_id, {"titulo": str(int(task.titulo) + 1)}, expected_version=task.version)
+                done += 1
+            except ConcurrentUpdateError:
+                conflicts += 1
+            except OperationalError as e:
+                if not is_busy_error(e):
+                    raise
+                busy += 1
+                session.rollback()
+    finally:
+        session.close()
+        writer.dispose()
+        reader.dispose()
+    return done, conflicts, busy
+
+class TestOptimisticConcurrency(BaseTest):
+    """
+    Pruebas unitarias para las versiones de las filas y las actualizaciones condicionadas.
+    """
+    def setUp(self):
+        super().setUp()
+        user = self.user_service.create_user({"nombre": "Ana", "correo": "ana@example.com", "contrasena": "password"})
+        self.task = self.task_service.create_task({"titulo": "Tarea", "id_usuario": user.id_usuario})
+        self.task_id = self.task.id_tarea
+
+    def bump(self):
+        """
+        Simula la escritura de otro proceso, fuera de la sesión de las pruebas.
+        """
+        with self.engine.begin() as conn:
+            conn.execute(text("UPDATE tasks SET titulo = 'Otro', version = version + 1 WHERE id_tarea = :id"),
+                         {"id": self.task_id})
+
+    def test_update_increments_version(self):
+        """
+        Verifica que cada actualización incrementa la versión, se indique o no la esperada.
+        """
+        self.assertEqual(self.task.version, 1)
+        task = self.task_service.update_task(self.task_id, {"titulo": "Uno"})
+        self.assertEqual(task.version, 2)
+        task = self.task_service.update_task(self.task_id, {"titulo": "Dos"}, expected_version=2)
+        self.assertEqual((task.titulo, task.version), ("Dos", 3))
+        self.assertEqual(self.task_service.update_task(self.task_id, {}, expected_version=3).version, 3)
+
+    def test_stale_version_is_rejected(self):
+        """
+        Verifica que una actualización con una versión que ya no es la de la fila no pisa el cambio
+        del otro proceso, y que una tarea inexistente sigue devolviendo None.
+        """
+        self.bump()
+        with self.assertRaises(ConcurrentUpdateError) as raised:
+            self.task_service.update_task(self.task_id, {"titulo": "Mío"}, expected_version=1)
+        self.assertIn("versión 2", str(raised.exception))
+        self.assertEqual(self.session.execute(text("SELECT titulo, version FROM tasks")).one(), ("Otro", 2))
+        with self.assertRaises(ConcurrentUpdateError):
+            self.task_service.update_task(self.task_id, {}, expected_version=1)
+        self.assertIsNone(self.task_service.update_task(999, {"titulo": "Nada"}, expected_version=1))
+        with self.assertRaises(ValueError):
+            self.task_service.update_task(self.task_id, {"titulo": "Mío"}, expected_version=0)
+
+    def test_update_checks_fields_and_keeps_pending_work(self):
+        """
+        Verifica que un campo que no es una columna se rechaza con ValueError y que actualizar una
+        entidad inexistente no descarta lo pendiente en la sesión.
+        """
+        with self.assertRaises(ValueError) as raised:
+            self.task_service.update_task(self.task_id, {"foo": 1})
+        self.assertIn("foo", str(raised.exception))
+        self.session.add(Category(nombre="Pendiente"))
+        self.assertIsNone(self.task_service.update_task(999, {"titulo": "Nada"}))
+        self.assertEqual(self.session.execute(text("SELECT nombre FROM categories")).scalars().all(), ["Pendiente"])
+
+    def test_stale_delete_is_rejected(self):
+        """
+        Verifica que borrar una entidad cargada que otro proceso ha modificado no la borra.
+        """
+        self.assertEqual(self.task_service.get_task_by_id(self.task_id).version, 1)
+        self.bump()
+        with self.assertRaises(ConcurrentUpdateError):
+            self.task_service.delete_task(self.task_id)
+        self.assertTrue(self.task_service.delete_task(self.task_id))
+        self.assertIsNone(self.task_service.get_task_by_id(self.task_id))
+
+class TestRetryPolicy(unittest.TestCase):
+    """
+    Pruebas unitarias para los reintentos ante SQLITE_BUSY.
+    """
+    def failing(self, errors):
+        """
+        Acción que lanza los errores dados en orden y después devuelve el número de llamadas.
+        """
+        calls = []
+
+        def action():
+            calls.append(None)
+            if len(calls) <= len(errors):
+                raise errors[len(calls) - 1]
+            return len(calls)
+        return action
+
+    def test_retries_busy_errors(self):
+        """
+        Verifica que se repiten las escrituras que fallan por base de datos ocupada, deshaciendo antes.
+        """
+        busy = sqlite3.OperationalError("database is locked")
+        retried, rollbacks = [], []
+        policy = RetryPolicy(attempts=3, base_delay=0, max_delay=0,
+                             on_retry=lambda attempt, error: retried.append(attempt))
+        self.assertEqual(policy.run(self.failing([busy, busy]), rollback=lambda: rollbacks.append(None)), 3)
+        self.assertEqual((retried, len(rollbacks)), ([1, 2], 2))
+        with self.assertRaises(sqlite3.OperationalError):
+            policy.run(self.failing([busy] * 3))
+        with self.assertRaises(sqlite3.IntegrityError):
+            policy.run(self.failing([sqlite3.IntegrityError("UNIQUE constraint failed")]))
+
+    def test_busy_error_detection(self):
+        """
+        Verifica qué errores se consideran de base de datos ocupada, también envueltos por SQLAlchemy.
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "database.db")
+            holder = sqlite3.connect(path, isolation_level=None)
+            holder.execute("CREATE TABLE t (x)")
+            holder.execute("BEGIN IMMEDIATE")
+            other = sqlite3.connect(path, timeout=0)
+            with self.assertRaises(sqlite3.OperationalError) as raised:
+                other.execute("INSERT INTO t VALUES (1)")
+            other.close()
+            holder.close()
+        self.assertTrue(is_busy_error(raised.exception))
+        self.assertTrue(is_busy_error(OperationalError("INSERT", {}, raised.exception)))
+        self.assertFalse(is_busy_error(sqlite3.OperationalError("no such table: t")))
+        self.assertFalse(is_busy_error(ValueError("database is locked")))
+
+    def test_delays_and_arguments(self):
+        """
+        Verifica la espera exponencial con tope y la validación de los parámetros.
+        """
+        policy = RetryPolicy(base_delay=0.1, max_delay=0.3, jitter=0)
+        self.assertEqual([policy.delay(attempt) for attempt in (1, 2, 3, 4)], [0.1, 0.2, 0.3, 0.3])
+        self.assertTrue(0.05 <= RetryPolicy(base_delay=0.1, jitter=0.5).delay(1) <= 0.1)
+        for kwargs in ({"attempts": 0}, {"base_delay": -1}, {"base_delay": 2, "max_delay": 1}, {"jitter": 2}):
+            with self.assertRaises(ValueError):
+                RetryPolicy(**kwargs)
+
+class TestConcurrentProcesses(unittest.TestCase):
+    """
+    Pruebas de varios procesos actualizando la misma fila de una base de datos en archivo.
+    """
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp, "database.db")
+        writer, reader = create_engines(self.db_path, readers=0)
+        Base.metadata.create_all(writer)
+        session = create_session_factory(writer)()
+        user = UserService(session, PasswordHasher(n=2 ** 4, workers=0)).create_user(
+            {"nombre": "Ana", "correo": "ana@example.com", "contrasena": "password"})
+        self.task_id = TaskService(session).create_task({"titulo": "0", "id_usuario": user.id_usuario}).id_tarea
+        session.close()
+        writer.dispose()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_no_lost_updates(self):
+        """
+        Verifica que, con las actualizaciones condicionadas a la versión, ningún incremento se pierde
+        aunque varios procesos lean y escriban la misma tarea a la vez, y que ningún error de base de
+        datos ocupada llega a la aplicación.
+        """
+        processes, increments = 4, 25
+        with multiprocessing.Pool(processes) as pool:
+            results = pool.starmap(increment, [(self.db_path, self.task_id, increments)] * processes)
+        self.assertEqual(sum(done for done, _, _ in results), processes * increments)
+        self.assertEqual(sum(busy for _, _, busy in results), 0)
+        with sqlite3.connect(self.db_path) as conn:
+            titulo, version = conn.execute("SELECT titulo, version FROM tasks").fetchone()
+        self.assertEqual((int(titulo), version), (processes * increments, processes * increments + 1))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import io
+import unittest
+from src.models import User
+from src.services import ImportService
+from src.utils import PasswordHasher, hash_password, verify_password, is_password_hash
+from src.utils.passwords import parse_password_hash
+from tests.test_base import BaseTest
+
+class TestPasswordHashing(unittest.TestCase):
+    """
+    Pruebas unitarias para el cálculo y verificación de hashes de contraseñas.
+    """
+    def test_hash_and_verify(self):
+        """
+        Verifica el formato del hash, la verificación y que cada hash usa una sal distinta.
+        """
+        encoded = hash_password("secreto123", n=16, r=8, p=1)
+        self.assertTrue(encoded.startswith("scrypt$16$8$1$"))
+        self.assertTrue(verify_password("secreto123", encoded))
+        self.assertFalse(verify_password("secreto124", encoded))
+        self.assertNotEqual(encoded, hash_password("secreto123", n=16, r=8, p=1))
+        self.assertEqual(parse_password_hash(encoded)[:3], (16, 8, 1))
+
+    def test_invalid_values(self):
+        """
+        Verifica que los valores que no son hashes no se aceptan y que el coste se valida.
+        """
+        for value in ("password", "scrypt$x$8$1$a$b", "bcrypt$16$8$1$a$b", None):
+            self.assertFalse(is_password_hash(value))
+            self.assertFalse(verify_password("password", value))
+        for kwargs in ({"n": 1000}, {"n": 1}, {"r": 0}, {"workers": -1}):
+            with self.assertRaises(ValueError):
+                PasswordHasher(**kwargs)
+
+    def test_process_pool(self):
+        """
+        Verifica el cálculo en el pool de procesos, individual y por lotes.
+        """
+        hasher = PasswordHasher(n=16, workers=2)
+        try:
+            passwords = [f"clave{i:03d}" for i in range(20)]
+            hashes = hasher.hash_many(passwords)
+            self.assertEqual(len(hashes), 20)
+            self.assertTrue(all(verify_password(pw, h) for pw, h in zip(passwords, hashes)))
+            encoded = hasher.hash_async("otra-clave").result()
+            self.assertTrue(hasher.verify("otra-clave", encoded))
+            self.assertFalse(hasher.needs_rehash(encoded))
+            self.assertTrue(PasswordHasher(n=32, workers=0).needs_rehash(encoded))
+        finally:
+            hasher.shutdown()
+
+class TestAuthentication(BaseTest):
+    """
+    Pruebas unitarias para el almacenamiento de contraseñas y la autenticación de usuarios.
+    """
+    def setUp(self):
+        super().setUp()
+        self.user = self.user_service.create_user({"nombre": "Ana", "correo": "ana@example.com", "contrasena": "password"})
+
+    def test_password_is_stored_hashed(self):
+        """
+        Verifica que la contraseña no se guarda en texto plano, también al actualizarla.
+        """
+        self.assertTrue(is_password_hash(self.user.contrasena))
+        self.assertNotIn("password", self.user.contrasena)
+        self.user_service.update_user(self.user.id_usuario, {"contrasena": "nueva-clave"})
+        self.assertTrue(verify_password("nueva-clave", self.user.contrasena))
+
+    def test_authenticate(self):
+        """
+        Verifica la autenticación con credenciales correctas, incorrectas y de un correo inexistente.
+        """
+        self.assertEqual(self.user_service.authenticate("ana@example.com", "password"), self.user)
+        self.assertIsNone(self.user_service.authenticate("ana@example.com", "incorrecta"))
+        self.assertIsNone(self.user_service.authenticate("nadie@example.com", "password"))
+
+    def test_precomputed_hashes_and_credentials(self):
+        """
+        Verifica el camino sin esperas de la interfaz: el hash calculado aparte se guarda tal cual
+        y las credenciales se verifican con un Future que después recibe authenticate.
+        """
+        future = self.user_service.hash_password_async({"contrasena": "otra-clave"}, is_new=False)
+        encoded = future.result()
+        user = self.user_service.update_user(self.user.id_usuario, {"contrasena": "otra-clave"}, password_hash=encoded)
+        self.assertEqual(user.contrasena, encoded)
+        self.assertIsNone(self.user_service.hash_password_async({"nombre": "Ana"}, is_new=False))
+        with self.assertRaises(ValueError):
+            self.user_service.hash_password_async({"contrasena": "123"}, is_new=False)
+        with self.assertRaises(ValueError):
+            self.user_service.create_user({"nombre": "Luis", "correo": "luis@example.com", "contrasena": "password"},
+                                          password_hash="password")
+
+        verified = self.user_service.verify_credentials_async("ana@example.com", "otra-clave")
+        self.assertTrue(verified.result())
+        self.assertEqual(self.user_service.authenticate("ana@example.com", "otra-clave", verified), self.user)
+        self.assertFalse(self.user_service.verify_credentials_async("nadie@example.com", "otra-clave").result())
+
+    def test_legacy_and_outdated_hashes_are_upgraded(self):
+        """
+        Verifica que una contraseña en texto plano o con otro coste se vuelve a guardar al autenticarse.
+        """
+        legacy = User(nombre="Luis", correo="luis@example.com", contrasena="antigua")
+        self.session.add(legacy)
+        self.session.commit()
+        self.assertIsNone(self.user_service.authenticate("luis@example.com", "otra"))
+        self.assertEqual(legacy.contrasena, "antigua")
+        self.assertEqual(self.user_service.authenticate("luis@example.com", "antigua"), legacy)
+        self.assertTrue(is_password_hash(legacy.contrasena))
+
+        self.user_service.hasher = PasswordHasher(n=32, workers=0)
+        self.user_service.authenticate("ana@example.com", "password")
+        self.assertEqual(parse_password_hash(self.user.contrasena)[0], 32)
+
+    def test_import_hashes_passwords_in_batches(self):
+        """
+        Verifica que la importación masiva guarda las contraseñas como hashes.
+        """
+        service = ImportService(self.session)
+        service.user_service.hasher = self.hasher
+        source = io.StringIO("nombre,correo,contrasena\nLuis,luis@example.com,secreto1\nEva,eva@example.com,secreto2\n")
+        self.assertEqual(service.import_users(source, 'csv').inserted, 2)
+        self.assertIsNotNone(self.user_service.authenticate("eva@example.com", "secreto2"))
+        self.assertIsNone(self.user_service.authenticate("luis@example.com", "secreto2"))
+
+if __name__ == '__main__':
+    unittest.main()
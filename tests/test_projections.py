@@ -0,0 +1,99 @@
+import unittest
+from tests.test_base import BaseTest
+from src.models import TaskState, TaskPriority
+from src.repositories.projections import row_class, make_rows, TaskListRow, TASK_LIST_COLUMNS
+
+class TestRowClass(unittest.TestCase):
+    """
+    Pruebas unitarias para las clases de fila de solo lectura.
+    """
+    def test_row_class_is_cached_and_slotted(self):
+        """
+        Verifica que la clase se reutiliza por combinación de columnas, no tiene __dict__ y exige
+        un valor por columna.
+        """
+        cls = row_class('TaskRow', TASK_LIST_COLUMNS)
+        self.assertIs(cls, TaskListRow)
+        row = cls(1, "Tarea", TaskState.PENDIENTE, TaskPriority.MEDIA, 2)
+        self.assertFalse(hasattr(row, '__dict__'))
+        self.assertEqual(row.titulo, "Tarea")
+        self.assertEqual(row._asdict()['id_usuario'], 2)
+        with self.assertRaises(TypeError):
+            cls(1, "Tarea")
+
+    def test_rows_are_read_only_and_comparable(self):
+        """
+        Verifica que las filas no se pueden modificar y se comparan por valor.
+        """
+        first, second = make_rows('PairRow', ('a', 'b'), [(1, 2), (1, 2)])
+        self.assertEqual(first, second)
+        self.assertEqual(hash(first), hash(second))
+        with self.assertRaises(AttributeError):
+            first.a = 5
+        with self.assertRaises(AttributeError):
+            first.c = 5
+
+class TestListProjections(BaseTest):
+    """
+    Pruebas para los listados con proyecciones de TaskService y UserService.
+    """
+    def setUp(self):
+        """
+        Crea dos usuarios, una categoría y varias tareas.
+        """
+        super().setUp()
+        self.user = self.user_service.create_user({"nombre": "Ana", "correo": "ana@example.com", "contrasena": "password"})
+        self.other = self.user_service.create_user({"nombre": "Luis", "correo": "luis@example.com", "contrasena": "password"})
+        self.category = self.category_service.create_category({"nombre": "Trabajo"})
+        self.task1 = self.task_service.create_task({"titulo": "Task 1", "id_usuario": self.user.id_usuario})
+        self.task2 = self.task_service.create_task({"titulo": "Task 2", "id_usuario": self.other.id_usuario,
+                                                    "prioridad": TaskPriority.ALTA})
+        self.task_service.add_category_to_task(self.task1.id_tarea, self.category.id_categoria)
+
+    def test_list_tasks_default_columns(self):
+        """
+        Verifica que list_tasks devuelve filas con las columnas de la vista, sin pasar por el ORM.
+        """
+        self.session.expunge_all()
+        rows = self.task_service.list_tasks()
+        self.assertEqual([type(row) for row in rows], [TaskListRow, TaskListRow])
+        self.assertEqual(rows[1].titulo, "Task 2")
+        self.assertEqual(rows[1].prioridad, TaskPriority.ALTA)
+        self.assertEqual(rows[0].estado, TaskState.PENDIENTE)
+        self.assertEqual(len(self.session.identity_map), 0)
+
+    def test_list_tasks_with_categories_and_user_filter(self):
+        """
+        Verifica la columna calculada 'categorias' y el filtro por usuario.
+        """
+        rows = self.task_service.list_tasks(('id_tarea', 'categorias'), user_id=self.user.id_usuario)
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0].id_tarea, self.task1.id_tarea)
+        self.assertEqual(rows[0].categorias, "Trabajo")
+
+    def test_list_users_and_invalid_columns(self):
+        """
+        Verifica list_users y que se rechazan columnas desconocidas.
+        """
+        rows = self.user_service.list_users(('id_usuario', 'nombre'))
+        self.assertEqual([row.nombre for row in rows], ["Ana", "Luis"])
+        self.assertFalse(hasattr(rows[0], 'contrasena'))
+        with self.assertRaises(ValueError) as cm:
+            self.user_service.list_users(('nombre', 'inexistente'))
+        self.assertIn("Columnas inválidas para users", str(cm.exception))
+        with self.assertRaises(ValueError):
+            self.task_service.list_tasks(('titulo',), user_id=0)
+
+    def test_lookup_pages_prefix_and_ids(self):
+        """
+        Verifica los pares (ID, etiqueta) para listas de selección: páginas, prefijo e IDs concretos.
+        """
+        task3 = self.task_service.create_task({"titulo": "Otra 100%", "id_usuario": self.user.id_usuario})
+        first = self.task_service.lookup_tasks(limit=2)
+        self.assertEqual(first, [(self.task1.id_tarea, "Task 1"), (self.task2.id_tarea, "Task 2")])
+        self.assertEqual(self.task_service.lookup_tasks(after_id=first[-1][0]), [(task3.id_tarea, "Otra 100%")])
+        self.assertEqual([pair[1] for pair in self.task_service.lookup_tasks(prefix="task")], ["Task 1", "Task 2"])
+        self.assertEqual(self.task_service.lookup_tasks(prefix="Otra 100%"), [(task3.id_tarea, "Otra 100%")])
+        self.assertEqual(self.task_service.lookup_tasks(prefix="Otra 1_"), [])
+        self.assertEqual(self.user_service.lookup_users(ids=[self.other.id_usuario]), [(self.other.id_usuario, "Luis")])
+        self.assertEqual(self.category_service.lookup_categories(prefix="Tra"), [(self.category.id_categoria, "Trabajo")])
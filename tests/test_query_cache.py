@@ -0,0 +1,159 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from sqlalchemy import event, update
+from src.models import Base, Task
+from src.services import UserService, TaskService, QueryCache
+from src.repositories import TableVersions
+from src.database import create_engines, create_session_factory
+from tests.test_base import BaseTest
+
+class TestQueryCache(BaseTest):
+    """
+    Pruebas unitarias para la caché de consultas de listado y su invalidación por escrituras.
+    """
+    def setUp(self):
+        """
+        Crea un usuario con dos tareas y cuenta las consultas SELECT ejecutadas.
+        """
+        super().setUp()
+        self.user = self.user_service.create_user({"nombre": "Ana", "correo": "ana@example.com", "contrasena": "password"})
+        self.tasks = [self.task_service.create_task({"titulo": f"Tarea {i}", "id_usuario": self.user.id_usuario})
+                      for i in range(2)]
+        self.selects = []
+        event.listen(self.engine, "before_cursor_execute", self._count)
+
+    def _count(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            self.selects.append(statement)
+
+    def test_repeated_listing_is_served_from_cache(self):
+        """
+        Verifica que la segunda llamada con los mismos argumentos no consulta la base de datos.
+        """
+        first = self.task_service.list_tasks(user_id=self.user.id_usuario)
+        count = len(self.selects)
+        second = self.task_service.list_tasks(user_id=self.user.id_usuario)
+        self.assertEqual(len(self.selects), count)
+        self.assertEqual(first, second)
+        self.task_service.list_tasks(user_id=999)
+        self.assertGreater(len(self.selects), count)
+
+        stats = self.task_service.cache.stats
+        self.assertEqual((stats.hits, stats.misses), (1, 2))
+        self.assertAlmostEqual(stats.hit_rate, 1 / 3)
+
+    def test_returned_list_is_a_copy(self):
+        """
+        Verifica que modificar la lista devuelta no altera la caché.
+        """
+        tasks = self.task_service.get_tasks_by_user(self.user.id_usuario)
+        tasks.clear()
+        self.assertEqual(len(self.task_service.get_tasks_by_user(self.user.id_usuario)), 2)
+
+    def test_writes_invalidate_dependent_listings(self):
+        """
+        Verifica que crear, modificar y eliminar tareas invalida los listados de tareas, pero no la versión de categorías.
+        """
+        self.category_service.create_category({"nombre": "Trabajo"})
+        versions = TableVersions.for_session(self.session)
+        categories = versions.snapshot(["categories"])
+        self.task_service.list_tasks()
+
+        self.task_service.create_task({"titulo": "Nueva", "id_usuario": self.user.id_usuario})
+        self.assertEqual(len(self.task_service.list_tasks()), 3)
+        self.task_service.update_task(self.tasks[0].id_tarea, {"titulo": "Cambiada"})
+        self.assertIn("Cambiada", [row.titulo for row in self.task_service.list_tasks()])
+        self.task_service.delete_task(self.tasks[1].id_tarea)
+        self.assertEqual(len(self.task_service.list_tasks()), 2)
+        self.assertEqual(versions.snapshot(["categories"]), categories)
+
+    def test_bulk_statements_invalidate(self):
+        """
+        Verifica que un UPDATE ejecutado con session.execute invalida el listado de sus tablas.
+        """
+        self.task_service.list_tasks()
+        self.session.execute(update(Task).values(titulo="Masiva"))
+        self.session.commit()
+        self.assertEqual({row.titulo for row in self.task_service.list_tasks()}, {"Masiva"})
+
+    def test_deleting_a_user_invalidates_its_tasks(self):
+        """
+        Verifica que escribir en una tabla invalida las que dependen de ella por clave foránea.
+        """
+        self.task_service.list_tasks()
+        self.user_service.delete_user(self.user.id_usuario)
+        self.assertEqual(self.task_service.list_tasks(), [])
+
+    def test_orm_results_expire_with_the_transaction(self):
+        """
+        Verifica que los listados de objetos ORM no sobreviven al fin de la transacción.
+        """
+        self.user_service.get_all_users()
+        count = len(self.selects)
+        self.user_service.get_all_users()
+        self.assertEqual(len(self.selects), count)
+        self.session.commit()
+        self.assertEqual(self.user_service.get_all_users()[0].nombre, "Ana")
+        self.assertGreater(len(self.selects), count)
+
+    def test_lru_eviction_and_unhashable_arguments(self):
+        """
+        Verifica el descarte de las entradas menos usadas y que los argumentos no hashables no se guardan.
+        """
+        self.task_service.cache = QueryCache.for_session(self.session, maxsize=2)
+        for user_id in (1, 2, 3):
+            self.task_service.list_tasks(user_id=user_id)
+        self.assertEqual(len(self.task_service.cache), 2)
+        self.assertEqual(self.task_service.cache.stats.evictions, 1)
+
+        self.task_service.list_tasks(["id_tarea", "titulo"])
+        self.assertEqual(len(self.task_service.cache), 2)
+        self.assertEqual(self.task_service.cache.stats.misses, 3)
+
+        with self.assertRaises(ValueError):
+            QueryCache.for_session(self.session, maxsize=0)
+
+class TestExternalChanges(unittest.TestCase):
+    """
+    Pruebas unitarias para la detección de cambios de otros procesos en una base de datos en archivo.
+    """
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp, "database.db")
+        self.writer, self.reader = create_engines(self.db_path, readers=1)
+        Base.metadata.create_all(self.writer)
+        self.session = create_session_factory(self.writer, self.reader)()
+        self.task_service = TaskService(self.session)
+        user = UserService(self.session).create_user({"nombre": "Ana", "correo": "ana@example.com", "contrasena": "password"})
+        self.task_service.create_task({"titulo": "Propia", "id_usuario": user.id_usuario})
+
+    def tearDown(self):
+        self.session.close()
+        TableVersions.for_session(self.session).close()
+        self.writer.dispose()
+        self.reader.dispose()
+        shutil.rmtree(self.tmp)
+
+    def test_external_commit_invalidates(self):
+        """
+        Verifica que un cambio confirmado por otra conexión invalida la caché, y uno propio no la vacía entera.
+        """
+        self.assertEqual(len(self.task_service.list_tasks()), 1)
+        other = sqlite3.connect(self.db_path)
+        with other:
+            other.execute("INSERT INTO tasks (titulo, estado, prioridad, id_usuario) VALUES ('Externa', 'PENDIENTE', 'MEDIA', 1)")
+        other.close()
+        self.session.commit()
+        self.assertEqual(len(self.task_service.list_tasks()), 2)
+
+        versions = TableVersions.for_session(self.session)
+        epoch = versions.snapshot(())[0]
+        self.task_service.create_task({"titulo": "Otra", "id_usuario": 1})
+        versions.poll()
+        self.assertEqual(versions.snapshot(())[0], epoch)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import time
+import unittest
+from importlib import util
+
+HAS_QT = util.find_spec("PyQt5") is not None
+if HAS_QT:
+    from PyQt5.QtCore import QCoreApplication
+    from refresh_scheduler import RefreshScheduler
+
+@unittest.skipUnless(HAS_QT, "PyQt5 no está instalado")
+class TestRefreshScheduler(unittest.TestCase):
+    """
+    Pruebas unitarias para el planificador de recargas de la GUI.
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def setUp(self):
+        """
+        Registra dos fuentes y tres regiones que registran cada consulta y cada recarga.
+        """
+        self.fetched = []
+        self.rendered = []
+        self.scheduler = RefreshScheduler(interval_ms=10)
+        self.scheduler.add_source("users", lambda: self.fetched.append("users") or ["Ana"])
+        self.scheduler.add_source("tasks", lambda: self.fetched.append("tasks") or ["Tarea"])
+        self.scheduler.add_region("users", lambda users: self.rendered.append(("users", users)), ["users"])
+        self.scheduler.add_region("user_combo", lambda users: self.rendered.append(("user_combo", users)), ["users"])
+        self.scheduler.add_region("tasks", lambda tasks, users: self.rendered.append(("tasks", tasks, users)),
+                                  ["tasks", "users"])
+
+    def wait(self, ms=50):
+        deadline = time.monotonic() + ms / 1000
+        while time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.005)
+
+    def test_requests_are_coalesced_until_the_timer_fires(self):
+        """
+        Verifica que varias peticiones seguidas producen una sola recarga al vencer el temporizador.
+        """
+        self.scheduler.request("user_combo")
+        self.scheduler.request("users")
+        self.scheduler.request("users", "user_combo")
+        self.assertTrue(self.scheduler.is_pending("users"))
+        self.assertEqual(self.rendered, [])
+
+        self.wait()
+        self.assertFalse(self.scheduler.is_pending())
+        self.assertEqual(self.fetched, ["users"])
+        self.assertEqual(self.rendered, [("users", ["Ana"]), ("user_combo", ["Ana"])])
+
+    def test_flush_queries_each_shared_source_once(self):
+        """
+        Verifica que una recarga inmediata consulta una sola vez cada fuente compartida.
+        """
+        self.scheduler.request("tasks", "users", "user_combo")
+        self.assertEqual(self.scheduler.flush(), ["users", "user_combo", "tasks"])
+        self.assertEqual(self.fetched, ["users", "tasks"])
+        self.assertEqual(self.rendered[-1], ("tasks", ["Tarea"], ["Ana"]))
+
+        # El temporizador ya no tiene nada pendiente
+        self.wait()
+        self.assertEqual(len(self.rendered), 3)
+        self.assertEqual(self.scheduler.flush(), [])
+
+    def test_unknown_names(self):
+        """
+        Verifica que se rechazan regiones y fuentes desconocidas.
+        """
+        with self.assertRaises(ValueError) as cm:
+            self.scheduler.request("categories")
+        self.assertIn("Regiones desconocidas: categories", str(cm.exception))
+        with self.assertRaises(ValueError) as cm:
+            self.scheduler.add_region("categories", lambda categories: None, ["categories"])
+        self.assertIn("Fuentes de datos desconocidas: categories", str(cm.exception))
@@ -0,0 +1,133 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+from src.models import Base, User
+from src.services import UserService, TaskService
+from src.database import RoutingSession, create_engines, create_session_factory, init_schema, schema_stamp
+
+class TestSessionRouting(unittest.TestCase):
+    """
+    Pruebas unitarias para el reparto de lecturas y escrituras entre motores.
+    """
+    def setUp(self):
+        """
+        Crea la base de datos en archivo con un escritor y dos conexiones de lectura.
+        """
+        self.tmp = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp, "data", "database.db")
+        self.writer, self.reader = create_engines(self.db_path, readers=2)
+        Base.metadata.create_all(self.writer)
+        self.session = create_session_factory(self.writer, self.reader)()
+        self.user_service = UserService(self.session)
+        self.task_service = TaskService(self.session)
+
+        self.statements = {"writer": [], "reader": []}
+        for name, engine in (("writer", self.writer), ("reader", self.reader)):
+            event.listen(engine, "before_cursor_execute", self._recorder(name))
+
+    def tearDown(self):
+        """
+        Cierra la sesión, los motores y elimina los archivos temporales.
+        """
+        self.session.close()
+        self.writer.dispose()
+        self.reader.dispose()
+        shutil.rmtree(self.tmp)
+
+    def _recorder(self, name):
+        def record(conn, cursor, statement, parameters, context, executemany):
+            self.statements[name].append(statement.split()[0].upper())
+        return record
+
+    def test_creates_directory_and_enables_wal(self):
+        """
+        Verifica que se crea el directorio de la base de datos y que el escritor usa WAL.
+        """
+        self.assertTrue(os.path.exists(self.db_path))
+        with self.writer.connect() as conn:
+            self.assertEqual(conn.execute(text("PRAGMA journal_mode")).scalar(), "wal")
+
+    def test_reads_go_to_reader_and_writes_to_writer(self):
+        """
+        Verifica que los SELECT usan el pool de lectura y los INSERT el escritor.
+        """
+        user = self.user_service.create_user({"nombre": "Ana", "correo": "ana@example.com",
+                                              "contrasena": "password"})
+        self.assertIn("INSERT", self.statements["writer"])
+        self.assertNotIn("INSERT", self.statements["reader"])
+
+        self.statements = {"writer": [], "reader": []}
+        self.assertEqual([row.nombre for row in self.user_service.list_users()], ["Ana"])
+        self.assertEqual(self.user_service.get_user_by_id(user.id_usuario).correo, "ana@example.com")
+        self.assertEqual(self.statements["writer"], [])
+        self.assertEqual(set(self.statements["reader"]), {"SELECT"})
+
+    def test_reads_after_write_in_same_transaction_use_writer(self):
+        """
+        Verifica que, tras escribir, la transacción sigue en el escritor y ve sus propios cambios.
+        """
+        self.session.add(User(nombre="Luis", correo="luis@example.com", contrasena="password"))
+        self.session.flush()
+        self.statements = {"writer": [], "reader": []}
+        self.assertEqual(self.session.query(User).filter_by(correo="luis@example.com").count(), 1)
+        self.assertEqual(self.statements["reader"], [])
+        self.assertIn("SELECT", self.statements["writer"])
+
+        self.session.commit()
+        self.statements = {"writer": [], "reader": []}
+        self.assertEqual(self.session.query(User).count(), 1)
+        self.assertEqual(self.statements["writer"], [])
+
+    def test_reader_rejects_writes(self):
+        """
+        Verifica que las conexiones de lectura no admiten escrituras.
+        """
+        with self.reader.connect() as conn:
+            with self.assertRaises(OperationalError):
+                conn.execute(text("INSERT INTO categories (nombre) VALUES ('Casa')"))
+
+    def test_without_readers_everything_uses_writer(self):
+        """
+        Verifica que con readers=0 las lecturas usan el mismo motor que las escrituras.
+        """
+        writer, reader = create_engines(self.db_path, readers=0)
+        self.assertIs(writer, reader)
+        session = create_session_factory(writer)()
+        self.assertIsInstance(session, RoutingSession)
+        self.assertIs(session.get_bind(clause=text("SELECT 1").columns()), writer)
+        session.close()
+        writer.dispose()
+
+    def test_init_schema_skips_create_all_when_stamp_matches(self):
+        """
+        Verifica que init_schema guarda la huella del esquema y no vuelve a crear tablas si coincide.
+        """
+        self.assertTrue(init_schema(self.writer, Base.metadata))
+        with self.writer.connect() as conn:
+            self.assertEqual(conn.exec_driver_sql("PRAGMA user_version").scalar(), schema_stamp(Base.metadata))
+        self.statements = {"writer": [], "reader": []}
+        self.assertFalse(init_schema(self.writer, Base.metadata))
+        self.assertEqual(self.statements["writer"], ["PRAGMA"])
+
+        # Una huella distinta (modelos cambiados) vuelve a crear las tablas que falten
+        with self.writer.begin() as conn:
+            conn.exec_driver_sql("DROP TABLE notifications")
+            conn.exec_driver_sql("PRAGMA user_version = 1")
+        self.assertTrue(init_schema(self.writer, Base.metadata))
+        with self.writer.connect() as conn:
+            self.assertEqual(conn.exec_driver_sql("SELECT COUNT(*) FROM notifications").scalar(), 0)
+
+    def test_database_package_imports_submodules_lazily(self):
+        """
+        Verifica que las herramientas basadas en sqlite3 no cargan SQLAlchemy al importar el paquete.
+        """
+        code = ("import sys; from src.database import DATABASE_PATH, create_backup, Migrator; "
+                "print('sqlalchemy' in sys.modules)")
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "False")
@@ -0,0 +1,252 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from sqlalchemy import event
+from src.models import Task
+from src.services import UserService, TaskService, CategoryService, NotificationService
+from src.database import Migration, Migrator, RebuildTable, MIGRATIONS
+from src.database.sharding import (create_sharded_sessionmaker, shard_paths, ShardDirectory, ShardRebalancer,
+                                   IdAllocator)
+from tests.test_migrations import BASELINE_SCHEMA
+
+class TestSharding(unittest.TestCase):
+    """
+    Pruebas unitarias para el almacenamiento repartido en varios archivos SQLite.
+    """
+    def setUp(self):
+        """
+        Crea tres shards y los servicios sobre una sesión repartida.
+        """
+        self.tmp = tempfile.mkdtemp()
+        self.directory_path = os.path.join(self.tmp, "shards.db")
+        self.shards = shard_paths(self.tmp, 3)
+        self.Session = create_sharded_sessionmaker(self.directory_path, self.shards)
+        self.session = self.Session()
+        self.user_service = UserService(self.session)
+        self.task_service = TaskService(self.session)
+        self.category_service = CategoryService(self.session)
+        self.notification_service = NotificationService(self.session)
+
+        self.category = self.category_service.create_category({"nombre": "Trabajo"})
+        self.users = [
+            self.user_service.create_user({"nombre": f"User {i}", "correo": f"user{i}@example.com",
+                                           "contrasena": "password"})
+            for i in range(6)
+        ]
+        for user in self.users:
+            for j in range(2):
+                self.task_service.create_task({"titulo": f"Task {user.id_usuario}-{j}", "id_usuario": user.id_usuario})
+
+    def tearDown(self):
+        """
+        Cierra la sesión y elimina los archivos temporales.
+        """
+        self.session.close()
+        for engine in self.session.engines.values():
+            engine.dispose()
+        shutil.rmtree(self.tmp)
+
+    def count(self, shard_id, table):
+        with sqlite3.connect(self.shards[shard_id]) as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def test_users_and_tasks_are_routed_together(self):
+        """
+        Verifica que cada usuario y sus tareas están en el mismo shard y que los IDs son globales.
+        """
+        directory = self.session.directory
+        used = set()
+        for user in self.users:
+            shard_id = directory.shard_for_user(user.id_usuario)
+            used.add(shard_id)
+            with sqlite3.connect(self.shards[shard_id]) as conn:
+                tasks = conn.execute("SELECT COUNT(*) FROM tasks WHERE id_usuario = ?", (user.id_usuario,)).fetchone()[0]
+            self.assertEqual(tasks, 2)
+        self.assertGreater(len(used), 1)
+        self.assertEqual(sum(self.count(s, "tasks") for s in self.shards), 12)
+        ids = [task.id_tarea for task in self.task_service.get_all_tasks()]
+        self.assertEqual(len(set(ids)), 12)
+
+    def test_fan_out_queries_are_merged_in_order(self):
+        """
+        Verifica que las consultas a todos los shards devuelven los resultados ordenados.
+        """
+        users = self.user_service.get_all_users()
+        self.assertEqual([u.id_usuario for u in users], sorted(u.id_usuario for u in self.users))
+        tasks = self.task_service.get_all_tasks()
+        self.assertEqual([t.id_tarea for t in tasks], sorted(t.id_tarea for t in tasks))
+        rows = self.task_service.list_tasks(('id_tarea', 'titulo'))
+        self.assertEqual([r.id_tarea for r in rows], [t.id_tarea for t in tasks])
+
+    def test_user_queries_go_to_a_single_shard(self):
+        """
+        Verifica que las consultas filtradas por usuario solo se ejecutan en su shard.
+        """
+        user = self.users[0]
+        executed = []
+        engines = self.session.engines
+        listeners = {}
+        for shard_id, engine in engines.items():
+            listeners[shard_id] = lambda *args, shard_id=shard_id, **kw: executed.append(shard_id)
+            event.listen(engine, "before_cursor_execute", listeners[shard_id])
+        try:
+            tasks = self.task_service.get_tasks_by_user(user.id_usuario)
+        finally:
+            for shard_id, engine in engines.items():
+                event.remove(engine, "before_cursor_execute", listeners[shard_id])
+        self.assertEqual(len(tasks), 2)
+        self.assertEqual(set(executed), {self.session.directory.shard_for_user(user.id_usuario)})
+
+    def test_categories_and_notifications_follow_the_task(self):
+        """
+        Verifica que las categorías (y sus cambios) se replican y que las asociaciones y notificaciones
+        se guardan en el shard de la tarea.
+        """
+        task = self.task_service.get_tasks_by_user(self.users[1].id_usuario)[0]
+        self.task_service.add_category_to_task(task.id_tarea, self.category.id_categoria)
+        self.notification_service.create_notification({"id_tarea": task.id_tarea})
+        shard_id = self.session.directory.shard_for_user(self.users[1].id_usuario)
+
+        self.assertTrue(all(self.count(s, "categories") == 1 for s in self.shards))
+        self.assertEqual(self.count(shard_id, "task_categories"), 1)
+        self.assertEqual(self.count(shard_id, "notifications"), 1)
+        self.assertEqual(len(self.category_service.get_all_categories()), 1)
+
+        other = self.Session()
+        try:
+            loaded = other.get(Task, task.id_tarea)
+            self.assertEqual([tc.categoria.nombre for tc in loaded.categorias], ["Trabajo"])
+            self.assertEqual(len(loaded.notificaciones), 1)
+        finally:
+            other.close()
+
+        self.category_service.update_category(self.category.id_categoria, {"nombre": "Oficina"})
+        for shard_id, path in self.shards.items():
+            with sqlite3.connect(path) as conn:
+                self.assertEqual(conn.execute("SELECT nombre FROM categories").fetchall(), [("Oficina",)], shard_id)
+
+    def total(self, shards, table, where=""):
+        total = 0
+        for path in shards.values():
+            with sqlite3.connect(path) as conn:
+                total += conn.execute(f"SELECT COUNT(*) FROM {table} {where}").fetchone()[0]
+        return total
+
+    def test_rebalance_after_adding_a_shard(self):
+        """
+        Verifica que el reequilibrado mueve a los usuarios con todos sus datos (también los archivados
+        y su historial) al añadir un shard, sin anotar creaciones ni borrados falsos.
+        """
+        task = self.task_service.get_tasks_by_user(self.users[0].id_usuario)[0]
+        self.task_service.add_category_to_task(task.id_tarea, self.category.id_categoria)
+        task_id, user_ids = task.id_tarea, [user.id_usuario for user in self.users]
+        # Una tarea archivada (con su notificación) de cada usuario
+        for user_id in user_ids:
+            archived = self.task_service.get_tasks_by_user(user_id)[1].id_tarea
+            with sqlite3.connect(self.shards[self.session.directory.shard_for_user(user_id)]) as conn:
+                conn.execute("INSERT INTO archived_tasks SELECT *, datetime('now') FROM tasks WHERE id_tarea = ?", (archived,))
+                conn.execute("INSERT INTO archived_notifications VALUES (?, ?, datetime('now'))", (archived, archived))
+                conn.execute("DELETE FROM tasks WHERE id_tarea = ?", (archived,))
+        self.session.close()
+        history, changes = self.total(self.shards, "task_state_history"), self.total(self.shards, "change_log")
+
+        shards = shard_paths(self.tmp, 4)
+        Session = create_sharded_sessionmaker(self.directory_path, shards)
+        session = Session()
+        rebalancer = ShardRebalancer(session.directory, shards)
+        moved = []
+        total = rebalancer.rebalance(progress=lambda user_id, source, target: moved.append(target))
+        self.assertEqual(total, len(moved))
+        self.assertGreater(total, 0)
+        stats = rebalancer.stats()
+        self.assertEqual(sum(s['usuarios'] for s in stats.values()), 6)
+        self.assertEqual(sum(s['tareas'] for s in stats.values()), 6)
+        self.assertEqual(rebalancer.rebalance(), 0)
+        self.assertEqual((self.total(shards, "task_state_history"), self.total(shards, "change_log")), (history, changes))
+
+        for user_id in user_ids:
+            shard_id = session.directory.shard_for_user(user_id)
+            self.assertEqual(shard_id, session.directory.preferred_shard(user_id))
+            # Todo el historial y lo archivado del usuario está en su shard: creación de sus dos tareas y
+            # borrado de la archivada
+            mine = f"WHERE id_usuario = {user_id}"
+            self.assertEqual(self.total({shard_id: shards[shard_id]}, "task_state_history", mine), 3)
+            self.assertEqual(self.total(shards, "task_state_history", mine), 3)
+            self.assertEqual(self.total({shard_id: shards[shard_id]}, "archived_tasks", mine), 1)
+            self.assertEqual(self.total(shards, "archived_tasks", mine), 1)
+        self.assertEqual(self.total(shards, "archived_notifications"), 6)
+        services = TaskService(session)
+        moved_task = services.get_task_by_id(task_id)
+        self.assertEqual([tc.categoria.nombre for tc in moved_task.categorias], ["Trabajo"])
+        self.assertEqual(len(services.get_all_tasks()), 6)
+        session.close()
+        for engine in session.engines.values():
+            engine.dispose()
+
+    def test_rebalance_from_a_migrated_shard(self):
+        """
+        Verifica que los usuarios pasan intactos de un shard migrado a uno creado con create_all,
+        aunque sus columnas estén en otro orden: las migraciones añaden las columnas al final, y
+        aquí se reescribe además la tabla de usuarios con su orden invertido.
+        """
+        tmp = os.path.join(self.tmp, "migrado")
+        os.mkdir(tmp)
+        directory_path = os.path.join(tmp, "shards.db")
+        shards = shard_paths(tmp, 1)
+        with sqlite3.connect(shards["shard0"]) as conn:
+            conn.executescript(BASELINE_SCHEMA)
+            conn.executescript("DELETE FROM notifications; DELETE FROM tasks; DELETE FROM users;")
+        with Migrator(shards["shard0"]) as migrator:
+            migrator.migrate()
+        columns = ["id_usuario", "version", "eliminado", "contrasena", "correo", "nombre"]
+        reorder = RebuildTable("users", "CREATE TABLE {name} (id_usuario INTEGER NOT NULL, "
+                               "version INTEGER NOT NULL DEFAULT 1, eliminado BOOLEAN NOT NULL DEFAULT 0, "
+                               "contrasena VARCHAR NOT NULL, correo VARCHAR NOT NULL, nombre VARCHAR NOT NULL, "
+                               "PRIMARY KEY (id_usuario), UNIQUE (correo))", columns)
+        with Migrator(shards["shard0"], [Migration(MIGRATIONS[-1].version + 1, "Orden de columnas", [reorder])]) as migrator:
+            migrator.migrate()
+        session = create_sharded_sessionmaker(directory_path, shards)()
+        users, tasks = UserService(session), TaskService(session)
+        for i in range(6):
+            user = users.create_user({"nombre": f"Migrado {i}", "correo": f"migrado{i}@example.com",
+                                      "contrasena": "password"})
+            task = tasks.create_task({"titulo": f"Tarea {i}", "id_usuario": user.id_usuario})
+            tasks.update_task(task.id_tarea, {"descripcion": "Revisada"}, expected_version=task.version)
+        user_columns = "id_usuario, nombre, correo, contrasena, eliminado, version"
+        task_columns = "id_tarea, titulo, estado, prioridad, id_usuario, version"
+        def rows(paths):
+            found = {}
+            for path in paths.values():
+                with sqlite3.connect(path) as conn:
+                    found.update({row[0]: row for row in conn.execute(f"SELECT {user_columns} FROM users")})
+                    found.update({('tarea', row[0]): row for row in conn.execute(f"SELECT {task_columns} FROM tasks")})
+            return found
+        before = rows(shards)
+        session.close()
+        for engine in session.engines.values():
+            engine.dispose()
+
+        shards = shard_paths(tmp, 2)
+        session = create_sharded_sessionmaker(directory_path, shards)()
+        self.assertGreater(ShardRebalancer(session.directory, shards).rebalance(), 0)
+        self.assertEqual(rows(shards), before)
+        with sqlite3.connect(shards["shard1"]) as conn:
+            self.assertGreater(conn.execute("SELECT COUNT(*) FROM users").fetchone()[0], 0)
+        self.assertEqual({task.version for task in TaskService(session).get_all_tasks()}, {2})
+        session.close()
+        for engine in session.engines.values():
+            engine.dispose()
+
+    def test_id_allocator_and_directory(self):
+        """
+        Verifica la reserva de bloques de IDs y la validación del directorio.
+        """
+        directory = ShardDirectory(os.path.join(self.tmp, "other.db"), ["a", "b"], strategy="range", range_size=10)
+        self.assertEqual([directory.preferred_shard(i) for i in (1, 10, 11, 500)], ["a", "a", "b", "b"])
+        first, second = IdAllocator(directory, block_size=5), IdAllocator(directory, block_size=5)
+        ids = [first.next_id("x") for _ in range(3)] + [second.next_id("x") for _ in range(3)] + [first.next_id("x")]
+        self.assertEqual(ids, [1, 2, 3, 6, 7, 8, 4])
+        with self.assertRaises(ValueError):
+            ShardDirectory(os.path.join(self.tmp, "bad.db"), ["a"], strategy="modulo")
@@ -0,0 +1,207 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from datetime import date, datetime
+import numpy as np
+from sqlalchemy import create_engine, update
+from src.models import Base, TaskPriority, TaskState, TaskStateChange
+from src.services import TaskAnalyticsService
+from src.database import Migrator
+from tests.test_base import BaseTest
+
+class TestTaskAnalytics(BaseTest):
+    """
+    Pruebas unitarias para el historial de estados de las tareas y las series diarias.
+    """
+    def setUp(self):
+        super().setUp()
+        self.analytics = TaskAnalyticsService(self.session)
+        self.ana = self.user_service.create_user({"nombre": "Ana", "correo": "ana@example.com", "contrasena": "password"})
+        self.luis = self.user_service.create_user({"nombre": "Luis", "correo": "luis@example.com", "contrasena": "password"})
+
+    def create(self, user, day, titulo="Tarea"):
+        return self.task_service.create_task({"titulo": titulo, "id_usuario": user.id_usuario,
+                                              "fecha_inicio": datetime(2024, 1, day, 9)})
+
+    def change_state(self, task, state, day):
+        """Cambia el estado con update_task y fecha el cambio registrado en el día indicado."""
+        self.task_service.update_task(task.id_tarea, {"estado": state})
+        last = max(row.id for row in self.session.query(TaskStateChange).filter_by(id_tarea=task.id_tarea))
+        self.session.execute(update(TaskStateChange).where(TaskStateChange.id == last)
+                             .values(fecha=datetime(2024, 1, day, 18)))
+        self.session.commit()
+
+    def test_state_history_is_recorded(self):
+        """
+        Verifica que se registran la creación, los cambios de estado y el borrado, pero no otros cambios.
+        """
+        task = self.create(self.ana, 1)
+        self.task_service.update_task(task.id_tarea, {"titulo": "Otro título"})
+        self.task_service.update_task(task.id_tarea, {"estado": "EN_PROGRESO"})
+        self.task_service.update_task(task.id_tarea, {"estado": TaskState.COMPLETADA})
+        self.task_service.delete_task(task.id_tarea)
+        history = self.task_service.get_state_history(task.id_tarea)
+        self.assertEqual([(row.estado_anterior, row.estado_nuevo) for row in history], [
+            (None, TaskState.PENDIENTE),
+            (TaskState.PENDIENTE, TaskState.EN_PROGRESO),
+            (TaskState.EN_PROGRESO, TaskState.COMPLETADA),
+            (TaskState.COMPLETADA, None),
+        ])
+        self.assertEqual(history[0].fecha, datetime(2024, 1, 1, 9))
+
+    def test_daily_series(self):
+        """
+        Verifica las series de creadas, completadas y abiertas, incluidos los días sin cambios y las reaperturas.
+        """
+        first, second = self.create(self.ana, 1), self.create(self.ana, 1)
+        third = self.create(self.luis, 2)
+        self.change_state(first, "COMPLETADA", 3)
+        self.change_state(third, "COMPLETADA", 5)
+        self.change_state(third, "EN_PROGRESO", 6)
+
+        series = self.analytics.daily_series(end=date(2024, 1, 6))
+        self.assertEqual(series['fecha'][0], np.datetime64('2024-01-01'))
+        self.assertEqual(len(series['fecha']), 6)
+        self.assertEqual(series['creadas'].tolist(), [2, 1, 0, 0, 0, 0])
+        self.assertEqual(series['completadas'].tolist(), [0, 0, 1, 0, 1, 0])
+        self.assertEqual(series['abiertas'].tolist(), [2, 3, 2, 2, 1, 2])
+
+        window = self.analytics.daily_series(date(2024, 1, 4), date(2024, 1, 5), user_id=self.ana.id_usuario)
+        self.assertEqual(window['abiertas'].tolist(), [1, 1])
+        self.assertEqual(window['creadas'].tolist(), [0, 0])
+
+    def test_series_by_category(self):
+        """
+        Verifica el filtro por categoría.
+        """
+        category = self.category_service.create_category({"nombre": "Trabajo"})
+        tagged = self.create(self.ana, 1)
+        self.create(self.ana, 1)
+        self.task_service.add_category_to_task(tagged.id_tarea, category.id_categoria)
+        series = self.analytics.daily_series(end=date(2024, 1, 2), category_id=category.id_categoria)
+        self.assertEqual(series['creadas'].tolist(), [1, 0])
+
+    def test_empty_history_and_validation(self):
+        """
+        Verifica las series sin historial y la validación de los parámetros.
+        """
+        self.session.query(TaskStateChange).delete()
+        self.session.commit()
+        series = self.analytics.daily_series(date(2024, 1, 1), date(2024, 1, 3))
+        self.assertEqual(series['abiertas'].tolist(), [0, 0, 0])
+        for kwargs in ({"user_id": 0}, {"start": "2024-01-01"}, {"start": date(2024, 2, 1), "end": date(2024, 1, 1)}):
+            with self.assertRaises(ValueError):
+                self.analytics.daily_series(**kwargs)
+
+class TestTaskColumns(BaseTest):
+    """
+    Pruebas unitarias para las columnas de las tareas y sus distribuciones.
+    """
+    NOW = datetime(2024, 1, 11)
+
+    def setUp(self):
+        super().setUp()
+        self.analytics = TaskAnalyticsService(self.session)
+        ana = self.user_service.create_user({"nombre": "Ana", "correo": "ana@example.com", "contrasena": "password"})
+        luis = self.user_service.create_user({"nombre": "Luis", "correo": "luis@example.com", "contrasena": "password"})
+        self.ana, self.luis = ana.id_usuario, luis.id_usuario
+        for titulo, user, start, due, priority in (
+            ("Vencida", self.ana, datetime(2024, 1, 1), datetime(2024, 1, 5), "ALTA"),
+            ("Sin vencimiento", self.ana, datetime(2024, 1, 9), None, "BAJA"),
+            ("A tiempo", self.luis, datetime(2024, 1, 10), datetime(2024, 2, 1), "ALTA"),
+            ("Completada", self.luis, datetime(2024, 1, 2), datetime(2024, 1, 3), "MEDIA"),
+        ):
+            data = {"titulo": titulo, "id_usuario": user, "fecha_inicio": start, "prioridad": priority}
+            if due:
+                data["fecha_vencimiento"] = due
+            task = self.task_service.create_task(data)
+        self.task_service.update_task(task.id_tarea, {"estado": "COMPLETADA"})
+        self.session.execute(update(TaskStateChange).where(TaskStateChange.estado_nuevo == TaskState.COMPLETADA)
+                             .values(fecha=datetime(2024, 1, 6, 12)))
+        self.session.commit()
+
+    def test_columns(self):
+        """
+        Verifica los códigos de estado y prioridad y las fechas en segundos desde la época Unix.
+        """
+        columns = self.analytics.task_columns()
+        self.assertEqual(len(columns), 4)
+        self.assertEqual(columns.estado.tolist(), [0, 0, 0, 2])
+        self.assertEqual(columns.prioridad.tolist(), [0, 2, 0, 1])
+        self.assertEqual(columns.fecha_inicio[0], 1704067200)
+        self.assertEqual(columns.fecha_vencimiento[1], np.iinfo(np.int64).min)
+        self.assertEqual(columns.fecha_completada[3] - columns.fecha_inicio[3], 4.5 * 86400)
+        self.assertEqual(len(self.analytics.task_columns(user_id=self.luis)), 2)
+
+    def test_summary_and_histogram(self):
+        """
+        Verifica las métricas de edad, retraso y finalización y el histograma por prioridad.
+        """
+        columns = self.analytics.task_columns()
+        summary = columns.summary(self.NOW, q=(50,))
+        self.assertEqual(summary['edad']['tareas'], 3)
+        self.assertEqual(summary['edad']['percentiles'], {50: 2.0})
+        self.assertEqual(summary['retraso']['media'], 6.0)
+        self.assertEqual(summary['finalizacion']['media'], 4.5)
+        histogram = columns.histogram_by_priority('edad', (0, 7, 30), self.NOW)
+        self.assertEqual(histogram[TaskPriority.ALTA].tolist(), [1, 1])
+        self.assertEqual(histogram[TaskPriority.BAJA].tolist(), [1, 0])
+        self.assertEqual(histogram[TaskPriority.MEDIA].tolist(), [0, 0])
+        with self.assertRaises(ValueError):
+            columns.histogram_by_priority('edad', (7, 0), self.NOW)
+        with self.assertRaises(ValueError):
+            columns.metric('antigüedad', self.NOW)
+
+    def test_per_user(self):
+        """
+        Verifica los agregados por usuario.
+        """
+        per_user = self.analytics.task_columns().per_user(self.NOW)
+        self.assertEqual(per_user['id_usuario'].tolist(), [self.ana, self.luis])
+        self.assertEqual(per_user['total'].tolist(), [2, 2])
+        self.assertEqual(per_user['abiertas'].tolist(), [2, 1])
+        self.assertEqual(per_user['vencidas'].tolist(), [1, 0])
+        self.assertEqual(per_user['edad_media'].tolist(), [6.0, 1.0])
+        self.assertTrue(np.isnan(per_user['finalizacion_media'][0]))
+        self.assertEqual(per_user['finalizacion_media'][1], 4.5)
+
+class TestStateHistoryMigration(unittest.TestCase):
+    """
+    Pruebas unitarias para la creación del historial en una base de datos existente.
+    """
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp, "database.db")
+        engine = create_engine(f"sqlite:///{self.db_path}")
+        Base.metadata.create_all(engine)
+        engine.dispose()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_migration_backfills_existing_tasks(self):
+        """
+        Verifica que la migración rellena la creación y la finalización de las tareas existentes.
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("DROP TABLE task_state_history")
+            for action in ("ins", "upd", "del"):
+                conn.execute(f"DROP TRIGGER _hist_tasks_{action}")
+            conn.execute("INSERT INTO users (nombre, correo, contrasena) VALUES ('Ana', 'ana@example.com', 'x')")
+            conn.execute("INSERT INTO tasks (titulo, estado, prioridad, recurrente, id_usuario, fecha_inicio, fecha_vencimiento) "
+                         "VALUES ('A', 'COMPLETADA', 'MEDIA', 0, 1, '2024-01-01 09:00:00', '2024-01-03 00:00:00'), "
+                         "('B', 'PENDIENTE', 'MEDIA', 0, 1, '2024-01-02 09:00:00', NULL)")
+        with Migrator(self.db_path) as migrator:
+            migrator.migrate()
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute("SELECT id_tarea, estado_anterior, estado_nuevo, date(fecha) FROM task_state_history "
+                                "ORDER BY fecha").fetchall()
+            self.assertEqual(rows, [(1, None, 'PENDIENTE', '2024-01-01'), (2, None, 'PENDIENTE', '2024-01-02'),
+                                    (1, 'PENDIENTE', 'COMPLETADA', '2024-01-03')])
+            conn.execute("UPDATE tasks SET estado = 'EN_PROGRESO' WHERE id_tarea = 2")
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM task_state_history").fetchone()[0], 4)
+
+if __name__ == '__main__':
+    unittest.main()
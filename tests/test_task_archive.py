@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta
+from tests.test_base import BaseTest
+from src.models import (Task, TaskCategory, Notification, ArchivedTask, ArchivedNotification, ArchivedTaskCategory,
+                        TaskState)
+
+class TestTaskArchive(BaseTest):
+    """
+    Pruebas unitarias para el archivado de tareas completadas de TaskService.
+    """
+    def setUp(self):
+        """
+        Crea un usuario, una categoría y tareas completadas antiguas, recientes y pendientes.
+        """
+        super().setUp()
+        self.user = self.user_service.create_user({"nombre": "Archive User", "correo": "archive@example.com",
+                                                   "contrasena": "password"})
+        self.category = self.category_service.create_category({"nombre": "Trabajo"})
+        old = datetime.now() - timedelta(days=60)
+        self.old_tasks = [
+            self.task_service.create_task({"titulo": f"Old {i}", "id_usuario": self.user.id_usuario,
+                                           "estado": TaskState.COMPLETADA, "fecha_inicio": old})
+            for i in range(5)
+        ]
+        self.recent = self.task_service.create_task({"titulo": "Recent", "id_usuario": self.user.id_usuario,
+                                                     "estado": TaskState.COMPLETADA})
+        self.pending = self.task_service.create_task({"titulo": "Pending", "id_usuario": self.user.id_usuario,
+                                                      "fecha_inicio": old})
+        self.old_id = self.old_tasks[0].id_tarea
+        self.task_service.add_category_to_task(self.old_id, self.category.id_categoria)
+        self.notification_service.create_notification({"id_tarea": self.old_id})
+
+    def test_archive_moves_old_completed_tasks_in_batches(self):
+        """
+        Verifica que solo se archivan las tareas completadas antiguas, con sus asociaciones, por lotes.
+        """
+        reported = []
+        total = self.task_service.archive_completed_tasks(30, batch_size=2, progress=reported.append)
+        self.assertEqual(total, 5)
+        self.assertEqual(reported, [2, 4, 5])
+
+        self.session.expire_all()
+        self.assertEqual(sorted(t.titulo for t in self.session.query(Task).all()), ["Pending", "Recent"])
+        self.assertEqual(self.session.query(ArchivedTask).count(), 5)
+        self.assertEqual(self.session.query(TaskCategory).count(), 0)
+        self.assertEqual(self.session.query(Notification).count(), 0)
+        self.assertEqual(self.session.query(ArchivedNotification).count(), 1)
+
+    def test_archived_tasks_are_read_only_on_request(self):
+        """
+        Verifica que las tareas archivadas solo se devuelven cuando se piden explícitamente.
+        """
+        self.task_service.archive_completed_tasks(30)
+        self.session.expire_all()
+        self.assertIsNone(self.task_service.get_task_by_id(self.old_id))
+
+        archived = self.task_service.get_task_by_id(self.old_id, include_archived=True)
+        self.assertIsInstance(archived, ArchivedTask)
+        self.assertEqual(archived.estado, TaskState.COMPLETADA)
+        self.assertEqual([tc.categoria.nombre for tc in archived.categorias], ["Trabajo"])
+        self.assertEqual(len(archived.notificaciones), 1)
+        self.assertEqual(archived.usuario.nombre, "Archive User")
+
+        self.assertEqual(len(self.task_service.get_all_tasks()), 2)
+        self.assertEqual(len(self.task_service.get_all_tasks(include_archived=True)), 7)
+        self.assertEqual(len(self.task_service.get_tasks_by_user(self.user.id_usuario, include_archived=True)), 7)
+
+    def test_archived_ids_are_not_reused(self):
+        """
+        Verifica que una tarea nueva no reutiliza el ID de una tarea archivada.
+        """
+        last = self.task_service.create_task({"titulo": "Last", "id_usuario": self.user.id_usuario,
+                                              "estado": TaskState.COMPLETADA,
+                                              "fecha_inicio": datetime.now() - timedelta(days=60)})
+        last_id = last.id_tarea
+        self.task_service.archive_completed_tasks(30)
+        new_task = self.task_service.create_task({"titulo": "New", "id_usuario": self.user.id_usuario})
+        self.assertGreater(new_task.id_tarea, last_id)
+
+    def test_deleting_user_and_category_removes_archived_rows(self):
+        """
+        Verifica que eliminar (sin diferir) una categoría borra sus asociaciones archivadas y que
+        eliminar el usuario borra sus tareas archivadas con sus notificaciones en la misma transacción.
+        """
+        self.task_service.archive_completed_tasks(30)
+        self.assertTrue(self.category_service.delete_category(self.category.id_categoria))
+        self.assertEqual(self.session.query(ArchivedTaskCategory).count(), 0)
+        self.assertTrue(self.user_service.delete_user(self.user.id_usuario))
+        self.assertEqual(self.user_service.get_all_users(), [])
+        self.assertEqual(self.task_service.get_all_tasks(include_archived=True), [])
+        self.assertEqual(self.session.query(ArchivedNotification).count(), 0)
+
+    def test_archive_invalid_arguments(self):
+        """
+        Verifica que el archivado falla con argumentos inválidos.
+        """
+        with self.assertRaises(ValueError):
+            self.task_service.archive_completed_tasks(-1)
+        with self.assertRaises(ValueError):
+            self.task_service.archive_completed_tasks(30, batch_size=0)
@@ -0,0 +1,99 @@
+import io
+import unittest
+from datetime import datetime
+from sqlalchemy import inspect, text
+from src.models import CompressedText
+from tests.test_base import BaseTest
+
+LONG_TEXT = "Descripción larga de la tarea con pasos repetidos. " * 200
+
+class TestTaskDescription(BaseTest):
+    """
+    Pruebas unitarias para la descripción diferida y comprimida de las tareas.
+    """
+    def setUp(self):
+        super().setUp()
+        user = self.user_service.create_user({"nombre": "Ana", "correo": "ana@example.com", "contrasena": "password"})
+        self.user_id = user.id_usuario
+
+    def create(self, descripcion, **data):
+        return self.task_service.create_task({"titulo": "Tarea", "descripcion": descripcion,
+                                              "id_usuario": self.user_id, **data})
+
+    def stored_type(self, task_id, table="tasks"):
+        return self.session.execute(text(f"SELECT typeof(descripcion) FROM {table} WHERE id_tarea = :id"),
+                                    {"id": task_id}).scalar()
+
+    def test_long_descriptions_are_compressed(self):
+        """
+        Verifica que las descripciones largas se guardan comprimidas y se leen sin cambios.
+        """
+        long_task, short_task = self.create(LONG_TEXT), self.create("Corta")
+        self.assertEqual(self.stored_type(long_task.id_tarea), "blob")
+        self.assertEqual(self.stored_type(short_task.id_tarea), "text")
+        stored = self.session.execute(text("SELECT length(descripcion) FROM tasks WHERE id_tarea = :id"),
+                                      {"id": long_task.id_tarea}).scalar()
+        self.assertLess(stored, len(LONG_TEXT.encode("utf-8")) / 10)
+        self.session.expire_all()
+        self.assertEqual(self.task_service.get_task_by_id(long_task.id_tarea).descripcion, LONG_TEXT)
+        self.assertEqual(self.task_service.get_task_by_id(short_task.id_tarea).descripcion, "Corta")
+
+    def test_uncompressed_rows_are_read(self):
+        """
+        Verifica que se leen las descripciones largas escritas sin comprimir.
+        """
+        task = self.create("Corta")
+        self.session.execute(text("UPDATE tasks SET descripcion = :text WHERE id_tarea = :id"),
+                             {"text": LONG_TEXT, "id": task.id_tarea})
+        self.session.commit()
+        self.session.expire_all()
+        self.assertEqual(self.task_service.get_task_by_id(task.id_tarea).descripcion, LONG_TEXT)
+
+    def test_listings_defer_description(self):
+        """
+        Verifica que los listados no cargan la descripción hasta que se accede a ella.
+        """
+        task_id = self.create(LONG_TEXT).id_tarea
+        self.session.expunge_all()
+        tasks = self.task_service.get_all_tasks()
+        self.assertIn("descripcion", inspect(tasks[0]).unloaded)
+        self.assertEqual(tasks[0].descripcion, LONG_TEXT)
+        self.session.expunge_all()
+        task = self.task_service.get_task_by_id(task_id)
+        self.assertNotIn("descripcion", inspect(task).unloaded)
+
+    def test_archive_and_export_keep_description(self):
+        """
+        Verifica que el archivo y la exportación conservan la descripción comprimida.
+        """
+        task_id = self.create(LONG_TEXT, estado="COMPLETADA", fecha_inicio=datetime(2020, 1, 1)).id_tarea
+        self.task_service.archive_completed_tasks(older_than_days=30)
+        self.assertEqual(self.stored_type(task_id, "archived_tasks"), "blob")
+        self.session.expunge_all()
+        archived = self.task_service.get_task_by_id(task_id, include_archived=True)
+        self.assertEqual(archived.descripcion, LONG_TEXT)
+
+        other = self.create(LONG_TEXT)
+        out = io.StringIO()
+        self.task_service.export("jsonl", out=out)
+        self.assertIn(LONG_TEXT, out.getvalue())
+        self.assertEqual(self.stored_type(other.id_tarea), "blob")
+
+class TestCompressedText(unittest.TestCase):
+    """
+    Pruebas unitarias para el tipo CompressedText.
+    """
+    def test_threshold(self):
+        """
+        Verifica el umbral, la compresión desactivada y los textos que no se reducen al comprimirlos.
+        """
+        column = CompressedText(threshold=10)
+        self.assertIsInstance(column.process_bind_param("x" * 100, None), bytes)
+        self.assertEqual(column.process_bind_param("corto", None), "corto")
+        self.assertIsNone(column.process_bind_param(None, None))
+        self.assertEqual(column.process_result_value(column.process_bind_param("x" * 100, None), None), "x" * 100)
+        self.assertEqual(CompressedText(threshold=None).process_bind_param("x" * 100, None), "x" * 100)
+        self.assertEqual(column.process_bind_param("Qz8#pL2@vN5&", None), "Qz8#pL2@vN5&")
+
+if __name__ == '__main__':
+    unittest.main()
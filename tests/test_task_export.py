@@ -0,0 +1,109 @@
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+from tests.test_base import BaseTest
+from src.models import TaskState
+
+class TestTaskExport(BaseTest):
+    """
+    Pruebas unitarias para la exportación de tareas de TaskService.
+    """
+    def setUp(self):
+        """
+        Crea dos usuarios, dos categorías y varias tareas para exportar.
+        """
+        super().setUp()
+        self.user = self.user_service.create_user({
+            "nombre": "Export User",
+            "correo": "export@example.com",
+            "contrasena": "password"
+        })
+        self.other_user = self.user_service.create_user({
+            "nombre": "Other User",
+            "correo": "other@example.com",
+            "contrasena": "password"
+        })
+        self.work = self.category_service.create_category({"nombre": "Trabajo"})
+        self.home = self.category_service.create_category({"nombre": "Casa"})
+
+        self.task1 = self.task_service.create_task({"titulo": "Task 1", "id_usuario": self.user.id_usuario})
+        self.task2 = self.task_service.create_task({
+            "titulo": "Task 2", "id_usuario": self.user.id_usuario, "estado": TaskState.COMPLETADA
+        })
+        self.task3 = self.task_service.create_task({"titulo": "Task 3", "id_usuario": self.other_user.id_usuario})
+        self.task_service.add_category_to_task(self.task1.id_tarea, self.work.id_categoria)
+        self.task_service.add_category_to_task(self.task1.id_tarea, self.home.id_categoria)
+        self.task_service.add_category_to_task(self.task3.id_tarea, self.home.id_categoria)
+
+    def test_export_csv_with_joined_data(self):
+        """
+        Verifica que el CSV incluye el nombre del usuario y las categorías de cada tarea.
+        """
+        out = io.StringIO()
+        total = self.task_service.export("csv", out=out)
+        self.assertEqual(total, 3)
+
+        rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+        self.assertEqual([row["titulo"] for row in rows], ["Task 1", "Task 2", "Task 3"])
+        self.assertEqual(rows[0]["usuario"], "Export User")
+        self.assertEqual(sorted(rows[0]["categorias"].split(", ")), ["Casa", "Trabajo"])
+        self.assertEqual(rows[1]["categorias"], "")
+        self.assertEqual(rows[1]["estado"], "Completada")
+
+    def test_export_jsonl_with_filters(self):
+        """
+        Verifica que los filtros limitan las tareas exportadas en JSONL.
+        """
+        out = io.StringIO()
+        total = self.task_service.export("jsonl", {"id_usuario": self.user.id_usuario, "estado": "PENDIENTE"}, out)
+        self.assertEqual(total, 1)
+
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["id_tarea"], self.task1.id_tarea)
+        self.assertEqual(records[0]["estado"], "Pendiente")
+        self.assertIsNone(records[0]["fecha_vencimiento"])
+
+    def test_export_filter_by_category(self):
+        """
+        Verifica el filtro por categoría.
+        """
+        out = io.StringIO()
+        total = self.task_service.export("jsonl", {"id_categoria": self.home.id_categoria}, out)
+        self.assertEqual(total, 2)
+
+    def test_export_gzip_file_in_chunks_with_progress(self):
+        """
+        Verifica la exportación comprimida a archivo y el informe de progreso por bloques.
+        """
+        reported = []
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tasks.csv.gz")
+            total = self.task_service.export("csv", out=path, chunk_size=2, progress=reported.append)
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                rows = list(csv.DictReader(f))
+        self.assertEqual(total, 3)
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(reported, [2, 3])
+
+    def test_export_invalid_format(self):
+        """
+        Verifica que la exportación falla con un formato no soportado.
+        """
+        with self.assertRaises(ValueError) as cm:
+            self.task_service.export("xml", out=io.StringIO())
+        self.assertIn("Formato de exportación inválido.", str(cm.exception))
+
+    def test_export_invalid_filter(self):
+        """
+        Verifica que la exportación falla con filtros desconocidos o inválidos.
+        """
+        with self.assertRaises(ValueError) as cm:
+            self.task_service.export("csv", {"titulo": "Task 1"}, io.StringIO())
+        self.assertIn("Filtros de exportación desconocidos", str(cm.exception))
+        with self.assertRaises(ValueError) as cm:
+            self.task_service.export("csv", {"estado": "INVALID"}, io.StringIO())
+        self.assertIn("Estado de tarea inválido.", str(cm.exception))
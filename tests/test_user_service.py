@@ -1,3 +1,4 @@
+from sqlalchemy import event
 from tests.test_base import BaseTest
 from src.models import User
 
@@ -104,6 +105,23 @@ class TestUserService(BaseTest):
             self.user_service.update_user(user.id_usuario, {"correo": "invalid-email"})
         self.assertIn("El formato del correo electrónico no es válido.", str(cm.exception))
 
+    def test_lookups_by_email_reuse_compiled_statement(self):
+        """
+        Verifica que las consultas por correo reutilizan el SQL compilado en las llamadas siguientes.
+        """
+        user = self.user_service.create_user({"nombre": "Ana", "correo": "ana@example.com", "contrasena": "password123"})
+        cache_hits = []
+        event.listen(self.engine, "after_cursor_execute",
+                     lambda conn, cursor, statement, parameters, context, executemany:
+                     cache_hits.append(context.cache_hit == context.dialect.CACHE_HIT))
+        repository = self.user_service.repository
+        self.assertTrue(repository.email_exists("ana@example.com"))
+        self.assertFalse(repository.email_exists("otro@example.com"))
+        self.assertIs(repository.get_by_email("ana@example.com"), user)
+        self.assertIsNone(repository.get_by_email("otro@example.com"))
+        # create_user ya compiló la comprobación de unicidad del correo
+        self.assertEqual(cache_hits, [True, True, False, True])
+
     def test_delete_user_success(self):
         """
         Verifica que se puede eliminar un usuario con éxito.
@@ -0,0 +1,86 @@
+import unittest
+from datetime import datetime, timedelta
+from tests.test_base import BaseTest
+from src.models import TaskState, TaskPriority, TaskFrequency
+from src.services.validators import TASK_VALIDATOR, USER_VALIDATOR, CATEGORY_VALIDATOR
+
+class TestValidators(unittest.TestCase):
+    """
+    Pruebas unitarias para los validadores precompilados.
+    """
+    def test_task_validator_reports_all_errors(self):
+        """
+        Verifica que se informan todos los errores de un registro, no solo el primero.
+        """
+        errors = TASK_VALIDATOR.validate({"descripcion": 5, "estado": "INVALID", "recurrente": "si"})
+        self.assertEqual(errors, [
+            "El título de la tarea es obligatorio y debe ser una cadena no vacía.",
+            "El ID de usuario es obligatorio para crear una tarea.",
+            "La descripción debe ser una cadena de texto.",
+            "Estado de tarea inválido. Valores permitidos: ['Pendiente', 'En progreso', 'Completada']",
+            "El campo 'recurrente' debe ser un booleano.",
+        ])
+
+    def test_task_validator_resolves_enums_by_name_and_value(self):
+        """
+        Verifica que los enums se resuelven por nombre o por valor, sin distinguir mayúsculas.
+        """
+        data = {"titulo": "Task", "id_usuario": 1, "estado": "en progreso", "prioridad": "ALTA",
+                "recurrente": True, "frecuencia": "Semanal"}
+        self.assertEqual(list(TASK_VALIDATOR.validate(data)), [])
+        self.assertEqual(data["estado"], TaskState.EN_PROGRESO)
+        self.assertEqual(data["prioridad"], TaskPriority.ALTA)
+        self.assertEqual(data["frecuencia"], TaskFrequency.SEMANAL)
+
+    def test_task_validator_cross_field_rules(self):
+        """
+        Verifica las reglas entre campos (fechas y frecuencia).
+        """
+        now = datetime.now()
+        errors = TASK_VALIDATOR.validate({
+            "fecha_inicio": now, "fecha_vencimiento": now - timedelta(days=1), "frecuencia": TaskFrequency.DIARIA
+        }, is_new=False)
+        self.assertEqual(errors, [
+            "La fecha de vencimiento no puede ser anterior a la fecha de inicio.",
+            "La frecuencia solo puede especificarse si la tarea es recurrente.",
+        ])
+
+    def test_user_validator_batch(self):
+        """
+        Verifica la validación por lotes de usuarios, con un resultado por registro.
+        """
+        results = USER_VALIDATOR.validate_batch([
+            {"nombre": "Ana", "correo": "ana@example.com", "contrasena": "password"},
+            {"nombre": " ", "correo": "bad-email", "contrasena": "123"},
+            {"nombre": "Luis"},
+        ])
+        self.assertEqual(list(results[0]), [])
+        self.assertEqual(len(results[1]), 3)
+        self.assertEqual(results[2], ["Nombre, correo y contraseña son campos obligatorios."])
+
+    def test_category_validator_messages_on_create_and_update(self):
+        """
+        Verifica que el mensaje de un campo inválido depende de si es creación o actualización.
+        """
+        self.assertEqual(CATEGORY_VALIDATOR.validate({"nombre": ""}, is_new=True),
+                         ["El nombre de la categoría es obligatorio y debe ser una cadena no vacía."])
+        self.assertEqual(CATEGORY_VALIDATOR.validate({"nombre": ""}, is_new=False),
+                         ["El nombre de la categoría debe ser una cadena no vacía."])
+
+class TestTaskServiceValidateBatch(BaseTest):
+    """
+    Pruebas para la validación por lotes de TaskService.
+    """
+    def test_validate_batch_checks_users_in_one_pass(self):
+        """
+        Verifica que la validación por lotes detecta usuarios inexistentes.
+        """
+        user = self.user_service.create_user({"nombre": "Batch", "correo": "batch@example.com", "contrasena": "password"})
+        results = self.task_service.validate_batch([
+            {"titulo": "Valid", "id_usuario": user.id_usuario},
+            {"titulo": "Missing user", "id_usuario": 999},
+            {"titulo": ""},
+        ])
+        self.assertEqual(list(results[0]), [])
+        self.assertEqual(results[1], ["El usuario con ID 999 no existe."])
+        self.assertEqual(len(results[2]), 2)
@@ -0,0 +1,90 @@
+import unittest
+from datetime import datetime
+from sqlalchemy import event, inspect
+from src.models import TaskState
+from tests.test_base import BaseTest
+
+class TestWriteStatements(BaseTest):
+    """
+    Pruebas unitarias para las escrituras de los servicios: cada creación o actualización es una
+    única sentencia, sin volver a leer la entidad después.
+    """
+    def setUp(self):
+        """
+        Registra las sentencias ejecutadas.
+        """
+        super().setUp()
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement.split()[0].upper())
+
+    def run_recorded(self, action):
+        """
+        Ejecuta una escritura y verifica que las columnas de la entidad devuelta se leen sin
+        consultar la base de datos.
+        :return: Tupla (entidad, sentencias ejecutadas por la escritura).
+        """
+        self.statements = statements = []
+        entity = action()
+        self.statements = []
+        if entity is not None:
+            for attr in inspect(entity).mapper.column_attrs:
+                if not attr.deferred:
+                    getattr(entity, attr.key)
+        self.assertEqual(self.statements, [])
+        return entity, statements
+
+    def create_all(self):
+        user, user_statements = self.run_recorded(lambda: self.user_service.create_user(
+            {"nombre": "Ana", "correo": "ana@example.com", "contrasena": "password"}))
+        task, task_statements = self.run_recorded(lambda: self.task_service.create_task(
+            {"titulo": "Tarea", "id_usuario": user.id_usuario}))
+        notification, notification_statements = self.run_recorded(lambda: self.notification_service.create_notification(
+            {"id_tarea": task.id_tarea, "fecha_envio": datetime(2024, 5, 1, 9, 0)}))
+        category, category_statements = self.run_recorded(lambda: self.category_service.create_category({"nombre": "Casa"}))
+        return (user, task, notification, category), (user_statements, task_statements,
+                                                      notification_statements, category_statements)
+
+    def test_create_is_a_single_insert(self):
+        """
+        Verifica que crear es un único INSERT (más la comprobación de unicidad de correos y nombres,
+        y la de existencia del padre solo si no está ya en la sesión) y que la entidad queda cargada.
+        """
+        (user, task, notification, category), statements = self.create_all()
+        self.assertEqual(statements, (["SELECT", "INSERT"], ["INSERT"], ["INSERT"], ["SELECT", "INSERT"]))
+        self.assertEqual((task.estado, task.descripcion, task.id_usuario), (TaskState.PENDIENTE, None, user.id_usuario))
+        self.assertIsInstance(task.fecha_inicio, datetime)
+        self.assertEqual(notification.fecha_envio, datetime(2024, 5, 1, 9, 0))
+
+    def test_update_is_a_single_statement(self):
+        """
+        Verifica que actualizar es un único UPDATE ... RETURNING, esté o no la entidad en la sesión.
+        """
+        (user, task, notification, category), _ = self.create_all()
+        user_id, task_id = user.id_usuario, task.id_tarea
+        notification_id, category_id = notification.id_notificacion, category.id_categoria
+        updates = (
+            lambda: self.user_service.update_user(user_id, {"nombre": "Eva"}),
+            lambda: self.task_service.update_task(task_id, {"estado": "COMPLETADA"}),
+            lambda: self.notification_service.update_notification(notification_id, {"fecha_envio": datetime(2024, 6, 1)}),
+            lambda: self.category_service.update_category(category_id, {"nombre": "Trabajo"}),
+        )
+        for expunge in (False, True):
+            for action in updates:
+                if expunge:
+                    self.session.expunge_all()
+                _, statements = self.run_recorded(action)
+                self.assertEqual(statements, ["UPDATE"])
+
+        self.session.expunge_all()
+        self.assertEqual(self.task_service.get_task_by_id(task_id).estado, TaskState.COMPLETADA)
+        self.assertEqual(self.user_service.get_user_by_id(user_id).nombre, "Eva")
+        self.assertEqual(self.notification_service.get_notification_by_id(notification_id).fecha_envio, datetime(2024, 6, 1))
+        self.assertEqual(self.category_service.get_category_by_id(category_id).nombre, "Trabajo")
+        missing, statements = self.run_recorded(lambda: self.task_service.update_task(999, {"titulo": "X"}))
+        self.assertEqual((missing, statements), (None, ["UPDATE"]))
+
+if __name__ == '__main__':
+    unittest.main()